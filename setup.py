@@ -6,7 +6,7 @@ from setuptools import setup, find_packages
 from distutils.extension import Extension
 
 ext_modules = [
-    Extension("dlinklist.libdll", ["src/dll_main.c"])
+    Extension("dlinklist.libdll", ["src/dll_main.c"], libraries=['pthread'])
     ]
 
 def read(fname):
@@ -39,5 +39,6 @@ setup(name='DLinklist',
                    ['test/ll_test.py',],),
                  ],
       ext_modules=ext_modules,
+      extras_require={'numpy': ['numpy'],},
       zip_safe=False
       )
@@ -76,7 +76,9 @@ import pkg_resources as _res
 _res.declare_namespace(__name__)
 _RES_PATH = _res.resource_filename(__name__, "libdll.so")
 
-from linklist import Return, SrchOrigin, SrchDir, InsertDir, Info, DLinklist
+from linklist import Return, SrchOrigin, SrchDir, InsertDir, FieldType, \
+     LoadMode, SaveMode, Endian, Info, Position, SortStats, Field, DLinklist, \
+     Cursor
 
 
 class BaseLinklistException(Exception):
@@ -8,10 +8,15 @@
 # $Revision$
 #
 
-import logging, os
+import logging, os, sys
 from ctypes import CDLL, CFUNCTYPE, POINTER, Structure, byref, cast, \
-     string_at, c_void_p, c_int, c_ulong, c_bool, c_size_t, c_char_p
+     string_at, addressof, create_string_buffer, sizeof, Array, c_void_p, \
+     c_int, c_ulong, c_longlong, c_double, c_bool, c_size_t, c_char_p, c_char
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 import dlinklist as dll
 
@@ -174,6 +179,151 @@ InsertDir._DIRS = dict([(v,k) for k,v in InsertDir.__dict__.items()
                         if not k.startswith("_")])
 
 
+class FieldType(object):
+    """
+    Provides an enumeration of the field types used by the native field
+    comparators.
+    """
+    MEMORY = 0 # Compare field bytes with memcmp
+    STRING = 1 # Compare field text with strncmp
+    INT = 2    # Compare field as a signed integer
+    UINT = 3   # Compare field as an unsigned integer
+    FLOAT = 4  # Compare field as a float or double
+    _TYPES = None
+    __MESSAGES = {
+        0: "Compare field bytes with memcmp",
+        1: "Compare field text with strncmp",
+        2: "Compare field as a signed integer",
+        3: "Compare field as an unsigned integer",
+        4: "Compare field as a float or double",
+        }
+
+    @classmethod
+    def getMessage(self, num):
+        """
+        Return a tuple consisting of the text name of the field type value and
+        the description of the type. If the field type value is invalid the
+        number of the value is returned and the phrase 'Unknown field type'.
+
+        @param num: The numeric value from the C{FieldType} class.
+        @type num: C{int}
+        @return: A tuple consisting of the text C{FieldType} value and the
+                 description.
+        @rtype: C{(str} or C{int, str)}
+        """
+        return (self._TYPES.get(num, num),
+                self.__MESSAGES.get(num, "Unknown field type"))
+
+FieldType._TYPES = dict([(v,k) for k,v in FieldType.__dict__.items()
+                         if not k.startswith("_")])
+
+
+class LoadMode(object):
+    """
+    Provides an enumeration of the load mode values.
+    """
+    INSERT = 0 # Insert each record with pFun as it is read
+    SORT = 1   # Append all records then sort once with pFun
+    SORTED = 2 # File is already sorted, append without pFun
+    MAP = 4    # Map the file, records are not copied
+    _MODES = None
+    __MESSAGES = {
+        0: "Insert each record with pFun as it is read",
+        1: "Append all records then sort once with pFun",
+        2: "File is already sorted, append without pFun",
+        4: "Map the file, records are not copied",
+        }
+
+    @classmethod
+    def getMessage(self, num):
+        """
+        Return a tuple consisting of the text name of the load mode value and
+        the description of the mode. If the load mode value is invalid the
+        number of the value is returned and the phrase 'Unknown load mode'.
+
+        @param num: The numeric value from the C{LoadMode} class.
+        @type num: C{int}
+        @return: A tuple consisting of the text C{LoadMode} value and the
+                 description.
+        @rtype: C{(str} or C{int, str)}
+        """
+        return (self._MODES.get(num, num),
+                self.__MESSAGES.get(num, "Unknown load mode"))
+
+LoadMode._MODES = dict([(v,k) for k,v in LoadMode.__dict__.items()
+                        if not k.startswith("_")])
+
+
+class SaveMode(object):
+    """
+    Provides an enumeration of the save file formats.
+    """
+    RAW = 0     # Records only, as written by saveList before
+    HEADER = 1  # Records after a versioned file header
+    ATOMIC = 2  # Write a temporary file and rename it
+    SYNC = 4    # Flush the file to disk before returning
+    COMPACT = 8 # Store the used bytes of each field only
+    _MODES = None
+    __MESSAGES = {
+        0: "Records only, as written by saveList before",
+        1: "Records after a versioned file header",
+        2: "Write a temporary file and rename it",
+        4: "Flush the file to disk before returning",
+        8: "Store the used bytes of each field only",
+        }
+
+    @classmethod
+    def getMessage(self, num):
+        """
+        Return a tuple consisting of the text name of the save mode value and
+        the description of the mode. If the save mode value is invalid the
+        number of the value is returned and the phrase 'Unknown save mode'.
+
+        @param num: The numeric value from the C{SaveMode} class.
+        @type num: C{int}
+        @return: A tuple consisting of the text C{SaveMode} value and the
+                 description.
+        @rtype: C{(str} or C{int, str)}
+        """
+        return (self._MODES.get(num, num),
+                self.__MESSAGES.get(num, "Unknown save mode"))
+
+SaveMode._MODES = dict([(v,k) for k,v in SaveMode.__dict__.items()
+                        if not k.startswith("_")])
+
+
+class Endian(object):
+    """
+    Provides an enumeration of the byte orders of a radix sort key.
+    """
+    BIG = 0    # First key byte is the most significant
+    LITTLE = 1 # First key byte is the least significant
+    _ORDERS = None
+    __MESSAGES = {
+        0: "First key byte is the most significant",
+        1: "First key byte is the least significant",
+        }
+
+    @classmethod
+    def getMessage(self, num):
+        """
+        Return a tuple consisting of the text name of the byte order value and
+        the description of the order. If the byte order value is invalid the
+        number of the value is returned and the phrase 'Unknown byte order'.
+
+        @param num: The numeric value from the C{Endian} class.
+        @type num: C{int}
+        @return: A tuple consisting of the text C{Endian} value and the
+                 description.
+        @rtype: C{(str} or C{int, str)}
+        """
+        return (self._ORDERS.get(num, num),
+                self.__MESSAGES.get(num, "Unknown byte order"))
+
+Endian._ORDERS = dict([(v,k) for k,v in Endian.__dict__.items()
+                       if not k.startswith("_")])
+
+
 class Node(Structure):
     """
     This class holds the link list pointers and the Info structure pointer.
@@ -202,6 +352,35 @@ class List(Structure):
         ('modified', c_bool),
         ('search_origin', c_int),
         ('search_dir', c_int),
+        ('blocksize', c_ulong),
+        ('blocks', c_void_p),
+        ('block', c_void_p),
+        ('blockused', c_ulong),
+        ('freenodes', POINTER(Node)),
+        ('inline_info', c_int),
+        ('skiphead', c_void_p),
+        ('skiplevel', c_int),
+        ('skipfun', c_void_p),
+        ('skipseed', c_ulong),
+        ('hashtable', c_void_p),
+        ('hashsize', c_ulong),
+        ('hashoffset', c_size_t),
+        ('hashlength', c_size_t),
+        ('checkpoints', c_void_p),
+        ('checkstep', c_ulong),
+        ('checkcount', c_ulong),
+        ('cursors', c_void_p),
+        ('lock', c_void_p),
+        ('searchthreads', c_int),
+        ('searchmin', c_ulong),
+        ('map', c_void_p),
+        ('mapsize', c_size_t),
+        ('mapnodes', c_void_p),
+        ('mapcount', c_ulong),
+        ('mapfd', c_int),
+        ('journal', c_void_p),
+        ('fields', c_void_p),
+        ('fieldcount', c_ulong),
         )
 
 
@@ -220,6 +399,164 @@ class SearchModes(Structure):
         )
 
 
+class Position(Structure):
+    """
+    This class holds a position in the list for the C{query} methods, the
+    record at the position and its index counted from one, zero if it is not
+    known. A new C{Position} is on no record.
+    """
+    _fields_ = (
+        ('node', c_void_p),
+        ('index', c_ulong),
+        )
+
+
+class SortStats(Structure):
+    """
+    This class is returned by the C{parallelSort()} method and contains the
+    number of threads the records were split between, the number of calls
+    made to C{pFun} and the wall time taken in seconds.
+    """
+    _fields_ = (
+        ('threads', c_int),
+        ('comparisons', c_ulong),
+        ('seconds', c_double),
+        )
+
+
+class Field(Structure):
+    """
+    This class holds the offset and length of one field of the C{Info} class
+    for the C{setFieldLayout()} method.
+    """
+    _fields_ = (
+        ('offset', c_size_t),
+        ('length', c_size_t),
+        )
+
+
+# The prototype of the compare functions passed as pFun.
+_CmpFunc = CFUNCTYPE(c_int, c_void_p, c_void_p)
+
+# The C function prototypes, (name, restype, argtypes), these are bound once
+# to the library when it is loaded. Info pointers are passed as c_void_p.
+_PROTOTYPES = (
+    ('DLL_CreateList', POINTER(List), (POINTER(POINTER(List)),)),
+    ('DLL_DestroyList', None, (POINTER(POINTER(List)),)),
+    ('DLL_CreateCursor', c_void_p, (POINTER(List),)),
+    ('DLL_DestroyCursor', None, (POINTER(c_void_p),)),
+    ('DLL_InitializeList', c_int, (POINTER(List), c_size_t)),
+    ('DLL_SetBlockSize', c_int, (POINTER(List), c_ulong)),
+    ('DLL_SetCheckpoints', c_int, (POINTER(List), c_ulong)),
+    ('DLL_SetInlineInfo', c_int, (POINTER(List), c_int)),
+    ('DLL_Version', c_void_p, ()),
+    ('DLL_IsListEmpty', c_int, (POINTER(List),)),
+    ('DLL_IsListFull', c_int, (POINTER(List),)),
+    ('DLL_GetNumberOfRecords', c_ulong, (POINTER(List),)),
+    ('DLL_SetSearchModes', c_int, (POINTER(List), c_int, c_int)),
+    ('DLL_SetSkipList', c_int, (POINTER(List), c_void_p)),
+    ('DLL_CreateIndex', c_int, (POINTER(List), c_size_t, c_size_t)),
+    ('DLL_SetFieldLayout', c_int, (POINTER(List), POINTER(Field), c_ulong)),
+    ('DLL_SetThreadSafe', c_int, (POINTER(List), c_int)),
+    ('DLL_SetParallelSearch', c_int, (POINTER(List), c_int, c_ulong)),
+    ('DLL_GetSearchModes', POINTER(SearchModes),
+     (POINTER(List), POINTER(SearchModes))),
+    ('DLL_GetCurrentIndex', c_ulong, (POINTER(List),)),
+    ('DLL_CopyToBuffer', c_int, (POINTER(List), c_void_p, c_ulong, c_ulong)),
+    ('DLL_CurrentPointerToHead', c_int, (POINTER(List),)),
+    ('DLL_CurrentPointerToTail', c_int, (POINTER(List),)),
+    ('DLL_CursorToHead', c_int, (c_void_p,)),
+    ('DLL_CursorToTail', c_int, (c_void_p,)),
+    ('DLL_CursorGetIndex', c_ulong, (c_void_p,)),
+    ('DLL_CursorSetSearchModes', c_int, (c_void_p, c_int, c_int)),
+    ('DLL_CursorGetCurrent', c_int, (c_void_p, c_void_p)),
+    ('DLL_CursorGetNext', c_int, (c_void_p, c_void_p)),
+    ('DLL_CursorGetPrior', c_int, (c_void_p, c_void_p)),
+    ('DLL_CursorGetRecordAt', c_int, (c_void_p, c_void_p, c_ulong)),
+    ('DLL_CursorGetRecords', c_int,
+     (c_void_p, c_void_p, c_ulong, c_int, POINTER(c_ulong))),
+    ('DLL_CursorFindRecord', c_int, (c_void_p, c_void_p, c_void_p, c_void_p)),
+    ('DLL_CursorFindNthRecord', c_int, (c_void_p, c_void_p, c_ulong)),
+    ('DLL_CursorInsertRecord', c_int, (c_void_p, c_void_p, c_int)),
+    ('DLL_CursorDeleteRecord', c_int, (c_void_p,)),
+    ('DLL_IncrementCurrentPointer', c_int, (POINTER(List),)),
+    ('DLL_DecrementCurrentPointer', c_int, (POINTER(List),)),
+    ('DLL_SortList', c_int, (POINTER(List), c_void_p)),
+    ('DLL_SortListByKeys', c_int, (POINTER(List), c_void_p, c_size_t,
+                                   c_int, c_int)),
+    ('DLL_ParallelSortList', c_int,
+     (POINTER(List), c_void_p, c_int, POINTER(SortStats))),
+    ('DLL_StoreCurrentPointer', c_int, (POINTER(List),)),
+    ('DLL_RadixSortList', c_int, (POINTER(List), c_size_t, c_size_t, c_int)),
+    ('DLL_RestoreCurrentPointer', c_int, (POINTER(List),)),
+    ('DLL_AddRecord', c_int, (POINTER(List), c_void_p, c_void_p)),
+    ('DLL_AddRecords', c_int, (POINTER(List), c_void_p, c_ulong, c_void_p)),
+    ('DLL_InsertRecord', c_int, (POINTER(List), c_void_p, c_int)),
+    ('DLL_SwapRecord', c_int, (POINTER(List), c_int)),
+    ('DLL_UpdateCurrentRecord', c_int, (POINTER(List), c_void_p)),
+    ('DLL_DeleteCurrentRecord', c_int, (POINTER(List),)),
+    ('DLL_DeleteEntireList', c_int, (POINTER(List),)),
+    ('DLL_FieldComparator', c_int,
+     (POINTER(c_void_p), c_size_t, c_size_t, c_int, c_int)),
+    ('DLL_FindRecord', c_int, (POINTER(List), c_void_p, c_void_p, c_void_p)),
+    ('DLL_FindByKey', c_int, (POINTER(List), c_void_p, c_void_p)),
+    ('DLL_FindLowerBound', c_int, (POINTER(List), c_void_p, c_void_p)),
+    ('DLL_FindNthRecord', c_int, (POINTER(List), c_void_p, c_ulong)),
+    ('DLL_GetCurrentRecord', c_int, (POINTER(List), c_void_p)),
+    ('DLL_GetPriorRecord', c_int, (POINTER(List), c_void_p)),
+    ('DLL_GetNextRecord', c_int, (POINTER(List), c_void_p)),
+    ('DLL_GetRecordAt', c_int, (POINTER(List), c_void_p, c_ulong)),
+    ('DLL_GetRecords', c_int,
+     (POINTER(List), c_void_p, c_ulong, c_int, POINTER(c_ulong))),
+    ('DLL_QueryRecord', c_int, (POINTER(List), c_void_p, c_void_p, c_void_p,
+                                c_int, c_int, POINTER(Position))),
+    ('DLL_QueryNthRecord', c_int, (POINTER(List), c_void_p, c_ulong, c_int,
+                                   c_int, POINTER(Position))),
+    ('DLL_QueryNextRecord', c_int,
+     (POINTER(List), c_void_p, c_int, POINTER(Position))),
+    ('DLL_QueryRecordAt', c_int,
+     (POINTER(List), c_void_p, c_ulong, POINTER(Position))),
+    ('DLL_QueryRecords', c_int, (POINTER(List), c_void_p, c_ulong, c_int,
+                                 POINTER(Position), POINTER(c_ulong))),
+    ('DLL_SaveList', c_int, (POINTER(List), c_char_p)),
+    ('DLL_SaveListEx', c_int, (POINTER(List), c_char_p, c_void_p, c_int)),
+    ('DLL_LoadList', c_int, (POINTER(List), c_char_p, c_void_p)),
+    ('DLL_LoadListEx', c_int, (POINTER(List), c_char_p, c_void_p, c_int)),
+    ('DLL_OpenJournal', c_int, (POINTER(List), c_char_p, c_char_p, c_int)),
+    ('DLL_CompactJournal', c_int, (POINTER(List),)),
+    ('DLL_CloseJournal', c_int, (POINTER(List),)),
+    ('_getListSize', c_size_t, ()),
+    ('_printList', None, (POINTER(List),)),
+    )
+
+
+def _dtypeOf(ctype):
+    """
+    Converts a C{ctypes} type into the equivalent C{numpy} data type. Padding
+    in structures is kept so the data type matches the C{C} layout exactly.
+
+    @param ctype: A C{ctypes} simple type, array or structure.
+    @type ctype: C{ctypes} type
+    @return: The C{numpy} data type.
+    @rtype: C{numpy.dtype}
+    """
+    if issubclass(ctype, Structure):
+        names = [field[0] for field in ctype._fields_]
+        return numpy.dtype({
+            'names': names,
+            'formats': [_dtypeOf(field[1]) for field in ctype._fields_],
+            'offsets': [getattr(ctype, name).offset for name in names],
+            'itemsize': sizeof(ctype),
+            })
+    elif issubclass(ctype, Array):
+        if ctype._type_ is c_char:
+            return numpy.dtype('S%d' % ctype._length_)
+
+        return numpy.dtype((_dtypeOf(ctype._type_), (ctype._length_,)))
+
+    return numpy.dtype(ctype._type_)
+
+
 class DLinklist(object):
     """
     This class provides thin wrappers around the functions in my doubly linklist
@@ -231,6 +568,19 @@ class DLinklist(object):
           preference to the next two methods except in rare cases.
         - C{createList()} -- List creation method.
         - C{initialize()} -- List initialization method.
+        - C{setBlockSize()} -- Sets the number of records allocated at one
+          time.
+        - C{setInlineInfo()} -- Sets whether a record is stored in the same
+          allocation as its C{Node}.
+        - C{setCheckpoints()} -- Keeps a pointer to every Nth record to speed
+          up positional access.
+        - C{setSkipList()} -- Keeps the list sorted with a skip list index.
+        - C{createIndex()} -- Builds a hash index on one field of the C{Info}
+          class for C{findByKey()}.
+        - C{setThreadSafe()} -- Turns the reader/writer lock of the list on
+          or off.
+        - C{setParallelSearch()} -- Sets the number of threads used to search
+          a long list.
         - C{destroyList()} -- List removal method.
 
       2. Status and State Methods
@@ -261,10 +611,17 @@ class DLinklist(object):
 
       4. List Update Methods
         - C{addRecord()} -- Adds a record to the link list.
+        - C{addRecords()} -- Adds an array of records to the link list in one
+          call.
         - C{insertRecord()} -- Inserts a record relative to the current
           pointer.
         - C{swapRecord()} -- Swaps current record up or down one position in
           the list.
+        - C{sort()} -- Sorts the list in place with a compare function or a
+          Python key function.
+        - C{parallelSort()} -- Sorts the list in place split between threads.
+        - C{radixSort()} -- Sorts the list in place by an unsigned key field
+          without a compare function.
         - C{updateCurrentRecord()} -- Updates the current record.
         - C{deleteCurrentRecord()} -- Delete a record from the list.
         - C{deleteAllNodes()} -- Deletes all the C{Info} and their C{Node}
@@ -275,23 +632,55 @@ class DLinklist(object):
           passed into C{match}.
         - C{findNthRecord()} -- Return the Nth record in the list based on
           the setting of origin and direction values in the control C{List}.
+        - C{findLowerBound()} -- Find the first record not less than C{match}
+          using the skip list.
+        - C{findByKey()} -- Find a record by the field indexed with
+          C{createIndex()}.
         - C{getCurrentRecord()} -- Return the current record.
         - C{getPriorRecord()} -- Return the prior record relative to the current
           pointer.
         - C{getNextRecord()} -- Return the next record relative to the current
           pointer.
-
-      6. Input/Output Methods
+        - C{getRecordAt()} -- Return the record at an index walking from the
+          nearest known position. This is also used by C{list[index]}.
+        - C{iterRecords()} -- Return an iterator over the records in the list,
+          they are fetched from the C{C} library in chunks. This is also used
+          by C{iter()}, C{reversed()} and C{len()} on the object.
+        - C{toArray()} -- Copy a range of records into an array with one
+          call, a C{numpy} structured array if C{numpy} is installed.
+
+      6. Cursor Methods
+        - C{cursor()} -- Returns a C{Cursor} with its own current record and
+          search modes, see the C{Cursor} class.
+
+      7. Query Methods
+        These read the list without changing it, so they can be called from
+        many threads at once as long as nothing modifies the list. The start
+        and result positions are kept in a C{Position} object.
+        - C{queryRecord()} -- Find a record like C{findRecord()}.
+        - C{queryNthRecord()} -- Find the Nth record like C{findNthRecord()}.
+        - C{queryNextRecord()} -- Return the record after or before a
+          position.
+        - C{queryRecordAt()} -- Return the record at an index like
+          C{getRecordAt()}.
+        - C{queryRecords()} -- Return an iterator over the records in the
+          list like C{iterRecords()}.
+
+      8. Input/Output Methods
         - C{saveList()} -- Save list to disk.
         - C{loadList()} -- Load list from disk.
 
-      7. Miscellaneous Helper Methods
+      9. Miscellaneous Helper Methods
         - C{compare()} -- A basic compare function. You may need to write
           your own.
+        - C{fieldComparator()} -- Returns a native compare function for one
+          field of the C{Info} class.
         - C{checkInfoType()} -- Utility method to check that the C{Info}
           object is valid.
     """
     __LIBRARY = ("../src/libdll.so", dll._RES_PATH, "../libdll.so",)
+    __LOADED = {}
+    CHUNK_SIZE = 64
 
     def __init__(self, logname="", disableLogging=False):
         """
@@ -314,7 +703,7 @@ class DLinklist(object):
 
         for path in self.__LIBRARY:
             try:
-                self._lib = CDLL(path)
+                self._lib = self.__loadLibrary(path)
                 break
             except:
                 pass
@@ -326,12 +715,76 @@ class DLinklist(object):
             raise dll.LibraryNotFoundException(msg % lib)
 
         self._list_p = None
+        self._infoClass = None
+        self._skipFun = None
+        self._indexClass = None
+        self._indexField = None
+        self._cursors = []
+
+    def __len__(self):
+        # There is no list before create() or after destroyList().
+        if not self._list_p:
+            return 0
+
+        return self.getNumberOfRecords()
+
+    def __iter__(self):
+        return self.iterRecords()
+
+    def __reversed__(self):
+        return self.iterRecords(dir=SrchDir.UP)
+
+    def __getitem__(self, index):
+        if not isinstance(index, (int, long)):
+            raise TypeError("list indices must be integers")
+
+        size = len(self)
+        if index < 0: index += size
+
+        if not 0 <= index < size:
+            raise IndexError("list index out of range")
+
+        if self._infoClass:
+            return self.getRecordAt(self._infoClass(), index + 1)
+
+        record = create_string_buffer(self._list_p.contents.infosize)
+        return self.getRecordAt(record, index + 1).raw
+
+    def __loadLibrary(self, path):
+        """
+        Loads the C{C} library and binds the function prototypes to it. This
+        is only done the first time a library is loaded, after that the bound
+        library is shared by all instances of this class so the methods below
+        can call the functions directly.
+
+        @param path: The path to the library.
+        @type path: C{str}
+        @return: The library object.
+        @rtype: C{ctypes CDLL}
+        @raise OSError: If the library cannot be loaded.
+        @raise AttributeError: If a function is missing from the library.
+        """
+        key = os.path.abspath(path)
+        lib = self.__LOADED.get(key)
+
+        if lib is None:
+            lib = CDLL(path)
+
+            for name, restype, argtypes in _PROTOTYPES:
+                func = getattr(lib, name)
+                func.restype = restype
+                func.argtypes = argtypes
+
+            self.__LOADED[key] = lib
+
+        return lib
 
     #
     # Initialization Methods
     #
 
-    def create(self, infoSize):
+    def create(self, infoSize, blockSize=0, inlineInfo=False, infoClass=None,
+               skipList=None, threadSafe=False):
         """
         Creates and initializes the link list. This method should be used
         instead of the C{createList} and C{initialize} methods unless you need
@@ -339,6 +792,26 @@ class DLinklist(object):
 
         @param infoSize: The size of the user defined C{Info} class.
         @type infoSize: C{int}
+        @keyword blockSize: The number of records to allocate at one time. The
+                            default C{0} allocates each record separately. See
+                            C{setBlockSize}.
+        @type blockSize: C{int}
+        @keyword inlineInfo: If C{True} each record is stored in the same
+                             allocation as its C{Node}. The default is
+                             C{False}. See C{setInlineInfo}.
+        @type inlineInfo: C{bool}
+        @keyword infoClass: The user defined C{Info} class, if given the
+                            records returned by C{iterRecords} are instances
+                            of it, otherwise they are strings of raw bytes.
+        @type infoClass: C{ctypes Structure}
+        @keyword skipList: A compare function, if given the list is kept
+                           sorted by it with a skip list index. See
+                           C{setSkipList}.
+        @type skipList: C{ctypes CFUNCTYPE}
+        @keyword threadSafe: If C{True} the list is guarded by a reader/writer
+                             lock so it can be shared between threads. The
+                             default is C{False}. See C{setThreadSafe}.
+        @type threadSafe: C{bool}
         @return: A pointer to the top level C{List} class. This return value
                  can be disregarded in most situations as it is not needed for
                  normal use.
@@ -347,8 +820,13 @@ class DLinklist(object):
         @raise FunctionException: If the status return value is not
                                   C{Return.NORMAL}.
         """
+        self._infoClass = infoClass
         list_p = self.createList()
         self.initialize(infoSize)
+        if blockSize: self.setBlockSize(blockSize)
+        if inlineInfo: self.setInlineInfo(True)
+        if skipList: self.setSkipList(skipList)
+        if threadSafe: self.setThreadSafe(True)
         return list_p
 
     def createList(self):
@@ -370,11 +848,8 @@ class DLinklist(object):
         @raise APIException: If a low level error occurred in the C{C} code.
         """
         try:
-            createList = self._lib.DLL_CreateList
-            createList.argtypes = (POINTER(POINTER(List)),)
-            createList.restype = POINTER(List)
             control = POINTER(List)()
-            list_p = createList(byref(control))
+            list_p = self._lib.DLL_CreateList(byref(control))
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -406,9 +881,7 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            initList = self._lib.DLL_InitializeList
-            initList.argtypes = (POINTER(List), c_size_t)
-            retval = initList(self._list_p, c_size_t(infoSize))
+            retval = self._lib.DLL_InitializeList(self._list_p, infoSize)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -417,170 +890,275 @@ class DLinklist(object):
             msg = "Return.%s: %s" % Return.getMessage(retval)
             raise dll.FunctionException(msg, retval=retval)
 
-    def destroyList(self):
+    def setBlockSize(self, blockSize):
         """
-        Deallocates the memory of all C{Nodes} and the C{Info} objects then
-        deallocates the memory used by the C{List} object.
+        Sets the number of records allocated at one time. When C{blockSize} is
+        not C{0} the C{Node} and C{Info} objects are handed out from larger
+        blocks of memory which grow on demand, deleted records are recycled.
+        The block size can be changed at any time, but turning block allocation
+        on or off can only be done on an empty list.
 
         The C{C} function doc string::
 
-          void DLL_DestroyList(List **list);
-
-          Arguments: list -- Pointer to a pointer to a name of a structure to
-                             destroy.
-          Returns  : void
+          DLL_Return DLL_SetBlockSize(List *list, unsigned long blocksize);
 
+          Arguments: list             -- Pointer to type List
+                     blocksize        -- Number of records per block, zero
+                                         turns block allocation off
+          Returns  : DLL_NORMAL       -- Block size was set
+                     DLL_NULL_LIST    -- list is NULL
+                     DLL_NOT_MODIFIED -- List is not empty and the allocation
+                                         method would change
+
+        @param blockSize: The number of records in each block.
+        @type blockSize: C{int}
         @return: C{None}
         @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
         """
         try:
-            destroyList = self._lib.DLL_DestroyList
-            destroyList.argtypes = (POINTER(POINTER(List)),)
-            destroyList.restype = None
-            destroyList(byref(self._list_p))
+            retval = self._lib.DLL_SetBlockSize(self._list_p, blockSize)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
 
-    #
-    # Status and State Methods
-    #
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
 
-    def version(self):
+    def setInlineInfo(self, flag):
         """
-        Get the version information and a list of contributors to this project.
+        Sets whether a record is stored in the same allocation as its C{Node}.
+        When C{flag} is C{True} the C{Info} object directly follows the next
+        and prior pointers, halving the number of allocations and keeping each
+        record next to its links during a traversal. This can only be changed
+        on an empty list.
 
         The C{C} function doc string::
 
-          DLL_Version() : Returns a pointer to version information
-
-          Arguments: void
-
-          Return   : char * -- Pointer to version info
+          DLL_Return DLL_SetInlineInfo(List *list, DLL_Boolean flag);
 
-        @return: A printable string.
-        @rtype: C{str}
+          Arguments: list             -- Pointer to type List
+                     flag             -- DLL_TRUE stores the Info with its
+                                         Node, DLL_FALSE allocates them
+                                         separately
+          Returns  : DLL_NORMAL       -- Flag was set
+                     DLL_NULL_LIST    -- list is NULL
+                     DLL_NOT_MODIFIED -- List is not empty or flag is invalid
+
+        @param flag: C{True} to store records with their C{Node}.
+        @type flag: C{bool}
+        @return: C{None}
         @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
         """
         try:
-            version = string_at(self._lib.DLL_Version())
+            retval = self._lib.DLL_SetInlineInfo(self._list_p, int(bool(flag)))
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
 
-        return version
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
 
-    def isListEmpty(self):
+    def setCheckpoints(self, step):
         """
-        Check if the list is empty.
+        Sets the distance between the records kept in the checkpoint table.
+        When C{step} is non-zero a pointer to every C{step}'th record is kept
+        so C{getRecordAt} and C{findNthRecord} walk at most C{step / 2}
+        records from the nearest one. The table is rebuilt by the first
+        positional search after records are inserted, deleted or moved,
+        records appended to the tail keep it. A C{step} of zero frees the
+        table.
 
         The C{C} function doc string::
 
-          DLL_Boolean DLL_IsListEmpty(List *list);
+          DLL_Return DLL_SetCheckpoints(List *list, unsigned long step);
 
-          Arguments: list      -- Pointer to type List
-          Returns  : DLL_TRUE  -- List is empty
-                     DLL_FALSE -- List has items in it
+          Arguments: list          -- Pointer to type List
+                     step          -- Records between checkpoints, zero
+                                      turns them off
+          Returns  : DLL_NORMAL    -- Step was set
+                     DLL_NULL_LIST -- list is NULL
 
-        @return: If the list is empty return C{True} else return C{False}.
-        @rtype: C{bool}
+        @param step: The number of records between checkpoints.
+        @type step: C{int}
+        @return: C{None}
         @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
         """
         try:
-            isListEmpty = self._lib.DLL_IsListEmpty
-            isListEmpty.argtypes = (POINTER(List),)
-            retval = isListEmpty(self._list_p)
+            retval = self._lib.DLL_SetCheckpoints(self._list_p, step)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
 
-        return retval
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
 
-    def isListFull(self):
+    def setSkipList(self, pFun):
         """
-        Check if the list is full, meaning memory is exhausted.
+        Binds a skip list index ordered by C{pFun} to the list so it is always
+        kept sorted. Records added with C{addRecord} are placed by the skip
+        list, C{findRecord} with C{pFun} from the head and C{findLowerBound}
+        are answered from it and updated records are moved to their new
+        place, all in O(log n) expected time instead of O(n).
+        C{insertRecord} and C{swapRecord} would break the order so they fail
+        with C{Return.NOT_MODIFIED}. It can only be set or removed on an empty
+        list, C{None} removes it.
 
         The C{C} function doc string::
 
-          DLL_Boolean DLL_IsListFull(List *list);
+          DLL_Return DLL_SetSkipList(List *list,
+                                     int (*pFun)(Info *, Info *));
 
-          Arguments: list      -- Pointer to type List
-          Returns  : DLL_TRUE  -- List is full (memory dependent)
-                     DLL_FALSE -- List is empty or partially full
+          Arguments: list             -- Pointer to type List
+                     pFun             -- Pointer to sort function or NULL
+          Returns  : DLL_NORMAL       -- Skip list was set
+                     DLL_MEM_ERROR    -- Memory allocation failed
+                     DLL_NULL_LIST    -- List is NULL
+                     DLL_NOT_MODIFIED -- List is not empty
 
-        @return: If the list is full return C{True} else return C{False}.
-        @rtype: C{bool}
+        @param pFun: A C{CFUNCTYPE} object for comparing data in the user
+                     C{Info} class, see C{compare} and C{fieldComparator}, or
+                     C{None}.
+        @type pFun: C{ctypes CFUNCTYPE}
+        @return: C{None}
         @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
         """
         try:
-            isListFull = self._lib.DLL_IsListFull
-            isListFull.argtypes = (POINTER(List),)
-            retval = isListFull(self._list_p)
+            retval = self._lib.DLL_SetSkipList(self._list_p, pFun)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
 
-        return retval
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
 
-    def getNumberOfRecords(self):
+        # The C library keeps the pointer so the callback must stay alive.
+        self._skipFun = pFun
+
+    def createIndex(self, field, infoClass=None):
         """
-        Get the number of records in the link list.
+        Builds a hash index on one field of the C{Info} class so that
+        C{findByKey} finds a record in constant time instead of scanning the
+        list. The index is built from the records already in the list and kept
+        up to date as records are added, inserted, updated, deleted and
+        loaded. A C{field} of C{None} removes the index.
 
         The C{C} function doc string::
 
-          unsigned long DLL_GetNumberOfRecords(List *list);
-
-          Arguments: list -- Pointer to type List
-          Returns  : Number of records in list
+          DLL_Return DLL_CreateIndex(List *list, size_t offset,
+                                     size_t length);
 
-        @return: The number of records in the link list.
-        @rtype: C{int}
-        @raise APIException: If a low level error occurred in the C{C} code.
+          Arguments: list             -- Pointer to type List
+                     offset           -- Offset of the key in the Info
+                                         structure
+                     length           -- Length of the key in bytes
+          Returns  : DLL_NORMAL       -- Index was built
+                     DLL_MEM_ERROR    -- Memory allocation failed
+                     DLL_NULL_LIST    -- List is NULL
+                     DLL_NOT_MODIFIED -- Key is not within the Info structure
+
+        @param field: The name of the field in the C{Info} class or C{None}.
+        @type field: C{str}
+        @keyword infoClass: The user defined C{Info} class, the default
+                            C{None} uses the class given to C{create}.
+        @type infoClass: C{ctypes Structure}
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code or
+                             C{field} is not in the C{Info} class.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
         """
+        offset = length = 0
+
+        if field is not None:
+            infoClass = infoClass or self._infoClass
+
+            if infoClass is None or field not in dict(infoClass._fields_):
+                msg = "Invalid field %s is not in %s."
+                name = getattr(infoClass, '__name__', None)
+                raise dll.APIException(msg % (field, name))
+
+            desc = getattr(infoClass, field)
+            offset, length = desc.offset, desc.size
+
         try:
-            getNumberOfRecords = self._lib.DLL_GetNumberOfRecords
-            getNumberOfRecords.argtypes = (POINTER(List),)
-            retval = getNumberOfRecords(self._list_p)
+            retval = self._lib.DLL_CreateIndex(self._list_p, offset, length)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
 
-        return retval
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
 
-    def setSearchModes(self, origin, dir):
+        self._indexClass = field and infoClass
+        self._indexField = field
+
+    def setFieldLayout(self, infoClass=None):
         """
-        Sets the search C{origin} and C{dir} modes and returns the previously
-        set modes.
+        Sets the fields C{SaveMode.COMPACT} divides each record into from the
+        C{_fields_} of the C{Info} class. Each field is saved without the
+        C{NULL} bytes at its end, so a C{c_char * 100} field holding ten
+        characters takes eleven bytes in the file. Bit fields are left in the
+        bytes around them, which are saved as fields of their own.
 
         The C{C} function doc string::
 
-          DLL_Return DLL_SetSearchModes(List *list, DLL_SrchOrigin origin,
-                                        DLL_SrchDir dir);
+          DLL_Return DLL_SetFieldLayout(List *list, const DLL_Field *fields,
+                                        unsigned long count);
 
           Arguments: list             -- Pointer to type List
-                     origin           -- Indicates the start search pointer to
-                                         use
-                     dir              -- Indicates the direction to search in
-          Returns  : DLL_NORMAL       -- Values assigned were accepted
-                     DLL_NOT_MODIFIED -- Values were not assigned--invalid type
-                                         (previous values are still in place)
-
-        @param origin: A value from the C{SrchOrigin} class.
-        @type origin: C{int}
-        @param dir: A value from  the C{SrchDir} class.
-        @type dir: C{int}
-        @return: The previously set modes: C{(origin, direction)}
-        @rtype: C{tuple}
-        @raise APIException: If a low level error occurred in the C{C} code.
+                     fields           -- Pointer to an array of type
+                                         DLL_Field
+                     count            -- Number of fields in the array
+          Returns  : DLL_NORMAL       -- Layout was set
+                     DLL_MEM_ERROR    -- Memory allocation failed
+                     DLL_NULL_LIST    -- List is NULL
+                     DLL_NOT_MODIFIED -- A field is empty, overlaps the one
+                                         before it or is not within the Info
+                                         structure
+
+        @keyword infoClass: The user defined C{Info} class, the default
+                            C{None} uses the class given to C{create}.
+        @type infoClass: C{ctypes Structure}
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code or
+                             there is no C{Info} class.
         @raise FunctionException: If the status return value is not
                                   C{Return.NORMAL}.
         """
-        modes = self.getSearchModes()
+        infoClass = infoClass or self._infoClass
+
+        if infoClass is None:
+            raise dll.APIException("No Info class to take the fields from.")
+
+        layout = []
+        end = 0
+
+        for desc in infoClass._fields_:
+            field = getattr(infoClass, desc[0])
+
+            # Bit fields share their bytes.
+            if len(desc) < 3 and field.offset >= end and field.size > 0:
+                layout.append(Field(field.offset, field.size))
+                end = field.offset + field.size
+
+        fields = (Field * len(layout))(*layout)
 
         try:
-            setSearchModes = self._lib.DLL_SetSearchModes
-            setSearchModes.argtypes = (POINTER(List), c_int, c_int)
-            retval = setSearchModes(self._list_p, origin, dir)
+            retval = self._lib.DLL_SetFieldLayout(self._list_p, fields,
+                                                  len(layout))
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -589,57 +1167,305 @@ class DLinklist(object):
             msg = "Return.%s: %s" % Return.getMessage(retval)
             raise dll.FunctionException(msg, retval=retval)
 
-        return modes
-
-    def getSearchModes(self):
+    def setThreadSafe(self, flag):
         """
-        Get the search modes, a tuple of origin and direction.
+        Turns the reader/writer lock of the list on or off. With the lock on
+        the methods that only read the list, the query methods, the cursor
+        methods that do not change the list and the status methods, run in
+        many threads at once, while the methods that change the list or move
+        its current pointer run alone. As C{ctypes} releases the GIL during
+        the C{C} call the readers really do run in parallel. This must be set
+        before the list is shared between threads, C{destroyList}, the
+        initialization methods and a cursor used by more than one thread are
+        not protected.
 
         The C{C} function doc string::
 
-          DLL_SearchModes DLL_GetSearchModes(List *list, DLL_SearchModes *ssp);
+          DLL_Return DLL_SetThreadSafe(List *list, DLL_Boolean flag);
 
-          Arguments: list -- Pointer to type List
-                     ssp  -- Save structure pointer
-          Returns  : Pointer to type DLL_SearchModes
+          Arguments: list             -- Pointer to type List
+                     flag             -- DLL_TRUE for a thread safe list
+          Returns  : DLL_NORMAL       -- Lock was set
+                     DLL_MEM_ERROR    -- Memory allocation failed
+                     DLL_NULL_LIST    -- List is NULL
 
-        @return: The search modes in a tuple C{(origin, direction)}.
-        @rtype: C{tuple}
+        @param flag: C{True} to lock the list.
+        @type flag: C{bool}
+        @return: C{None}
         @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
         """
         try:
-            setSearchModes = self._lib.DLL_GetSearchModes
-            setSearchModes.argtypes = (POINTER(List), POINTER(SearchModes))
-            setSearchModes.restype = POINTER(SearchModes)
-            sm = SearchModes()
-            modes_p = setSearchModes(self._list_p, byref(sm))
-            modes = modes_p.contents # Dereference pointer
+            retval = self._lib.DLL_SetThreadSafe(self._list_p, int(bool(flag)))
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
 
-        return modes.search_origin, modes.search_dir
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
 
-    def getCurrentIndex(self):
+    def setParallelSearch(self, threads, minSize=0):
         """
-        Get the current index value.
+        Sets the number of threads used to search a long list. When
+        C{threads} is more than one and at least C{minSize} records lie
+        between the search origin and the end of the list, C{findRecord} and
+        the other searches that call C{pFun} on each record split those
+        records into one part per thread and search the parts at once. The
+        record found is still the first match in search order. If the
+        checkpoint table is built, see C{setCheckpoints}, the parts are found
+        from it instead of by walking the list. Use a native comparator from
+        C{fieldComparator}, a Python C{pFun} holds the GIL so the threads
+        gain nothing.
 
         The C{C} function doc string::
 
-          unsigned long DLL_GetCurrentIndex(List *list);
-
-          Arguments: list -- Pointer to type List
-          Returns  : Current record's index
+          DLL_Return DLL_SetParallelSearch(List *list, int threads,
+                                           unsigned long minsize);
 
-        @return: The index where the first C{Node} is 1.
+          Arguments: list             -- Pointer to type List
+                     threads          -- Number of threads, zero or one
+                                         searches in the calling thread only
+                     minsize          -- Fewest records searched in parallel
+          Returns  : DLL_NORMAL       -- Threads were set
+                     DLL_NULL_LIST    -- List is NULL
+                     DLL_NOT_MODIFIED -- threads is negative or too large
+
+        @param threads: The number of threads, C{0} or C{1} turns the
+                        parallel search off.
+        @type threads: C{int}
+        @keyword minSize: The fewest records searched in parallel, the default
+                          C{0} uses the C{C} library default.
+        @type minSize: C{int}
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        try:
+            retval = self._lib.DLL_SetParallelSearch(self._list_p, threads,
+                                                     minSize)
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+    def destroyList(self):
+        """
+        Deallocates the memory of all C{Nodes} and the C{Info} objects then
+        deallocates the memory used by the C{List} object. Any open cursors
+        are destroyed with it.
+
+        The C{C} function doc string::
+
+          void DLL_DestroyList(List **list);
+
+          Arguments: list -- Pointer to a pointer to a name of a structure to
+                             destroy.
+          Returns  : void
+
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        """
+        try:
+            self._lib.DLL_DestroyList(byref(self._list_p))
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        # The C library has freed the cursors with the list.
+        for cursor in self._cursors:
+            cursor._cursor_p = None
+
+        self._cursors = []
+
+    #
+    # Status and State Methods
+    #
+
+    def version(self):
+        """
+        Get the version information and a list of contributors to this project.
+
+        The C{C} function doc string::
+
+          DLL_Version() : Returns a pointer to version information
+
+          Arguments: void
+
+          Return   : char * -- Pointer to version info
+
+        @return: A printable string.
+        @rtype: C{str}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        """
+        try:
+            version = string_at(self._lib.DLL_Version())
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        return version
+
+    def isListEmpty(self):
+        """
+        Check if the list is empty.
+
+        The C{C} function doc string::
+
+          DLL_Boolean DLL_IsListEmpty(List *list);
+
+          Arguments: list      -- Pointer to type List
+          Returns  : DLL_TRUE  -- List is empty
+                     DLL_FALSE -- List has items in it
+
+        @return: If the list is empty return C{True} else return C{False}.
+        @rtype: C{bool}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        """
+        try:
+            retval = self._lib.DLL_IsListEmpty(self._list_p)
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        return retval
+
+    def isListFull(self):
+        """
+        Check if the list is full, meaning memory is exhausted.
+
+        The C{C} function doc string::
+
+          DLL_Boolean DLL_IsListFull(List *list);
+
+          Arguments: list      -- Pointer to type List
+          Returns  : DLL_TRUE  -- List is full (memory dependent)
+                     DLL_FALSE -- List is empty or partially full
+
+        @return: If the list is full return C{True} else return C{False}.
+        @rtype: C{bool}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        """
+        try:
+            retval = self._lib.DLL_IsListFull(self._list_p)
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        return retval
+
+    def getNumberOfRecords(self):
+        """
+        Get the number of records in the link list.
+
+        The C{C} function doc string::
+
+          unsigned long DLL_GetNumberOfRecords(List *list);
+
+          Arguments: list -- Pointer to type List
+          Returns  : Number of records in list
+
+        @return: The number of records in the link list.
+        @rtype: C{int}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        """
+        try:
+            retval = self._lib.DLL_GetNumberOfRecords(self._list_p)
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        return retval
+
+    def setSearchModes(self, origin, dir):
+        """
+        Sets the search C{origin} and C{dir} modes and returns the previously
+        set modes.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_SetSearchModes(List *list, DLL_SrchOrigin origin,
+                                        DLL_SrchDir dir);
+
+          Arguments: list             -- Pointer to type List
+                     origin           -- Indicates the start search pointer to
+                                         use
+                     dir              -- Indicates the direction to search in
+          Returns  : DLL_NORMAL       -- Values assigned were accepted
+                     DLL_NOT_MODIFIED -- Values were not assigned--invalid type
+                                         (previous values are still in place)
+
+        @param origin: A value from the C{SrchOrigin} class.
+        @type origin: C{int}
+        @param dir: A value from  the C{SrchDir} class.
+        @type dir: C{int}
+        @return: The previously set modes: C{(origin, direction)}
+        @rtype: C{tuple}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        modes = self.getSearchModes()
+
+        try:
+            retval = self._lib.DLL_SetSearchModes(self._list_p, origin, dir)
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+        return modes
+
+    def getSearchModes(self):
+        """
+        Get the search modes, a tuple of origin and direction.
+
+        The C{C} function doc string::
+
+          DLL_SearchModes DLL_GetSearchModes(List *list, DLL_SearchModes *ssp);
+
+          Arguments: list -- Pointer to type List
+                     ssp  -- Save structure pointer
+          Returns  : Pointer to type DLL_SearchModes
+
+        @return: The search modes in a tuple C{(origin, direction)}.
+        @rtype: C{tuple}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        """
+        try:
+            modes = SearchModes()
+            self._lib.DLL_GetSearchModes(self._list_p, byref(modes))
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        return modes.search_origin, modes.search_dir
+
+    def getCurrentIndex(self):
+        """
+        Get the current index value.
+
+        The C{C} function doc string::
+
+          unsigned long DLL_GetCurrentIndex(List *list);
+
+          Arguments: list -- Pointer to type List
+          Returns  : Current record's index
+
+        @return: The index where the first C{Node} is 1.
         @rtype: C{int}
         @raise APIException: If a low level error occurred in the C{C} code.
         """
         try:
-            getCurrentIndex = self._lib.DLL_GetCurrentIndex
-            getCurrentIndex.argtypes = (POINTER(List),)
-            getCurrentIndex.restype = c_ulong
-            retval = getCurrentIndex(self._list_p)
+            retval = self._lib.DLL_GetCurrentIndex(self._list_p)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -668,9 +1494,7 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            currentPointerToHead = self._lib.DLL_CurrentPointerToHead
-            currentPointerToHead.argtypes = (POINTER(List),)
-            retval = currentPointerToHead(self._list_p)
+            retval = self._lib.DLL_CurrentPointerToHead(self._list_p)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -697,9 +1521,7 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            currentPointerToTail = self._lib.DLL_CurrentPointerToTail
-            currentPointerToTail.argtypes = (POINTER(List),)
-            retval = currentPointerToTail(self._list_p)
+            retval = self._lib.DLL_CurrentPointerToTail(self._list_p)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -727,9 +1549,7 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            incrementCurrentPointer = self._lib.DLL_IncrementCurrentPointer
-            incrementCurrentPointer.argtypes = (POINTER(List),)
-            retval = incrementCurrentPointer(self._list_p)
+            retval = self._lib.DLL_IncrementCurrentPointer(self._list_p)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -757,9 +1577,7 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            decrementCurrentPointer = self._lib.DLL_DecrementCurrentPointer
-            decrementCurrentPointer.argtypes = (POINTER(List),)
-            retval = decrementCurrentPointer(self._list_p)
+            retval = self._lib.DLL_DecrementCurrentPointer(self._list_p)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -786,9 +1604,7 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            storeCurrentPointer = self._lib.DLL_StoreCurrentPointer
-            storeCurrentPointer.argtypes = (POINTER(List),)
-            retval = storeCurrentPointer(self._list_p)
+            retval = self._lib.DLL_StoreCurrentPointer(self._list_p)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -815,9 +1631,7 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            restoreCurrentPointer = self._lib.DLL_RestoreCurrentPointer
-            restoreCurrentPointer.argtypes = (POINTER(List),)
-            retval = restoreCurrentPointer(self._list_p)
+            retval = self._lib.DLL_RestoreCurrentPointer(self._list_p)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -859,9 +1673,81 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            addRecord = self._lib.DLL_AddRecord
-            addRecord.argtypes = (POINTER(List), c_void_p, c_void_p,)
-            retval = addRecord(self._list_p, cast(byref(info), c_void_p), pFun)
+            retval = self._lib.DLL_AddRecord(self._list_p, byref(info), pFun)
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+    def addRecords(self, records, count=None, pFun=None):
+        """
+        Adds an array of records to the link list with one call into the
+        C{C} library. The C{records} can be a C{ctypes} array of C{Info}
+        objects, a C{str} or any object supporting the buffer protocol that
+        holds C{count} records one after the other. If C{pFun} is C{None} the
+        records are appended at the end of the list in the order given,
+        otherwise each record's position is determined by this function.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_AddRecords(List *list, Info *buffer,
+                                    unsigned long count,
+                                    int (*pFun)(Info *, Info *));
+
+          Arguments: list          -- Pointer to type List
+                     buffer        -- Pointer to an array of records to add
+                     count         -- Number of records in the array
+                     pFun          -- Pointer to search function
+          Returns  : DLL_NORMAL    -- Nodes were added successfully
+                     DLL_MEM_ERROR -- Memory allocation failed
+
+        @param records: The records to add.
+        @type records: C{ctypes Array}, C{str}, C{memoryview} or a buffer
+                       object
+        @keyword count: The number of records to add, the default C{None}
+                        adds every record in C{records}.
+        @type count: C{int}
+        @keyword pFun: A C{CFUNCTYPE} object for comparing data in the user
+                       C{Info} class. The default is C{None}.
+        @type pFun: C{ctypes CFUNCTYPE}
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code or
+                             C{records} is not a whole number of records.
+        @raise FunctionException: If status return value is not
+                                  C{Return.NORMAL}.
+        """
+        if isinstance(records, Array):
+            buf, size = records, sizeof(records)
+        elif isinstance(records, str):
+            buf, size = records, len(records)
+        elif isinstance(records, memoryview):
+            buf = records.tobytes()
+            size = len(buf)
+        else:
+            size = len(buffer(records))
+
+            try:
+                buf = (c_char * size).from_buffer(records)
+            except TypeError: # Read only buffers are copied.
+                buf = str(buffer(records))
+
+        infoSize = self._list_p.contents.infosize
+
+        if count is None:
+            count, remainder = divmod(size, infoSize)
+
+            if remainder:
+                msg = "Buffer of %s bytes is not a multiple of %s byte records."
+                raise dll.APIException(msg % (size, infoSize))
+        elif count * infoSize > size:
+            msg = "Buffer of %s bytes is too small for %s records of %s bytes."
+            raise dll.APIException(msg % (size, count, infoSize))
+
+        try:
+            retval = self._lib.DLL_AddRecords(self._list_p, buf, count, pFun)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -902,10 +1788,7 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            insertRecord = self._lib.DLL_InsertRecord
-            insertRecord.argtypes = (POINTER(List), c_void_p, c_int)
-            retval = insertRecord(self._list_p, cast(byref(info), c_void_p),
-                                  dir)
+            retval = self._lib.DLL_InsertRecord(self._list_p, byref(info), dir)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -945,9 +1828,7 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            swapRecord = self._lib.DLL_SwapRecord
-            swapRecord.argtypes = (POINTER(List), c_int)
-            retval = swapRecord(self._list_p, dir)
+            retval = self._lib.DLL_SwapRecord(self._list_p, dir)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -956,31 +1837,278 @@ class DLinklist(object):
             msg = "Return.%s: %s" % Return.getMessage(retval)
             raise dll.FunctionException(msg, retval=retval)
 
-    def updateCurrentRecord(self, record):
+    def sort(self, pFun=None, key=None, reverse=False):
         """
-        Updates the current record. The entire record is over written.
+        Sorts the list in place with a stable merge sort, records that compare
+        equal keep their order. The nodes are relinked so no records are
+        copied and the record that was current is still current after
+        completion.
 
-        The C{C} function doc string::
+        Either C{pFun} or C{key} is given. With C{key} the records are copied
+        out of the list once and C{key} is called exactly once per record,
+        as with the Python C{sorted} function. The keys are packed into a
+        C{C} array, integers as 64 bit integers, floats as doubles and
+        strings zero padded to the longest, and the C{C} code compares them
+        itself so Python is not called while sorting. Any
+        other keys, tuples for example, are first ranked with the Python
+        C{sorted} function and the list is sorted by the ranks.
 
-          DLL_Return DLL_UpdateCurrentRecord(List *list, Info *record);
+        The C{C} function doc strings::
 
-          Arguments: list          -- Pointer to type List
-                     record        -- Pointer to an Info structure in list
-          Returns  : DLL_NORMAL    -- Record updated
-                     DLL_NULL_LIST -- Empty list
+          DLL_Return DLL_SortList(List *list, int (*pFun)(Info *, Info *));
 
-        @param record: An C{Info} object with new data.
-        @type record: C{Info} is defined internally as C{c_void_p}
-        @return: C{None}
-        @raise APIException: If a low level error occurred in the C{C} code.
-        @raise FunctionException: If the status return value is not
-                                  C{Return.NORMAL}.
-        """
+          Arguments: list              -- Pointer to type List
+                     pFun              -- Pointer to sort function
+          Returns  : DLL_NORMAL        -- List was sorted successfully
+                     DLL_NULL_LIST     -- List is empty
+                     DLL_NULL_FUNCTION -- pFun is NULL
+
+          DLL_Return DLL_SortListByKeys(List *list, Info *keys,
+                                        size_t keysize, DLL_FieldType type,
+                                        DLL_Boolean descending);
+
+          Arguments: list              -- Pointer to type List
+                     keys              -- Pointer to the array of keys
+                     keysize           -- Size of one key in bytes
+                     type              -- Type of the keys
+                     descending        -- DLL_TRUE reverses the order
+          Returns  : DLL_NORMAL        -- List was sorted successfully
+                     DLL_NULL_LIST     -- List is empty
+                     DLL_MEM_ERROR     -- Memory allocation failed
+                     DLL_NOT_MODIFIED  -- keys is NULL, invalid keysize,
+                                          type or order, or the list has a
+                                          skip list
+
+        @keyword pFun: A C{CFUNCTYPE} object for comparing data in the user
+                       C{Info} class, see C{compare} and C{fieldComparator}.
+        @type pFun: C{ctypes CFUNCTYPE}
+        @keyword key: A function called with each record, an C{Info} object
+                      if an C{infoClass} was passed to C{create}, else a
+                      C{str}, returning the key to sort it by.
+        @type key: C{callable}
+        @keyword reverse: If C{True} the keys are sorted largest first, equal
+                          keys still keep their order. Only used with C{key}.
+        @type reverse: C{bool}
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code or
+                             both C{pFun} and C{key} are given.
+        @raise FunctionException: If status return value is not
+                                  C{Return.NORMAL}.
+        """
+        if pFun is not None and key is not None:
+            msg = "Invalid arguments, pass either pFun or key not both."
+            raise dll.APIException(msg)
+
+        if key is not None:
+            keys, keySize, keyType = self.__packKeys(key)
+
+        try:
+            if key is None:
+                retval = self._lib.DLL_SortList(self._list_p, pFun)
+            else:
+                retval = self._lib.DLL_SortListByKeys(self._list_p, keys,
+                                                      keySize, keyType,
+                                                      bool(reverse))
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+    def __packKeys(self, key):
+        """
+        Call C{key} once for each record in list order and pack the keys into
+        a C{C} array for C{DLL_SortListByKeys}.
+
+        @param key: A function returning the key of a record.
+        @type key: C{callable}
+        @return: The array of keys, the size of one key and the C{FieldType}
+                 to compare them as.
+        @rtype: C{(ctypes Array, int, int)}
+        """
+        size = self.getNumberOfRecords()
+        infoSize = self._list_p.contents.infosize
+
+        if self._infoClass:
+            records = self.toArray(out=(self._infoClass * size)())
+        else:
+            raw = self.toArray(out=(c_char * (infoSize * size))()).raw
+            records = [raw[i:i + infoSize]
+                       for i in xrange(0, infoSize * size, infoSize)]
+
+        keys = [key(record) for record in records]
+
+        if all(isinstance(k, (int, long)) and -2**63 <= k < 2**63
+               for k in keys):
+            array, type = (c_longlong * size)(*keys), FieldType.INT
+            keySize = sizeof(c_longlong)
+        elif all(isinstance(k, float) for k in keys):
+            array, type = (c_double * size)(*keys), FieldType.FLOAT
+            keySize = sizeof(c_double)
+        elif all(isinstance(k, str) and '\0' not in k for k in keys):
+            keySize = max([len(k) for k in keys] + [1])
+            data = ''.join([k.ljust(keySize, '\0') for k in keys])
+            array, type = create_string_buffer(data, len(data)), \
+                          FieldType.MEMORY
+        else:
+            # Equal keys share a rank so the sort keeps them in order.
+            order = sorted(xrange(size), key=keys.__getitem__)
+            array, type = (c_ulong * size)(), FieldType.UINT
+            keySize = sizeof(c_ulong)
+            rank = 0
+
+            for pos, idx in enumerate(order):
+                if pos and keys[idx] != keys[order[pos - 1]]:
+                    rank = pos
+
+                array[idx] = rank
+
+        return array, keySize, type
+
+    def parallelSort(self, pFun, threads):
+        """
+        Sorts the list in place with a stable merge sort split between
+        threads. The list is cut into one run of records per thread, the runs
+        are sorted at once, then neighbouring runs are merged in pairs until
+        one is left. The result is the same as from C{sort}. Use a native
+        comparator from C{fieldComparator}, a Python C{pFun} holds the GIL so
+        the threads gain nothing.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_ParallelSortList(List *list,
+                                          int (*pFun)(Info *, Info *),
+                                          int threads, DLL_SortStats *stats);
+
+          Arguments: list              -- Pointer to type List
+                     pFun              -- Pointer to sort function
+                     threads           -- Number of threads to use
+                     stats             -- Pointer to type DLL_SortStats or
+                                          NULL
+          Returns  : DLL_NORMAL        -- List was sorted successfully
+                     DLL_NULL_LIST     -- List is empty
+                     DLL_NULL_FUNCTION -- pFun is NULL
+                     DLL_NOT_MODIFIED  -- threads is negative or too large,
+                                          or the list has a skip list with
+                                          another order
+
+        @param pFun: A C{CFUNCTYPE} object for comparing data in the user
+                     C{Info} class, see C{compare} and C{fieldComparator}.
+        @type pFun: C{ctypes CFUNCTYPE}
+        @param threads: The number of threads, C{0} or C{1} sorts in the
+                        calling thread only.
+        @type threads: C{int}
+        @return: The threads used, the calls made to C{pFun} and the seconds
+                 taken.
+        @rtype: C{SortStats}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If status return value is not
+                                  C{Return.NORMAL}.
+        """
+        stats = SortStats()
+
+        try:
+            retval = self._lib.DLL_ParallelSortList(self._list_p, pFun,
+                                                    threads, byref(stats))
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+        return stats
+
+    def radixSort(self, infoClass, field, endian=None):
+        """
+        Sorts the list in place by one field of the C{Info} class taken as an
+        unsigned number, without calling a compare function. It is a stable
+        radix sort with one pass over the list per byte of the field, so it
+        suits long lists with short keys such as unsigned integers,
+        timestamps and zero padded C{c_char} codes. Negative numbers and
+        floating point fields do not sort by value.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_RadixSortList(List *list, size_t offset,
+                                       size_t length, DLL_Endian endian);
+
+          Arguments: list             -- Pointer to type List
+                     offset           -- Offset of the key in the Info
+                                         structure
+                     length           -- Length of the key in bytes
+                     endian           -- DLL_BIG_ENDIAN or DLL_LITTLE_ENDIAN
+          Returns  : DLL_NORMAL       -- List was sorted successfully
+                     DLL_NULL_LIST    -- List is empty
+                     DLL_MEM_ERROR    -- Memory allocation failed
+                     DLL_NOT_MODIFIED -- Invalid key or endian, or the list
+                                         has a skip list
+
+        @param infoClass: The user defined C{Info} class.
+        @type infoClass: C{ctypes Structure}
+        @param field: The name of the field in the C{Info} class.
+        @type field: C{str}
+        @keyword endian: One of the C{Endian} values, the default C{None}
+                         uses C{Endian.BIG} for C{c_char} arrays and the byte
+                         order of the machine for anything else.
+        @type endian: C{int}
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code or
+                             C{field} is not in the C{Info} class.
+        @raise FunctionException: If status return value is not
+                                  C{Return.NORMAL}.
+        """
+        ctype = dict(infoClass._fields_).get(field)
+
+        if ctype is None:
+            msg = "Invalid field %s is not in %s."
+            raise dll.APIException(msg % (field, infoClass.__name__))
+
+        if endian is None:
+            if issubclass(ctype, Array) or sys.byteorder == 'big':
+                endian = Endian.BIG
+            else:
+                endian = Endian.LITTLE
+
+        desc = getattr(infoClass, field)
+
+        try:
+            retval = self._lib.DLL_RadixSortList(self._list_p, desc.offset,
+                                                 desc.size, endian)
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+    def updateCurrentRecord(self, record):
+        """
+        Updates the current record. The entire record is over written.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_UpdateCurrentRecord(List *list, Info *record);
+
+          Arguments: list          -- Pointer to type List
+                     record        -- Pointer to an Info structure in list
+          Returns  : DLL_NORMAL    -- Record updated
+                     DLL_NULL_LIST -- Empty list
+
+        @param record: An C{Info} object with new data.
+        @type record: C{Info} is defined internally as C{c_void_p}
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
         try:
-            updateCurrentRecord = self._lib.DLL_UpdateCurrentRecord
-            updateCurrentRecord.argtypes = (POINTER(List), c_void_p,)
-            retval = updateCurrentRecord(self._list_p, cast(byref(record),
-                                                            c_void_p))
+            retval = self._lib.DLL_UpdateCurrentRecord(self._list_p,
+                                                       byref(record))
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -1008,9 +2136,7 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            deleteCurrentRecord = self._lib.DLL_DeleteCurrentRecord
-            deleteCurrentRecord.argtypes = (POINTER(List),)
-            retval = deleteCurrentRecord(self._list_p)
+            retval = self._lib.DLL_DeleteCurrentRecord(self._list_p)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -1022,7 +2148,9 @@ class DLinklist(object):
     def deleteAllNodes(self):
         """
         Deletes all the C{Info} and their C{Node} objects from the list then
-        reinitializes the control C{List} for continued use.
+        reinitializes the control C{List} for continued use. With block
+        allocation on (see C{setBlockSize}) the blocks are kept for reuse and
+        the list is emptied in constant time.
 
         The C{C} function doc string::
 
@@ -1038,9 +2166,7 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            deleteEntireList = self._lib.DLL_DeleteEntireList
-            deleteEntireList.argtypes = (POINTER(List),)
-            retval = deleteEntireList(self._list_p)
+            retval = self._lib.DLL_DeleteEntireList(self._list_p)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -1088,10 +2214,102 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            findRecord = self._lib.DLL_FindRecord
-            findRecord.argtypes = (POINTER(List), c_void_p, c_void_p, c_void_p,)
-            retval = findRecord(self._list_p, cast(byref(record), c_void_p),
-                                cast(byref(match), c_void_p), pFun)
+            retval = self._lib.DLL_FindRecord(self._list_p, byref(record),
+                                              byref(match), pFun)
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+        return record
+
+    def findByKey(self, record, key):
+        """
+        Find a record whose indexed field equals C{key} using the hash index
+        built by C{createIndex} and make it current. If several records have
+        the key any one of them may be found. Return the found record.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_FindByKey(List *list, Info *record, Info *match);
+
+          Arguments: list              -- Pointer to type List
+                     record            -- Pointer to an Info structure
+                     match             -- Pointer to an Info structure
+                                          holding the key to match
+          Returns  : DLL_NORMAL        -- Record found
+                     DLL_NULL_LIST     -- List is empty
+                     DLL_NOT_FOUND     -- Record not found
+                     DLL_NULL_FUNCTION -- List has no index
+
+        @param record: An C{Info} object that will have the retrieved data.
+        @type record: C{Info} is defined internally as C{c_void_p}
+        @param key: The value of the indexed field, or an C{Info} object
+                    holding it.
+        @type key: The type of the field or C{Info}
+        @return: The found record.
+        @rtype: C{Info}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        if isinstance(key, Structure):
+            match = key
+        elif self._indexClass is None:
+            match = record
+        else:
+            match = self._indexClass()
+            setattr(match, self._indexField, key)
+
+        try:
+            retval = self._lib.DLL_FindByKey(self._list_p, byref(record),
+                                             byref(match))
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+        return record
+
+    def findLowerBound(self, record, match):
+        """
+        Find the first record that is not less than C{match} by the skip list
+        compare function and make it current. The list must have a skip list,
+        see C{setSkipList}. Return the found record.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_FindLowerBound(List *list, Info *record,
+                                        Info *match);
+
+          Arguments: list              -- Pointer to type List
+                     record            -- Pointer to an Info structure
+                     match             -- Pointer to an Info structure to
+                                          match
+          Returns  : DLL_NORMAL        -- Record found
+                     DLL_NULL_LIST     -- List is empty
+                     DLL_NOT_FOUND     -- Every record is less than match
+                     DLL_NULL_FUNCTION -- List has no skip list
+
+        @param record: An C{Info} object that will have the retrieved data.
+        @type record: C{Info} is defined internally as C{c_void_p}
+        @param match: An C{Info} object with the data to match.
+        @type match: C{Info} is defined internally as C{c_void_p}
+        @return: The found record.
+        @rtype: C{Info}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        try:
+            retval = self._lib.DLL_FindLowerBound(self._list_p, byref(record),
+                                                  byref(match))
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -1133,10 +2351,8 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            findNthRecord = self._lib.DLL_FindNthRecord
-            findNthRecord.argtypes = (POINTER(List), c_void_p, c_ulong,)
-            retval = findNthRecord(self._list_p, cast(byref(record), c_void_p),
-                                   skip)
+            retval = self._lib.DLL_FindNthRecord(self._list_p, byref(record),
+                                                 skip)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -1169,10 +2385,8 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            getCurrentRecord = self._lib.DLL_GetCurrentRecord
-            getCurrentRecord.argtypes = (POINTER(List), c_void_p,)
-            retval = getCurrentRecord(self._list_p,
-                                      cast(byref(record), c_void_p))
+            retval = self._lib.DLL_GetCurrentRecord(self._list_p,
+                                                    byref(record))
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -1206,9 +2420,7 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            getPriorRecord = self._lib.DLL_GetPriorRecord
-            getPriorRecord.argtypes = (POINTER(List), c_void_p,)
-            retval = getPriorRecord(self._list_p, cast(byref(record), c_void_p))
+            retval = self._lib.DLL_GetPriorRecord(self._list_p, byref(record))
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -1242,9 +2454,7 @@ class DLinklist(object):
                                   C{Return.NORMAL}.
         """
         try:
-            getNextRecord = self._lib.DLL_GetNextRecord
-            getNextRecord.argtypes = (POINTER(List), c_void_p,)
-            retval = getNextRecord(self._list_p, cast(byref(record), c_void_p))
+            retval = self._lib.DLL_GetNextRecord(self._list_p, byref(record))
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -1255,41 +2465,40 @@ class DLinklist(object):
 
         return record
 
-    #
-    # Input/Output Methods
-    #
-
-    def saveList(self, path):
+    def getRecordAt(self, record, index):
         """
-        Save list to disk. The file is saved in binary format because the fields
-        in the C{Info} class are save in their entirety causing C{NULL} bytes
-        to be padded after text. It should be trivial to pad the fields with
-        spaces before calling this method thus eliminating any binary data
-        in text files.
+        Return the record at C{index}, counted from one at the head of the
+        list, and make it current. The walk starts from whichever of the
+        head, tail, current record, stored record or checkpoint is nearest,
+        see C{setCheckpoints}. The search modes are not used.
 
         The C{C} function doc string::
 
-          DLL_Return DLL_SaveList(List *list, const char *path);
+          DLL_Return DLL_GetRecordAt(List *list, Info *record,
+                                     unsigned long index);
 
-          Arguments: list             -- Pointer to type List
-                     path             -- Pointer to path and filename
-          Return   : DLL_NORMAL       -- File written successfully
-                     DLL_NULL_LIST    -- List is empty
-                     DLL_OPEN_ERROR   -- File open error
-                     DLL_WRITE_ERROR  -- File write error
-                     DLL_NOT_MODIFIED -- Unmodified list no save was done
+          Arguments: list          -- Pointer to type List
+                     record        -- Record to hold return data
+                     index         -- Index of the record from the head
+                                      starting at one
+          Returns  : DLL_NORMAL    -- Record found
+                     DLL_NULL_LIST -- Empty list
+                     DLL_NOT_FOUND -- Index is out of range (current record
+                                      remains unchanged)
 
-        @param path: The full path to the data file.
-        @type path: C{str}
-        @return: C{None}
+        @param record: An C{Info} object that will have the retrieved data.
+        @type record: C{Info} is defined internally as C{c_void_p}
+        @param index: The index of the record.
+        @type index: C{int}
+        @return: The found record.
+        @rtype: C{Info}
         @raise APIException: If a low level error occurred in the C{C} code.
         @raise FunctionException: If the status return value is not
                                   C{Return.NORMAL}.
         """
         try:
-            saveList = self._lib.DLL_SaveList
-            saveList.argtypes = (POINTER(List), c_char_p,)
-            retval = saveList(self._list_p, c_char_p(path))
+            retval = self._lib.DLL_GetRecordAt(self._list_p, byref(record),
+                                               index)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -1298,38 +2507,147 @@ class DLinklist(object):
             msg = "Return.%s: %s" % Return.getMessage(retval)
             raise dll.FunctionException(msg, retval=retval)
 
-    def loadList(self, path, pFun=None):
+        return record
+
+    def iterRecords(self, dir=SrchDir.DOWN, chunkSize=None):
         """
-        Load list from disk. When using the C{pFun} keyword argument the
-        function passed will sort the incoming data.
+        Return an iterator over the records in the list starting at the head,
+        or at the tail if C{dir} is C{SrchDir.UP}. The records are copied out
+        of the list C{chunkSize} at a time into a buffer that is reused for
+        the whole walk, so there is one call into the C{C} library per chunk
+        rather than per record.
+
+        The current pointer is moved by the iteration, the list should not be
+        modified until the iterator is exhausted.
 
         The C{C} function doc string::
 
-          DLL_Return DLL_LoadList(List *list, const char *path,
-                                  int (*pFun)(Info *, Info *));
+          DLL_Return DLL_GetRecords(List *list, Info *buffer,
+                                    unsigned long count, DLL_SrchDir dir,
+                                    unsigned long *fetched);
 
-          Arguments: list           -- Pointer to type List
-                     path           -- Pointer to path and filename
-                     pFun           -- Pointer to search function
-          Return   : DLL_NORMAL     -- File written successfully
-                     DLL_MEM_ERROR  -- Memory allocation failed
-                     DLL_OPEN_ERROR -- File open error
-                     DLL_READ_ERROR -- File read error
+          Arguments: list          -- Pointer to type List
+                     buffer        -- Pointer to an array of Info structures
+                     count         -- Maximum number of records to copy
+                     dir           -- Direction to move through the list
+                     fetched       -- Pointer to the number of records copied
+          Returns  : DLL_NORMAL    -- Records returned, more records remain
+                     DLL_NULL_LIST -- List is empty
+                     DLL_NOT_FOUND -- Records returned, end of list was reached
 
-        @param path: The full path to the data file.
-        @type path: C{str}
-        @keyword pFun: A C{CFUNCTYPE} object for comparing data in the user
-                       C{Info} class. The default is C{None}.
-        @type pFun: C{ctypes CFUNCTYPE}
-        @return: C{None}
+        @keyword dir: The direction to walk the list, C{SrchDir.DOWN} the
+                      default walks from head to tail, C{SrchDir.UP} walks
+                      from tail to head.
+        @type dir: C{int}
+        @keyword chunkSize: The number of records fetched per call, defaults
+                            to C{CHUNK_SIZE}.
+        @type chunkSize: C{int}
+        @return: An iterator of C{Info} objects if an C{infoClass} was passed
+                 to C{create}, else of C{str} objects holding the raw records.
+        @rtype: C{generator}
         @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL} or C{Return.NOT_FOUND}.
+        """
+        if self.isListEmpty(): return
+
+        if dir == SrchDir.UP:
+            self.currentPointerToTail()
+        else:
+            self.currentPointerToHead()
+
+        count = chunkSize or self.CHUNK_SIZE
+        infoSize = self._list_p.contents.infosize
+        buf = create_string_buffer(infoSize * count)
+        address = addressof(buf)
+        fetched = c_ulong()
+        retval = Return.NORMAL
+
+        while retval == Return.NORMAL:
+            try:
+                retval = self._lib.DLL_GetRecords(self._list_p, buf, count,
+                                                  dir, byref(fetched))
+            except Exception, e:
+                self._log.critical("Unknown error: %s", str(e))
+                raise dll.APIException(e)
+
+            if retval not in (Return.NORMAL, Return.NOT_FOUND):
+                msg = "Return.%s: %s" % Return.getMessage(retval)
+                raise dll.FunctionException(msg, retval=retval)
+
+            for offset in xrange(0, fetched.value * infoSize, infoSize):
+                if self._infoClass:
+                    yield self._infoClass.from_buffer_copy(buf, offset)
+                else:
+                    yield string_at(address + offset, infoSize)
+
+    def toArray(self, out=None, start=0, count=None):
+        """
+        Copy C{count} records starting at index C{start}, counted from zero at
+        the head of the list, into an array with one call into the C{C}
+        library. The records are written directly into the memory of C{out}
+        which can be any writable object supporting the buffer protocol, for
+        example a C{numpy} array or a C{ctypes} array. The current pointer is
+        not changed.
+
+        If C{out} is not given a new array is returned. When C{numpy} is
+        installed and an C{infoClass} was passed to C{create} this is a
+        structured array whose data type is built from the C{_fields_} of the
+        C{Info} class, otherwise it is a C{ctypes} array of C{Info} objects or
+        of bytes.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_CopyToBuffer(List *list, Info *buffer,
+                                      unsigned long start,
+                                      unsigned long count);
+
+          Arguments: list          -- Pointer to type List
+                     buffer        -- Pointer to an array of Info structures
+                     start         -- Index of the first record to copy
+                     count         -- Number of records to copy
+          Returns  : DLL_NORMAL    -- Records returned
+                     DLL_NULL_LIST -- List is empty
+                     DLL_NOT_FOUND -- Records out of range
+
+        @keyword out: The array to fill, the default C{None} creates one.
+        @type out: A writable buffer object
+        @keyword start: The index of the first record to copy, the default is
+                        C{0}.
+        @type start: C{int}
+        @keyword count: The number of records to copy, the default C{None}
+                        copies to the end of the list.
+        @type count: C{int}
+        @return: The filled array.
+        @rtype: C{numpy.ndarray}, C{ctypes Array} or the type of C{out}
+        @raise APIException: If a low level error occurred in the C{C} code or
+                             C{out} is too small.
         @raise FunctionException: If the status return value is not
                                   C{Return.NORMAL}.
         """
+        infoSize = self._list_p.contents.infosize
+        if count is None: count = max(self.getNumberOfRecords() - start, 0)
+
+        if out is None:
+            if numpy is not None and self._infoClass:
+                out = numpy.empty(count, dtype=_dtypeOf(self._infoClass))
+            elif self._infoClass:
+                out = (self._infoClass * count)()
+            else:
+                out = (c_char * (infoSize * count))()
+
+        size = len(buffer(out))
+
+        if count * infoSize > size:
+            msg = "Buffer of %s bytes is too small for %s records of %s bytes."
+            raise dll.APIException(msg % (size, count, infoSize))
+
+        if not count: return out
+
         try:
-            loadList = self._lib.DLL_LoadList
-            loadList.argtypes = (POINTER(List), c_char_p, c_void_p,)
-            retval = loadList(self._list_p, c_char_p(path), pFun)
+            buf = (c_char * size).from_buffer(out)
+            retval = self._lib.DLL_CopyToBuffer(self._list_p, buf, start + 1,
+                                                count)
         except Exception, e:
             self._log.critical("Unknown error: %s", str(e))
             raise dll.APIException(e)
@@ -1338,30 +2656,1197 @@ class DLinklist(object):
             msg = "Return.%s: %s" % Return.getMessage(retval)
             raise dll.FunctionException(msg, retval=retval)
 
+        return out
+
     #
-    # Miscellaneous Helper Methods
+    # Cursor Methods
     #
 
-    def compare(self):
+    def cursor(self):
         """
-        A basic compare function. You may need to write your own.
+        Returns a C{Cursor} on the list. A cursor has its own current record
+        and search modes so several readers can walk the list at the same
+        time without moving the current pointer or each other.
 
-        @return: Function pointer.
-        @rtype: C{ctypes POINTER}
-        """
-        # Create a prototype function for the compare function.
-        #cmpField(c_char_p("abcde"), c_char_p("bcdef"))
-        cmpPrototype = CFUNCTYPE(c_int, c_char_p, c_char_p)
-        return cmpPrototype(cmp)
+        The C{C} function doc string::
 
-    def checkInfoType(self, info):
-        """
-        Utility method to check that the C{Info} object is valid.
+          Cursor *DLL_CreateCursor(List *list);
 
-        @param info: An instance of an C{Info} class.
-        @type info: C{Info}
+          Arguments: list -- Pointer to type List
+          Returns  : Pointer to a cursor on the head record
+                     NULL if unsuccessful
+
+        @return: A cursor on the head record.
+        @rtype: C{Cursor}
         @raise APIException: If a low level error occurred in the C{C} code.
         """
-        if not isinstance(info, Structure):
-            msg = "Invalid Info type is not a subclass of ctypes Structure."
+        try:
+            cursor_p = self._lib.DLL_CreateCursor(self._list_p)
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if not cursor_p:
+            msg = "Could not create a cursor."
+            self._log.critical(msg)
             raise dll.APIException(msg)
+
+        cursor = Cursor(self, c_void_p(cursor_p))
+        self._cursors.append(cursor)
+        return cursor
+
+    #
+    # Query Methods
+    #
+
+    def queryRecord(self, record, match, pFun=None, origin=SrchOrigin.HEAD,
+                    dir=SrchDir.DOWN, position=None):
+        """
+        Find a C{record} in the list with search criteria passed into C{match}
+        without changing the list, see C{findRecord}. The search starts at
+        C{origin}, C{SrchOrigin.CURRENT} starts at C{position}. Return the
+        found record, its position is returned in C{position}.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_QueryRecord(List *list, Info *record, Info *match,
+                                     int (*pFun)(Info *, Info *),
+                                     DLL_SrchOrigin origin, DLL_SrchDir dir,
+                                     DLL_Position *position);
+
+          Arguments: list              -- Pointer to type List
+                     record            -- Pointer to an Info structure
+                     match             -- Pointer to an Info structure to match
+                     pFun              -- Pointer to search function
+                     origin            -- Where the search starts, DLL_CURRENT
+                                          starts at position
+                     dir               -- Direction of the search
+                     position          -- Start position, returns the
+                                          position of the record found
+          Returns  : DLL_NORMAL        -- Record found
+                     DLL_NULL_LIST     -- Empty list or no start position
+                     DLL_NOT_FOUND     -- Record not found
+                     DLL_NULL_FUNCTION -- pFun is NULL
+                     DLL_NOT_MODIFIED  -- Invalid origin or direction
+
+        @param record: An C{Info} object that will have the retrieved data.
+        @type record: C{Info} is defined internally as C{c_void_p}
+        @param match: An C{Info} object with the search criteria.
+        @type match: C{Info} is defined internally as C{c_void_p}
+        @keyword pFun: A C{CFUNCTYPE} object for comparing data in the user
+                       C{Info} class. The default is C{None}.
+        @type pFun: C{ctypes CFUNCTYPE}
+        @keyword origin: A value from the C{SrchOrigin} class, the default is
+                         C{SrchOrigin.HEAD}.
+        @type origin: C{int}
+        @keyword dir: A value from the C{SrchDir} class, the default is
+                      C{SrchDir.DOWN}.
+        @type dir: C{int}
+        @keyword position: The start position and the position of the found
+                           record. The default is C{None}.
+        @type position: C{Position}
+        @return: The found record.
+        @rtype: C{Info}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        if position is None: position = Position()
+
+        try:
+            retval = self._lib.DLL_QueryRecord(self._list_p, byref(record),
+                                               byref(match), pFun, origin,
+                                               dir, byref(position))
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+        return record
+
+    def queryNthRecord(self, record, skip, origin=SrchOrigin.HEAD,
+                       dir=SrchDir.DOWN, position=None):
+        """
+        Returns the Nth record from C{origin} in direction C{dir} without
+        changing the list, see C{findNthRecord}. C{SrchOrigin.CURRENT} starts
+        at C{position}. The position of the record is returned in
+        C{position}.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_QueryNthRecord(List *list, Info *record,
+                                        unsigned long skip,
+                                        DLL_SrchOrigin origin,
+                                        DLL_SrchDir dir,
+                                        DLL_Position *position);
+
+          Arguments: list             -- Pointer to type List
+                     record           -- Record to hold return data
+                     skip             -- Number of records to skip
+                     origin           -- Where the search starts, DLL_CURRENT
+                                         starts at position
+                     dir              -- Direction of the search
+                     position         -- Start position, returns the position
+                                         of the record found
+          Returns  : DLL_NORMAL       -- Node was found successfully
+                     DLL_NULL_LIST    -- Empty list or no start position
+                     DLL_NOT_FOUND    -- Skip value is too large or too small
+                     DLL_NOT_MODIFIED -- Invalid origin or direction
+
+        @param record: An C{Info} object that will have the retrieved data.
+        @type record: C{Info} is defined internally as C{c_void_p}
+        @param skip: The number of records to skip over while doing the search.
+        @type skip: C{int}
+        @keyword origin: A value from the C{SrchOrigin} class, the default is
+                         C{SrchOrigin.HEAD}.
+        @type origin: C{int}
+        @keyword dir: A value from the C{SrchDir} class, the default is
+                      C{SrchDir.DOWN}.
+        @type dir: C{int}
+        @keyword position: The start position and the position of the found
+                           record. The default is C{None}.
+        @type position: C{Position}
+        @return: The found record.
+        @rtype: C{Info}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        if position is None: position = Position()
+
+        try:
+            retval = self._lib.DLL_QueryNthRecord(self._list_p, byref(record),
+                                                  skip, origin, dir,
+                                                  byref(position))
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+        return record
+
+    def queryNextRecord(self, record, position, dir=SrchDir.DOWN):
+        """
+        Return the record after C{position}, or before it if C{dir} is
+        C{SrchDir.UP}, without changing the list and move C{position} to it.
+        A new C{Position} returns the head, or the tail.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_QueryNextRecord(List *list, Info *record,
+                                         DLL_SrchDir dir,
+                                         DLL_Position *position);
+
+          Arguments: list          -- Pointer to type List
+                     record        -- Pointer to an Info structure
+                     dir           -- DLL_DOWN, DLL_UP or
+                                      DLL_DIRECTION_DEFAULT for DLL_DOWN
+                     position      -- Start position, returns the position
+                                      of the record
+          Returns  : DLL_NORMAL    -- Record returned
+                     DLL_NULL_LIST -- Empty list
+                     DLL_NOT_FOUND -- Position is at the end of the list
+
+        @param record: An C{Info} object that will have the retrieved data.
+        @type record: C{Info} is defined internally as C{c_void_p}
+        @param position: The start position and the position of the record.
+        @type position: C{Position}
+        @keyword dir: A value from the C{SrchDir} class, the default is
+                      C{SrchDir.DOWN}.
+        @type dir: C{int}
+        @return: The record.
+        @rtype: C{Info}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        try:
+            retval = self._lib.DLL_QueryNextRecord(self._list_p,
+                                                   byref(record), dir,
+                                                   byref(position))
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+        return record
+
+    def queryRecordAt(self, record, index, position=None):
+        """
+        Return the record at C{index}, counted from one at the head of the
+        list, without changing the list, see C{getRecordAt}. The walk may
+        also start from C{position} and the position of the record is
+        returned in it.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_QueryRecordAt(List *list, Info *record,
+                                       unsigned long index,
+                                       DLL_Position *position);
+
+          Arguments: list          -- Pointer to type List
+                     record        -- Pointer to an Info structure
+                     index         -- Index of the record, from one to the
+                                      list size
+                     position      -- Returns the position of the record
+          Returns  : DLL_NORMAL    -- Record returned
+                     DLL_NULL_LIST -- Empty list
+                     DLL_NOT_FOUND -- Index is out of range
+
+        @param record: An C{Info} object that will have the retrieved data.
+        @type record: C{Info} is defined internally as C{c_void_p}
+        @param index: The index of the record.
+        @type index: C{int}
+        @keyword position: The position of the record. The default is
+                           C{None}.
+        @type position: C{Position}
+        @return: The found record.
+        @rtype: C{Info}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        if position is None: position = Position()
+
+        try:
+            retval = self._lib.DLL_QueryRecordAt(self._list_p, byref(record),
+                                                 index, byref(position))
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+        return record
+
+    def queryRecords(self, dir=SrchDir.DOWN, chunkSize=None):
+        """
+        Return an iterator over the records in the list starting at the head,
+        or at the tail if C{dir} is C{SrchDir.UP}, like C{iterRecords} but
+        without moving the current pointer, so several threads can iterate
+        at once. The list should not be modified until the iterator is
+        exhausted.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_QueryRecords(List *list, Info *buffer,
+                                      unsigned long count, DLL_SrchDir dir,
+                                      DLL_Position *position,
+                                      unsigned long *fetched);
+
+          Arguments: list          -- Pointer to type List
+                     buffer        -- Pointer to an array of Info structures
+                     count         -- Maximum number of records to copy
+                     dir           -- Direction to move through the list
+                     position      -- Start position, returns the position
+                                      of the next record to copy
+                     fetched       -- Pointer to the number of records copied
+          Returns  : DLL_NORMAL    -- Records returned, more records remain
+                     DLL_NULL_LIST -- List is empty
+                     DLL_NOT_FOUND -- Records returned, end of list was reached
+
+        @keyword dir: The direction to walk the list, C{SrchDir.DOWN} the
+                      default walks from head to tail, C{SrchDir.UP} walks
+                      from tail to head.
+        @type dir: C{int}
+        @keyword chunkSize: The number of records fetched per call, defaults
+                            to C{CHUNK_SIZE}.
+        @type chunkSize: C{int}
+        @return: An iterator of C{Info} objects if an C{infoClass} was passed
+                 to C{create}, else of C{str} objects holding the raw records.
+        @rtype: C{generator}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}, C{Return.NOT_FOUND} or
+                                  C{Return.NULL_LIST}.
+        """
+        count = chunkSize or self.CHUNK_SIZE
+        infoSize = self._list_p.contents.infosize
+        buf = create_string_buffer(infoSize * count)
+        address = addressof(buf)
+        position = Position()
+        fetched = c_ulong()
+        retval = Return.NORMAL
+
+        while retval == Return.NORMAL:
+            try:
+                retval = self._lib.DLL_QueryRecords(self._list_p, buf, count,
+                                                    dir, byref(position),
+                                                    byref(fetched))
+            except Exception, e:
+                self._log.critical("Unknown error: %s", str(e))
+                raise dll.APIException(e)
+
+            if retval not in (Return.NORMAL, Return.NOT_FOUND,
+                              Return.NULL_LIST):
+                msg = "Return.%s: %s" % Return.getMessage(retval)
+                raise dll.FunctionException(msg, retval=retval)
+
+            for offset in xrange(0, fetched.value * infoSize, infoSize):
+                if self._infoClass:
+                    yield self._infoClass.from_buffer_copy(buf, offset)
+                else:
+                    yield string_at(address + offset, infoSize)
+
+    #
+    # Input/Output Methods
+    #
+
+    def saveList(self, path, pFun=None, mode=SaveMode.RAW):
+        """
+        Save list to disk. The file is saved in binary format because the fields
+        in the C{Info} class are save in their entirety causing C{NULL} bytes
+        to be padded after text. It should be trivial to pad the fields with
+        spaces before calling this method thus eliminating any binary data
+        in text files.
+
+        With C{SaveMode.HEADER} a header is written before the records holding
+        the record size and count and a checksum of the records, which
+        C{loadList} checks. If C{pFun} is a comparator from C{fieldComparator}
+        and the records are in its order, the header also says so and
+        C{loadList} with the same comparator does not sort them again.
+
+        C{SaveMode.ATOMIC} can be added to either format to write a temporary
+        file beside C{path} and rename it over C{path}, so a crash leaves the
+        old file or the new one and never part of one. C{SaveMode.SYNC} can be
+        added to flush the file, and after a rename its directory, to disk
+        before returning.
+
+        C{SaveMode.COMPACT} writes the header followed by the layout set by
+        C{setFieldLayout} and leaves the C{NULL} bytes at the end of each field
+        out of the file, C{loadList} puts them back. Without a layout the
+        whole record is taken as one field.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_SaveListEx(List *list, const char *path,
+                                    int (*pFun)(Info *, Info *),
+                                    DLL_SaveMode mode);
+
+          Arguments: list             -- Pointer to type List
+                     path             -- Pointer to path and filename
+                     pFun             -- Pointer to the sort function the
+                                         records are in order by or NULL
+                     mode             -- File format and how it is written
+          Return   : DLL_NORMAL       -- File written successfully
+                     DLL_MEM_ERROR    -- Memory allocation failed
+                     DLL_NULL_LIST    -- List is empty
+                     DLL_OPEN_ERROR   -- File open error
+                     DLL_WRITE_ERROR  -- File write error
+                     DLL_NOT_MODIFIED -- Unmodified list no save was done, or
+                                         mode is invalid
+
+        @param path: The full path to the data file.
+        @type path: C{str}
+        @keyword pFun: A C{CFUNCTYPE} object the records are in order by. The
+                       default is C{None}.
+        @type pFun: C{ctypes CFUNCTYPE}
+        @keyword mode: A value from the C{SaveMode} class, the default is
+                       C{SaveMode.RAW}.
+        @type mode: C{int}
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        try:
+            retval = self._lib.DLL_SaveListEx(self._list_p, path, pFun, mode)
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+    def loadList(self, path, pFun=None, mode=LoadMode.INSERT):
+        """
+        Load list from disk. When using the C{pFun} keyword argument the
+        function passed will sort the incoming data. How it is sorted depends
+        on C{mode}, C{LoadMode.INSERT} places each record as it is read,
+        C{LoadMode.SORT} reads all the records then sorts the list once, which
+        is much faster for large files, and C{LoadMode.SORTED} trusts that the
+        file is already in order and does not sort at all.
+
+        C{LoadMode.MAP} can be added to C{LoadMode.SORT} or C{LoadMode.SORTED}
+        to map the file into memory instead of reading it. Each record is left
+        in the mapping and only read from disk when it is used, a record that
+        is changed is copied first so the file is never written. The records
+        are always sorted once, as with C{LoadMode.SORT}, and the mapping is
+        released by C{deleteAllNodes} and C{destroyList}. The file must not be
+        changed by anything else while it is mapped. A list with a skip list
+        reads the file as usual.
+
+        A file saved with C{SaveMode.HEADER} is checked against its header
+        before the list is emptied and against its checksum after it is read,
+        leaving the list empty if they do not match. The checksum of a mapped
+        file is not checked. If the header says the file is in the order of
+        C{pFun} it is not sorted again. A file saved with C{SaveMode.COMPACT}
+        is unpacked by the layout saved in it and is read rather than mapped.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_LoadListEx(List *list, const char *path,
+                                    int (*pFun)(Info *, Info *),
+                                    DLL_LoadMode mode);
+
+          Arguments: list           -- Pointer to type List
+                     path           -- Pointer to path and filename
+                     pFun           -- Pointer to search function
+                     mode           -- How the records are ordered
+          Return   : DLL_NORMAL     -- File read successfully
+                     DLL_MEM_ERROR  -- Memory allocation failed
+                     DLL_OPEN_ERROR -- File open error
+                     DLL_READ_ERROR -- File read or map error, or the file
+                                       header or checksum does not match
+
+        @param path: The full path to the data file.
+        @type path: C{str}
+        @keyword pFun: A C{CFUNCTYPE} object for comparing data in the user
+                       C{Info} class. The default is C{None}.
+        @type pFun: C{ctypes CFUNCTYPE}
+        @keyword mode: A value from the C{LoadMode} class, the default is
+                       C{LoadMode.INSERT}.
+        @type mode: C{int}
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        try:
+            retval = self._lib.DLL_LoadListEx(self._list_p, path, pFun, mode)
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+    def openJournal(self, path, logPath, sync=False):
+        """
+        Keep the list on disk as a snapshot and a log of the changes made
+        since the snapshot was written. Each record added, inserted, updated,
+        deleted or swapped appends one entry to the log at C{logPath} instead
+        of saving the whole list. Sorting, loading or emptying the list and
+        C{compactJournal} write a new snapshot to C{path} and empty the log.
+
+        If either file exists the list is replaced by the snapshot with the
+        log replayed on it, an entry cut short by a crash is dropped. If
+        neither exists the records in the list are written as the first
+        snapshot. With C{sync} every write is flushed to disk before the
+        method that made it returns. A list with a layout set by
+        C{setFieldLayout} writes its snapshots with C{SaveMode.COMPACT}.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_OpenJournal(List *list, const char *path,
+                                     const char *logpath, DLL_Boolean sync);
+
+          Arguments: list             -- Pointer to type List
+                     path             -- Pointer to path and filename of the
+                                         snapshot
+                     logpath          -- Pointer to path and filename of the
+                                         log
+                     sync             -- DLL_TRUE to flush every write to disk
+          Returns  : DLL_NORMAL       -- Journal was opened
+                     DLL_MEM_ERROR    -- Memory allocation failed
+                     DLL_OPEN_ERROR   -- File open error
+                     DLL_READ_ERROR   -- The snapshot could not be read or the
+                                         log does not fit it, the list holds
+                                         what was read
+                     DLL_WRITE_ERROR  -- File write error
+                     DLL_NOT_MODIFIED -- A journal is already open
+
+        @param path: The full path to the snapshot file.
+        @type path: C{str}
+        @param logPath: The full path to the log file.
+        @type logPath: C{str}
+        @keyword sync: If C{True} flush every write to disk. The default is
+                       C{False}.
+        @type sync: C{bool}
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        try:
+            retval = self._lib.DLL_OpenJournal(self._list_p, path, logPath,
+                                               sync and 1 or 0)
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+    def compactJournal(self):
+        """
+        Write the list as a new journal snapshot and empty the log.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_CompactJournal(List *list);
+
+          Arguments: list             -- Pointer to type List
+          Returns  : DLL_NORMAL       -- Snapshot was written
+                     DLL_MEM_ERROR    -- Memory allocation failed
+                     DLL_OPEN_ERROR   -- File open error
+                     DLL_WRITE_ERROR  -- File write error
+                     DLL_NOT_MODIFIED -- No journal is open
+
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        try:
+            retval = self._lib.DLL_CompactJournal(self._list_p)
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+    def closeJournal(self):
+        """
+        Stop logging changes to the list. The files are kept and
+        C{openJournal} carries on from them.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_CloseJournal(List *list);
+
+          Arguments: list             -- Pointer to type List
+          Returns  : DLL_NORMAL       -- Journal was closed
+                     DLL_WRITE_ERROR  -- The log could not be closed
+                     DLL_NOT_MODIFIED -- No journal is open
+
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        try:
+            retval = self._lib.DLL_CloseJournal(self._list_p)
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+    #
+    # Miscellaneous Helper Methods
+    #
+
+    def compare(self):
+        """
+        A basic compare function. You may need to write your own.
+
+        @return: Function pointer.
+        @rtype: C{ctypes POINTER}
+        """
+        # Create a prototype function for the compare function.
+        #cmpField(c_char_p("abcde"), c_char_p("bcdef"))
+        cmpPrototype = CFUNCTYPE(c_int, c_char_p, c_char_p)
+        return cmpPrototype(cmp)
+
+    def fieldComparator(self, infoClass, field, type=None, descending=False):
+        """
+        Returns a compare function implemented in the C{C} library for one
+        field of the C{Info} class. It can be passed as C{pFun} to any method
+        in this class and, unlike the function returned by C{compare}, never
+        calls back into Python, so sorted inserts and searches run without the
+        interpreter.
+
+        If C{type} is not given it is taken from the C{ctypes} type of the
+        field, C{c_char} arrays are compared as strings, integers and floating
+        point numbers by value, and anything else byte by byte.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_FieldComparator(int (**pFun)(Info *, Info *),
+                                         size_t offset, size_t length,
+                                         DLL_FieldType type,
+                                         DLL_Boolean descending);
+
+          Arguments: pFun              -- Pointer to the returned compare
+                                          function
+                     offset            -- Offset of the field in the Info
+                                          structure
+                     length            -- Length of the field in bytes
+                     type              -- Type of the field
+                     descending        -- DLL_TRUE reverses the order
+          Returns  : DLL_NORMAL        -- Compare function returned
+                     DLL_MEM_ERROR     -- No comparators left
+                     DLL_NULL_FUNCTION -- pFun is NULL
+                     DLL_NOT_MODIFIED  -- Invalid length, type or order
+
+        @param infoClass: The user defined C{Info} class.
+        @type infoClass: C{ctypes Structure}
+        @param field: The name of the field in the C{Info} class.
+        @type field: C{str}
+        @keyword type: One of the C{FieldType} values, the default C{None}
+                       uses the type of the field.
+        @type type: C{int}
+        @keyword descending: If C{True} the order is reversed, the default is
+                             C{False}.
+        @type descending: C{bool}
+        @return: Function pointer.
+        @rtype: C{ctypes CFUNCTYPE}
+        @raise APIException: If a low level error occurred in the C{C} code or
+                             C{field} is not in the C{Info} class.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        ctype = dict(infoClass._fields_).get(field)
+
+        if ctype is None:
+            msg = "Invalid field %s is not in %s."
+            raise dll.APIException(msg % (field, infoClass.__name__))
+
+        if type is None: type = self.__fieldType(ctype)
+        desc = getattr(infoClass, field)
+        pFun = c_void_p()
+
+        try:
+            retval = self._lib.DLL_FieldComparator(byref(pFun), desc.offset,
+                                                   desc.size, type,
+                                                   bool(descending))
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        if retval != Return.NORMAL:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+        return _CmpFunc(pFun.value)
+
+    def __fieldType(self, ctype):
+        """
+        Get the C{FieldType} for a C{ctypes} type.
+
+        @param ctype: The C{ctypes} type of a field.
+        @type ctype: C{ctypes} type
+        @return: The field type.
+        @rtype: C{int}
+        """
+        if issubclass(ctype, Array):
+            if ctype._type_ is c_char: return FieldType.STRING
+        else:
+            code = getattr(ctype, '_type_', None)
+            if code in ('b', 'h', 'i', 'l', 'q'): return FieldType.INT
+            if code in ('B', 'H', 'I', 'L', 'Q', '?'): return FieldType.UINT
+            if code in ('f', 'd'): return FieldType.FLOAT
+
+        return FieldType.MEMORY
+
+    def checkInfoType(self, info):
+        """
+        Utility method to check that the C{Info} object is valid.
+
+        @param info: An instance of an C{Info} class.
+        @type info: C{Info}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        """
+        if not isinstance(info, Structure):
+            msg = "Invalid Info type is not a subclass of ctypes Structure."
+            raise dll.APIException(msg)
+
+
+class Cursor(object):
+    """
+    A cursor on a C{DLinklist} returned by its C{cursor()} method. It has its
+    own current record and search modes so several readers can walk the same
+    list without moving the current pointer of the list or each other.
+
+    Records inserted or deleted through the list or another cursor are fixed
+    up, a cursor on a deleted record moves to the next record or to the prior
+    one at the tail, and every cursor is emptied by C{deleteAllNodes()}.
+
+      - C{toHead()} -- Moves the cursor to the head of the list.
+      - C{toTail()} -- Moves the cursor to the tail of the list.
+      - C{getCurrentIndex()} -- Get the index of the cursor's record.
+      - C{setSearchModes()} -- Sets the search C{origin} and C{dir} modes of
+        the cursor.
+      - C{getCurrentRecord()} -- Return the cursor's record.
+      - C{getNextRecord()} -- Move to and return the next record.
+      - C{getPriorRecord()} -- Move to and return the prior record.
+      - C{getRecordAt()} -- Move to and return the record at an index.
+      - C{iterRecords()} -- Return an iterator over the records in the list
+        that moves only the cursor. This is also used by C{iter()}.
+      - C{findRecord()} -- Find a record from the cursor's search origin.
+      - C{findNthRecord()} -- Return the Nth record from the cursor's search
+        origin.
+      - C{insertRecord()} -- Inserts a record relative to the cursor.
+      - C{deleteRecord()} -- Deletes the cursor's record.
+      - C{destroy()} -- Frees the cursor, it is also freed with the list.
+    """
+
+    def __init__(self, dlinklist, cursor_p):
+        """
+        Use C{DLinklist.cursor()} to create a cursor.
+
+        @param dlinklist: The list the cursor is on.
+        @type dlinklist: C{DLinklist}
+        @param cursor_p: The pointer to the C{C} cursor.
+        @type cursor_p: C{ctypes c_void_p}
+        """
+        self._dll = dlinklist
+        self._lib = dlinklist._lib
+        self._log = dlinklist._log
+        self._cursor_p = cursor_p
+
+    def __iter__(self):
+        return self.iterRecords()
+
+    def __call(self, name, *args, **kwargs):
+        """
+        Calls a cursor function in the C{C} library and checks the status.
+
+        @param name: The name of the C{C} function.
+        @type name: C{str}
+        @keyword valid: The status values that are not errors, defaults to
+                        C{Return.NORMAL} only. C{None} returns the value
+                        unchecked.
+        @type valid: C{tuple}
+        @return: The status return value.
+        @rtype: C{int}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not valid.
+        """
+        if not self._cursor_p:
+            msg = "The cursor has been destroyed."
+            self._log.error(msg)
+            raise dll.APIException(msg)
+
+        try:
+            retval = getattr(self._lib, name)(self._cursor_p, *args)
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        valid = kwargs.get('valid', (Return.NORMAL,))
+
+        if valid is not None and retval not in valid:
+            msg = "Return.%s: %s" % Return.getMessage(retval)
+            raise dll.FunctionException(msg, retval=retval)
+
+        return retval
+
+    def destroy(self):
+        """
+        Frees the cursor. Calling it again does nothing.
+
+        The C{C} function doc string::
+
+          void DLL_DestroyCursor(Cursor **cursor);
+
+          Arguments: cursor -- Pointer to a pointer to type Cursor
+          Returns  : void
+
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        """
+        if not self._cursor_p: return
+
+        try:
+            self._lib.DLL_DestroyCursor(byref(self._cursor_p))
+        except Exception, e:
+            self._log.critical("Unknown error: %s", str(e))
+            raise dll.APIException(e)
+
+        self._cursor_p = None
+        self._dll._cursors.remove(self)
+
+    def toHead(self):
+        """
+        Moves the cursor to the head of the list.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_CursorToHead(Cursor *cursor);
+
+          Arguments: cursor        -- Pointer to type Cursor
+          Returns  : DLL_NORMAL    -- Record found
+                     DLL_NULL_LIST -- Empty list
+
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        self.__call('DLL_CursorToHead')
+
+    def toTail(self):
+        """
+        Moves the cursor to the tail of the list.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_CursorToTail(Cursor *cursor);
+
+          Arguments: cursor        -- Pointer to type Cursor
+          Returns  : DLL_NORMAL    -- Record found
+                     DLL_NULL_LIST -- Empty list
+
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        self.__call('DLL_CursorToTail')
+
+    def getCurrentIndex(self):
+        """
+        Get the index of the cursor's record counted from one at the head.
+
+        The C{C} function doc string::
+
+          unsigned long DLL_CursorGetIndex(Cursor *cursor);
+
+          Arguments: cursor -- Pointer to type Cursor
+          Returns  : Index of the cursor's record, zero if it is not on a
+                     record
+
+        @return: The index of the cursor's record.
+        @rtype: C{int}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        """
+        return self.__call('DLL_CursorGetIndex', valid=None)
+
+    def setSearchModes(self, origin, dir):
+        """
+        Sets the search C{origin} and C{dir} modes of the cursor, see
+        C{DLinklist.setSearchModes}.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_CursorSetSearchModes(Cursor *cursor,
+                                              DLL_SrchOrigin origin,
+                                              DLL_SrchDir dir);
+
+          Arguments: cursor           -- Pointer to type Cursor
+                     origin           -- Indicates the start search pointer
+                     dir              -- Indicates the direction to search in
+          Returns  : DLL_NORMAL       -- Values assigned were accepted
+                     DLL_NOT_MODIFIED -- Values were not assigned--invalid type
+
+        @param origin: A value from the C{SrchOrigin} class.
+        @type origin: C{int}
+        @param dir: A value from the C{SrchDir} class.
+        @type dir: C{int}
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        self.__call('DLL_CursorSetSearchModes', origin, dir)
+
+    def getCurrentRecord(self, record):
+        """
+        Return the cursor's record.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_CursorGetCurrent(Cursor *cursor, Info *record);
+
+          Arguments: cursor        -- Pointer to type Cursor
+                     record        -- Pointer to an Info structure
+          Returns  : DLL_NORMAL    -- Record returned
+                     DLL_NULL_LIST -- Cursor is not on a record
+
+        @param record: An C{Info} object that will have the retrieved data.
+        @type record: C{Info} is defined internally as C{c_void_p}
+        @return: The cursor's record.
+        @rtype: C{Info}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        self.__call('DLL_CursorGetCurrent', byref(record))
+        return record
+
+    def getNextRecord(self, record):
+        """
+        Move the cursor to the next record and return it.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_CursorGetNext(Cursor *cursor, Info *record);
+
+          Arguments: cursor        -- Pointer to type Cursor
+                     record        -- Pointer to an Info structure
+          Returns  : DLL_NORMAL    -- Record returned
+                     DLL_NULL_LIST -- Cursor is not on a record
+                     DLL_NOT_FOUND -- Cursor is at the tail
+
+        @param record: An C{Info} object that will have the retrieved data.
+        @type record: C{Info} is defined internally as C{c_void_p}
+        @return: The next record.
+        @rtype: C{Info}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        self.__call('DLL_CursorGetNext', byref(record))
+        return record
+
+    def getPriorRecord(self, record):
+        """
+        Move the cursor to the prior record and return it.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_CursorGetPrior(Cursor *cursor, Info *record);
+
+          Arguments: cursor        -- Pointer to type Cursor
+                     record        -- Pointer to an Info structure
+          Returns  : DLL_NORMAL    -- Record returned
+                     DLL_NULL_LIST -- Cursor is not on a record
+                     DLL_NOT_FOUND -- Cursor is at the head
+
+        @param record: An C{Info} object that will have the retrieved data.
+        @type record: C{Info} is defined internally as C{c_void_p}
+        @return: The prior record.
+        @rtype: C{Info}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        self.__call('DLL_CursorGetPrior', byref(record))
+        return record
+
+    def getRecordAt(self, record, index):
+        """
+        Move the cursor to the record at C{index}, counted from one at the
+        head of the list, and return it, see C{DLinklist.getRecordAt}.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_CursorGetRecordAt(Cursor *cursor, Info *record,
+                                           unsigned long index);
+
+          Arguments: cursor        -- Pointer to type Cursor
+                     record        -- Pointer to an Info structure
+                     index         -- Index of the record, from one to the
+                                      list size
+          Returns  : DLL_NORMAL    -- Record returned
+                     DLL_NULL_LIST -- Empty list
+                     DLL_NOT_FOUND -- Index is out of range
+
+        @param record: An C{Info} object that will have the retrieved data.
+        @type record: C{Info} is defined internally as C{c_void_p}
+        @param index: The index of the record.
+        @type index: C{int}
+        @return: The found record.
+        @rtype: C{Info}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        self.__call('DLL_CursorGetRecordAt', byref(record), index)
+        return record
+
+    def iterRecords(self, dir=SrchDir.DOWN, chunkSize=None):
+        """
+        Return an iterator over the records in the list starting at the head,
+        or at the tail if C{dir} is C{SrchDir.UP}, see
+        C{DLinklist.iterRecords}. Only the cursor is moved so other cursors
+        and the current pointer of the list are left where they are.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_CursorGetRecords(Cursor *cursor, Info *buffer,
+                                          unsigned long count,
+                                          DLL_SrchDir dir,
+                                          unsigned long *fetched);
+
+          Arguments: cursor        -- Pointer to type Cursor
+                     buffer        -- Pointer to an array of Info structures
+                     count         -- Maximum number of records to copy
+                     dir           -- Direction to move through the list
+                     fetched       -- Pointer to the number of records copied
+          Returns  : DLL_NORMAL    -- Records returned, more records remain
+                     DLL_NULL_LIST -- Cursor is not on a record
+                     DLL_NOT_FOUND -- Records returned, end of list was reached
+
+        @keyword dir: The direction to walk the list, C{SrchDir.DOWN} the
+                      default walks from head to tail, C{SrchDir.UP} walks
+                      from tail to head.
+        @type dir: C{int}
+        @keyword chunkSize: The number of records fetched per call, defaults
+                            to C{DLinklist.CHUNK_SIZE}.
+        @type chunkSize: C{int}
+        @return: An iterator of C{Info} objects if an C{infoClass} was passed
+                 to C{create}, else of C{str} objects holding the raw records.
+        @rtype: C{generator}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL} or C{Return.NOT_FOUND}.
+        """
+        if self._dll.isListEmpty(): return
+
+        if dir == SrchDir.UP:
+            self.toTail()
+        else:
+            self.toHead()
+
+        count = chunkSize or self._dll.CHUNK_SIZE
+        infoSize = self._dll._list_p.contents.infosize
+        infoClass = self._dll._infoClass
+        buf = create_string_buffer(infoSize * count)
+        address = addressof(buf)
+        fetched = c_ulong()
+        retval = Return.NORMAL
+
+        while retval == Return.NORMAL:
+            retval = self.__call('DLL_CursorGetRecords', buf, count, dir,
+                                 byref(fetched),
+                                 valid=(Return.NORMAL, Return.NOT_FOUND))
+
+            for offset in xrange(0, fetched.value * infoSize, infoSize):
+                if infoClass:
+                    yield infoClass.from_buffer_copy(buf, offset)
+                else:
+                    yield string_at(address + offset, infoSize)
+
+    def findRecord(self, record, match, pFun=None):
+        """
+        Find a C{record} with search criteria passed into C{match} starting
+        from the cursor's search origin and move the cursor to it, see
+        C{DLinklist.findRecord}.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_CursorFindRecord(Cursor *cursor, Info *record,
+                                          Info *match,
+                                          int (*pFun)(Info *, Info *));
+
+          Arguments: cursor            -- Pointer to type Cursor
+                     record            -- Pointer to an Info structure
+                     match             -- Pointer to an Info structure to match
+                     pFun              -- Pointer to search function
+          Returns  : DLL_NORMAL        -- Record found
+                     DLL_NULL_LIST     -- Empty list
+                     DLL_NOT_FOUND     -- Record not found
+                     DLL_NULL_FUNCTION -- pFun is NULL
+
+        @param record: An C{Info} object that will have the retrieved data.
+        @type record: C{Info} is defined internally as C{c_void_p}
+        @param match: An C{Info} object with the search criteria.
+        @type match: C{Info} is defined internally as C{c_void_p}
+        @keyword pFun: A C{CFUNCTYPE} object for comparing data in the user
+                       C{Info} class. The default is C{None}.
+        @type pFun: C{ctypes CFUNCTYPE}
+        @return: The found record.
+        @rtype: C{Info}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        self.__call('DLL_CursorFindRecord', byref(record), byref(match), pFun)
+        return record
+
+    def findNthRecord(self, record, skip):
+        """
+        Returns the Nth record from the cursor's search origin and moves the
+        cursor to it, see C{DLinklist.findNthRecord}.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_CursorFindNthRecord(Cursor *cursor, Info *record,
+                                             unsigned long skip);
+
+          Arguments: cursor        -- Pointer to type Cursor
+                     record        -- Record to hold return data
+                     skip          -- Number of records to skip
+          Returns  : DLL_NORMAL    -- Node was found successfully
+                     DLL_NULL_LIST -- Empty list
+                     DLL_NOT_FOUND -- Skip value is too large, too small or
+                                      wrong dir value (cursor remains
+                                      unchanged)
+
+        @param record: An C{Info} object that will have the retrieved data.
+        @type record: C{Info} is defined internally as C{c_void_p}
+        @param skip: The number of records to skip over while doing the search.
+        @type skip: C{int}
+        @return: The found record.
+        @rtype: C{Info}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        self.__call('DLL_CursorFindNthRecord', byref(record), skip)
+        return record
+
+    def insertRecord(self, info, dir):
+        """
+        Inserts a record above or below the cursor's record and moves the
+        cursor to it. Other cursors and the current pointer of the list stay
+        on their records.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_CursorInsertRecord(Cursor *cursor, Info *info,
+                                            DLL_InsertDir dir);
+
+          Arguments: cursor           -- Pointer to type Cursor
+                     info             -- Record to add
+                     dir              -- Direction to insert, can be
+                                         DLL_ABOVE (toward head) or
+                                         DLL_BELOW (toward tail)
+          Returns  : DLL_NORMAL       -- Node was added successfully
+                     DLL_MEM_ERROR    -- Memory allocation failed
+                     DLL_NULL_LIST    -- Cursor is not on a record
+                     DLL_NOT_MODIFIED -- Insert direction is invalid or the
+                                         list has a skip list
+
+        @param info: The C{Info} class instantiated object.
+        @type info: C{Info} is defined internally as C{c_void_p}
+        @param dir: A value from the C{InsertDir} class.
+        @type dir: C{int}
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        self.__call('DLL_CursorInsertRecord', byref(info), dir)
+
+    def deleteRecord(self):
+        """
+        Deletes the cursor's record. The cursor, and the current pointer of
+        the list or any other cursor on the same record, move to the next
+        record or to the prior one if it was the tail.
+
+        The C{C} function doc string::
+
+          DLL_Return DLL_CursorDeleteRecord(Cursor *cursor);
+
+          Arguments: cursor        -- Pointer to type Cursor
+          Returns  : DLL_NORMAL    -- Record deleted
+                     DLL_NULL_LIST -- Cursor is not on a record
+
+        @return: C{None}
+        @raise APIException: If a low level error occurred in the C{C} code.
+        @raise FunctionException: If the status return value is not
+                                  C{Return.NORMAL}.
+        """
+        self.__call('DLL_CursorDeleteRecord')
@@ -0,0 +1,486 @@
+/*
+ * dll_bench.c : Benchmarks for the double link library
+ *
+ * Copyright (c) 1996-2012 Carl J. Nobile
+ *
+ * $Author$
+ * $Date$
+ * $Revision$
+ *
+ * Note on the copyright licenses.
+ * -------------------------------
+ * This Double Link List API is covered under either the Artistic or the
+ * Eclipse license. The Eclipse license is more business friendly so I
+ * have added it. Retaining the Artistic license prevents anybody that
+ * preferred it from complaining.
+ *
+ **************************************************************************
+ * Copyright (c) 2012 Carl J. Nobile.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * which accompanies this distribution, and is available at
+ * http://www.eclipse.org/legal/epl-v10.html
+ *
+ * Contributors:
+ *    Carl J. Nobile - initial API and implementation
+ **************************************************************************
+ */
+
+#define _XOPEN_SOURCE 500  /* gettimeofday() under -ansi */
+
+#include <stdio.h>
+#include <stddef.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/stat.h>
+#include <sys/time.h>
+#include "linklist.h"
+
+#define MINRECORDS  1000L
+#define MAXRECORDS  4000000L
+#define THREADS     4
+#define REPEAT      5
+#define CHECKSTEP   1024L
+
+/* Structures */
+typedef struct bench_info
+    {
+    long key;
+    long seq;                  /* order the record was added in */
+    char data[48];
+    } BenchInfo;
+
+/* Prototypes */
+int    bench_find(int threads, unsigned long maxrecords);
+int    bench_sort(int threads, unsigned long maxrecords);
+int    bench_load(unsigned long maxrecords);
+int    bench_save(unsigned long maxrecords);
+List   *create_list(unsigned long records, DLL_Boolean random);
+double elapsed(struct timeval *start);
+double time_find(List *list, int (*pFun)(Info *, Info *));
+double time_load(List *list, char *path, DLL_LoadMode mode, double *walk);
+double time_save(List *list, char *path, DLL_SaveMode mode);
+void   usage(char *name);
+
+
+int main(int argc, char **argv)
+    {
+    int threads = THREADS;
+    unsigned long maxrecords = MAXRECORDS;
+
+    if(argc < 2)
+        {
+        usage(argv[0]);
+        return(EXIT_FAILURE);
+        }
+
+    if(argc > 2)
+        threads = atoi(argv[2]);
+
+    if(argc > 3)
+        maxrecords = strtoul(argv[3], NULL, 10);
+
+    if(strcmp(argv[1], "find") == 0)
+        return(bench_find(threads, maxrecords));
+
+    if(strcmp(argv[1], "sort") == 0)
+        return(bench_sort(threads, maxrecords));
+
+    if(strcmp(argv[1], "load") == 0)
+        return(bench_load(maxrecords));
+
+    if(strcmp(argv[1], "save") == 0)
+        return(bench_save(maxrecords));
+
+    usage(argv[0]);
+    return(EXIT_FAILURE);
+    }
+
+
+/*
+ * Prints how to run the benchmarks.
+ */
+void usage(char *name)
+    {
+    fprintf(stderr, "Usage: %s find|sort|load|save [threads [max_records]]\n",
+      name);
+    fputs("  find -- DLL_FindRecord in one thread and in parallel\n", stderr);
+    fputs("  sort -- DLL_ParallelSortList with 1, 2, 4 ... threads and "
+      "DLL_RadixSortList\n", stderr);
+    fputs("  load -- DLL_LoadListEx reading and mapping the file\n", stderr);
+    fputs("  save -- DLL_SaveListEx in place, atomic, synced and compact\n",
+      stderr);
+    }
+
+
+/*
+ * Times a search of every record in lists of doubling size with one thread
+ * and with threads threads, the parts found by walking the list and from the
+ * checkpoint table, then prints the smallest list from which the parallel
+ * search is always faster.
+ */
+int bench_find(int threads, unsigned long maxrecords)
+    {
+    List *list;
+    int (*pFun)(Info *, Info *);
+    BenchInfo record;
+    unsigned long records, crossover = 0L;
+    double serial, walked, checked, best;
+
+    if(DLL_FieldComparator(&pFun, 0, sizeof(long), DLL_FIELD_INT, DLL_FALSE)
+      != DLL_NORMAL)
+        {
+        fputs("Could not create the comparator.\n", stderr);
+        return(EXIT_FAILURE);
+        }
+
+    printf("DLL_FindRecord over every record, %d threads\n", threads);
+    printf("%10s %10s %10s %14s %8s\n", "records", "serial ms",
+      "walked ms", "checkpoint ms", "speedup");
+
+    for(records = MINRECORDS; records <= maxrecords; records *= 2)
+        {
+        if((list = create_list(records, DLL_FALSE)) == NULL)
+            {
+            fputs("Fatal memory error\n", stderr);
+            return(EXIT_FAILURE);
+            }
+
+        DLL_SetParallelSearch(list, 0, 0L);
+        serial = time_find(list, pFun);
+        DLL_SetParallelSearch(list, threads, 1L);
+        walked = time_find(list, pFun);
+        DLL_SetCheckpoints(list, CHECKSTEP);
+        DLL_GetRecordAt(list, &record, 1L); /* Builds the table */
+        checked = time_find(list, pFun);
+        DLL_DestroyList(&list);
+        best = (checked < walked) ? checked : walked;
+
+        printf("%10lu %10.3f %10.3f %14.3f %8.2f\n", records, serial,
+          walked, checked, serial / best);
+
+        if(best >= serial)
+            crossover = 0L;
+        else if(crossover == 0L)
+            crossover = records;
+        }
+
+    if(crossover != 0L)
+        printf("Parallel search is faster from %lu records.\n", crossover);
+    else
+        puts("Parallel search was never faster.");
+
+    return(EXIT_SUCCESS);
+    }
+
+
+/*
+ * Sorts a list of max_records random keys with 1, 2, 4 ... up to threads
+ * threads and then with the radix sort, printing the wall time and
+ * comparisons of each sort. The list is put back in the order it was added
+ * in before each sort, so every sort walks the nodes in the same order
+ * through memory.
+ */
+int bench_sort(int threads, unsigned long maxrecords)
+    {
+    List *list;
+    int (*pFun)(Info *, Info *), (*pSeq)(Info *, Info *);
+    DLL_SortStats stats;
+    DLL_Endian endian;
+    struct timeval start;
+    double serial = 0.0, ms;
+    long one = 1L;
+    int count;
+
+    if(DLL_FieldComparator(&pFun, 0, sizeof(long), DLL_FIELD_INT, DLL_FALSE)
+      != DLL_NORMAL || DLL_FieldComparator(&pSeq, sizeof(long), sizeof(long),
+      DLL_FIELD_INT, DLL_FALSE) != DLL_NORMAL)
+        {
+        fputs("Could not create the comparators.\n", stderr);
+        return(EXIT_FAILURE);
+        }
+
+    if((list = create_list(maxrecords, DLL_TRUE)) == NULL)
+        {
+        fputs("Fatal memory error\n", stderr);
+        return(EXIT_FAILURE);
+        }
+
+    printf("DLL_ParallelSortList of %lu random records\n", maxrecords);
+    printf("%8s %10s %14s %8s\n", "threads", "seconds", "comparisons",
+      "speedup");
+
+    for(count = 1; count <= threads; count *= 2)
+        {
+        if(DLL_SortList(list, pSeq) != DLL_NORMAL
+          || DLL_ParallelSortList(list, pFun, count, &stats) != DLL_NORMAL)
+            {
+            fputs("Could not sort the list.\n", stderr);
+            DLL_DestroyList(&list);
+            return(EXIT_FAILURE);
+            }
+
+        if(count == 1)
+            serial = stats.seconds;
+
+        printf("%8d %10.3f %14lu %8.2f\n", stats.threads, stats.seconds,
+          stats.comparisons, stats.seconds > 0.0 ? serial / stats.seconds
+          : 1.0);
+        }
+
+    /* The keys are native longs, never negative. */
+    endian = (*(char *) &one == 1) ? DLL_LITTLE_ENDIAN : DLL_BIG_ENDIAN;
+    DLL_SortList(list, pSeq);
+    gettimeofday(&start, NULL);
+
+    if(DLL_RadixSortList(list, 0, sizeof(long), endian) != DLL_NORMAL)
+        {
+        fputs("Could not radix sort the list.\n", stderr);
+        DLL_DestroyList(&list);
+        return(EXIT_FAILURE);
+        }
+
+    ms = elapsed(&start);
+    printf("%8s %10.3f %14lu %8.2f\n", "radix", ms / 1000.0, 0L,
+      ms > 0.0 ? serial * 1000.0 / ms : 1.0);
+    DLL_DestroyList(&list);
+    return(EXIT_SUCCESS);
+    }
+
+
+/*
+ * Saves a list of max_records records, then loads it by reading the file and
+ * by mapping it, printing the time of each load and of a walk that reads
+ * every record afterwards.
+ */
+int bench_load(unsigned long maxrecords)
+    {
+    List *list;
+    char path[] = "dll_bench.dat";
+    double read, mapped, readWalk, mapWalk;
+
+    if((list = create_list(maxrecords, DLL_FALSE)) == NULL)
+        {
+        fputs("Fatal memory error\n", stderr);
+        return(EXIT_FAILURE);
+        }
+
+    if(DLL_SaveList(list, path) != DLL_NORMAL)
+        {
+        fputs("Could not save the list.\n", stderr);
+        DLL_DestroyList(&list);
+        return(EXIT_FAILURE);
+        }
+
+    read = time_load(list, path, DLL_LOAD_SORTED, &readWalk);
+    mapped = time_load(list, path, DLL_LOAD_MAP | DLL_LOAD_SORTED, &mapWalk);
+    DLL_DestroyList(&list);
+    remove(path);
+
+    if(read < 0.0 || mapped < 0.0)
+        {
+        fputs("Could not load the list.\n", stderr);
+        return(EXIT_FAILURE);
+        }
+
+    printf("DLL_LoadListEx of %lu records, %lu bytes\n", maxrecords,
+      maxrecords * (unsigned long) sizeof(BenchInfo));
+    printf("%8s %10s %10s\n", "mode", "load ms", "walk ms");
+    printf("%8s %10.3f %10.3f\n", "read", read, readWalk);
+    printf("%8s %10.3f %10.3f\n", "map", mapped, mapWalk);
+    return(EXIT_SUCCESS);
+    }
+
+
+/*
+ * Saves a list of max_records records over the same file in place, through a
+ * renamed temporary file, through a temporary file flushed to disk, and
+ * packed field by field, printing the best time of each and the file size.
+ */
+int bench_save(unsigned long maxrecords)
+    {
+    List *list;
+    BenchInfo record;
+    DLL_Field fields[3];
+    struct stat st;
+    char path[] = "dll_bench.dat";
+    double raw, atomic, synced, compact;
+    unsigned long size, packed = 0L;
+
+    if((list = create_list(maxrecords, DLL_FALSE)) == NULL)
+        {
+        fputs("Fatal memory error\n", stderr);
+        return(EXIT_FAILURE);
+        }
+
+    fields[0].offset = offsetof(BenchInfo, key);
+    fields[0].length = sizeof(record.key);
+    fields[1].offset = offsetof(BenchInfo, seq);
+    fields[1].length = sizeof(record.seq);
+    fields[2].offset = offsetof(BenchInfo, data);
+    fields[2].length = sizeof(record.data);
+
+    raw = time_save(list, path, DLL_SAVE_RAW);
+    atomic = time_save(list, path, DLL_SAVE_ATOMIC);
+    synced = time_save(list, path, DLL_SAVE_ATOMIC | DLL_SAVE_SYNC);
+    compact = (DLL_SetFieldLayout(list, fields, 3L) == DLL_NORMAL)
+      ? time_save(list, path, DLL_SAVE_COMPACT) : -1.0;
+
+    if(stat(path, &st) == 0)
+        packed = (unsigned long) st.st_size;
+
+    DLL_DestroyList(&list);
+    remove(path);
+
+    if(raw < 0.0 || atomic < 0.0 || synced < 0.0 || compact < 0.0)
+        {
+        fputs("Could not save the list.\n", stderr);
+        return(EXIT_FAILURE);
+        }
+
+    size = maxrecords * (unsigned long) sizeof(BenchInfo);
+    printf("DLL_SaveListEx of %lu records\n", maxrecords);
+    printf("%12s %10s %12s\n", "mode", "save ms", "bytes");
+    printf("%12s %10.3f %12lu\n", "in place", raw, size);
+    printf("%12s %10.3f %12lu\n", "atomic", atomic, size);
+    printf("%12s %10.3f %12lu\n", "atomic sync", synced, size);
+    printf("%12s %10.3f %12lu\n", "compact", compact, packed);
+    return(EXIT_SUCCESS);
+    }
+
+
+/*
+ * Creates a list of records with keys counting up from zero, or random keys
+ * that are the same on every call.
+ */
+List *create_list(unsigned long records, DLL_Boolean random)
+    {
+    List *list = NULL;
+    BenchInfo info;
+    unsigned long n;
+
+    if(DLL_CreateList(&list) == NULL
+      || DLL_InitializeList(list, sizeof(BenchInfo)) != DLL_NORMAL)
+        return(NULL);
+
+    memset(&info, 0, sizeof(BenchInfo));
+    srand(1);
+
+    for(n = 0L; n < records; n++)
+        {
+        info.key = (random == DLL_TRUE) ? (long) rand() : (long) n;
+        info.seq = (long) n;
+
+        if(DLL_AddRecord(list, &info, NULL) != DLL_NORMAL)
+            {
+            DLL_DestroyList(&list);
+            return(NULL);
+            }
+        }
+
+    return(list);
+    }
+
+
+/*
+ * Returns the best time in milliseconds of REPEAT searches for a key that
+ * is not in the list, so every record is compared.
+ */
+double time_find(List *list, int (*pFun)(Info *, Info *))
+    {
+    BenchInfo record, match;
+    struct timeval start;
+    double best = 0.0, ms;
+    int n;
+
+    match.key = -1L;
+
+    for(n = 0; n < REPEAT; n++)
+        {
+        DLL_SetSearchModes(list, DLL_HEAD, DLL_DOWN);
+        gettimeofday(&start, NULL);
+        DLL_FindRecord(list, &record, &match, pFun);
+        ms = elapsed(&start);
+
+        if(n == 0 || ms < best)
+            best = ms;
+        }
+
+    return(best);
+    }
+
+
+/*
+ * Returns the milliseconds taken to load the list from path with mode, or
+ * -1.0 if it could not be loaded, and in walk those taken to read every
+ * record after the load.
+ */
+double time_load(List *list, char *path, DLL_LoadMode mode, double *walk)
+    {
+    BenchInfo record;
+    struct timeval start;
+    double ms;
+
+    DLL_DeleteEntireList(list);
+    gettimeofday(&start, NULL);
+
+    if(DLL_LoadListEx(list, path, NULL, mode) != DLL_NORMAL)
+        return(-1.0);
+
+    ms = elapsed(&start);
+    gettimeofday(&start, NULL);
+    DLL_CurrentPointerToHead(list);
+
+    do
+        DLL_GetCurrentRecord(list, &record);
+    while(DLL_IncrementCurrentPointer(list) == DLL_NORMAL);
+
+    *walk = elapsed(&start);
+    return(ms);
+    }
+
+
+/*
+ * Returns the best time in milliseconds of REPEAT saves of the list to path
+ * with mode, or -1.0 if it could not be saved. The last record is deleted
+ * and added again before each save so the list is modified.
+ */
+double time_save(List *list, char *path, DLL_SaveMode mode)
+    {
+    BenchInfo record;
+    struct timeval start;
+    double best = 0.0, ms;
+    int n;
+
+    for(n = 0; n < REPEAT; n++)
+        {
+        DLL_CurrentPointerToTail(list);
+        DLL_GetCurrentRecord(list, &record);
+        DLL_DeleteCurrentRecord(list);
+        DLL_AddRecord(list, &record, NULL);
+        gettimeofday(&start, NULL);
+
+        if(DLL_SaveListEx(list, path, NULL, mode) != DLL_NORMAL)
+            return(-1.0);
+
+        ms = elapsed(&start);
+
+        if(n == 0 || ms < best)
+            best = ms;
+        }
+
+    return(best);
+    }
+
+
+/*
+ * Returns the milliseconds since start.
+ */
+double elapsed(struct timeval *start)
+    {
+    struct timeval now;
+
+    gettimeofday(&now, NULL);
+    return((now.tv_sec - start->tv_sec) * 1000.0
+      + (now.tv_usec - start->tv_usec) / 1000.0);
+    }
@@ -28,13 +28,176 @@
  **************************************************************************
  */
 
+#define _XOPEN_SOURCE 500  /* pthread_rwlock_t under -ansi */
+
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
+#include <errno.h>
+#include <pthread.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <sys/time.h>
 
 #define  _DLL_MAIN_C
 #include "linklist.h"
 
+/*
+ * Records carved out of a larger allocation must keep the alignment malloc
+ * would have given them.
+ */
+typedef union align
+    {
+    long   l;
+    double d;
+    void   *p;
+    } Align;
+
+#define _ALIGN(size)    (((size) + sizeof(Align) - 1) & ~(sizeof(Align) - 1))
+#define _SLOT_SIZE(list) (_ALIGN(sizeof(Node)) + _ALIGN((list)->infosize))
+
+/* Highest level of a skip list tower, enough for 4^16 records. */
+#define _SKIP_MAXLEVEL  16
+#define _SKIP_SIZE(level) (sizeof(SkipNode) + ((level) - 1) * sizeof(SkipLink))
+
+/* Smallest hash index, it is kept at least twice the number of records. */
+#define _HASH_MINSIZE   16
+
+/* Distance between two indexes in the list. */
+#define _DISTANCE(a, b) ((a) > (b) ? (a) - (b) : (b) - (a))
+
+/* Bytes of records read at a time when loading without inserting. */
+#define _LOAD_BUFSIZE   65536
+#define _SAVE_BUFSIZE   262144
+
+/* File header written by DLL_SaveListEx(), see struct file_header. */
+#define _FILE_MAGIC     "\211DLL\r\n\032\n"
+#define _FILE_VERSION   1L
+#define _FILE_COMPACT   2L  /* Version of a DLL_SAVE_COMPACT file */
+
+/* Bytes before a packed field giving how many of its bytes follow. */
+#define _PACK_PREFIX(length) ((length) > 255 ? sizeof(unsigned long) : 1)
+
+/* Change log of DLL_OpenJournal(), see struct journal_header. */
+#define _JOURNAL_MAGIC   "\211DLJ\r\n\032\n"
+#define _JOURNAL_VERSION 1L
+#define _JOURNAL_INSERT  1L
+#define _JOURNAL_UPDATE  2L
+#define _JOURNAL_DELETE  3L
+#define _JOURNAL_SWAP    4L
+
+/* True if the node is one of those made for a mapped file by _mapList(). */
+#define _MAPPED(list, node) ((list)->mapnodes != NULL \
+    && (node) >= (list)->mapnodes \
+    && (node) < (list)->mapnodes + (list)->mapcount)
+
+/*
+ * The reader/writer lock of a thread safe list, see DLL_SetThreadSafe().
+ * The lock macros do nothing on a list that is not thread safe.
+ */
+struct list_lock
+   {
+   pthread_rwlock_t rwlock;
+   };
+
+#define _READ_LOCK(list)  ((list)->lock != NULL \
+    ? pthread_rwlock_rdlock(&(list)->lock->rwlock) : 0)
+#define _WRITE_LOCK(list) ((list)->lock != NULL \
+    ? pthread_rwlock_wrlock(&(list)->lock->rwlock) : 0)
+#define _UNLOCK(list)     ((list)->lock != NULL \
+    ? pthread_rwlock_unlock(&(list)->lock->rwlock) : 0)
+
+/* Limits of the parallel search and sort. */
+#define _MAX_THREADS       64
+#define _SEARCH_MINSIZE    65536
+#define _SEARCH_POLL       256    /* Records between checks for a match */
+
+/*
+ * A parallel search splits the records into one part per thread, the state
+ * is shared by all the parts.
+ */
+typedef struct search_state
+   {
+   pthread_mutex_t mutex;
+   int             best;           /* lowest numbered part with a match */
+   DLL_SrchDir     dir;
+   Info            *match;
+   int             (*pFun)(Info *, Info *);
+   } SearchState;
+
+typedef struct search_part
+   {
+   SearchState   *state;
+   int           number;
+   Node          *start;
+   unsigned long first;            /* offset of start from the origin */
+   unsigned long count;
+   Node          *found;
+   unsigned long offset;           /* offset of found from start */
+   } SearchPart;
+
+/*
+ * A parallel sort sorts one run of records per thread, then merges pairs of
+ * neighbouring runs until one is left.
+ */
+struct sort_run
+   {
+   Node          *head;
+   Node          *other;           /* run merged into head */
+   DLL_Boolean   merge;            /* merge other, do not sort head */
+   int           (*pFun)(Info *, Info *);
+   unsigned long compares;
+   };
+
+/*
+ * The header DLL_SaveListEx() writes before the records. It is written in
+ * the byte order and sizes of the machine, as the records are.
+ */
+struct file_header
+   {
+   char          magic[8];         /* _FILE_MAGIC */
+   unsigned long version;          /* _FILE_VERSION */
+   unsigned long headersize;       /* bytes before the first record */
+   unsigned long infosize;         /* size of each record */
+   unsigned long count;            /* number of records */
+   unsigned long sorttag;          /* _sortTag() of their order, or zero */
+   unsigned long checksum;         /* _checksum() of the records */
+   };
+
+/*
+ * The journal of DLL_OpenJournal(). The log starts with a journal_header
+ * naming the snapshot it follows, then holds a journal_op for each change
+ * followed by any records it adds or updates.
+ */
+struct journal
+   {
+   int           fd;               /* log, opened for appending */
+   char          *path;            /* snapshot file */
+   char          *logpath;         /* log file */
+   DLL_Boolean   sync;             /* fsync() after every write */
+   char          *buffer;          /* one entry and one record */
+   long          length;           /* bytes of whole entries in the log */
+   };
+
+struct journal_header
+   {
+   char          magic[8];         /* _JOURNAL_MAGIC */
+   unsigned long version;          /* _JOURNAL_VERSION */
+   unsigned long infosize;         /* size of each record */
+   unsigned long count;            /* records in the snapshot */
+   unsigned long checksum;         /* checksum in the snapshot's header */
+   };
+
+struct journal_op
+   {
+   unsigned long checksum;         /* _checksum() of the rest and records */
+   unsigned long op;               /* _JOURNAL_INSERT ... _JOURNAL_SWAP */
+   unsigned long index;            /* index of the record from one */
+   unsigned long count;            /* records that follow, or swap dir */
+   };
+
 /**************************
  * Initialization Functions
  */
@@ -69,10 +232,33 @@ List *DLL_CreateList(List **list)
  */
 void DLL_DestroyList(List **list)
     {
+    Cursor *cursor;
+
     if(*list == NULL)
         return;
 
-    DLL_DeleteEntireList(*list);
+    if((*list)->journal != NULL) /* The files are kept. */
+        _closeJournal(*list);
+
+    _deleteEntireList(*list);
+    _releaseBlocks(*list);
+    free((*list)->skiphead);
+    free((*list)->hashtable);
+    free((*list)->checkpoints);
+    free((*list)->fields);
+
+    if((*list)->lock != NULL)
+        {
+        pthread_rwlock_destroy(&(*list)->lock->rwlock);
+        free((*list)->lock);
+        }
+
+    while((cursor = (*list)->cursors) != NULL)
+        {
+        (*list)->cursors = cursor->next;
+        free(cursor);
+        }
+
     free(*list);
     *list = NULL;
     }
@@ -104,410 +290,5513 @@ DLL_Return DLL_InitializeList(List *list, size_t infosize)
     }
 
 
-/****************************
- * Status and State Functions
- */
-
 /*
- * DLL_Version() : Returns a pointer to version information
+ * DLL_SetBlockSize() : Sets the number of records allocated at one time.
+ *
+ * Note: When blocksize is non-zero the Node and Info structures are handed
+ *       out from blocks of blocksize records, a new block is allocated only
+ *       when all the others are in use. Deleted records are recycled, not
+ *       freed, until the list is destroyed. The block size can be changed at
+ *       any time, it only affects blocks allocated afterwards. Going from or
+ *       to a zero block size can only be done on an empty list.
  *
  * Status   : Public
  *
- * Arguments: void
+ * Arguments: list             -- Pointer to type List
+ *            blocksize        -- Number of records per block, zero turns
+ *                                block allocation off
  *
- * Return   : char * -- Pointer to version info
+ * Returns  : DLL_NORMAL       -- Block size was set
+ *            DLL_NULL_LIST    -- list is NULL
+ *            DLL_NOT_MODIFIED -- List is not empty and the allocation method
+ *                                would change
  */
-char *DLL_Version(void)
+DLL_Return DLL_SetBlockSize(List *list, unsigned long blocksize)
     {
-    if(version == NULL)
-        {
-        int size = sizeof(VERSION) + sizeof(VERDATE) + sizeof(CREDITS) + 4;
-
-        if((version = (char *) malloc(size)) != NULL)
-            {
-            strcpy(version, VERSION);
-            strcat(version, "  ");
-            strcat(version, VERDATE);
-            strcat(version, "\n");
-            strcat(version, CREDITS);
-            strcat(version, "\n");
-            }
-        }
-
-    return(version);
-    }
+    if(list == NULL)
+        return(DLL_NULL_LIST);
 
+    if(list->head != NULL && (list->blocksize == 0L || blocksize == 0L)
+     && list->blocksize != blocksize)
+        return(DLL_NOT_MODIFIED);
 
-/*
- * DLL_IsListEmpty() : Checks for an empty list
- *
- * Status   : Public
- *
- * Arguments: list      -- Pointer to type List
- *
- * Returns  : DLL_TRUE  -- List is empty
- *            DLL_FALSE -- List has items in it
- */
-DLL_Boolean DLL_IsListEmpty(List *list)
-    {
-    if(list->head == NULL || list->tail == NULL)
-        return(DLL_TRUE);
+    if(blocksize == 0L)
+        _releaseBlocks(list);
 
-    return(DLL_FALSE);
+    list->blocksize = blocksize;
+    return(DLL_NORMAL);
     }
 
 
 /*
- * DLL_IsListFull() : Checks for an empty list
+ * DLL_SetCheckpoints() : Sets the distance between the nodes kept in the
+ *                        checkpoint table.
+ *
+ * Note: When step is non-zero a pointer to every step'th node is kept so
+ *       that DLL_GetRecordAt() and DLL_FindNthRecord() walk at most step / 2
+ *       nodes from the nearest one. The table is rebuilt by the first
+ *       positional search after records are inserted, deleted or moved,
+ *       records appended to the tail keep it. A step of zero frees the
+ *       table.
  *
  * Status   : Public
  *
- * Arguments: list      -- Pointer to type List
+ * Arguments: list          -- Pointer to type List
+ *            step          -- Records between checkpoints, zero turns them
+ *                             off
  *
- * Returns  : DLL_TRUE  -- List is full (memory dependent)
- *            DLL_FALSE -- List is empty or partially full
+ * Returns  : DLL_NORMAL    -- Step was set
+ *            DLL_NULL_LIST -- list is NULL
  */
-DLL_Boolean DLL_IsListFull(List *list)
+DLL_Return DLL_SetCheckpoints(List *list, unsigned long step)
     {
-    Node *newN;
-    Info *newI;
-
-    if((newN = (Node *) malloc(sizeof(Node))) == NULL)
-        return(DLL_TRUE);
+    if(list == NULL)
+        return(DLL_NULL_LIST);
 
-    if((newI = (Info *) malloc(list->infosize)) == NULL)
+    if(step == 0L)
         {
-        free(newN);
-        return(DLL_TRUE);
+        free(list->checkpoints);
+        list->checkpoints = NULL;
         }
 
-    free(newN);
-    free(newI);
-    return(DLL_FALSE);
+    list->checkstep = step;
+    list->checkcount = 0L;
+    return(DLL_NORMAL);
     }
 
 
 /*
- * DLL_GetNumberOfRecords() : Return number of records.
+ * DLL_SetInlineInfo() : Sets whether a record is stored in the same
+ *                       allocation as its Node.
+ *
+ * Note: With flag set to DLL_TRUE each record takes a single allocation with
+ *       the Info structure directly after the next and prior pointers, so
+ *       traversals touch one block of memory per record instead of two.
+ *       Block allocation (see DLL_SetBlockSize) always stores records this
+ *       way.
  *
  * Status   : Public
  *
- * Arguments: list -- Pointer to type List
+ * Arguments: list             -- Pointer to type List
+ *            flag             -- DLL_TRUE stores the Info with its Node,
+ *                                DLL_FALSE allocates them separately
  *
- * Returns  : Number of records in list
+ * Returns  : DLL_NORMAL       -- Flag was set
+ *            DLL_NULL_LIST    -- list is NULL
+ *            DLL_NOT_MODIFIED -- List is not empty or flag is invalid
  */
-unsigned long DLL_GetNumberOfRecords(List *list)
+DLL_Return DLL_SetInlineInfo(List *list, DLL_Boolean flag)
     {
-    return list->listsize;
+    if(list == NULL)
+        return(DLL_NULL_LIST);
+
+    if((flag != DLL_TRUE && flag != DLL_FALSE)
+     || (list->head != NULL && list->inline_info != flag))
+        return(DLL_NOT_MODIFIED);
+
+    list->inline_info = flag;
+    return(DLL_NORMAL);
     }
 
 
 /*
- * DLL_SetSearchModes() : Sets the pointer used to start a search origin
- *                        and the direction indicator.
+ * DLL_SetSkipList() : Binds a skip list index ordered by pFun to the list.
+ *
+ * Note: With a skip list the list is always kept in pFun order. Records
+ *       added with DLL_AddRecord() are placed by the skip list whatever
+ *       function is passed to it, DLL_FindRecord() with pFun from the head
+ *       and DLL_FindLowerBound() are answered from it, and updated records
+ *       are moved to their new place. All take O(log n) expected time.
+ *       DLL_InsertRecord() and DLL_SwapRecord() would break the order so
+ *       they return DLL_NOT_MODIFIED. It can only be set or removed while
+ *       the list is empty, a NULL pFun removes it.
  *
  * Status   : Public
  *
  * Arguments: list             -- Pointer to type List
- *            origin           -- Indicates the start search pointer to use
- *            dir              -- Indicates the direction to search in
+ *            pFun             -- Pointer to sort function or NULL
  *
- * Returns  : DLL_NORMAL       -- Values assigned were accepted
- *            DLL_NOT_MODIFIED -- Values were not assigned--invalid type
- *                                (previous values are still in place)
+ * Returns  : DLL_NORMAL       -- Skip list was set
+ *            DLL_MEM_ERROR    -- Memory allocation failed
+ *            DLL_NULL_LIST    -- List is NULL
+ *            DLL_NOT_MODIFIED -- List is not empty
  */
-DLL_Return DLL_SetSearchModes(List *list, DLL_SrchOrigin origin,
-  DLL_SrchDir dir)
+DLL_Return DLL_SetSkipList(List *list, int (*pFun)(Info *, Info *))
     {
-    switch(origin)
-        {
-        case DLL_HEAD:
-        case DLL_CURRENT:
-        case DLL_TAIL:
-        case DLL_ORIGIN_DEFAULT:
-            break;
-        default:
-            return(DLL_NOT_MODIFIED);
-        }
+    int i;
 
-    switch(dir)
+    if(list == NULL)
+        return(DLL_NULL_LIST);
+
+    if(list->head != NULL && list->skipfun != pFun)
+        return(DLL_NOT_MODIFIED);
+
+    if(pFun == NULL)
         {
-        case DLL_DOWN:
-        case DLL_UP:
-        case DLL_DIRECTION_DEFAULT:
-            break;
-        default:
-            return(DLL_NOT_MODIFIED);
+        free(list->skiphead);
+        list->skiphead = NULL;
         }
+    else if(list->skiphead == NULL)
+        {
+        if((list->skiphead = (SkipNode *) malloc(
+            _SKIP_SIZE(_SKIP_MAXLEVEL))) == NULL)
+            return(DLL_MEM_ERROR);
 
-    if(origin != DLL_ORIGIN_DEFAULT)
-        list->search_origin = origin;
+        list->skiphead->node = NULL;
+        list->skiphead->level = _SKIP_MAXLEVEL;
 
-    if(dir != DLL_DIRECTION_DEFAULT)
-        list->search_dir = dir;
+        for(i = 0; i < _SKIP_MAXLEVEL; i++)
+            {
+            list->skiphead->link[i].next = NULL;
+            list->skiphead->link[i].span = 0L;
+            }
+
+        list->skiplevel = 1;
+        }
 
+    list->skipfun = pFun;
     return(DLL_NORMAL);
     }
 
 
 /*
- * DLL_GetSearchModes() : Returns the search modes
+ * DLL_CreateIndex() : Builds a hash index on a key in the records.
+ *
+ * Note: The key is the length bytes at offset in the Info structure. The
+ *       index is built from the records already in the list and kept up to
+ *       date as records are added, inserted, updated, deleted and loaded, so
+ *       DLL_FindByKey() finds a record in constant expected time. A length
+ *       of zero removes the index.
  *
  * Status   : Public
  *
- * Arguments: list -- Pointer to type List
- *            ssp  -- Save structure pointer
+ * Arguments: list             -- Pointer to type List
+ *            offset           -- Offset of the key in the Info structure
+ *            length           -- Length of the key in bytes
  *
- * Returns  : Pointer to type DLL_SearchModes
+ * Returns  : DLL_NORMAL       -- Index was built
+ *            DLL_MEM_ERROR    -- Memory allocation failed
+ *            DLL_NULL_LIST    -- List is NULL
+ *            DLL_NOT_MODIFIED -- Key is not within the Info structure
  */
-DLL_SearchModes *DLL_GetSearchModes(List *list, DLL_SearchModes *ssp)
+DLL_Return DLL_CreateIndex(List *list, size_t offset, size_t length)
     {
-    ssp->search_origin = list->search_origin;
-    ssp->search_dir = list->search_dir;
-    return(ssp);
+    Node *step;
+
+    if(list == NULL)
+        return(DLL_NULL_LIST);
+
+    if(length != 0 && (offset >= list->infosize
+        || length > list->infosize - offset))
+        return(DLL_NOT_MODIFIED);
+
+    free(list->hashtable);
+    list->hashtable = NULL;
+    list->hashsize = 0L;
+    list->hashlength = 0;
+
+    if(length == 0)
+        return(DLL_NORMAL);
+
+    list->hashoffset = offset;
+    list->hashlength = length;
+
+    if(_hashResize(list, list->listsize) != DLL_NORMAL)
+        {
+        list->hashlength = 0;
+        return(DLL_MEM_ERROR);
+        }
+
+    for(step = list->head; step != NULL; step = step->next)
+        _hashInsert(list, step);
+
+    return(DLL_NORMAL);
     }
 
 
 /*
- * DLL_GetCurrentIndex() : Return the index of the current record
+ * DLL_SetFieldLayout() : Sets the fields DLL_SAVE_COMPACT divides each
+ *                        record into.
  *
- * Note: The index is always referenced from the head of the list.
+ * Note: fields holds the offset and length of each field in the Info
+ *       structure in the order they are in it. The bytes between and after
+ *       the fields are kept as fields of their own, so a compact file
+ *       holds every byte of the records. A count of zero removes the
+ *       layout and the whole record is taken as one field.
  *
- * Status : Public
+ * Status   : Public
  *
- * Arguments: list -- Pointer to type List
+ * Arguments: list             -- Pointer to type List
+ *            fields           -- Pointer to an array of type DLL_Field
+ *            count            -- Number of fields in the array
  *
- * Returns  : Current record's index
+ * Returns  : DLL_NORMAL       -- Layout was set
+ *            DLL_MEM_ERROR    -- Memory allocation failed
+ *            DLL_NULL_LIST    -- List is NULL
+ *            DLL_NOT_MODIFIED -- A field is empty, overlaps the one before
+ *                                it or is not within the Info structure
  */
-unsigned long DLL_GetCurrentIndex(List *list)
+DLL_Return DLL_SetFieldLayout(List *list, const DLL_Field *fields,
+ unsigned long count)
     {
-    return list->current_index;
-    }
+    DLL_Field *layout;
+    unsigned long i, n = 0L;
+    size_t end = 0;
 
+    if(list == NULL)
+        return(DLL_NULL_LIST);
+
+    if(count != 0L && _checkLayout(list, fields, count, DLL_FALSE)
+        != DLL_NORMAL)
+        return(DLL_NOT_MODIFIED);
+
+    free(list->fields);
+    list->fields = NULL;
+    list->fieldcount = 0L;
+
+    if(count == 0L)
+        return(DLL_NORMAL);
+
+    if((layout = (DLL_Field *) malloc((2 * count + 1) * sizeof(DLL_Field)))
+        == NULL)
+        return(DLL_MEM_ERROR);
+
+    for(i = 0L; i < count; i++)
+        {
+        if(fields[i].offset > end) /* Bytes before the field */
+            {
+            layout[n].offset = end;
+            layout[n++].length = fields[i].offset - end;
+            }
+
+        layout[n++] = fields[i];
+        end = fields[i].offset + fields[i].length;
+        }
+
+    if(end < list->infosize) /* Bytes after the last field */
+        {
+        layout[n].offset = end;
+        layout[n++].length = list->infosize - end;
+        }
+
+    list->fields = layout;
+    list->fieldcount = n;
+    return(DLL_NORMAL);
+    }
 
-/********************************
- * Pointer Manipulation Functions
- */
 
 /*
- * DLL_CurrentPointerToHead() : Moves the current pointer to
- *                              the head of the list.
+ * DLL_SetThreadSafe() : Turns the reader/writer lock of the list on or off.
+ *
+ * Note: With the lock on the functions that only read the list (the query
+ *       functions, the cursor functions that do not change the list and
+ *       the status functions) can run in many threads at once, while the
+ *       functions that change the list or move its current record run
+ *       alone. This must be set before the list is shared between threads,
+ *       DLL_DestroyList(), the initialization functions and a cursor used by
+ *       more than one thread are not protected.
+ *
  * Status   : Public
  *
- * Arguments: list          -- Pointer to type List
+ * Arguments: list             -- Pointer to type List
+ *            flag             -- DLL_TRUE for a thread safe list
  *
- * Returns  : DLL_NORMAL    -- Record found
- *            DLL_NULL_LIST -- Empty list
+ * Returns  : DLL_NORMAL       -- Lock was set
+ *            DLL_MEM_ERROR    -- Memory allocation failed
+ *            DLL_NULL_LIST    -- List is NULL
  */
-DLL_Return DLL_CurrentPointerToHead(List *list)
+DLL_Return DLL_SetThreadSafe(List *list, DLL_Boolean flag)
     {
-    if(list->head == NULL)
+    if(list == NULL)
         return(DLL_NULL_LIST);
 
-    list->current = list->head;
-    list->current_index = 1L;
+    if(flag == DLL_TRUE && list->lock == NULL)
+        {
+        if((list->lock = (ListLock *) malloc(sizeof(ListLock))) == NULL)
+            return(DLL_MEM_ERROR);
+
+        if(pthread_rwlock_init(&list->lock->rwlock, NULL) != 0)
+            {
+            free(list->lock);
+            list->lock = NULL;
+            return(DLL_MEM_ERROR);
+            }
+        }
+    else if(flag == DLL_FALSE && list->lock != NULL)
+        {
+        pthread_rwlock_destroy(&list->lock->rwlock);
+        free(list->lock);
+        list->lock = NULL;
+        }
+
     return(DLL_NORMAL);
     }
 
 
 /*
- * DLL_CurrentPointerToTail() : Moves the current pointer to
- *                              the tail of the list.
+ * DLL_SetParallelSearch() : Sets the number of threads used to search a
+ *                           long list.
+ *
+ * Note: When threads is more than one and at least minsize records lie
+ *       between the search origin and the end of the list, DLL_FindRecord()
+ *       and the other searches that call pFun on each record split those
+ *       records into one part per thread and search the parts at once. The
+ *       match found is still the first one in search order. Shorter
+ *       searches are done by the calling thread alone. If the checkpoint
+ *       table is built (see DLL_SetCheckpoints) the parts are found from
+ *       it, otherwise by walking the list. A pFun that calls back into an
+ *       interpreter holding a global lock gains nothing. A minsize of zero
+ *       uses the default.
+ *
  * Status   : Public
  *
- * Arguments: list          -- Pointer to type List
+ * Arguments: list             -- Pointer to type List
+ *            threads          -- Number of threads, zero or one searches
+ *                                in the calling thread only
+ *            minsize          -- Fewest records searched in parallel
  *
- * Returns  : DLL_NORMAL    -- Record found
- *            DLL_NULL_LIST -- Empty list
+ * Returns  : DLL_NORMAL       -- Threads were set
+ *            DLL_NULL_LIST    -- List is NULL
+ *            DLL_NOT_MODIFIED -- threads is negative or too large
  */
-DLL_Return DLL_CurrentPointerToTail(List *list)
+DLL_Return DLL_SetParallelSearch(List *list, int threads,
+ unsigned long minsize)
     {
-    if(list->tail == NULL)
+    if(list == NULL)
         return(DLL_NULL_LIST);
 
-    list->current = list->tail;
-    list->current_index = list->listsize;
+    if(threads < 0 || threads > _MAX_THREADS)
+        return(DLL_NOT_MODIFIED);
+
+    list->searchthreads = threads;
+    list->searchmin = (minsize != 0L) ? minsize : _SEARCH_MINSIZE;
     return(DLL_NORMAL);
     }
 
 
+/****************************
+ * Status and State Functions
+ */
+
 /*
- * DLL_IncrementCurrentPointer() : Moves the current pointer to next position.
+ * DLL_Version() : Returns a pointer to version information
+ *
+ * Status   : Public
+ *
+ * Arguments: void
+ *
+ * Return   : char * -- Pointer to version info
+ */
+char *DLL_Version(void)
+    {
+    if(version == NULL)
+        {
+        int size = sizeof(VERSION) + sizeof(VERDATE) + sizeof(CREDITS) + 4;
+
+        if((version = (char *) malloc(size)) != NULL)
+            {
+            strcpy(version, VERSION);
+            strcat(version, "  ");
+            strcat(version, VERDATE);
+            strcat(version, "\n");
+            strcat(version, CREDITS);
+            strcat(version, "\n");
+            }
+        }
+
+    return(version);
+    }
+
+
+/*
+ * DLL_IsListEmpty() : Checks for an empty list
+ *
+ * Status   : Public
+ *
+ * Arguments: list      -- Pointer to type List
+ *
+ * Returns  : DLL_TRUE  -- List is empty
+ *            DLL_FALSE -- List has items in it
+ */
+DLL_Boolean DLL_IsListEmpty(List *list)
+    {
+    DLL_Boolean retval;
+
+    _READ_LOCK(list);
+    retval = (list->head == NULL || list->tail == NULL) ? DLL_TRUE : DLL_FALSE;
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_IsListFull() : Checks for an empty list
+ *
+ * Status   : Public
+ *
+ * Arguments: list      -- Pointer to type List
+ *
+ * Returns  : DLL_TRUE  -- List is full (memory dependent)
+ *            DLL_FALSE -- List is empty or partially full
+ */
+DLL_Boolean DLL_IsListFull(List *list)
+    {
+    DLL_Boolean retval;
+
+    _READ_LOCK(list);
+    retval = _isListFull(list);
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_GetNumberOfRecords() : Return number of records.
+ *
+ * Status   : Public
+ *
+ * Arguments: list -- Pointer to type List
+ *
+ * Returns  : Number of records in list
+ */
+unsigned long DLL_GetNumberOfRecords(List *list)
+    {
+    unsigned long listsize;
+
+    _READ_LOCK(list);
+    listsize = list->listsize;
+    _UNLOCK(list);
+    return listsize;
+    }
+
+
+/*
+ * DLL_SetSearchModes() : Sets the pointer used to start a search origin
+ *                        and the direction indicator.
+ *
+ * Status   : Public
+ *
+ * Arguments: list             -- Pointer to type List
+ *            origin           -- Indicates the start search pointer to use
+ *            dir              -- Indicates the direction to search in
+ *
+ * Returns  : DLL_NORMAL       -- Values assigned were accepted
+ *            DLL_NOT_MODIFIED -- Values were not assigned--invalid type
+ *                                (previous values are still in place)
+ */
+DLL_Return DLL_SetSearchModes(List *list, DLL_SrchOrigin origin,
+  DLL_SrchDir dir)
+    {
+    Cursor cursor;
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    _getListCursor(list, &cursor);
+
+    if((retval = DLL_CursorSetSearchModes(&cursor, origin, dir))
+        == DLL_NORMAL)
+        _putListCursor(list, &cursor);
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_GetSearchModes() : Returns the search modes
+ *
+ * Status   : Public
+ *
+ * Arguments: list -- Pointer to type List
+ *            ssp  -- Save structure pointer
+ *
+ * Returns  : Pointer to type DLL_SearchModes
+ */
+DLL_SearchModes *DLL_GetSearchModes(List *list, DLL_SearchModes *ssp)
+    {
+    _READ_LOCK(list);
+    ssp->search_origin = list->search_origin;
+    ssp->search_dir = list->search_dir;
+    _UNLOCK(list);
+    return(ssp);
+    }
+
+
+/*
+ * DLL_GetCurrentIndex() : Return the index of the current record
+ *
+ * Note: The index is always referenced from the head of the list.
+ *
+ * Status : Public
+ *
+ * Arguments: list -- Pointer to type List
+ *
+ * Returns  : Current record's index
+ */
+unsigned long DLL_GetCurrentIndex(List *list)
+    {
+    unsigned long index;
+
+    _WRITE_LOCK(list);
+    index = _currentIndex(list);
+    _UNLOCK(list);
+    return index;
+    }
+
+
+/********************************
+ * Pointer Manipulation Functions
+ */
+
+/*
+ * DLL_CurrentPointerToHead() : Moves the current pointer to
+ *                              the head of the list.
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *
+ * Returns  : DLL_NORMAL    -- Record found
+ *            DLL_NULL_LIST -- Empty list
+ */
+DLL_Return DLL_CurrentPointerToHead(List *list)
+    {
+    DLL_Return retval = DLL_NULL_LIST;
+
+    _WRITE_LOCK(list);
+
+    if(list->head != NULL)
+        {
+        list->current = list->head;
+        list->current_index = 1L;
+        retval = DLL_NORMAL;
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_CurrentPointerToTail() : Moves the current pointer to
+ *                              the tail of the list.
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *
+ * Returns  : DLL_NORMAL    -- Record found
+ *            DLL_NULL_LIST -- Empty list
+ */
+DLL_Return DLL_CurrentPointerToTail(List *list)
+    {
+    DLL_Return retval = DLL_NULL_LIST;
+
+    _WRITE_LOCK(list);
+
+    if(list->tail != NULL)
+        {
+        list->current = list->tail;
+        list->current_index = list->listsize;
+        retval = DLL_NORMAL;
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_IncrementCurrentPointer() : Moves the current pointer to next position.
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *
+ * Returns  : DLL_NORMAL    -- Record found
+ *            DLL_NULL_LIST -- Empty list
+ *            DLL_NOT_FOUND -- Record not found
+ */
+DLL_Return DLL_IncrementCurrentPointer(List *list)
+    {
+    DLL_Return retval = DLL_NORMAL;
+
+    _WRITE_LOCK(list);
+
+    if(list->current == NULL)
+        retval = DLL_NULL_LIST;
+    else if(list->current->next == NULL)
+        retval = DLL_NOT_FOUND;
+    else
+        {
+        _currentIndex(list);
+        list->current = list->current->next;
+        list->current_index++;
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_DecrementCurrentPointer() : Moves the current pointer to last position.
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *
+ * Returns  : DLL_NORMAL    -- Record found
+ *            DLL_NULL_LIST -- Empty list
+ *            DLL_NOT_FOUND -- Record not found
+ */
+DLL_Return DLL_DecrementCurrentPointer(List *list)
+    {
+    DLL_Return retval = DLL_NORMAL;
+
+    _WRITE_LOCK(list);
+
+    if(list->current == NULL)
+        retval = DLL_NULL_LIST;
+    else if(list->current->prior == NULL)
+        retval = DLL_NOT_FOUND;
+    else
+        {
+        _currentIndex(list);
+        list->current = list->current->prior;
+        list->current_index--;
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_StoreCurrentPointer() : Saves the current pointer.
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *
+ * Returns  : DLL_NORMAL    -- Record found
+ *            DLL_NOT_FOUND -- Record not found
+ */
+DLL_Return DLL_StoreCurrentPointer(List *list)
+    {
+    DLL_Return retval = DLL_NOT_FOUND;
+
+    _WRITE_LOCK(list);
+
+    if(list->current != NULL)
+        {
+        list->saved = list->current;
+        list->save_index = _currentIndex(list);
+        retval = DLL_NORMAL;
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_RestoreCurrentPointer() : Loads the previously saved current pointer.
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *
+ * Returns  : DLL_NORMAL    -- Record found
+ *            DLL_NOT_FOUND -- Record not found
+ */
+DLL_Return DLL_RestoreCurrentPointer(List *list)
+    {
+    DLL_Return retval = DLL_NOT_FOUND;
+
+    _WRITE_LOCK(list);
+
+    if(list->saved != NULL)
+        {
+        list->current = list->saved;
+        list->saved = NULL;
+        list->current_index = list->save_index;
+        retval = DLL_NORMAL;
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/***********************
+ * List Update Functions
+ */
+
+/*
+ * DLL_AddRecord() : Creates a new node in list with or without sorting.
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *            info          -- Pointer to record to add
+ *            pFun          -- Pointer to search function
+ *
+ * Returns  : DLL_NORMAL      -- Node was added successfully
+ *            DLL_MEM_ERROR   -- Memory allocation failed
+ *            DLL_WRITE_ERROR -- Journal could not be written
+ */
+DLL_Return DLL_AddRecord(List *list, Info *info, int (*pFun)(Info *, Info *))
+    {
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    retval = _addRecord(list, info, pFun);
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_AddRecords() : Creates new nodes in list for an array of records with
+ *                    or without sorting.
+ *
+ * Note: The buffer holds count records one after the other, each infosize
+ *       bytes long. Without a search function the records are appended to
+ *       the tail in the order given. If memory runs out the records already
+ *       added are kept.
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *            buffer        -- Pointer to an array of records to add
+ *            count         -- Number of records in the array
+ *            pFun          -- Pointer to search function
+ *
+ * Returns  : DLL_NORMAL      -- Nodes were added successfully
+ *            DLL_MEM_ERROR   -- Memory allocation failed
+ *            DLL_WRITE_ERROR -- Journal could not be written
+ */
+DLL_Return DLL_AddRecords(List *list, Info *buffer, unsigned long count,
+ int (*pFun)(Info *, Info *))
+    {
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    retval = _addRecords(list, buffer, count, pFun);
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_InsertRecord() : Creates a new node in list above or below current
+ *                      record. The new record will be current after completion.
+ *
+ * Status   : Public
+ *
+ * Arguments: list             -- Pointer to type List
+ *            info             -- Record to add
+ *            dir              -- Direction to insert, can be DLL_ABOVE
+ *                                (toward head) or DLL_BELOW (toward tail)
+ *
+ * Returns  : DLL_NORMAL       -- Node was added successfully
+ *            DLL_MEM_ERROR    -- Memory allocation failed
+ *            DLL_NOT_MODIFIED -- Insert direction is invalid (not DLL_ABOVE
+ *                                or DLL_BELOW)
+ *            DLL_WRITE_ERROR  -- Journal could not be written
+ */
+DLL_Return DLL_InsertRecord(List *list, Info *info, DLL_InsertDir dir)
+    {
+    Cursor cursor;
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    _getListCursor(list, &cursor);
+    retval = _insertRecord(&cursor, info, dir);
+    _putListCursor(list, &cursor);
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_SwapRecord() : Swaps current record up or down one place in the
+ *                    list. The swapped record will still be current
+ *                    after completion.
+ *
+ * Status   : Public
+ *
+ * Arguments: list             -- Pointer to type List
+ *            dir              --  Direction to swap, can be DLL_ABOVE
+ *                                 (toward head) or DLL_BELOW (toward tail)
+ *
+ * Returns  : DLL_NORMAL       -- Node was swapped successfully
+ *            DLL_NULL_LIST    -- list->current is NULL
+ *            DLL_NOT_MODIFIED -- Swap direction not DLL_ABOVE or DLL_BELOW
+ *            DLL_NOT_FOUND    -- Current record is already at end of
+ *                                list indicated by dir.
+ *            DLL_WRITE_ERROR  -- Journal could not be written
+ */
+DLL_Return DLL_SwapRecord(List *list, DLL_InsertDir dir)
+    {
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    retval = _swapRecord(list, dir);
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_SortList() : Sorts the list in place with a stable merge sort. The
+ *                  nodes are relinked, no records are copied. The record
+ *                  that was current is still current after completion.
+ *
+ * Status   : Public
+ *
+ * Arguments: list              -- Pointer to type List
+ *            pFun              -- Pointer to sort function
+ *
+ * Returns  : DLL_NORMAL        -- List was sorted successfully
+ *            DLL_NULL_LIST     -- List is empty
+ *            DLL_NULL_FUNCTION -- pFun is NULL
+ *            DLL_WRITE_ERROR   -- Journal could not be written
+ */
+DLL_Return DLL_SortList(List *list, int (*pFun)(Info *, Info *))
+    {
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    retval = _sortList(list, pFun, 0, NULL);
+
+    /* Every record may have moved, so a new snapshot is written. */
+    if(retval == DLL_NORMAL && list->journal != NULL
+        && _compactJournal(list) != DLL_NORMAL)
+        retval = DLL_WRITE_ERROR;
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_ParallelSortList() : Sorts the list in place with a stable merge sort
+ *                          split between threads.
+ *
+ * Note: The list is cut into one run of records per thread, the runs are
+ *       sorted at once, then neighbouring runs are merged in pairs, also at
+ *       once, until one is left. Only the links are changed as with
+ *       DLL_SortList(), which is used when threads is zero or one. If the
+ *       checkpoint table is built (see DLL_SetCheckpoints) the runs are cut
+ *       using it instead of by walking the list. A pFun that calls back into
+ *       an interpreter holding a global lock gains nothing. When stats is
+ *       not NULL it returns the number of threads used, the number of calls
+ *       made to pFun and the wall time taken.
+ *
+ * Status   : Public
+ *
+ * Arguments: list              -- Pointer to type List
+ *            pFun              -- Pointer to sort function
+ *            threads           -- Number of threads to use
+ *            stats             -- Pointer to type DLL_SortStats or NULL
+ *
+ * Returns  : DLL_NORMAL        -- List was sorted successfully
+ *            DLL_NULL_LIST     -- List is empty
+ *            DLL_NULL_FUNCTION -- pFun is NULL
+ *            DLL_NOT_MODIFIED  -- threads is negative or too large, or the
+ *                                 list has a skip list with another order
+ *            DLL_WRITE_ERROR   -- Journal could not be written
+ */
+DLL_Return DLL_ParallelSortList(List *list, int (*pFun)(Info *, Info *),
+ int threads, DLL_SortStats *stats)
+    {
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    retval = _sortList(list, pFun, threads, stats);
+
+    /* Every record may have moved, so a new snapshot is written. */
+    if(retval == DLL_NORMAL && list->journal != NULL
+        && _compactJournal(list) != DLL_NORMAL)
+        retval = DLL_WRITE_ERROR;
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_RadixSortList() : Sorts the list in place by the unsigned key at offset
+ *                       in each record without calling a compare function.
+ *
+ * Note: The key is the length bytes at offset in the Info structure taken
+ *       as one unsigned number, endian says which of its bytes is the most
+ *       significant. Use DLL_BIG_ENDIAN for zero padded text and numbers
+ *       stored most significant byte first, DLL_LITTLE_ENDIAN for native
+ *       integers on x86. The sort is a stable least significant digit radix
+ *       sort, one pass per key byte that is not the same in every record, so
+ *       it takes time proportional to n times length. Only the links are
+ *       changed as with DLL_SortList().
+ *
+ * Status   : Public
+ *
+ * Arguments: list             -- Pointer to type List
+ *            offset           -- Offset of the key in the Info structure
+ *            length           -- Length of the key in bytes
+ *            endian           -- DLL_BIG_ENDIAN or DLL_LITTLE_ENDIAN
+ *
+ * Returns  : DLL_NORMAL       -- List was sorted successfully
+ *            DLL_NULL_LIST    -- List is empty
+ *            DLL_MEM_ERROR    -- Memory allocation failed
+ *            DLL_NOT_MODIFIED -- Invalid key or endian, or the list has a
+ *                                skip list
+ *            DLL_WRITE_ERROR  -- Journal could not be written
+ */
+DLL_Return DLL_RadixSortList(List *list, size_t offset, size_t length,
+ DLL_Endian endian)
+    {
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    retval = _radixSortList(list, offset, length, endian);
+
+    /* Every record may have moved, so a new snapshot is written. */
+    if(retval == DLL_NORMAL && list->journal != NULL
+        && _compactJournal(list) != DLL_NORMAL)
+        retval = DLL_WRITE_ERROR;
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_SortListByKeys() : Sorts the list in place by keys made in advance,
+ *                        one for each record.
+ *
+ * Note: keys is an array of listsize keys of keysize bytes each, the first
+ *       is the key of the head record and so on down the list. The keys are
+ *       compared as fields of type, the same way as a comparator from
+ *       DLL_FieldComparator() would, but without using up one of them. This
+ *       lets a key that is costly to work out, or that can only be worked
+ *       out by the caller, be made once per record instead of on every
+ *       comparison. The sort is the same stable merge sort as DLL_SortList()
+ *       and only the links are changed.
+ *
+ * Status   : Public
+ *
+ * Arguments: list              -- Pointer to type List
+ *            keys              -- Pointer to the array of keys
+ *            keysize           -- Size of one key in bytes
+ *            type              -- Type of the keys
+ *            descending        -- DLL_TRUE reverses the order
+ *
+ * Returns  : DLL_NORMAL        -- List was sorted successfully
+ *            DLL_NULL_LIST     -- List is empty
+ *            DLL_MEM_ERROR     -- Memory allocation failed
+ *            DLL_NOT_MODIFIED  -- keys is NULL, invalid keysize, type or
+ *                                 order, or the list has a skip list
+ *            DLL_WRITE_ERROR   -- Journal could not be written
+ */
+DLL_Return DLL_SortListByKeys(List *list, Info *keys, size_t keysize,
+ DLL_FieldType type, DLL_Boolean descending)
+    {
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    retval = _sortByKeys(list, keys, keysize, type, descending);
+
+    /* Every record may have moved, so a new snapshot is written. */
+    if(retval == DLL_NORMAL && list->journal != NULL
+        && _compactJournal(list) != DLL_NORMAL)
+        retval = DLL_WRITE_ERROR;
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_UpdateCurrentRecord() : Updates current record
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *            record        -- Pointer to an Info structure in list
+ *
+ * Returns  : DLL_NORMAL      -- Record updated
+ *            DLL_NULL_LIST   -- Empty list
+ *            DLL_WRITE_ERROR -- Journal could not be written
+ */
+DLL_Return DLL_UpdateCurrentRecord(List *list, Info *record)
+    {
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    retval = _updateRecord(list, record);
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_DeleteCurrentRecord() : Delete a record from the list. This removes the
+ *                             Node and Info objects.
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *
+ * Returns  : DLL_NORMAL      -- Record deleted
+ *            DLL_NULL_LIST   -- List is empty
+ *            DLL_WRITE_ERROR -- Journal could not be written
+ */
+DLL_Return DLL_DeleteCurrentRecord(List *list)
+    {
+    Cursor cursor;
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    _getListCursor(list, &cursor);
+    retval = _deleteRecord(&cursor);
+    _putListCursor(list, &cursor);
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_DeleteEntireList() : Deletes all the Node structures from the list then
+ *                          reinitializes the control List structure for
+ *                          continued use.
+ *
+ * Note: When block allocation is on (see DLL_SetBlockSize) the records are
+ *       not visited, the blocks are kept and handed out again from the first
+ *       one, so the list is emptied in constant time. The blocks are freed by
+ *       DLL_DestroyList or by setting the block size to zero.
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *
+ * Returns  : DLL_NORMAL      -- List deleted
+ *            DLL_NULL_LIST   -- List is empty
+ *            DLL_WRITE_ERROR -- Journal could not be written
+ */
+DLL_Return DLL_DeleteEntireList(List *list)
+    {
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    retval = _deleteEntireList(list);
+
+    if(retval == DLL_NORMAL && list->journal != NULL
+        && _compactJournal(list) != DLL_NORMAL)
+        retval = DLL_WRITE_ERROR;
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/********************************
+ * Search and Retrieval Functions
+ */
+
+/*
+ * DLL_FindRecord() : Find a record in list with search criteria.
+ *
+ * Status   : Public
+ *
+ * Arguments: list              -- Pointer to type List
+ *            record            -- Pointer to an Info structure in list
+ *            match             -- Pointer to an Info structure to match to
+ *                                 Node in list
+ *            pFun              -- Pointer to search function
+ *
+ * Returns  : DLL_NORMAL        -- Record found
+ *            DLL_NULL_LIST     -- Empty list
+ *            DLL_NOT_FOUND     -- Record not found
+ *            DLL_NULL_FUNCTION -- pFun is NULL
+ */
+DLL_Return DLL_FindRecord(List *list, Info *record, Info *match,
+  int (*pFun)(Info *, Info *))
+    {
+    Cursor cursor;
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    _getListCursor(list, &cursor);
+    retval = _findRecord(&cursor, record, match, pFun);
+    _putListCursor(list, &cursor);
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_FindByKey() : Find a record with the same key as match using the hash
+ *                   index.
+ *
+ * Note: The record found is made current. If several records have the key
+ *       any one of them may be found. The index of the current record is
+ *       only worked out when it is next needed. See DLL_CreateIndex().
+ *
+ * Status   : Public
+ *
+ * Arguments: list              -- Pointer to type List
+ *            record            -- Pointer to an Info structure
+ *            match             -- Pointer to an Info structure holding the
+ *                                 key to match
+ *
+ * Returns  : DLL_NORMAL        -- Record found
+ *            DLL_NULL_LIST     -- List is empty
+ *            DLL_NOT_FOUND     -- Record not found
+ *            DLL_NULL_FUNCTION -- List has no index
+ */
+DLL_Return DLL_FindByKey(List *list, Info *record, Info *match)
+    {
+    Node *node;
+    DLL_Return retval = DLL_NORMAL;
+
+    _WRITE_LOCK(list);
+
+    if(list->hashlength == 0)
+        retval = DLL_NULL_FUNCTION;
+    else if(list->head == NULL)
+        retval = DLL_NULL_LIST;
+    else if((node = _hashFind(list, match)) == NULL)
+        retval = DLL_NOT_FOUND;
+    else
+        {
+        memcpy(record, node->info, list->infosize);
+
+        if(node != list->current)
+            {
+            list->current = node;
+            list->current_index = 0L;
+            }
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_FindLowerBound() : Find the first record that is not less than match
+ *                        using the skip list.
+ *
+ * Note: The record found is made current. See DLL_SetSkipList().
+ *
+ * Status   : Public
+ *
+ * Arguments: list              -- Pointer to type List
+ *            record            -- Pointer to an Info structure
+ *            match             -- Pointer to an Info structure to match
+ *
+ * Returns  : DLL_NORMAL        -- Record found
+ *            DLL_NULL_LIST     -- List is empty
+ *            DLL_NOT_FOUND     -- Every record is less than match
+ *            DLL_NULL_FUNCTION -- List has no skip list
+ */
+DLL_Return DLL_FindLowerBound(List *list, Info *record, Info *match)
+    {
+    Cursor cursor;
+    DLL_Return retval = DLL_NULL_FUNCTION;
+
+    _WRITE_LOCK(list);
+
+    if(list->skipfun != NULL)
+        {
+        _getListCursor(list, &cursor);
+        retval = _skipFindRecord(&cursor, record, match, DLL_FALSE);
+        _putListCursor(list, &cursor);
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_FindNthRecord() : Returns the Nth record in the list based on the
+ *                       setting of list->search_origin and list->search_dir.
+ *
+ * Note: The Nth record is found based on the ordinal numbering system, in
+ *       other words if the current record is 1 then a skip value of 5 would
+ *       return the 6th not the 5th record.
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *            record        -- Record to hold return data
+ *            skip          -- Number of records to skip
+ *                             (Always a positive number)
+ *
+ * Returns  : DLL_NORMAL    -- Node was found successfully
+ *            DLL_NULL_LIST -- list->current is NULL
+ *            DLL_NOT_FOUND -- Skip value is too large, too small or wrong dir
+ *                             value (current index remains unchanged)
+ */
+DLL_Return DLL_FindNthRecord(List *list, Info *record, unsigned long skip)
+    {
+    Cursor cursor;
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+
+    if(list->checkstep != 0L && list->checkcount == 0L && list->head != NULL)
+        _buildCheckpoints(list);
+
+    _getListCursor(list, &cursor);
+    retval = _findNthRecord(&cursor, record, skip);
+    _putListCursor(list, &cursor);
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_GetCurrentRecord() : Get the current record.
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *            record        -- Pointer to an Info structure
+ *
+ * Returns  : DLL_NORMAL    -- Record returned
+ *            DLL_NULL_LIST -- List is empty
+ */
+DLL_Return DLL_GetCurrentRecord(List *list, Info *record)
+    {
+    DLL_Return retval = DLL_NULL_LIST;
+
+    _READ_LOCK(list);
+
+    if(list->current != NULL)
+        {
+        memcpy(record, list->current->info, list->infosize);
+        retval = DLL_NORMAL;
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_GetPriorRecord() : Get the record pointed to by current->prior
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *            record        -- Pointer to an Info structure
+ *
+ * Returns  : DLL_NORMAL    -- Record returned
+ *            DLL_NULL_LIST -- List is empty
+ *            DLL_NOT_FOUND -- Beginning of list
+ */
+DLL_Return DLL_GetPriorRecord(List *list, Info *record)
+    {
+    DLL_Return retval = DLL_NORMAL;
+
+    _WRITE_LOCK(list);
+
+    if(list->current == NULL)
+        retval = DLL_NULL_LIST;
+    else if(list->current->prior == NULL)
+        retval = DLL_NOT_FOUND;
+    else
+        {
+        _currentIndex(list);
+        list->current = list->current->prior;
+        memcpy(record, list->current->info, list->infosize);
+        list->current_index--;
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_GetNextRecord() : Get the record pointed to by current->next
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *            record        -- Pointer to an Info structure
+ *
+ * Returns  : DLL_NORMAL    -- Record returned
+ *            DLL_NULL_LIST -- List is empty
+ *            DLL_NOT_FOUND -- End of list
+ */
+DLL_Return DLL_GetNextRecord(List *list, Info *record)
+    {
+    DLL_Return retval = DLL_NORMAL;
+
+    _WRITE_LOCK(list);
+
+    if(list->current == NULL)
+        retval = DLL_NULL_LIST;
+    else if(list->current->next == NULL)
+        retval = DLL_NOT_FOUND;
+    else
+        {
+        _currentIndex(list);
+        list->current = list->current->next;
+        memcpy(record, list->current->info, list->infosize);
+        list->current_index++;
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_GetRecordAt() : Returns the record at an index and makes it current.
+ *
+ * Note: The walk starts from whichever of the head, tail, current record,
+ *       stored record or checkpoint (see DLL_SetCheckpoints()) is nearest
+ *       to the index. The search modes are not used.
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *            record        -- Record to hold return data
+ *            index         -- Index of the record from the head starting at
+ *                             one
+ *
+ * Returns  : DLL_NORMAL    -- Record found
+ *            DLL_NULL_LIST -- Empty list
+ *            DLL_NOT_FOUND -- Index is out of range (current record remains
+ *                             unchanged)
+ */
+DLL_Return DLL_GetRecordAt(List *list, Info *record, unsigned long index)
+    {
+    Cursor cursor;
+    DLL_Return retval = DLL_NORMAL;
+
+    _WRITE_LOCK(list);
+
+    if(list->current == NULL)
+        retval = DLL_NULL_LIST;
+    else if(index == 0L || index > list->listsize)
+        retval = DLL_NOT_FOUND;
+    else
+        {
+        if(list->checkstep != 0L && list->checkcount == 0L)
+            _buildCheckpoints(list);
+
+        _getListCursor(list, &cursor);
+        list->current = _seekIndex(&cursor, index);
+        list->current_index = index;
+        memcpy(record, list->current->info, list->infosize);
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_GetRecords() : Get up to count records starting with the current record.
+ *
+ * Note: The records are copied one after the other into buffer which must be
+ *       at least count * infosize bytes long. When more records remain the
+ *       current pointer is left on the next record to be copied, so repeated
+ *       calls walk the whole list. At the end of the list the current pointer
+ *       is left on the last record copied.
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *            buffer        -- Pointer to an array of Info structures
+ *            count         -- Maximum number of records to copy
+ *            dir           -- Direction to move through the list
+ *            fetched       -- Pointer to the number of records copied
+ *
+ * Returns  : DLL_NORMAL    -- Records returned, more records remain
+ *            DLL_NULL_LIST -- List is empty
+ *            DLL_NOT_FOUND -- Records returned, end of list was reached
+ */
+DLL_Return DLL_GetRecords(List *list, Info *buffer, unsigned long count,
+ DLL_SrchDir dir, unsigned long *fetched)
+    {
+    Cursor cursor;
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    _getListCursor(list, &cursor);
+    retval = _getRecords(&cursor, buffer, count, dir, fetched);
+    _putListCursor(list, &cursor);
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_CopyToBuffer() : Copy count records starting at index start into buffer.
+ *
+ * Note: The index is referenced from the head of the list starting at one.
+ *       The records are copied one after the other into buffer which must be
+ *       at least count * infosize bytes long. The current pointer is not
+ *       changed.
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *            buffer        -- Pointer to an array of Info structures
+ *            start         -- Index of the first record to copy
+ *            count         -- Number of records to copy
+ *
+ * Returns  : DLL_NORMAL    -- Records returned
+ *            DLL_NULL_LIST -- List is empty
+ *            DLL_NOT_FOUND -- Records out of range
+ */
+DLL_Return DLL_CopyToBuffer(List *list, Info *buffer, unsigned long start,
+ unsigned long count)
+    {
+    char *dest = (char *) buffer;
+    Node *step;
+    unsigned long n;
+    DLL_Return retval = DLL_NORMAL;
+
+    _READ_LOCK(list);
+
+    if(list->head == NULL)
+        retval = DLL_NULL_LIST;
+    else if(start < 1L || start > list->listsize
+        || count > list->listsize - start + 1)
+        retval = DLL_NOT_FOUND;
+    else
+        {
+        /* Walk to the first record from whichever end is closer. */
+        if(start <= list->listsize / 2)
+            for(step = list->head, n = 1L; n < start; n++)
+                step = step->next;
+        else
+            for(step = list->tail, n = list->listsize; n > start; n--)
+                step = step->prior;
+
+        for(n = 0L; n < count; n++, step = step->next)
+            {
+            memcpy(dest, step->info, list->infosize);
+            dest += list->infosize;
+            }
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/******************
+ * Cursor Functions
+ */
+
+/*
+ * DLL_CreateCursor() : Creates a cursor on a list. A cursor has its own
+ *                      current record and search modes so several readers
+ *                      can walk the same list without disturbing each other
+ *                      or the current record of the list.
+ *
+ * Status   : Public
+ *
+ * Arguments: list -- Pointer to type List
+ *
+ * Returns  : Pointer to a cursor on the head record
+ *            NULL if unsuccessful
+ */
+Cursor *DLL_CreateCursor(List *list)
+    {
+    Cursor *cursor;
+
+    if(list == NULL || (cursor = (Cursor *) malloc(sizeof(Cursor))) == NULL)
+        return(NULL);
+
+    _WRITE_LOCK(list);
+    cursor->list = list;
+    cursor->current = list->head;
+    cursor->current_index = (list->head != NULL) ? 1L : 0L;
+    cursor->search_origin = DLL_HEAD;
+    cursor->search_dir = DLL_DOWN;
+    cursor->next = list->cursors;
+    list->cursors = cursor;
+    _UNLOCK(list);
+    return(cursor);
+    }
+
+
+/*
+ * DLL_DestroyCursor() : Destroys a cursor. Cursors still open when the list
+ *                       is destroyed are destroyed with it.
+ *
+ * Status   : Public
+ *
+ * Arguments: cursor -- Pointer to a pointer to type Cursor
+ *
+ * Returns  : void
+ */
+void DLL_DestroyCursor(Cursor **cursor)
+    {
+    Cursor *oldC = *cursor, **link;
+
+    if(oldC == NULL)
+        return;
+
+    *cursor = NULL;
+    _WRITE_LOCK(oldC->list);
+
+    for(link = &oldC->list->cursors; *link != NULL; link = &(*link)->next)
+        if(*link == oldC)
+            {
+            *link = oldC->next;
+            break;
+            }
+
+    _UNLOCK(oldC->list);
+    free(oldC);
+    }
+
+
+/*
+ * DLL_CursorToHead() : Moves the cursor to the head of the list.
+ *
+ * Status   : Public
+ *
+ * Arguments: cursor        -- Pointer to type Cursor
+ *
+ * Returns  : DLL_NORMAL    -- Record found
+ *            DLL_NULL_LIST -- Empty list
+ */
+DLL_Return DLL_CursorToHead(Cursor *cursor)
+    {
+    DLL_Return retval = DLL_NULL_LIST;
+
+    _READ_LOCK(cursor->list);
+
+    if(cursor->list->head != NULL)
+        {
+        cursor->current = cursor->list->head;
+        cursor->current_index = 1L;
+        retval = DLL_NORMAL;
+        }
+
+    _UNLOCK(cursor->list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_CursorToTail() : Moves the cursor to the tail of the list.
+ *
+ * Status   : Public
+ *
+ * Arguments: cursor        -- Pointer to type Cursor
+ *
+ * Returns  : DLL_NORMAL    -- Record found
+ *            DLL_NULL_LIST -- Empty list
+ */
+DLL_Return DLL_CursorToTail(Cursor *cursor)
+    {
+    DLL_Return retval = DLL_NULL_LIST;
+
+    _READ_LOCK(cursor->list);
+
+    if(cursor->list->tail != NULL)
+        {
+        cursor->current = cursor->list->tail;
+        cursor->current_index = cursor->list->listsize;
+        retval = DLL_NORMAL;
+        }
+
+    _UNLOCK(cursor->list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_CursorGetIndex() : Get the index of the cursor's record.
+ *
+ * Status   : Public
+ *
+ * Arguments: cursor -- Pointer to type Cursor
+ *
+ * Returns  : Index of the cursor's record, zero if it is not on a record
+ */
+unsigned long DLL_CursorGetIndex(Cursor *cursor)
+    {
+    unsigned long index;
+
+    _READ_LOCK(cursor->list);
+    index = _cursorIndex(cursor);
+    _UNLOCK(cursor->list);
+    return index;
+    }
+
+
+/*
+ * DLL_CursorSetSearchModes() : Sets the search origin and direction of the
+ *                              cursor, see DLL_SetSearchModes().
+ *
+ * Status   : Public
+ *
+ * Arguments: cursor           -- Pointer to type Cursor
+ *            origin           -- Indicates the start search pointer
+ *            dir              -- Indicates the direction to search in
+ *
+ * Returns  : DLL_NORMAL       -- Values assigned were accepted
+ *            DLL_NOT_MODIFIED -- Values were not assigned--invalid type
+ */
+DLL_Return DLL_CursorSetSearchModes(Cursor *cursor, DLL_SrchOrigin origin,
+  DLL_SrchDir dir)
+    {
+    switch(origin)
+        {
+        case DLL_HEAD:
+        case DLL_CURRENT:
+        case DLL_TAIL:
+        case DLL_ORIGIN_DEFAULT:
+            break;
+        default:
+            return(DLL_NOT_MODIFIED);
+        }
+
+    switch(dir)
+        {
+        case DLL_DOWN:
+        case DLL_UP:
+        case DLL_DIRECTION_DEFAULT:
+            break;
+        default:
+            return(DLL_NOT_MODIFIED);
+        }
+
+    if(origin != DLL_ORIGIN_DEFAULT)
+        cursor->search_origin = origin;
+
+    if(dir != DLL_DIRECTION_DEFAULT)
+        cursor->search_dir = dir;
+
+    return(DLL_NORMAL);
+    }
+
+
+/*
+ * DLL_CursorGetCurrent() : Gets the record at the cursor.
+ *
+ * Status   : Public
+ *
+ * Arguments: cursor        -- Pointer to type Cursor
+ *            record        -- Pointer to an Info structure
+ *
+ * Returns  : DLL_NORMAL    -- Record returned
+ *            DLL_NULL_LIST -- Cursor is not on a record
+ */
+DLL_Return DLL_CursorGetCurrent(Cursor *cursor, Info *record)
+    {
+    DLL_Return retval = DLL_NULL_LIST;
+
+    _READ_LOCK(cursor->list);
+
+    if(cursor->current != NULL)
+        {
+        memcpy(record, cursor->current->info, cursor->list->infosize);
+        retval = DLL_NORMAL;
+        }
+
+    _UNLOCK(cursor->list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_CursorGetNext() : Moves the cursor to the next record and gets it.
+ *
+ * Status   : Public
+ *
+ * Arguments: cursor        -- Pointer to type Cursor
+ *            record        -- Pointer to an Info structure
+ *
+ * Returns  : DLL_NORMAL    -- Record returned
+ *            DLL_NULL_LIST -- Cursor is not on a record
+ *            DLL_NOT_FOUND -- Cursor is at the tail
+ */
+DLL_Return DLL_CursorGetNext(Cursor *cursor, Info *record)
+    {
+    DLL_Return retval = DLL_NORMAL;
+
+    _READ_LOCK(cursor->list);
+
+    if(cursor->current == NULL)
+        retval = DLL_NULL_LIST;
+    else if(cursor->current->next == NULL)
+        retval = DLL_NOT_FOUND;
+    else
+        {
+        _cursorIndex(cursor);
+        cursor->current = cursor->current->next;
+        memcpy(record, cursor->current->info, cursor->list->infosize);
+        cursor->current_index++;
+        }
+
+    _UNLOCK(cursor->list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_CursorGetPrior() : Moves the cursor to the prior record and gets it.
+ *
+ * Status   : Public
+ *
+ * Arguments: cursor        -- Pointer to type Cursor
+ *            record        -- Pointer to an Info structure
+ *
+ * Returns  : DLL_NORMAL    -- Record returned
+ *            DLL_NULL_LIST -- Cursor is not on a record
+ *            DLL_NOT_FOUND -- Cursor is at the head
+ */
+DLL_Return DLL_CursorGetPrior(Cursor *cursor, Info *record)
+    {
+    DLL_Return retval = DLL_NORMAL;
+
+    _READ_LOCK(cursor->list);
+
+    if(cursor->current == NULL)
+        retval = DLL_NULL_LIST;
+    else if(cursor->current->prior == NULL)
+        retval = DLL_NOT_FOUND;
+    else
+        {
+        _cursorIndex(cursor);
+        cursor->current = cursor->current->prior;
+        memcpy(record, cursor->current->info, cursor->list->infosize);
+        cursor->current_index--;
+        }
+
+    _UNLOCK(cursor->list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_CursorGetRecordAt() : Moves the cursor to the record at an index and
+ *                           gets it, see DLL_GetRecordAt(). The checkpoint
+ *                           table is used if the list has built it but is
+ *                           not built here.
+ *
+ * Status   : Public
+ *
+ * Arguments: cursor        -- Pointer to type Cursor
+ *            record        -- Pointer to an Info structure
+ *            index         -- Index of the record, from one to the list size
+ *
+ * Returns  : DLL_NORMAL    -- Record returned
+ *            DLL_NULL_LIST -- Empty list
+ *            DLL_NOT_FOUND -- Index is out of range
+ */
+DLL_Return DLL_CursorGetRecordAt(Cursor *cursor, Info *record,
+ unsigned long index)
+    {
+    DLL_Return retval = DLL_NORMAL;
+
+    _READ_LOCK(cursor->list);
+
+    if(cursor->list->head == NULL)
+        retval = DLL_NULL_LIST;
+    else if(index == 0L || index > cursor->list->listsize)
+        retval = DLL_NOT_FOUND;
+    else
+        {
+        cursor->current = _seekIndex(cursor, index);
+        cursor->current_index = index;
+        memcpy(record, cursor->current->info, cursor->list->infosize);
+        }
+
+    _UNLOCK(cursor->list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_CursorGetRecords() : Copies records into a buffer starting at the
+ *                          cursor, see DLL_GetRecords().
+ *
+ * Status   : Public
+ *
+ * Arguments: cursor        -- Pointer to type Cursor
+ *            buffer        -- Pointer to an array of at least count records
+ *            count         -- Number of records to copy
+ *            dir           -- DLL_DOWN, DLL_UP or DLL_DIRECTION_DEFAULT to
+ *                             use the cursor's search direction
+ *            fetched       -- Returns the number of records copied
+ *
+ * Returns  : DLL_NORMAL    -- More records remain
+ *            DLL_NULL_LIST -- Cursor is not on a record
+ *            DLL_NOT_FOUND -- The end of the list was reached
+ */
+DLL_Return DLL_CursorGetRecords(Cursor *cursor, Info *buffer,
+ unsigned long count, DLL_SrchDir dir, unsigned long *fetched)
+    {
+    DLL_Return retval;
+
+    _READ_LOCK(cursor->list);
+    retval = _getRecords(cursor, buffer, count, dir, fetched);
+    _UNLOCK(cursor->list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_CursorFindRecord() : Finds a record from the cursor's search origin
+ *                          and moves the cursor to it, see DLL_FindRecord().
+ *
+ * Status   : Public
+ *
+ * Arguments: cursor            -- Pointer to type Cursor
+ *            record            -- Pointer to an Info structure
+ *            match             -- Pointer to an Info structure to match
+ *            pFun              -- Pointer to search function
+ *
+ * Returns  : DLL_NORMAL        -- Record found
+ *            DLL_NULL_LIST     -- Empty list
+ *            DLL_NOT_FOUND     -- Record not found
+ *            DLL_NULL_FUNCTION -- pFun is NULL
+ */
+DLL_Return DLL_CursorFindRecord(Cursor *cursor, Info *record, Info *match,
+  int (*pFun)(Info *, Info *))
+    {
+    DLL_Return retval;
+
+    _READ_LOCK(cursor->list);
+    retval = _findRecord(cursor, record, match, pFun);
+    _UNLOCK(cursor->list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_CursorFindNthRecord() : Finds the Nth record from the cursor's search
+ *                             origin and moves the cursor to it, see
+ *                             DLL_FindNthRecord().
+ *
+ * Status   : Public
+ *
+ * Arguments: cursor        -- Pointer to type Cursor
+ *            record        -- Record to hold return data
+ *            skip          -- Number of records to skip
+ *
+ * Returns  : DLL_NORMAL    -- Node was found successfully
+ *            DLL_NULL_LIST -- Empty list
+ *            DLL_NOT_FOUND -- Skip value is too large, too small or wrong dir
+ *                             value (cursor remains unchanged)
+ */
+DLL_Return DLL_CursorFindNthRecord(Cursor *cursor, Info *record,
+ unsigned long skip)
+    {
+    DLL_Return retval;
+
+    _READ_LOCK(cursor->list);
+    retval = _findNthRecord(cursor, record, skip);
+    _UNLOCK(cursor->list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_CursorInsertRecord() : Inserts a record relative to the cursor and
+ *                            moves the cursor to it, see DLL_InsertRecord().
+ *                            Other cursors stay on their records.
+ *
+ * Status   : Public
+ *
+ * Arguments: cursor           -- Pointer to type Cursor
+ *            info             -- Record to add
+ *            dir              -- Direction to insert, can be DLL_ABOVE
+ *                                (toward head) or DLL_BELOW (toward tail)
+ *
+ * Returns  : DLL_NORMAL       -- Node was added successfully
+ *            DLL_MEM_ERROR    -- Memory allocation failed
+ *            DLL_NULL_LIST    -- Cursor is not on a record
+ *            DLL_NOT_MODIFIED -- Insert direction is invalid or the list
+ *                                has a skip list
+ *            DLL_WRITE_ERROR  -- Journal could not be written
+ */
+DLL_Return DLL_CursorInsertRecord(Cursor *cursor, Info *info,
+ DLL_InsertDir dir)
+    {
+    DLL_Return retval;
+
+    _WRITE_LOCK(cursor->list);
+    retval = _insertRecord(cursor, info, dir);
+    _UNLOCK(cursor->list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_CursorDeleteRecord() : Deletes the record at the cursor. The cursor,
+ *                            and the current record of the list or any
+ *                            other cursor on the same record, move to the
+ *                            next record or to the prior one at the tail.
+ *
+ * Status   : Public
+ *
+ * Arguments: cursor        -- Pointer to type Cursor
+ *
+ * Returns  : DLL_NORMAL      -- Record deleted
+ *            DLL_NULL_LIST   -- Cursor is not on a record
+ *            DLL_WRITE_ERROR -- Journal could not be written
+ */
+DLL_Return DLL_CursorDeleteRecord(Cursor *cursor)
+    {
+    DLL_Return retval;
+
+    _WRITE_LOCK(cursor->list);
+    retval = _deleteRecord(cursor);
+    _UNLOCK(cursor->list);
+    return(retval);
+    }
+
+
+/***************************
+ * Read-only Query Functions
+ */
+
+/*
+ * The query functions below read the list without writing to it. The start
+ * position and search modes are passed in and the position of the record
+ * found is passed back, so any number of queries can run at the same time
+ * provided nothing modifies the list while they do.
+ */
+
+/*
+ * DLL_QueryRecord() : Finds a record without changing the list, see
+ *                     DLL_FindRecord().
+ *
+ * Status   : Public
+ *
+ * Arguments: list              -- Pointer to type List
+ *            record            -- Pointer to an Info structure
+ *            match             -- Pointer to an Info structure to match
+ *            pFun              -- Pointer to search function
+ *            origin            -- Where the search starts, DLL_CURRENT
+ *                                 starts at position
+ *            dir               -- Direction of the search
+ *            position          -- Start position, returns the position of
+ *                                 the record found
+ *
+ * Returns  : DLL_NORMAL        -- Record found
+ *            DLL_NULL_LIST     -- Empty list or no start position
+ *            DLL_NOT_FOUND     -- Record not found
+ *            DLL_NULL_FUNCTION -- pFun is NULL
+ *            DLL_NOT_MODIFIED  -- Invalid origin or direction
+ */
+DLL_Return DLL_QueryRecord(List *list, Info *record, Info *match,
+ int (*pFun)(Info *, Info *), DLL_SrchOrigin origin, DLL_SrchDir dir,
+ DLL_Position *position)
+    {
+    Cursor cursor;
+    DLL_Return retval;
+
+    _READ_LOCK(list);
+
+    if((retval = _getPositionCursor(list, &cursor, origin, dir, position))
+        == DLL_NORMAL)
+        {
+        retval = _findRecord(&cursor, record, match, pFun);
+        _putPositionCursor(&cursor, position);
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_QueryNthRecord() : Finds the Nth record without changing the list,
+ *                        see DLL_FindNthRecord().
+ *
+ * Status   : Public
+ *
+ * Arguments: list             -- Pointer to type List
+ *            record           -- Record to hold return data
+ *            skip             -- Number of records to skip
+ *            origin           -- Where the search starts, DLL_CURRENT starts
+ *                                at position
+ *            dir              -- Direction of the search
+ *            position         -- Start position, returns the position of the
+ *                                record found
+ *
+ * Returns  : DLL_NORMAL       -- Node was found successfully
+ *            DLL_NULL_LIST    -- Empty list or no start position
+ *            DLL_NOT_FOUND    -- Skip value is too large or too small
+ *            DLL_NOT_MODIFIED -- Invalid origin or direction
+ */
+DLL_Return DLL_QueryNthRecord(List *list, Info *record, unsigned long skip,
+ DLL_SrchOrigin origin, DLL_SrchDir dir, DLL_Position *position)
+    {
+    Cursor cursor;
+    DLL_Return retval;
+
+    _READ_LOCK(list);
+
+    if((retval = _getPositionCursor(list, &cursor, origin, dir, position))
+        == DLL_NORMAL)
+        {
+        retval = _findNthRecord(&cursor, record, skip);
+        _putPositionCursor(&cursor, position);
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_QueryNextRecord() : Gets the record after position, or before it if
+ *                         dir is DLL_UP, without changing the list. With no
+ *                         position the head, or the tail, is returned.
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *            record        -- Pointer to an Info structure
+ *            dir           -- DLL_DOWN, DLL_UP or DLL_DIRECTION_DEFAULT
+ *                             for DLL_DOWN
+ *            position      -- Start position, returns the position of the
+ *                             record
+ *
+ * Returns  : DLL_NORMAL    -- Record returned
+ *            DLL_NULL_LIST -- Empty list
+ *            DLL_NOT_FOUND -- Position is at the end of the list
+ */
+DLL_Return DLL_QueryNextRecord(List *list, Info *record, DLL_SrchDir dir,
+ DLL_Position *position)
+    {
+    Node *step = NULL;
+    DLL_Return retval = DLL_NULL_LIST;
+
+    _READ_LOCK(list);
+
+    if(list->head != NULL)
+        {
+        if(position->node == NULL)
+            step = (dir == DLL_UP) ? list->tail : list->head;
+        else
+            step = (dir == DLL_UP) ? position->node->prior
+                : position->node->next;
+
+        retval = (step == NULL) ? DLL_NOT_FOUND : DLL_NORMAL;
+        }
+
+    if(step != NULL)
+        {
+        if(position->node == NULL)
+            position->index = (dir == DLL_UP) ? list->listsize : 1L;
+        else if(position->index != 0L)
+            position->index += (dir == DLL_UP) ? -1 : 1;
+
+        position->node = step;
+        memcpy(record, step->info, list->infosize);
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_QueryRecordAt() : Gets the record at an index without changing the
+ *                       list, see DLL_GetRecordAt(). The walk may also start
+ *                       from position.
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *            record        -- Pointer to an Info structure
+ *            index         -- Index of the record, from one to the list size
+ *            position      -- Returns the position of the record
+ *
+ * Returns  : DLL_NORMAL    -- Record returned
+ *            DLL_NULL_LIST -- Empty list
+ *            DLL_NOT_FOUND -- Index is out of range
+ */
+DLL_Return DLL_QueryRecordAt(List *list, Info *record, unsigned long index,
+ DLL_Position *position)
+    {
+    Cursor cursor;
+    DLL_Return retval = DLL_NORMAL;
+
+    _READ_LOCK(list);
+
+    if(list->head == NULL)
+        retval = DLL_NULL_LIST;
+    else if(index == 0L || index > list->listsize)
+        retval = DLL_NOT_FOUND;
+    else
+        {
+        _getPositionCursor(list, &cursor, DLL_CURRENT, DLL_DOWN, position);
+        position->node = _seekIndex(&cursor, index);
+        position->index = index;
+        memcpy(record, position->node->info, list->infosize);
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_QueryRecords() : Copies records into a buffer without changing the
+ *                      list, see DLL_GetRecords(). With no position the
+ *                      copy starts at the head, or the tail if dir is
+ *                      DLL_UP.
+ *
+ * Status   : Public
+ *
+ * Arguments: list          -- Pointer to type List
+ *            buffer        -- Pointer to an array of at least count records
+ *            count         -- Number of records to copy
+ *            dir           -- DLL_DOWN, DLL_UP or DLL_DIRECTION_DEFAULT
+ *                             for DLL_DOWN
+ *            position      -- Start position, returns the position of the
+ *                             next record to copy
+ *            fetched       -- Returns the number of records copied
+ *
+ * Returns  : DLL_NORMAL    -- More records remain
+ *            DLL_NULL_LIST -- Empty list
+ *            DLL_NOT_FOUND -- The end of the list was reached
+ */
+DLL_Return DLL_QueryRecords(List *list, Info *buffer, unsigned long count,
+ DLL_SrchDir dir, DLL_Position *position, unsigned long *fetched)
+    {
+    Cursor cursor;
+    DLL_Return retval;
+
+    *fetched = 0L;
+    _READ_LOCK(list);
+
+    if(list->head == NULL)
+        retval = DLL_NULL_LIST;
+    else
+        {
+        _getPositionCursor(list, &cursor, DLL_CURRENT, DLL_DOWN, position);
+
+        if(cursor.current == NULL)
+            {
+            cursor.current = (dir == DLL_UP) ? list->tail : list->head;
+            cursor.current_index = (dir == DLL_UP) ? list->listsize : 1L;
+            }
+
+        retval = _getRecords(&cursor, buffer, count, dir, fetched);
+        _putPositionCursor(&cursor, position);
+        }
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/**********************
+ * Comparison Functions
+ */
+
+/*
+ * A function pointer cannot carry the description of the field it compares,
+ * so each comparator handed out by DLL_FieldComparator() is a small function
+ * bound to its own entry in _fieldKeys. The table is shared by every list in
+ * the process, _fieldLock guards looking up and claiming entries. An entry
+ * never changes once claimed, so the comparators read it without the lock.
+ */
+static FieldKey _fieldKeys[DLL_MAX_COMPARATORS];
+static int _fieldKeysUsed = 0;
+static pthread_mutex_t _fieldLock = PTHREAD_MUTEX_INITIALIZER;
+
+#define _FIELD_SLOT(n) \
+static int _fieldSlot##n(Info *record, Info *compare) \
+    { \
+    return(_compareField(&_fieldKeys[n], record, compare)); \
+    }
+
+_FIELD_SLOT(0)
+_FIELD_SLOT(1)
+_FIELD_SLOT(2)
+_FIELD_SLOT(3)
+_FIELD_SLOT(4)
+_FIELD_SLOT(5)
+_FIELD_SLOT(6)
+_FIELD_SLOT(7)
+_FIELD_SLOT(8)
+_FIELD_SLOT(9)
+_FIELD_SLOT(10)
+_FIELD_SLOT(11)
+_FIELD_SLOT(12)
+_FIELD_SLOT(13)
+_FIELD_SLOT(14)
+_FIELD_SLOT(15)
+_FIELD_SLOT(16)
+_FIELD_SLOT(17)
+_FIELD_SLOT(18)
+_FIELD_SLOT(19)
+_FIELD_SLOT(20)
+_FIELD_SLOT(21)
+_FIELD_SLOT(22)
+_FIELD_SLOT(23)
+_FIELD_SLOT(24)
+_FIELD_SLOT(25)
+_FIELD_SLOT(26)
+_FIELD_SLOT(27)
+_FIELD_SLOT(28)
+_FIELD_SLOT(29)
+_FIELD_SLOT(30)
+_FIELD_SLOT(31)
+
+static int (*_fieldSlots[DLL_MAX_COMPARATORS])(Info *, Info *) =
+    {
+    _fieldSlot0, _fieldSlot1, _fieldSlot2, _fieldSlot3,
+    _fieldSlot4, _fieldSlot5, _fieldSlot6, _fieldSlot7,
+    _fieldSlot8, _fieldSlot9, _fieldSlot10, _fieldSlot11,
+    _fieldSlot12, _fieldSlot13, _fieldSlot14, _fieldSlot15,
+    _fieldSlot16, _fieldSlot17, _fieldSlot18, _fieldSlot19,
+    _fieldSlot20, _fieldSlot21, _fieldSlot22, _fieldSlot23,
+    _fieldSlot24, _fieldSlot25, _fieldSlot26, _fieldSlot27,
+    _fieldSlot28, _fieldSlot29, _fieldSlot30, _fieldSlot31
+    };
+
+/*
+ * DLL_FieldComparator() : Returns a compare function for one field of the
+ *                         Info structure.
+ *
+ * Note: The function returned can be passed as pFun to any function in the
+ *       API. It compares the length bytes at offset in both records without
+ *       calling back into the application. Asking again for the same field,
+ *       type and order returns the same function. At most DLL_MAX_COMPARATORS
+ *       different comparators can exist. It is safe to call from several
+ *       threads at once.
+ *
+ * Status   : Public
+ *
+ * Arguments: pFun              -- Pointer to the returned compare function
+ *            offset            -- Offset of the field in the Info structure
+ *            length            -- Length of the field in bytes
+ *            type              -- Type of the field
+ *            descending        -- DLL_TRUE reverses the order
+ *
+ * Returns  : DLL_NORMAL        -- Compare function returned
+ *            DLL_MEM_ERROR     -- No comparators left
+ *            DLL_NULL_FUNCTION -- pFun is NULL
+ *            DLL_NOT_MODIFIED  -- Invalid length, type or order
+ */
+DLL_Return DLL_FieldComparator(int (**pFun)(Info *, Info *), size_t offset,
+ size_t length, DLL_FieldType type, DLL_Boolean descending)
+    {
+    DLL_Return retval = DLL_NORMAL;
+    FieldKey *key;
+    int i;
+
+    if(pFun == NULL)
+        return(DLL_NULL_FUNCTION);
+
+    if(length == 0 || type < DLL_FIELD_MEMORY || type > DLL_FIELD_FLOAT
+        || (type == DLL_FIELD_FLOAT && length != sizeof(float)
+            && length != sizeof(double))
+        || (descending != DLL_FALSE && descending != DLL_TRUE))
+        return(DLL_NOT_MODIFIED);
+
+    pthread_mutex_lock(&_fieldLock);
+
+    for(i = 0; i < _fieldKeysUsed; i++)
+        {
+        key = &_fieldKeys[i];
+
+        if(key->offset == offset && key->length == length
+            && key->type == type && key->descending == descending)
+            break;
+        }
+
+    if(i < _fieldKeysUsed)
+        *pFun = _fieldSlots[i];
+    else if(_fieldKeysUsed == DLL_MAX_COMPARATORS)
+        retval = DLL_MEM_ERROR;
+    else
+        {
+        key = &_fieldKeys[_fieldKeysUsed];
+        key->offset = offset;
+        key->length = length;
+        key->type = type;
+        key->descending = descending;
+        *pFun = _fieldSlots[_fieldKeysUsed++];
+        }
+
+    pthread_mutex_unlock(&_fieldLock);
+    return(retval);
+    }
+
+
+/************************
+ * Input/Output Functions
+ */
+
+/*
+ * DLL_SaveList() : Save list to disk.
+ *
+ * Status   : Public
+ *
+ * Arguments: list             -- Pointer to type List
+ *            path             -- Pointer to path and filename
+ *
+ * Return   : DLL_NORMAL       -- File written successfully
+ *            DLL_MEM_ERROR    -- Memory allocation failed
+ *            DLL_NULL_LIST    -- List is empty
+ *            DLL_OPEN_ERROR   -- File open error
+ *            DLL_WRITE_ERROR  -- File write error
+ *            DLL_NOT_MODIFIED -- Unmodified list no save was done
+ */
+DLL_Return DLL_SaveList(List *list, const char *path)
+    {
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    retval = _saveList(list, path, NULL, DLL_SAVE_RAW, NULL);
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_SaveListEx() : Save list to disk choosing the file format.
+ *
+ * Status   : Public
+ *
+ * Note: DLL_SAVE_RAW writes the records only, as DLL_SaveList() does.
+ *       DLL_SAVE_HEADER writes a header first holding the record size and
+ *       count, a checksum of the records and, when pFun is a comparator from
+ *       DLL_FieldComparator() and the records are in its order, a tag for
+ *       that order so DLL_LoadListEx() with the same comparator need not
+ *       sort them again. The order is checked as the records are written.
+ *
+ *       Either may be or'ed with DLL_SAVE_ATOMIC to write a temporary file
+ *       beside path and rename it over path, so a crash leaves either the
+ *       old file or the new one, and with DLL_SAVE_SYNC to flush the file,
+ *       and after a rename its directory, to disk before returning.
+ *
+ *       DLL_SAVE_COMPACT writes the header followed by the field layout set
+ *       by DLL_SetFieldLayout(), and packs each record by leaving out the
+ *       zero bytes at the end of each field, so text fields much larger
+ *       than their text take little more room than the text. Without a
+ *       layout the whole record is taken as one field.
+ *
+ * Arguments: list             -- Pointer to type List
+ *            path             -- Pointer to path and filename
+ *            pFun             -- Pointer to the sort function the records
+ *                                are in order by or NULL
+ *            mode             -- File format and how it is written
+ *
+ * Return   : DLL_NORMAL       -- File written successfully
+ *            DLL_MEM_ERROR    -- Memory allocation failed
+ *            DLL_NULL_LIST    -- List is empty
+ *            DLL_OPEN_ERROR   -- File open error
+ *            DLL_WRITE_ERROR  -- File write error
+ *            DLL_NOT_MODIFIED -- Unmodified list no save was done, or mode
+ *                                is invalid
+ */
+DLL_Return DLL_SaveListEx(List *list, const char *path,
+ int (*pFun)(Info *, Info *), DLL_SaveMode mode)
+    {
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    retval = _saveList(list, path, pFun, mode, NULL);
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_LoadList() : Load list to disk.
+ *
+ * Status   : Public
+ *
+ * Note: The list->current_index will have an arbitrary value it depending on
+ *       the sort algorithm used.
+ *
+ * Arguments: list           -- Pointer to type List
+ *            path           -- Pointer to path and filename
+ *            pFun           -- Pointer to search function
+ *
+ * Return   : DLL_NORMAL      -- File written successfully
+ *            DLL_MEM_ERROR   -- Memory allocation failed
+ *            DLL_OPEN_ERROR  -- File open error
+ *            DLL_READ_ERROR  -- File read error
+ *            DLL_WRITE_ERROR -- Journal could not be written
+ */
+DLL_Return DLL_LoadList(List *list, const char *path,
+  int (*pFun)(Info *, Info *))
+    {
+    return(DLL_LoadListEx(list, path, pFun, DLL_LOAD_INSERT));
+    }
+
+
+/*
+ * DLL_LoadListEx() : Load list from disk choosing how the records are
+ *                    ordered.
+ *
+ * Status   : Public
+ *
+ * Note: With DLL_LOAD_INSERT each record is placed by pFun as it is read,
+ *       which is the behavior of DLL_LoadList(). With DLL_LOAD_SORT the
+ *       records are appended in file order and then sorted once with
+ *       DLL_SortList(). With DLL_LOAD_SORTED the file is trusted to already
+ *       be in order and pFun is not used. DLL_LOAD_MAP or'ed with either
+ *       of the others maps the file copy on write instead of reading it, the
+ *       records stay in the mapping until DLL_DeleteEntireList(). The
+ *       list->current_index will have an arbitrary value it depending on the
+ *       mode and sort used.
+ *
+ *       A file written by DLL_SaveListEx() with DLL_SAVE_HEADER is checked
+ *       against its header before the list is emptied, and its checksum is
+ *       checked after the records are read, the list is left empty if they
+ *       do not match. A mapped file's checksum is not checked so its records
+ *       are not all read. If the header names the order of pFun the file is
+ *       loaded as with DLL_LOAD_SORTED. A file written with
+ *       DLL_SAVE_COMPACT is unpacked by the layout it holds, so the list
+ *       needs no layout of its own, and is read rather than mapped.
+ *
+ * Arguments: list           -- Pointer to type List
+ *            path           -- Pointer to path and filename
+ *            pFun           -- Pointer to search function
+ *            mode           -- How the records are ordered
+ *
+ * Return   : DLL_NORMAL      -- File read successfully
+ *            DLL_MEM_ERROR   -- Memory allocation failed
+ *            DLL_OPEN_ERROR  -- File open error
+ *            DLL_READ_ERROR  -- File read or map error, or the file header
+ *                               or checksum does not match
+ *            DLL_WRITE_ERROR -- Journal could not be written
+ */
+DLL_Return DLL_LoadListEx(List *list, const char *path,
+ int (*pFun)(Info *, Info *), DLL_LoadMode mode)
+    {
+    Journal *journal;
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+
+    /* The records read are not logged, a new snapshot is written instead. */
+    journal = list->journal;
+    list->journal = NULL;
+    retval = _loadList(list, path, pFun, mode);
+    list->journal = journal;
+
+    if(journal != NULL && retval != DLL_OPEN_ERROR
+        && _compactJournal(list) != DLL_NORMAL && retval == DLL_NORMAL)
+        retval = DLL_WRITE_ERROR;
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_OpenJournal() : Keeps the list on disk as a snapshot and a log of the
+ *                     changes made since the snapshot was written.
+ *
+ * Note: The snapshot at path is written by DLL_SaveListEx() with
+ *       DLL_SAVE_HEADER and DLL_SAVE_ATOMIC. The log at logpath gets an
+ *       entry for each record added, inserted, updated, deleted or swapped,
+ *       giving its index and any new record, so a change costs one append
+ *       rather than a save of the whole list. Sorting, loading or emptying
+ *       the list and DLL_CompactJournal() write a new snapshot and empty the
+ *       log. A change that returns DLL_WRITE_ERROR was made in the list but
+ *       not logged, DLL_CompactJournal() saves it. A list with a field
+ *       layout writes its snapshots with DLL_SAVE_COMPACT.
+ *
+ *       If either file exists the list is replaced by the snapshot with the
+ *       log replayed on it, an entry cut short by a crash is dropped. If
+ *       neither exists the records in the list are written as the first
+ *       snapshot. A list with a skip list must have the one it had when the
+ *       log was written. With sync every entry and snapshot is flushed to
+ *       disk before the function that wrote it returns.
+ *
+ * Status   : Public
+ *
+ * Arguments: list             -- Pointer to type List
+ *            path             -- Pointer to path and filename of the
+ *                                snapshot
+ *            logpath          -- Pointer to path and filename of the log
+ *            sync             -- DLL_TRUE to flush every write to disk
+ *
+ * Returns  : DLL_NORMAL       -- Journal was opened
+ *            DLL_MEM_ERROR    -- Memory allocation failed
+ *            DLL_OPEN_ERROR   -- File open error
+ *            DLL_READ_ERROR   -- The snapshot could not be read or the log
+ *                                does not fit it, the list holds what was
+ *                                read
+ *            DLL_WRITE_ERROR  -- File write error
+ *            DLL_NOT_MODIFIED -- A journal is already open
+ */
+DLL_Return DLL_OpenJournal(List *list, const char *path, const char *logpath,
+ DLL_Boolean sync)
+    {
+    DLL_Return retval;
+
+    _WRITE_LOCK(list);
+    retval = _openJournal(list, path, logpath, sync);
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_CompactJournal() : Writes the list as a new journal snapshot and
+ *                        empties the log.
+ *
+ * Note: The snapshot is renamed over the old one before the log is emptied,
+ *       a log left behind by a crash in between names the old snapshot and
+ *       is not replayed by DLL_OpenJournal(). An empty list removes the
+ *       snapshot.
+ *
+ * Status   : Public
+ *
+ * Arguments: list             -- Pointer to type List
+ *
+ * Returns  : DLL_NORMAL       -- Snapshot was written
+ *            DLL_MEM_ERROR    -- Memory allocation failed
+ *            DLL_OPEN_ERROR   -- File open error
+ *            DLL_WRITE_ERROR  -- File write error
+ *            DLL_NOT_MODIFIED -- No journal is open
+ */
+DLL_Return DLL_CompactJournal(List *list)
+    {
+    DLL_Return retval = DLL_NOT_MODIFIED;
+
+    _WRITE_LOCK(list);
+
+    if(list->journal != NULL)
+        retval = _compactJournal(list);
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/*
+ * DLL_CloseJournal() : Stops logging changes to the list. The files are
+ *                      kept and DLL_OpenJournal() carries on from them.
+ *
+ * Status   : Public
+ *
+ * Arguments: list             -- Pointer to type List
+ *
+ * Returns  : DLL_NORMAL       -- Journal was closed
+ *            DLL_WRITE_ERROR  -- The log could not be closed
+ *            DLL_NOT_MODIFIED -- No journal is open
+ */
+DLL_Return DLL_CloseJournal(List *list)
+    {
+    DLL_Return retval = DLL_NOT_MODIFIED;
+
+    _WRITE_LOCK(list);
+
+    if(list->journal != NULL)
+        retval = _closeJournal(list);
+
+    _UNLOCK(list);
+    return(retval);
+    }
+
+
+/******************
+ * Helper Functions
+ */
+
+/*
+ * _getListSize : Get the list size--sizeof(List)
+ *
+ * Status   : Private
+ *
+ * Arguments: Void
+ *
+ * Return   : Size of the List
+ */
+size_t _getListSize(void)
+    {
+    return sizeof(List);
+    }
+
+
+/*
+ * _initializeList(): Initialize the list
+ *
+ * Status   : Private
+ *
+ * Arguments: list     -- Pointer to type List
+ *            infosize -- Size of user Info
+ *
+ * Returns  : void
+ */
+void _initializeList(List *list, size_t infosize)
+    {
+    list->head = NULL;
+    list->tail = NULL;
+    list->current = NULL;
+    list->saved = NULL;
+    list->listsize = 0L;
+    list->modified = DLL_FALSE;
+    list->search_origin = DLL_HEAD;
+    list->search_dir = DLL_DOWN;
+    list->save_index = 0L;
+    list->current_index = 0L;
+    list->checkcount = 0L;
+
+    if(infosize)
+        {
+        list->infosize = infosize;
+        list->blocksize = 0L;
+        list->blocks = NULL;
+        list->block = NULL;
+        list->blockused = 0L;
+        list->freenodes = NULL;
+        list->inline_info = DLL_FALSE;
+        list->skiphead = NULL;
+        list->skiplevel = 0;
+        list->skipfun = NULL;
+        list->skipseed = 1L;
+        list->hashtable = NULL;
+        list->hashsize = 0L;
+        list->hashoffset = 0;
+        list->hashlength = 0;
+        list->checkpoints = NULL;
+        list->checkstep = 0L;
+        list->cursors = NULL;
+        list->lock = NULL;
+        list->searchthreads = 0;
+        list->searchmin = _SEARCH_MINSIZE;
+        list->map = NULL;
+        list->mapsize = 0;
+        list->mapnodes = NULL;
+        list->mapcount = 0L;
+        list->mapfd = -1;
+        list->journal = NULL;
+        list->fields = NULL;
+        list->fieldcount = 0L;
+        }
+    }
+
+
+/*
+ * _isListFull : Does the work of DLL_IsListFull() without locking
+ *               the list.
+ *
+ * Status   : Private
+ *
+ * Arguments: list      -- Pointer to type List
+ *
+ * Return   : DLL_TRUE  -- List is full (memory dependent)
+ *            DLL_FALSE -- List is empty or partially full
+ */
+DLL_Boolean _isListFull(List *list)
+    {
+    Node *newN;
+    Info *newI;
+
+    if(list->blocksize != 0L)
+        {
+        if(list->freenodes != NULL
+         || (list->block != NULL && list->blockused < list->block->count))
+            return(DLL_FALSE);
+
+        if((newI = (Info *) malloc(list->blocksize * _SLOT_SIZE(list)))
+         == NULL)
+            return(DLL_TRUE);
+
+        free(newI);
+        return(DLL_FALSE);
+        }
+
+    if(list->inline_info == DLL_TRUE)
+        {
+        if((newN = (Node *) malloc(_SLOT_SIZE(list))) == NULL)
+            return(DLL_TRUE);
+
+        free(newN);
+        return(DLL_FALSE);
+        }
+
+    if((newN = (Node *) malloc(sizeof(Node))) == NULL)
+        return(DLL_TRUE);
+
+    if((newI = (Info *) malloc(list->infosize)) == NULL)
+        {
+        free(newN);
+        return(DLL_TRUE);
+        }
+
+    free(newN);
+    free(newI);
+    return(DLL_FALSE);
+    }
+
+
+/*
+ * _addRecord : Does the work of DLL_AddRecord() without locking
+ *              the list.
+ *
+ * Status   : Private
+ *
+ * Arguments: list          -- Pointer to type List
+ *            info          -- Pointer to record to add
+ *            pFun          -- Pointer to search function
+ *
+ * Return   : DLL_NORMAL    -- Node was added successfully
+ *            DLL_MEM_ERROR -- Memory allocation failed
+ */
+DLL_Return _addRecord(List *list, Info *info, int (*pFun)(Info *, Info *))
+    {
+    Node *newN = NULL, *old, *step;
+    Info *newI = NULL;
+    DLL_Return exitCode;
+
+    if(list->skipfun != NULL) /* The skip list places the record. */
+        {
+        if((exitCode = _skipAddRecord(list, info)) != DLL_NORMAL)
+            return(exitCode);
+
+        return(_journalOp(list, _JOURNAL_INSERT, list->current_index, 1L,
+            (char *) list->current->info));
+        }
+
+    if((exitCode = _createNewRecord(list, info, &newN, &newI)) != DLL_CONTINUE)
+        return(exitCode == DLL_NORMAL ? _journalOp(list, _JOURNAL_INSERT, 1L,
+            1L, (char *) newI) : exitCode);
+
+    if(pFun != NULL) /* If NULL don't do sort */
+        {
+        _positionsChanged(list);
+        step = list->head;
+        old = list->tail;
+        list->current_index = 1L;
+
+        while(step != NULL) /* Loop through records until a match is found. */
+            {
+            if(((*pFun)(step->info, newI)) >= 0)
+                break;
+
+            list->current_index++;
+            old = step;
+            step = (Node *) step->next;
+            }
+        }
+    else
+        {
+        /* Will always be last record. */
+        step = NULL;
+        old = list->tail;
+        list->current_index = list->listsize + 1;
+        }
+
+    /*
+     * The order of the 'if' statements below is critical and
+     * cannot be changed or a no sort (NULL) situation will fail.
+     */
+    if(step == NULL) /* New last record */
+        {
+        /*printf("New last record.\n");*/
+        newN->info = newI;
+        old->next = newN;
+        newN->next = NULL;
+        newN->prior = old;
+        list->tail = newN;
+        list->current = newN;
+        }
+    else if(step->prior == NULL) /* New first record */
+        {
+        /*printf("New first record.\n");*/
+        newN->info = newI;
+        newN->prior = NULL;
+        newN->next = step;
+        step->prior = newN;
+        list->head = newN;
+        list->current = newN;
+        }
+    else /* New middle record */
+        {
+        /*printf("New middle record.\n");*/
+        newN->info = newI;
+        step->prior->next = newN;
+        newN->next = step;
+        newN->prior = step->prior;
+        step->prior = newN;
+        list->current = newN;
+        }
+
+    list->listsize++;
+    list->modified = DLL_TRUE;
+    return(_journalOp(list, _JOURNAL_INSERT, list->current_index, 1L,
+        (char *) newI));
+    }
+
+
+/*
+ * _addRecords : Does the work of DLL_AddRecords() without locking
+ *               the list.
+ *
+ * Status   : Private
+ *
+ * Arguments: list          -- Pointer to type List
+ *            buffer        -- Pointer to an array of records to add
+ *            count         -- Number of records in the array
+ *            pFun          -- Pointer to search function
+ *
+ * Return   : DLL_NORMAL    -- Nodes were added successfully
+ *            DLL_MEM_ERROR -- Memory allocation failed
+ */
+DLL_Return _addRecords(List *list, Info *buffer, unsigned long count,
+ int (*pFun)(Info *, Info *))
+    {
+    char *src = (char *) buffer;
+    Node *newN = NULL;
+    Info *newI = NULL;
+    DLL_Return exitCode = DLL_NORMAL;
+    unsigned long n;
+
+    /* Each record has to be placed by the sort. */
+    if(pFun != NULL || list->skipfun != NULL)
+        {
+        for(n = 0L; n < count; n++, src += list->infosize)
+            if((exitCode = _addRecord(list, src, pFun)) != DLL_NORMAL)
+                break;
+
+        return(exitCode);
+        }
+
+    for(n = 0L; n < count; n++, src += list->infosize)
+        {
+        exitCode = _createNewRecord(list, src, &newN, &newI);
+
+        if(exitCode == DLL_CONTINUE) /* New last record */
+            {
+            newN->next = NULL;
+            newN->prior = list->tail;
+            list->tail->next = newN;
+            list->tail = newN;
+            list->listsize++;
+            }
+        else if(exitCode != DLL_NORMAL)
+            break;
+        }
+
+    if(n > 0L)
+        {
+        list->current = list->tail;
+        list->current_index = list->listsize;
+        list->modified = DLL_TRUE;
+
+        /* The records appended are logged as one entry. */
+        if(_journalOp(list, _JOURNAL_INSERT, list->listsize - n + 1, n,
+            (char *) buffer) != DLL_NORMAL)
+            return(DLL_WRITE_ERROR);
+        }
+
+    return(exitCode == DLL_CONTINUE ? DLL_NORMAL : exitCode);
+    }
+
+
+/*
+ * _swapRecord : Does the work of DLL_SwapRecord() without locking
+ *               the list.
+ *
+ * Status   : Private
+ *
+ * Arguments: list             -- Pointer to type List
+ *            dir              --  Direction to swap, can be DLL_ABOVE
+ *                                 (toward head) or DLL_BELOW (toward tail)
+ *
+ * Return   : DLL_NORMAL       -- Node was swapped successfully
+ *            DLL_NULL_LIST    -- list->current is NULL
+ *            DLL_NOT_MODIFIED -- Swap direction not DLL_ABOVE or DLL_BELOW
+ *            DLL_NOT_FOUND    -- Current record is already at end of
+ *                                list indicated by dir.
+ */
+DLL_Return _swapRecord(List *list, DLL_InsertDir dir)
+    {
+    Node *swap, *newPrior, *newNext;
+    unsigned long index;
+
+    /* If current is NULL, can't swap it */
+    if(list->current == NULL)
+        return(DLL_NULL_LIST);
+
+    if(list->skipfun != NULL) /* Would break the skip list order. */
+        return(DLL_NOT_MODIFIED);
+
+    index = _currentIndex(list);
+    _positionsChanged(list);
+    list->current_index = index;
+
+    /* Decide what to do according to dir */
+    switch(dir)
+        {
+        case DLL_ABOVE:
+            swap = list->current;
+
+            /* current is at head */
+            if(swap->prior == NULL)
+                return(DLL_NOT_FOUND);
+
+            /* Save current new prior and new next */
+            newPrior = swap->prior->prior;
+            newNext = swap->prior;
+
+            /* If prior node is not at head */
+            if(newPrior != NULL)
+                newPrior->next = swap;
+
+            /* Set up old next record's prior node */
+            if(swap->next != NULL)
+                swap->next->prior = newNext;
+
+            /* Set up new next record's next & prior nodes */
+            newNext->next = swap->next;
+            newNext->prior = swap;
+
+            /* Set the current record's new next & prior node */
+            swap->prior = newPrior;
+            swap->next = newNext;
+
+            /* If current is now at head, set list head */
+            if(newPrior == NULL)
+                list->head = swap;
+
+            /* If current used to be at tail, set list tail */
+            if(newNext->next == NULL)
+                list->tail = newNext;
+
+            list->current_index--;
+            break;
+        case DLL_BELOW:
+            swap = list->current;
+
+            /* current is at tail */
+            if(swap->next == NULL)
+                return(DLL_NOT_FOUND);
+
+            /* Save current new prior and new next */
+            newPrior = swap->next;
+            newNext = swap->next->next;
+
+            /* If next node is not at tail */
+            if(newNext != NULL)
+                newNext->prior = swap;
+
+            /* Set up old prior record's next node */
+            if(swap->prior != NULL)
+                swap->prior->next = newPrior;
+
+            /* Set up new prior record's next & prior nodes */
+            newPrior->next = swap;
+            newPrior->prior = swap->prior;
+
+            /* Set the current record's new next & prior node */
+            swap->prior = newPrior;
+            swap->next = newNext;
+
+            /* If current is now at tail, set list tail */
+            if(newNext == NULL)
+                list->tail = swap;
+
+            /* If current used to be at head, set list head */
+            if(newPrior->prior == NULL)
+                list->head = newPrior;
+
+            list->current_index++;
+            break;
+        default:
+            return(DLL_NOT_MODIFIED);
+            break;
+        }
+
+    list->modified = DLL_TRUE;
+    return(_journalOp(list, _JOURNAL_SWAP, index, (unsigned long) dir, NULL));
+    }
+
+
+/*
+ * _sortList : Does the work of DLL_SortList() and DLL_ParallelSortList()
+ *             without locking the list.
+ *
+ * Status   : Private
+ *
+ * Arguments: list              -- Pointer to type List
+ *            pFun              -- Pointer to sort function
+ *            threads           -- Number of threads to use
+ *            stats             -- Pointer to type DLL_SortStats or NULL
+ *
+ * Return   : DLL_NORMAL        -- List was sorted successfully
+ *            DLL_NULL_LIST     -- List is empty
+ *            DLL_NULL_FUNCTION -- pFun is NULL
+ *            DLL_NOT_MODIFIED  -- threads is invalid or the list has a skip
+ *                                 list with another order
+ */
+DLL_Return _sortList(List *list, int (*pFun)(Info *, Info *), int threads,
+ DLL_SortStats *stats)
+    {
+    struct timeval start, end;
+    unsigned long compares = 0L;
+    Node *head;
+
+    if(stats != NULL)
+        {
+        stats->threads = 0;
+        stats->comparisons = 0L;
+        stats->seconds = 0.0;
+        }
+
+    if(pFun == NULL)
+        return(DLL_NULL_FUNCTION);
+
+    if(threads < 0 || threads > _MAX_THREADS)
+        return(DLL_NOT_MODIFIED);
+
+    if(list->head == NULL)
+        return(DLL_NULL_LIST);
+
+    if(list->skipfun != NULL) /* Always in skip list order. */
+        return(pFun == list->skipfun ? DLL_NORMAL : DLL_NOT_MODIFIED);
+
+    gettimeofday(&start, NULL);
+
+    if(threads > 1 && list->listsize > 1L)
+        head = _parallelSort(list, pFun, threads, &compares);
+    else
+        head = _mergeSort(list->head, pFun, NULL, &compares);
+
+    _positionsChanged(list);
+    _relinkList(list, head);
+    list->modified = DLL_TRUE;
+    gettimeofday(&end, NULL);
+
+    if(stats != NULL)
+        {
+        stats->threads = ((unsigned long) threads < list->listsize)
+            ? (threads > 1 ? threads : 1) : (int) list->listsize;
+        stats->comparisons = compares;
+        stats->seconds = (end.tv_sec - start.tv_sec)
+            + (end.tv_usec - start.tv_usec) / 1000000.0;
+        }
+
+    return(DLL_NORMAL);
+    }
+
+
+/*
+ * _radixSortList : Does the work of DLL_RadixSortList() without locking the
+ *                  list.
+ *
+ * Status   : Private
+ *
+ * Arguments: list             -- Pointer to type List
+ *            offset           -- Offset of the key in the Info structure
+ *            length           -- Length of the key in bytes
+ *            endian           -- DLL_BIG_ENDIAN or DLL_LITTLE_ENDIAN
+ *
+ * Return   : DLL_NORMAL       -- List was sorted successfully
+ *            DLL_NULL_LIST    -- List is empty
+ *            DLL_MEM_ERROR    -- Memory allocation failed
+ *            DLL_NOT_MODIFIED -- Invalid key or endian, or the list has a
+ *                                skip list
+ */
+DLL_Return _radixSortList(List *list, size_t offset, size_t length,
+ DLL_Endian endian)
+    {
+    Node *head[256], *tail[256], *step, *last;
+    unsigned long *count;
+    unsigned char *key;
+    size_t pass, byte;
+    int n;
+
+    if(length == 0 || offset + length > list->infosize
+        || offset + length < offset
+        || (endian != DLL_BIG_ENDIAN && endian != DLL_LITTLE_ENDIAN))
+        return(DLL_NOT_MODIFIED);
+
+    if(list->head == NULL)
+        return(DLL_NULL_LIST);
+
+    if(list->skipfun != NULL) /* Always in skip list order. */
+        return(DLL_NOT_MODIFIED);
+
+    if((count = (unsigned long *) calloc(length * 256,
+        sizeof(unsigned long))) == NULL)
+        return(DLL_MEM_ERROR);
+
+    /* Count every key byte first so bytes that never differ are skipped. */
+    for(step = list->head; step != NULL; step = step->next)
+        {
+        key = (unsigned char *) step->info + offset;
+
+        for(byte = 0; byte < length; byte++)
+            count[byte * 256 + key[byte]]++;
+        }
+
+    /* Least significant byte first, each pass keeps the order of the last. */
+    for(pass = 0; pass < length; pass++)
+        {
+        byte = (endian == DLL_LITTLE_ENDIAN) ? pass : length - 1 - pass;
+
+        if(count[byte * 256 + ((unsigned char *) list->head->info)[offset
+            + byte]] == list->listsize)
+            continue;
+
+        for(n = 0; n < 256; n++)
+            head[n] = NULL;
+
+        for(step = list->head; step != NULL; step = step->next)
+            {
+            n = ((unsigned char *) step->info)[offset + byte];
+
+            if(head[n] == NULL)
+                head[n] = step;
+            else
+                tail[n]->next = step;
+
+            tail[n] = step;
+            }
+
+        for(last = NULL, n = 0; n < 256; n++)
+            {
+            if(head[n] == NULL)
+                continue;
+
+            if(last == NULL)
+                list->head = head[n];
+            else
+                last->next = head[n];
+
+            last = tail[n];
+            }
+
+        last->next = NULL;
+        }
+
+    free(count);
+    _positionsChanged(list);
+    _relinkList(list, list->head);
+    list->modified = DLL_TRUE;
+    return(DLL_NORMAL);
+    }
+
+
+/*
+ * _sortByKeys : Does the work of DLL_SortListByKeys() without locking the
+ *               list.
+ *
+ * Note: A chain of stand in nodes, each pointing to a key, is sorted by
+ *       _mergeSort() with a field description of the whole key. The prior
+ *       pointer of each stand in is the record node it stands for, the
+ *       record nodes are then linked in the same order.
+ *
+ * Status   : Private
+ *
+ * Arguments: list              -- Pointer to type List
+ *            keys              -- Pointer to the array of keys
+ *            keysize           -- Size of one key in bytes
+ *            type              -- Type of the keys
+ *            descending        -- DLL_TRUE reverses the order
+ *
+ * Return   : DLL_NORMAL        -- List was sorted successfully
+ *            DLL_NULL_LIST     -- List is empty
+ *            DLL_MEM_ERROR     -- Memory allocation failed
+ *            DLL_NOT_MODIFIED  -- keys is NULL, invalid keysize, type or
+ *                                 order, or the list has a skip list
+ */
+DLL_Return _sortByKeys(List *list, Info *keys, size_t keysize,
+ DLL_FieldType type, DLL_Boolean descending)
+    {
+    Node *stand, *step, *head, *last;
+    FieldKey key;
+    unsigned long compares = 0L, i;
+
+    if(keys == NULL || keysize == 0 || type < DLL_FIELD_MEMORY
+        || type > DLL_FIELD_FLOAT
+        || (type == DLL_FIELD_FLOAT && keysize != sizeof(float)
+            && keysize != sizeof(double))
+        || (descending != DLL_FALSE && descending != DLL_TRUE))
+        return(DLL_NOT_MODIFIED);
+
+    if(list->head == NULL)
+        return(DLL_NULL_LIST);
+
+    if(list->skipfun != NULL) /* Always in skip list order. */
+        return(DLL_NOT_MODIFIED);
+
+    if((stand = (Node *) malloc(list->listsize * sizeof(Node))) == NULL)
+        return(DLL_MEM_ERROR);
+
+    for(step = list->head, i = 0L; step != NULL; step = step->next, i++)
+        {
+        stand[i].info = (char *) keys + i * keysize;
+        stand[i].prior = step;
+        stand[i].next = (i + 1 < list->listsize) ? &stand[i + 1] : NULL;
+        }
+
+    key.offset = 0;
+    key.length = keysize;
+    key.type = type;
+    key.descending = descending;
+    head = last = NULL;
+
+    for(step = _mergeSort(stand, NULL, &key, &compares); step != NULL;
+        step = step->next)
+        {
+        if(last == NULL)
+            head = step->prior;
+        else
+            last->next = step->prior;
+
+        last = step->prior;
+        }
+
+    last->next = NULL;
+    free(stand);
+    _positionsChanged(list);
+    _relinkList(list, head);
+    list->modified = DLL_TRUE;
+    return(DLL_NORMAL);
+    }
+
+
+/*
+ * _updateRecord : Does the work of DLL_UpdateCurrentRecord() without locking
+ *                 the list.
+ *
+ * Status   : Private
+ *
+ * Arguments: list          -- Pointer to type List
+ *            record        -- Pointer to an Info structure in list
+ *
+ * Return   : DLL_NORMAL    -- Record updated
+ *            DLL_NULL_LIST -- Empty list
+ */
+DLL_Return _updateRecord(List *list, Info *record)
+    {
+    Node *node = list->current;
+    SkipNode *sn;
+    DLL_Boolean rekey = DLL_FALSE;
+    unsigned long index = 0L;
+
+    if(list->current == NULL)
+        return(DLL_NULL_LIST);
+
+    if(list->journal != NULL || list->skipfun != NULL)
+        index = _currentIndex(list);
+
+    /* A record whose key changes has to move in the hash index. */
+    if(list->hashlength != 0 && memcmp((char *) node->info + list->hashoffset,
+        (char *) record + list->hashoffset, list->hashlength) != 0)
+        {
+        _hashRemove(list, node);
+        rekey = DLL_TRUE;
+        }
+
+    memcpy(list->current->info, record, list->infosize);
+
+    if(rekey == DLL_TRUE)
+        _hashInsert(list, node);
+
+    if(list->skipfun != NULL) /* Move the record to its new place. */
+        {
+        sn = _skipUnlink(list, index);
+
+        if(node->prior != NULL)
+            node->prior->next = node->next;
+        else
+            list->head = node->next;
+
+        if(node->next != NULL)
+            node->next->prior = node->prior;
+        else
+            list->tail = node->prior;
+
+        _positionsChanged(list);
+        _linkNode(list, node, _skipLink(list, sn, node));
+        list->modified = DLL_TRUE;
+        }
+
+    return(_journalOp(list, _JOURNAL_UPDATE, index, 1L, (char *) record));
+    }
+
+
+/*
+ * _deleteEntireList : Does the work of DLL_DeleteEntireList() without locking
+ *                     the list.
+ *
+ * Status   : Private
+ *
+ * Arguments: list          -- Pointer to type List
+ *
+ * Return   : DLL_NORMAL    -- List deleted
+ *            DLL_NULL_LIST -- List is empty
+ */
+DLL_Return _deleteEntireList(List *list)
+    {
+    Node *oldN;
+    Cursor *cursor;
+
+    if(list->head == NULL)
+        {
+        _releaseMap(list); /* Every mapped record was deleted singly. */
+        return(DLL_NULL_LIST);
+        }
+
+    for(cursor = list->cursors; cursor != NULL; cursor = cursor->next)
+        {
+        cursor->current = NULL;
+        cursor->current_index = 0L;
+        }
+
+    if(list->skipfun != NULL)
+        _skipClear(list);
+
+    if(list->hashlength != 0)
+        memset(list->hashtable, 0, list->hashsize * sizeof(Node *));
+
+    if(list->blocksize != 0L)
+        {
+        /* Every record lives in a block, recycle the blocks whole. */
+        list->freenodes = NULL;
+        list->block = list->blocks;
+        list->blockused = 0L;
+        }
+    else
+        {
+        do
+            {
+            oldN = list->head;
+            list->head = list->head->next;
+            _freeNode(list, oldN);
+            }
+        while(list->head != NULL);
+        }
+
+    _releaseMap(list);
+    _initializeList(list, 0L);
+    return(DLL_NORMAL);
+    }
+
+
+/*
+ * _saveList : Does the work of DLL_SaveList() and DLL_SaveListEx() without
+ *             locking the list.
+ *
+ * Status   : Private
+ *
+ * Arguments: list             -- Pointer to type List
+ *            path             -- Pointer to path and filename
+ *            pFun             -- Pointer to the sort function the records
+ *                                are in order by or NULL
+ *            mode             -- File format and how it is written
+ *            written          -- Pointer to receive the file header or NULL
+ *
+ * Return   : DLL_NORMAL       -- File written successfully
+ *            DLL_MEM_ERROR    -- Memory allocation failed
+ *            DLL_NULL_LIST    -- List is empty
+ *            DLL_OPEN_ERROR   -- File open error
+ *            DLL_WRITE_ERROR  -- File write error
+ *            DLL_NOT_MODIFIED -- Unmodified list no save was done, or mode
+ *                                is invalid
+ */
+DLL_Return _saveList(List *list, const char *path,
+ int (*pFun)(Info *, Info *), DLL_SaveMode mode, FileHeader *written)
+    {
+    struct stat target, mapped;
+    FileHeader header;
+    DLL_Field whole, *fields = &whole;
+    Node *step;
+    DLL_Return exitCode = DLL_NORMAL;
+    const char *name = path;
+    char *temp = NULL, *buffer;
+    size_t size, record = list->infosize, used = 0;
+    unsigned long fieldcount = 1L;
+    int fd;
+
+    if(list->head == NULL)
+        return(DLL_NULL_LIST);
+
+    if(list->modified == DLL_FALSE || (mode & ~(DLL_SAVE_HEADER
+        | DLL_SAVE_ATOMIC | DLL_SAVE_SYNC | DLL_SAVE_COMPACT)) != 0)
+        return(DLL_NOT_MODIFIED);
+
+    if(mode & DLL_SAVE_COMPACT) /* The header holds the layout. */
+        {
+        mode = (DLL_SaveMode) (mode | DLL_SAVE_HEADER);
+
+        /* Without a layout the whole record is one field. */
+        whole.offset = 0;
+        whole.length = list->infosize;
+
+        if(list->fields != NULL)
+            {
+            fields = list->fields;
+            fieldcount = list->fieldcount;
+            }
+
+        record = _packedSize(fields, fieldcount);
+        }
+
+    /* Whole records, or one record if it is larger. */
+    size = (record > _SAVE_BUFSIZE) ? record
+        : _SAVE_BUFSIZE - _SAVE_BUFSIZE % record;
+
+    if((buffer = (char *) malloc(size)) == NULL)
+        return(DLL_MEM_ERROR);
+
+    /*
+     * Truncating a mapped file would take the records out from under it,
+     * so it is replaced by a new file, which is only done once the new file
+     * has been written.
+     */
+    if(list->map != NULL && stat(path, &target) == 0
+        && fstat(list->mapfd, &mapped) == 0
+        && target.st_dev == mapped.st_dev && target.st_ino == mapped.st_ino)
+        mode = (DLL_SaveMode) (mode | DLL_SAVE_ATOMIC);
+
+    if(mode & DLL_SAVE_ATOMIC)
+        {
+        /*
+         * Written beside the file so rename() stays on one file system, the
+         * name is unique to this process and list.
+         */
+        if((temp = (char *) malloc(strlen(path) + 4 * sizeof(long) + 3))
+            == NULL)
+            {
+            free(buffer);
+            return(DLL_MEM_ERROR);
+            }
+
+        sprintf(temp, "%s.%lx.%lx", path, (unsigned long) getpid(),
+            (unsigned long) list);
+        name = temp;
+        }
+
+    if((fd = open(name, O_WRONLY | O_CREAT | O_TRUNC, 0666)) == -1)
+        {
+        free(temp);
+        free(buffer);
+        return(DLL_OPEN_ERROR);
+        }
+
+    /* The file that is replaced keeps its permissions. */
+    if(temp != NULL && stat(path, &target) == 0)
+        fchmod(fd, target.st_mode & 07777);
+
+    if(mode & DLL_SAVE_HEADER)
+        {
+        /* Written again once the tag and checksum are known. */
+        memset(&header, 0, sizeof(FileHeader));
+        memcpy(header.magic, _FILE_MAGIC, sizeof(header.magic));
+        header.version = _FILE_VERSION;
+        header.headersize = sizeof(FileHeader);
+        header.infosize = list->infosize;
+        header.count = list->listsize;
+        header.sorttag = _sortTag(pFun);
+        header.checksum = _checksum(0L, NULL, 0);
+
+        if(mode & DLL_SAVE_COMPACT)
+            {
+            header.version = _FILE_COMPACT;
+            header.headersize += fieldcount * sizeof(DLL_Field);
+            }
+
+        exitCode = _writeAll(fd, (char *) &header, sizeof(FileHeader));
+
+        if(exitCode == DLL_NORMAL && (mode & DLL_SAVE_COMPACT))
+            exitCode = _writeAll(fd, (char *) fields,
+                fieldcount * sizeof(DLL_Field));
+        }
+
+    for(step = list->head; step != NULL && exitCode == DLL_NORMAL;
+        step = (Node *) step->next)
+        {
+        if(used + record > size)
+            {
+            exitCode = _writeAll(fd, buffer, used);
+            used = 0;
+            }
+
+        if(mode & DLL_SAVE_COMPACT)
+            used += _packRecord(fields, fieldcount, (char *) step->info,
+                buffer + used);
+        else
+            {
+            memcpy(buffer + used, step->info, list->infosize);
+            used += list->infosize;
+            }
+
+        if(mode & DLL_SAVE_HEADER)
+            {
+            header.checksum = _checksum(header.checksum,
+                (const unsigned char *) step->info, list->infosize);
+
+            if(header.sorttag != 0L && step->next != NULL
+                && (*pFun)(step->info, step->next->info) > 0)
+                header.sorttag = 0L;
+            }
+        }
+
+    if(exitCode == DLL_NORMAL)
+        exitCode = _writeAll(fd, buffer, used);
+
+    if(exitCode == DLL_NORMAL && (mode & DLL_SAVE_HEADER)
+        && (lseek(fd, 0L, SEEK_SET) != 0L
+        || _writeAll(fd, (char *) &header, sizeof(FileHeader))
+        != DLL_NORMAL))
+        exitCode = DLL_WRITE_ERROR;
+
+    if(exitCode == DLL_NORMAL && (mode & DLL_SAVE_SYNC) && fsync(fd) == -1)
+        exitCode = DLL_WRITE_ERROR;
+
+    if(close(fd) == -1)
+        exitCode = DLL_WRITE_ERROR;
+
+    if(temp != NULL)
+        {
+        if(exitCode != DLL_NORMAL)
+            unlink(temp);
+        else if(rename(temp, path) == -1)
+            {
+            unlink(temp);
+            exitCode = DLL_WRITE_ERROR;
+            }
+        else if(mode & DLL_SAVE_SYNC)
+            _syncDirectory(path);
+
+        free(temp);
+        }
+
+    free(buffer);
+
+    if(exitCode == DLL_NORMAL)
+        {
+        list->modified = DLL_FALSE;
+
+        if(written != NULL && (mode & DLL_SAVE_HEADER))
+            *written = header;
+        }
+
+    return(exitCode);
+    }
+
+
+/*
+ * _writeAll : Writes length bytes to a file, continuing after short writes
+ *             and signals.
+ *
+ * Status   : Private
+ *
+ * Arguments: fd              -- Descriptor of the file
+ *            data            -- Pointer to the bytes
+ *            length          -- Number of bytes
+ *
+ * Return   : DLL_NORMAL      -- Everything was written
+ *            DLL_WRITE_ERROR -- File write error
+ */
+DLL_Return _writeAll(int fd, const char *data, size_t length)
+    {
+    ssize_t n;
+
+    while(length > 0)
+        {
+        if((n = write(fd, data, length)) == -1)
+            {
+            if(errno == EINTR)
+                continue;
+
+            return(DLL_WRITE_ERROR);
+            }
+
+        data += n;
+        length -= (size_t) n;
+        }
+
+    return(DLL_NORMAL);
+    }
+
+
+/*
+ * _syncDirectory : Flushes the directory holding path to disk so a file
+ *                  renamed into it is still there after a crash. Systems
+ *                  that cannot sync a directory are left as they are.
+ *
+ * Status   : Private
+ *
+ * Arguments: path -- Pointer to path and filename
+ *
+ * Return   : void
+ */
+void _syncDirectory(const char *path)
+    {
+    const char *slash = strrchr(path, '/');
+    char *dir;
+    int fd;
+
+    if(slash == NULL)
+        fd = open(".", O_RDONLY);
+    else if((dir = (char *) malloc((size_t) (slash - path) + 2)) == NULL)
+        return;
+    else
+        {
+        /* The root directory keeps its slash. */
+        memcpy(dir, path, (size_t) (slash - path) + 1);
+        dir[(slash == path) ? 1 : slash - path] = '\0';
+        fd = open(dir, O_RDONLY);
+        free(dir);
+        }
+
+    if(fd != -1)
+        {
+        fsync(fd);
+        close(fd);
+        }
+    }
+
+
+/*
+ * _loadList : Does the work of DLL_LoadListEx() without locking
+ *             the list.
+ *
+ * Status   : Private
+ *
+ * Arguments: list           -- Pointer to type List
+ *            path           -- Pointer to path and filename
+ *            pFun           -- Pointer to search function
+ *            mode           -- How the records are ordered
+ *
+ * Return   : DLL_NORMAL     -- File read successfully
+ *            DLL_MEM_ERROR  -- Memory allocation failed
+ *            DLL_OPEN_ERROR -- File open error
+ *            DLL_READ_ERROR -- File read error
+ */
+DLL_Return _loadList(List *list, const char *path,
+ int (*pFun)(Info *, Info *), DLL_LoadMode mode)
+    {
+    struct stat st;
+    FileHeader header;
+    DLL_Field *fields = NULL;
+    Info *set;
+    FILE *fp;
+    DLL_Return exitCode = DLL_NORMAL;
+    DLL_Boolean insert;
+    unsigned long count = 1L, fieldcount = 0L, n, sum;
+    size_t offset = 0, room = 0, have = 0, used = 0, size;
+    char *packed = NULL;
+
+    if((fp = fopen(path, "rb")) == NULL)
+        return(DLL_OPEN_ERROR);
+
+    /* A file without the magic number holds records only. */
+    if(fread(&header, sizeof(FileHeader), 1, fp) != 1
+        || memcmp(header.magic, _FILE_MAGIC, sizeof(header.magic)) != 0)
+        header.version = 0L;
+    else if(fstat(fileno(fp), &st) == -1
+        || _checkHeader(list, &header, (unsigned long) st.st_size)
+        != DLL_NORMAL)
+        {
+        fclose(fp);
+        return(DLL_READ_ERROR);
+        }
+    else
+        {
+        offset = header.headersize;
+
+        if(pFun != NULL && header.sorttag != 0L
+            && header.sorttag == _sortTag(pFun)) /* Already in order */
+            mode = (DLL_LoadMode) (mode | DLL_LOAD_SORTED);
+        }
+
+    /* The records of a compact file are unpacked by the layout after it. */
+    if(header.version == _FILE_COMPACT)
+        {
+        fieldcount = (header.headersize - sizeof(FileHeader))
+            / sizeof(DLL_Field);
+
+        if((fields = (DLL_Field *) malloc(fieldcount * sizeof(DLL_Field)))
+            == NULL)
+            {
+            fclose(fp);
+            return(DLL_MEM_ERROR);
+            }
+
+        if(fread(fields, sizeof(DLL_Field), fieldcount, fp) != fieldcount
+            || _checkLayout(list, fields, fieldcount, DLL_TRUE)
+            != DLL_NORMAL)
+            {
+            free(fields);
+            fclose(fp);
+            return(DLL_READ_ERROR);
+            }
+        }
+
+    /*
+     * A skip list has to place and so copy each record, and the records of a
+     * compact file are not laid out as they are in memory.
+     */
+    if((mode & DLL_LOAD_MAP) && list->skipfun == NULL && fields == NULL)
+        {
+        fclose(fp);
+        return(_mapList(list, path, pFun, mode, offset));
+        }
+
+    if(fseek(fp, (long) offset, SEEK_SET) != 0)
+        {
+        free(fields);
+        fclose(fp);
+        return(DLL_READ_ERROR);
+        }
+
+    _deleteEntireList(list);
+
+    list->head = list->tail = NULL;
+
+    /* Make room for every record at once. */
+    if(header.version != 0L && ((list->hashlength != 0
+        && header.count * 2 > list->hashsize
+        && _hashResize(list, header.count) != DLL_NORMAL)
+        || (list->blocksize != 0L && list->blocks == NULL
+        && header.count > 0L && _newBlock(list, header.count) == NULL)))
+        {
+        free(fields);
+        fclose(fp);
+        return(DLL_MEM_ERROR);
+        }
+
+    if(mode & DLL_LOAD_SORTED) /* Already in order */
+        pFun = NULL;
+
+    /* Records are read in chunks unless each one is placed by pFun. */
+    insert = (pFun != NULL && !(mode & DLL_LOAD_SORT)) ? DLL_TRUE : DLL_FALSE;
+
+    if(!insert && (count = _LOAD_BUFSIZE / list->infosize) == 0L)
+        count = 1L;
+
+    if(fields != NULL) /* Room for a chunk of the file and a record. */
+        {
+        room = _LOAD_BUFSIZE + _packedSize(fields, fieldcount);
+        packed = (char *) malloc(room);
+        }
+
+    if((set = (Info *) malloc(list->infosize * count)) == NULL
+        || (fields != NULL && packed == NULL))
+        {
+        free(set);
+        free(packed);
+        free(fields);
+        fclose(fp);
+        return(DLL_MEM_ERROR);
+        }
+
+    sum = _checksum(0L, NULL, 0);
+
+    for(;;)
+        {
+        if(fields == NULL)
+            n = fread(set, list->infosize, count, fp);
+        else /* Unpack what was read, reading more when a record is cut. */
+            for(n = 0L; n < count; )
+                {
+                if((exitCode = _unpackRecord(fields, fieldcount,
+                    packed + used, have - used,
+                    (char *) set + n * list->infosize, &size)) == DLL_NORMAL)
+                    {
+                    used += size;
+                    n++;
+                    }
+                else if(exitCode != DLL_CONTINUE || feof(fp) || ferror(fp))
+                    break;
+                else
+                    {
+                    memmove(packed, packed + used, have - used);
+                    have -= used;
+                    used = 0;
+                    have += fread(packed + have, 1, room - have, fp);
+                    }
+                }
+
+        if(n > 0L)
+            {
+            if(header.version != 0L)
+                sum = _checksum(sum, (const unsigned char *) set,
+                    n * list->infosize);
+
+            if(insert)
+                exitCode = _addRecord(list, set, pFun);
+            else
+                exitCode = _addRecords(list, set, n, NULL);
+
+            if(exitCode == DLL_MEM_ERROR)
+                break;
+            }
+
+        if(n < count)
+            {
+            /* Bytes left over are part of a record. */
+            if(feof(fp) && used == have)
+                exitCode = DLL_NORMAL;
+            else
+                exitCode = DLL_READ_ERROR;
+
+            break;
+            }
+        }
+
+    /* Records were lost or changed since the file was written. */
+    if(exitCode == DLL_NORMAL && header.version != 0L
+        && (sum != header.checksum || list->listsize != header.count))
+        {
+        _deleteEntireList(list);
+        exitCode = DLL_READ_ERROR;
+        }
+
+    if(exitCode == DLL_NORMAL && !insert && pFun != NULL
+        && list->head != NULL)
+        _sortList(list, pFun, 0, NULL);
+    else if(!pFun)
+        list->modified = DLL_FALSE;
+
+    free(packed);
+    free(fields);
+    free(set);
+    fclose(fp);
+    return(exitCode);
+    }
+
+
+/*
+ * _mapList : Loads the list from disk by mapping the file copy on write, the
+ *            info pointer of each node points into the mapping so no record
+ *            is read or copied until it is used. The nodes are allocated in
+ *            one array, both are freed and the file closed by _releaseMap()
+ *            when the list is emptied.
+ *
+ * Status   : Private
+ *
+ * Arguments: list           -- Pointer to type List
+ *            path           -- Pointer to path and filename
+ *            pFun           -- Pointer to search function
+ *            mode           -- How the records are ordered
+ *            offset         -- Size of the file header before the records
+ *
+ * Return   : DLL_NORMAL     -- File mapped successfully
+ *            DLL_MEM_ERROR  -- Memory allocation failed
+ *            DLL_OPEN_ERROR -- File open error
+ *            DLL_READ_ERROR -- File could not be mapped
+ */
+DLL_Return _mapList(List *list, const char *path,
+ int (*pFun)(Info *, Info *), DLL_LoadMode mode, size_t offset)
+    {
+    struct stat st;
+    Node *nodes;
+    char *map;
+    unsigned long count, n;
+    int fd;
+
+    if((fd = open(path, O_RDONLY)) == -1)
+        return(DLL_OPEN_ERROR);
+
+    if(fstat(fd, &st) == -1)
+        {
+        close(fd);
+        return(DLL_READ_ERROR);
+        }
+
+    _deleteEntireList(list);
+
+    /* A short last record is ignored as when the file is read. */
+    if((unsigned long) st.st_size <= offset
+        || (count = ((unsigned long) st.st_size - offset)
+        / list->infosize) == 0L)
+        {
+        close(fd);
+        list->modified = DLL_FALSE;
+        return(DLL_NORMAL);
+        }
+
+    if(list->hashlength != 0 && count * 2 > list->hashsize
+        && _hashResize(list, count) != DLL_NORMAL)
+        {
+        close(fd);
+        return(DLL_MEM_ERROR);
+        }
+
+    map = (char *) mmap(NULL, offset + count * list->infosize,
+        PROT_READ | PROT_WRITE, MAP_PRIVATE, fd, 0);
+
+    if(map == (char *) MAP_FAILED)
+        {
+        close(fd);
+        return(DLL_READ_ERROR);
+        }
+
+    if((nodes = (Node *) malloc(count * sizeof(Node))) == NULL)
+        {
+        munmap(map, offset + count * list->infosize);
+        close(fd);
+        return(DLL_MEM_ERROR);
+        }
+
+    for(n = 0L; n < count; n++)
+        {
+        nodes[n].info = map + offset + n * list->infosize;
+        nodes[n].prior = (n > 0L) ? &nodes[n - 1] : NULL;
+        nodes[n].next = (n + 1 < count) ? &nodes[n + 1] : NULL;
+
+        if(list->hashlength != 0)
+            _hashInsert(list, &nodes[n]);
+        }
+
+    list->map = map;
+    list->mapsize = offset + count * list->infosize;
+    list->mapnodes = nodes;
+    list->mapcount = count;
+    list->mapfd = fd; /* Kept to tell if a save would overwrite the file */
+    list->head = nodes;
+    list->tail = list->current = &nodes[count - 1];
+    list->listsize = count;
+    list->current_index = count;
+
+    if(pFun != NULL && !(mode & DLL_LOAD_SORTED))
+        _sortList(list, pFun, 0, NULL);
+    else
+        list->modified = DLL_FALSE;
+
+    return(DLL_NORMAL);
+    }
+
+
+/*
+ * _openJournal : Does the work of DLL_OpenJournal() without locking the
+ *                list.
+ *
+ * Status   : Private
+ *
+ * Arguments: list             -- Pointer to type List
+ *            path             -- Pointer to path and filename of the
+ *                                snapshot
+ *            logpath          -- Pointer to path and filename of the log
+ *            sync             -- DLL_TRUE to flush every write to disk
+ *
+ * Return   : DLL_NORMAL       -- Journal was opened
+ *            DLL_MEM_ERROR    -- Memory allocation failed
+ *            DLL_OPEN_ERROR   -- File open error
+ *            DLL_READ_ERROR   -- The snapshot could not be read or the log
+ *                                does not fit it
+ *            DLL_WRITE_ERROR  -- File write error
+ *            DLL_NOT_MODIFIED -- A journal is already open
+ */
+DLL_Return _openJournal(List *list, const char *path, const char *logpath,
+ DLL_Boolean sync)
+    {
+    struct stat st;
+    FileHeader header;
+    Journal *journal;
+    FILE *fp;
+    DLL_Return exitCode = DLL_NORMAL;
+    DLL_Boolean known = DLL_TRUE, logged;
+    long length = 0L;
+
+    if(list->journal != NULL)
+        return(DLL_NOT_MODIFIED);
+
+    if((journal = (Journal *) malloc(sizeof(Journal))) == NULL)
+        return(DLL_MEM_ERROR);
+
+    journal->fd = -1;
+    journal->path = (char *) malloc(strlen(path) + 1);
+    journal->logpath = (char *) malloc(strlen(logpath) + 1);
+    journal->sync = sync;
+    journal->buffer = (char *) malloc(sizeof(JournalOp) + list->infosize);
+    journal->length = 0L;
+    list->journal = journal;
+
+    if(journal->path == NULL || journal->logpath == NULL
+        || journal->buffer == NULL)
+        {
+        _closeJournal(list);
+        return(DLL_MEM_ERROR);
+        }
+
+    strcpy(journal->path, path);
+    strcpy(journal->logpath, logpath);
+
+    /* Nothing read or replayed is logged. */
+    list->journal = NULL;
+    header.count = 0L;
+    header.checksum = _checksum(0L, NULL, 0);
+    logged = (stat(logpath, &st) == 0) ? DLL_TRUE : DLL_FALSE;
+
+    if((fp = fopen(path, "rb")) != NULL)
+        {
+        /* Only a snapshot with a header can be matched to a log. */
+        if(fread(&header, sizeof(FileHeader), 1, fp) != 1
+            || memcmp(header.magic, _FILE_MAGIC, sizeof(header.magic)) != 0)
+            known = DLL_FALSE;
+
+        fclose(fp);
+        exitCode = _loadList(list, path, NULL, DLL_LOAD_SORTED);
+        }
+    else if(logged) /* The snapshot was of an empty list. */
+        _deleteEntireList(list);
+    else /* The list is the first snapshot. */
+        known = DLL_FALSE;
+
+    if(exitCode == DLL_NORMAL && known && logged)
+        exitCode = _replayJournal(list, logpath, header.count,
+            header.checksum, &length);
+
+    if(exitCode == DLL_NORMAL && (journal->fd = open(logpath,
+        O_WRONLY | O_CREAT | O_APPEND, 0666)) == -1)
+        exitCode = DLL_OPEN_ERROR;
+
+    list->journal = journal;
+
+    if(exitCode == DLL_NORMAL)
+        {
+        if(length > 0L) /* Drops an entry cut short by a crash. */
+            {
+            if(ftruncate(journal->fd, (off_t) length) == -1)
+                exitCode = DLL_WRITE_ERROR;
+
+            journal->length = length;
+            }
+        else if(known)
+            exitCode = _startJournal(list, header.count, header.checksum);
+        else
+            exitCode = _compactJournal(list);
+        }
+
+    if(exitCode != DLL_NORMAL)
+        _closeJournal(list);
+
+    return(exitCode);
+    }
+
+
+/*
+ * _closeJournal : Closes the log and frees the journal.
+ *
+ * Status   : Private
+ *
+ * Arguments: list            -- Pointer to type List
+ *
+ * Return   : DLL_NORMAL      -- Journal was closed
+ *            DLL_WRITE_ERROR -- The log could not be closed
+ */
+DLL_Return _closeJournal(List *list)
+    {
+    Journal *journal = list->journal;
+    DLL_Return exitCode = DLL_NORMAL;
+
+    if(journal->fd != -1 && close(journal->fd) == -1)
+        exitCode = DLL_WRITE_ERROR;
+
+    free(journal->buffer);
+    free(journal->logpath);
+    free(journal->path);
+    free(journal);
+    list->journal = NULL;
+    return(exitCode);
+    }
+
+
+/*
+ * _compactJournal : Does the work of DLL_CompactJournal() without locking
+ *                   the list.
+ *
+ * Status   : Private
+ *
+ * Arguments: list            -- Pointer to type List
+ *
+ * Return   : DLL_NORMAL      -- Snapshot was written
+ *            DLL_MEM_ERROR   -- Memory allocation failed
+ *            DLL_OPEN_ERROR  -- File open error
+ *            DLL_WRITE_ERROR -- File write error
+ */
+DLL_Return _compactJournal(List *list)
+    {
+    Journal *journal = list->journal;
+    FileHeader header;
+    DLL_Return exitCode;
+
+    if(list->head == NULL)
+        {
+        if(unlink(journal->path) == -1 && errno != ENOENT)
+            return(DLL_WRITE_ERROR);
+
+        if(journal->sync)
+            _syncDirectory(journal->path);
+
+        header.count = 0L;
+        header.checksum = _checksum(0L, NULL, 0);
+        }
+    else
+        {
+        list->modified = DLL_TRUE; /* Written even if saved before. */
+
+        if((exitCode = _saveList(list, journal->path, NULL, (DLL_SaveMode)
+            (DLL_SAVE_HEADER | DLL_SAVE_ATOMIC
+            | (journal->sync ? DLL_SAVE_SYNC : 0)
+            | (list->fields != NULL ? DLL_SAVE_COMPACT : 0)), &header))
+            != DLL_NORMAL)
+            return(exitCode);
+        }
+
+    return(_startJournal(list, header.count, header.checksum));
+    }
+
+
+/*
+ * _startJournal : Empties the log and writes its header naming the snapshot
+ *                 it follows.
+ *
+ * Status   : Private
+ *
+ * Arguments: list            -- Pointer to type List
+ *            count           -- Number of records in the snapshot
+ *            checksum        -- Checksum in the snapshot's header
+ *
+ * Return   : DLL_NORMAL      -- Log was started
+ *            DLL_WRITE_ERROR -- File write error
+ */
+DLL_Return _startJournal(List *list, unsigned long count,
+ unsigned long checksum)
+    {
+    Journal *journal = list->journal;
+    JournalHeader header;
+
+    memset(&header, 0, sizeof(JournalHeader));
+    memcpy(header.magic, _JOURNAL_MAGIC, sizeof(header.magic));
+    header.version = _JOURNAL_VERSION;
+    header.infosize = list->infosize;
+    header.count = count;
+    header.checksum = checksum;
+    journal->length = 0L;
+
+    if(ftruncate(journal->fd, (off_t) 0) == -1
+        || _writeAll(journal->fd, (char *) &header, sizeof(JournalHeader))
+        != DLL_NORMAL || (journal->sync && fsync(journal->fd) == -1))
+        return(DLL_WRITE_ERROR);
+
+    journal->length = sizeof(JournalHeader);
+    return(DLL_NORMAL);
+    }
+
+
+/*
+ * _journalOp : Appends an entry for a change to the log if the list has a
+ *              journal. An entry that could not be written whole is cut
+ *              off again so the entries after it can be replayed.
+ *
+ * Status   : Private
+ *
+ * Arguments: list            -- Pointer to type List
+ *            op              -- _JOURNAL_INSERT, _JOURNAL_UPDATE,
+ *                               _JOURNAL_DELETE or _JOURNAL_SWAP
+ *            index           -- Index of the record changed
+ *            count           -- Number of records inserted or updated, or
+ *                               the direction of a swap
+ *            records         -- Pointer to the records inserted or updated
+ *
+ * Return   : DLL_NORMAL      -- Entry was written or there is no journal
+ *            DLL_WRITE_ERROR -- File write error
+ */
+DLL_Return _journalOp(List *list, unsigned long op, unsigned long index,
+ unsigned long count, const char *records)
+    {
+    Journal *journal = list->journal;
+    JournalOp *entry;
+    DLL_Return exitCode;
+    size_t size = 0;
+
+    if(journal == NULL)
+        return(DLL_NORMAL);
+
+    if(op == _JOURNAL_INSERT || op == _JOURNAL_UPDATE)
+        size = count * list->infosize;
+
+    entry = (JournalOp *) journal->buffer;
+    entry->op = op;
+    entry->index = index;
+    entry->count = count;
+    entry->checksum = _checksum(_checksum(0L, NULL, 0),
+        (const unsigned char *) &entry->op,
+        sizeof(JournalOp) - sizeof(entry->checksum));
+
+    if(size > 0)
+        entry->checksum = _checksum(entry->checksum,
+            (const unsigned char *) records, size);
+
+    /* An entry with one record goes out in one write. */
+    if(size <= list->infosize)
+        {
+        if(size > 0)
+            memcpy(journal->buffer + sizeof(JournalOp), records, size);
+
+        exitCode = _writeAll(journal->fd, journal->buffer,
+            sizeof(JournalOp) + size);
+        }
+    else if((exitCode = _writeAll(journal->fd, journal->buffer,
+        sizeof(JournalOp))) == DLL_NORMAL)
+        exitCode = _writeAll(journal->fd, records, size);
+
+    if(exitCode == DLL_NORMAL && journal->sync && fsync(journal->fd) == -1)
+        exitCode = DLL_WRITE_ERROR;
+
+    if(exitCode == DLL_NORMAL)
+        journal->length += (long) (sizeof(JournalOp) + size);
+    else
+        ftruncate(journal->fd, (off_t) journal->length);
+
+    return(exitCode);
+    }
+
+
+/*
+ * _replayJournal : Applies the entries in a log to the list loaded from the
+ *                  snapshot it names. A log that names another snapshot was
+ *                  written before it and is already in it, so nothing is
+ *                  done.
+ *
+ * Status   : Private
+ *
+ * Arguments: list           -- Pointer to type List
+ *            logpath        -- Pointer to path and filename of the log
+ *            count          -- Number of records in the snapshot
+ *            checksum       -- Checksum in the snapshot's header
+ *            length         -- Pointer to receive the bytes of whole
+ *                              entries in the log, zero if none were used
+ *
+ * Return   : DLL_NORMAL     -- Log was replayed
+ *            DLL_MEM_ERROR  -- Memory allocation failed
+ *            DLL_OPEN_ERROR -- File open error
+ *            DLL_READ_ERROR -- An entry does not fit the list
+ */
+DLL_Return _replayJournal(List *list, const char *logpath,
+ unsigned long count, unsigned long checksum, long *length)
+    {
+    struct stat st;
+    JournalHeader header;
+    JournalOp op;
+    FILE *fp;
+    DLL_Return exitCode = DLL_NORMAL;
+    char *records = NULL, *more;
+    size_t size, room = 0;
+    unsigned long n, sum;
+
+    *length = 0L;
+
+    if((fp = fopen(logpath, "rb")) == NULL)
+        return(DLL_OPEN_ERROR);
+
+    if(fstat(fileno(fp), &st) == -1
+        || fread(&header, sizeof(JournalHeader), 1, fp) != 1
+        || memcmp(header.magic, _JOURNAL_MAGIC, sizeof(header.magic)) != 0
+        || header.version != _JOURNAL_VERSION
+        || header.infosize != list->infosize
+        || header.count != count || header.checksum != checksum)
+        {
+        fclose(fp);
+        return(DLL_NORMAL);
+        }
+
+    *length = (long) sizeof(JournalHeader);
+
+    while(exitCode == DLL_NORMAL && fread(&op, sizeof(JournalOp), 1, fp) == 1)
+        {
+        n = (op.op == _JOURNAL_INSERT || op.op == _JOURNAL_UPDATE)
+            ? op.count : 0L;
+
+        /* An entry cut short by a crash ends the log. */
+        if(n > ((unsigned long) st.st_size - *length - sizeof(JournalOp))
+            / list->infosize)
+            break;
+
+        size = n * list->infosize;
+
+        if(size > room)
+            {
+            if((more = (char *) realloc(records, size)) == NULL)
+                {
+                exitCode = DLL_MEM_ERROR;
+                break;
+                }
+
+            records = more;
+            room = size;
+            }
+
+        if(fread(records, 1, size, fp) != size)
+            break;
+
+        sum = _checksum(_checksum(0L, NULL, 0),
+            (const unsigned char *) &op.op,
+            sizeof(JournalOp) - sizeof(op.checksum));
+
+        if(size > 0)
+            sum = _checksum(sum, (const unsigned char *) records, size);
+
+        if(sum != op.checksum)
+            break;
+
+        if((exitCode = _replayOp(list, &op, records)) == DLL_NORMAL)
+            *length += (long) (sizeof(JournalOp) + size);
+        }
+
+    free(records);
+    fclose(fp);
+    return(exitCode);
+    }
+
+
+/*
+ * _replayOp : Makes the change of one log entry to the list.
+ *
+ * Status   : Private
+ *
+ * Arguments: list           -- Pointer to type List
+ *            op             -- Pointer to the entry
+ *            records        -- Pointer to the records that followed it
+ *
+ * Return   : DLL_NORMAL     -- Change was made
+ *            DLL_MEM_ERROR  -- Memory allocation failed
+ *            DLL_READ_ERROR -- The entry does not fit the list
+ */
+DLL_Return _replayOp(List *list, JournalOp *op, char *records)
+    {
+    Cursor cursor;
+    DLL_Return exitCode = DLL_NORMAL;
+    unsigned long n;
+
+    /* An index off the list means the log is not for this snapshot. */
+    if(op->index == 0L || op->index > list->listsize
+        + (op->op == _JOURNAL_INSERT ? 1L : 0L)
+        || (op->op == _JOURNAL_UPDATE && op->count != 1L))
+        return(DLL_READ_ERROR);
+
+    _getListCursor(list, &cursor);
+
+    switch(op->op)
+        {
+        case _JOURNAL_INSERT:
+            for(n = 0L; n < op->count && exitCode == DLL_NORMAL;
+                n++, records += list->infosize)
+                {
+                if(list->skipfun != NULL)
+                    exitCode = _skipAddRecord(list, (Info *) records);
+                else if(op->index + n > list->listsize) /* New last record */
+                    {
+                    cursor.current = list->tail;
+                    cursor.current_index = list->listsize;
+                    exitCode = _insertRecord(&cursor, (Info *) records,
+                        DLL_BELOW);
+                    }
+                else
+                    {
+                    cursor.current = _seekIndex(&cursor, op->index + n);
+                    cursor.current_index = op->index + n;
+                    exitCode = _insertRecord(&cursor, (Info *) records,
+                        DLL_ABOVE);
+                    }
+                }
+            break;
+        case _JOURNAL_UPDATE:
+            list->current = _seekIndex(&cursor, op->index);
+            list->current_index = op->index;
+            exitCode = _updateRecord(list, (Info *) records);
+            break;
+        case _JOURNAL_DELETE:
+            cursor.current = _seekIndex(&cursor, op->index);
+            cursor.current_index = op->index;
+            exitCode = _deleteRecord(&cursor);
+            break;
+        case _JOURNAL_SWAP:
+            list->current = _seekIndex(&cursor, op->index);
+            list->current_index = op->index;
+            exitCode = _swapRecord(list, (DLL_InsertDir) op->count);
+            break;
+        default:
+            exitCode = DLL_READ_ERROR;
+            break;
+        }
+
+    return((exitCode == DLL_NORMAL || exitCode == DLL_MEM_ERROR) ? exitCode
+        : DLL_READ_ERROR);
+    }
+
+
+/*
+ * _checkHeader : Checks a file header read by _loadList() belongs to a file
+ *                of filesize bytes holding records of the list's size.
+ *
+ * Status   : Private
+ *
+ * Arguments: list           -- Pointer to type List
+ *            header         -- Pointer to the header
+ *            filesize       -- Size of the file in bytes
+ *
+ * Return   : DLL_NORMAL     -- Header is good
+ *            DLL_READ_ERROR -- Unknown version, wrong record size or the
+ *                              file is the wrong size
+ */
+DLL_Return _checkHeader(List *list, FileHeader *header,
+ unsigned long filesize)
+    {
+    if((header->version != _FILE_VERSION && header->version != _FILE_COMPACT)
+        || header->headersize < sizeof(FileHeader)
+        || header->headersize > filesize
+        || header->infosize != list->infosize)
+        return(DLL_READ_ERROR);
+
+    filesize -= header->headersize;
+
+    /* A compact file has a layout and records of at least a byte each. */
+    if(header->version == _FILE_COMPACT
+        ? (header->headersize == sizeof(FileHeader)
+        || (header->headersize - sizeof(FileHeader)) % sizeof(DLL_Field) != 0
+        || header->count > filesize)
+        : (header->count != filesize / list->infosize
+        || filesize % list->infosize != 0))
+        return(DLL_READ_ERROR);
+
+    return(DLL_NORMAL);
+    }
+
+
+/*
+ * _checkLayout : Checks the fields of a layout are in order, do not overlap
+ *                and are within the Info structure.
+ *
+ * Status   : Private
+ *
+ * Arguments: list           -- Pointer to type List
+ *            fields         -- Pointer to an array of type DLL_Field
+ *            count          -- Number of fields in the array
+ *            whole          -- DLL_TRUE if the fields must also cover every
+ *                              byte of the Info structure
+ *
+ * Return   : DLL_NORMAL     -- Layout is good
+ *            DLL_READ_ERROR -- Layout is not
+ */
+DLL_Return _checkLayout(List *list, const DLL_Field *fields,
+ unsigned long count, DLL_Boolean whole)
+    {
+    unsigned long i;
+    size_t end = 0;
+
+    for(i = 0L; i < count; i++)
+        {
+        if(fields[i].length == 0 || fields[i].offset < end
+            || (whole && fields[i].offset != end)
+            || fields[i].offset >= list->infosize
+            || fields[i].length > list->infosize - fields[i].offset)
+            return(DLL_READ_ERROR);
+
+        end = fields[i].offset + fields[i].length;
+        }
+
+    return((count == 0L || (whole && end != list->infosize))
+        ? DLL_READ_ERROR : DLL_NORMAL);
+    }
+
+
+/*
+ * _packedSize : Works out the most bytes _packRecord() can pack a record
+ *               into.
+ *
+ * Status   : Private
+ *
+ * Arguments: fields -- Pointer to an array of type DLL_Field
+ *            count  -- Number of fields in the array
+ *
+ * Return   : The size in bytes
+ */
+size_t _packedSize(const DLL_Field *fields, unsigned long count)
+    {
+    unsigned long i;
+    size_t size = 0;
+
+    for(i = 0L; i < count; i++)
+        size += _PACK_PREFIX(fields[i].length) + fields[i].length;
+
+    return(size);
+    }
+
+
+/*
+ * _packRecord : Packs a record for DLL_SAVE_COMPACT. Each field is written
+ *               as the number of its bytes up to the last one that is not
+ *               zero followed by those bytes, the zero bytes after them are
+ *               left out.
+ *
+ * Status   : Private
+ *
+ * Arguments: fields -- Pointer to an array of type DLL_Field covering the
+ *                      record
+ *            count  -- Number of fields in the array
+ *            info   -- Pointer to the record
+ *            data   -- Pointer to receive the packed record
+ *
+ * Return   : The size in bytes of the packed record
+ */
+size_t _packRecord(const DLL_Field *fields, unsigned long count,
+ const char *info, char *data)
+    {
+    const char *field;
+    unsigned long i, used, word;
+    size_t size = 0, prefix;
+
+    for(i = 0L; i < count; i++)
+        {
+        field = info + fields[i].offset;
+        used = fields[i].length;
+
+        /* Skips the zero bytes a word at a time, then the rest singly. */
+        while(used >= sizeof(word))
+            {
+            memcpy(&word, field + used - sizeof(word), sizeof(word));
+
+            if(word != 0L)
+                break;
+
+            used -= sizeof(word);
+            }
+
+        while(used > 0L && field[used - 1] == '\0')
+            used--;
+
+        if((prefix = _PACK_PREFIX(fields[i].length)) == 1)
+            data[size] = (char) (unsigned char) used;
+        else
+            memcpy(data + size, &used, prefix);
+
+        memcpy(data + size + prefix, field, used);
+        size += prefix + used;
+        }
+
+    return(size);
+    }
+
+
+/*
+ * _unpackRecord : Unpacks a record written by _packRecord(), putting back
+ *                 the zero bytes that were left out.
+ *
+ * Status   : Private
+ *
+ * Arguments: fields         -- Pointer to an array of type DLL_Field
+ *                              covering the record
+ *            count          -- Number of fields in the array
+ *            data           -- Pointer to the packed bytes
+ *            length         -- Number of packed bytes
+ *            info           -- Pointer to receive the record
+ *            used           -- Pointer to receive the size of the packed
+ *                              record
+ *
+ * Return   : DLL_NORMAL     -- Record was unpacked
+ *            DLL_CONTINUE   -- The bytes end part way through the record
+ *            DLL_READ_ERROR -- A field says it holds more than it can
+ */
+DLL_Return _unpackRecord(const DLL_Field *fields, unsigned long count,
+ const char *data, size_t length, char *info, size_t *used)
+    {
+    unsigned long i, n;
+    size_t size = 0, prefix;
+
+    for(i = 0L; i < count; i++)
+        {
+        if(length - size < (prefix = _PACK_PREFIX(fields[i].length)))
+            return(DLL_CONTINUE);
+
+        if(prefix == 1)
+            n = (unsigned char) data[size];
+        else
+            memcpy(&n, data + size, prefix);
+
+        if(n > fields[i].length)
+            return(DLL_READ_ERROR);
+
+        if(length - size - prefix < n)
+            return(DLL_CONTINUE);
+
+        memcpy(info + fields[i].offset, data + size + prefix, n);
+        memset(info + fields[i].offset + n, 0, fields[i].length - n);
+        size += prefix + n;
+        }
+
+    *used = size;
+    return(DLL_NORMAL);
+    }
+
+
+/*
+ * _sortTag : Names the order of a comparator from DLL_FieldComparator() so
+ *            it can be written in a file header, the same field, type and
+ *            direction give the same tag in any program.
+ *
+ * Status   : Private
+ *
+ * Arguments: pFun -- Pointer to sort function
+ *
+ * Return   : The tag
+ *            0 if pFun is not a field comparator
+ */
+unsigned long _sortTag(int (*pFun)(Info *, Info *))
+    {
+    unsigned long tag = 0L;
+    FieldKey *key;
+    int i;
+
+    pthread_mutex_lock(&_fieldLock);
+
+    for(i = 0; pFun != NULL && i < _fieldKeysUsed; i++)
+        {
+        if(_fieldSlots[i] == pFun)
+            {
+            key = &_fieldKeys[i];
+            tag = 1L + key->descending + 2L * (key->type + 8L
+                * (key->length + 65536L * key->offset));
+            break;
+            }
+        }
+
+    pthread_mutex_unlock(&_fieldLock);
+    return(tag);
+    }
+
+
+/*
+ * _checksum : Adds bytes to an Adler-32 checksum.
+ *
+ * Status   : Private
+ *
+ * Arguments: sum    -- Checksum of the bytes before
+ *            data   -- Pointer to the bytes or NULL to start a checksum
+ *            length -- Number of bytes
+ *
+ * Return   : The new checksum
+ */
+#define _ADLER_MOD      65521L
+#define _ADLER_NMAX     5552      /* Bytes before the sums could overflow */
+
+unsigned long _checksum(unsigned long sum, const unsigned char *data,
+ size_t length)
+    {
+    unsigned long a = sum & 0xffffL, b = (sum >> 16) & 0xffffL;
+    size_t n;
+
+    if(data == NULL)
+        return(1L);
+
+    while(length > 0)
+        {
+        n = (length < _ADLER_NMAX) ? length : _ADLER_NMAX;
+        length -= n;
+
+        while(n-- > 0)
+            {
+            a += *data++;
+            b += a;
+            }
+
+        a %= _ADLER_MOD;
+        b %= _ADLER_MOD;
+        }
+
+    return((b << 16) | a);
+    }
+
+
+/*
+ * _createNewRecord : Allocates space for a new node and info structure and
+ *                    possibly adds the new node to the list if the list is
+ *                    empty.
+ *
+ * Status   : Private
+ *
+ * Arguments: list          -- Pointer to type List
+ *            info          -- Record to add
+ *            newN          -- Pointer to new node
+ *            newI          -- Pointer to new info
+ *
+ * Return   : DLL_NORMAL    -- File written successfully
+ *            DLL_MEM_ERROR -- Memory allocation failed
+ *            DLL_CONTINUE  -- Continue (internal use only)
+ */
+DLL_Return _createNewRecord(List *list, Info *info, Node **newN, Info **newI)
+    {
+    /* Grow the hash index first so nothing has to be undone. */
+    if(list->hashlength != 0 && (list->listsize + 1) * 2 > list->hashsize
+        && _hashResize(list, list->listsize + 1) != DLL_NORMAL)
+        return(DLL_MEM_ERROR);
+
+    /* Allocate space for new node and info */
+    if((*newN = _allocNode(list)) == NULL)
+        return(DLL_MEM_ERROR);
+
+    *newI = (*newN)->info;
+
+    /* Put new info into allocated space */
+    memcpy(*newI, info, list->infosize);
+
+    if(list->hashlength != 0)
+        _hashInsert(list, *newN);
+
+    /* If list->head is NULL, assume empty list and this is the 1st record. */
+    if(list->head == NULL)
+        {
+        (*newN)->info = *newI;
+        (*newN)->next = NULL;
+        (*newN)->prior = NULL;
+        list->head = *newN;
+        list->tail = *newN;
+        list->current = *newN;
+        list->listsize = 1L;
+        list->current_index = 1L;
+        list->modified = DLL_TRUE;
+        return(DLL_NORMAL);
+        }
+
+    return(DLL_CONTINUE);
+    }
+
+
+/*
+ * _allocNode : Allocates a Node and the space for its Info structure. The
+ *              new node's info pointer is set, but it is not linked into the
+ *              list.
+ *
+ * Status   : Private
+ *
+ * Arguments: list -- Pointer to type List
+ *
+ * Return   : Pointer to the new Node
+ *            NULL if unsuccessful
+ */
+Node *_allocNode(List *list)
+    {
+    Node *node;
+
+    if(list->blocksize == 0L && list->inline_info == DLL_TRUE)
+        {
+        if((node = (Node *) malloc(_SLOT_SIZE(list))) == NULL)
+            return(NULL);
+
+        node->info = (Info *) ((char *) node + _ALIGN(sizeof(Node)));
+        return(node);
+        }
+
+    if(list->blocksize == 0L)
+        {
+        if((node = (Node *) malloc(sizeof(Node))) == NULL)
+            return(NULL);
+
+        if((node->info = (Info *) malloc(list->infosize)) == NULL)
+            {
+            free(node);
+            return(NULL);
+            }
+
+        return(node);
+        }
+
+    /* Reuse a deleted record first, its info still points into its slot. */
+    if((node = list->freenodes) != NULL)
+        {
+        list->freenodes = node->next;
+        return(node);
+        }
+
+    if(list->block == NULL || list->blockused >= list->block->count)
+        {
+        /* Blocks after the current one were emptied by DLL_DeleteEntireList */
+        if(list->block != NULL && list->block->next != NULL)
+            {
+            list->block = list->block->next;
+            list->blockused = 0L;
+            }
+        else if(_newBlock(list, list->blocksize) == NULL)
+            return(NULL);
+        }
+
+    node = (Node *) ((char *) list->block + _ALIGN(sizeof(Block))
+     + list->blockused * _SLOT_SIZE(list));
+    node->info = (Info *) ((char *) node + _ALIGN(sizeof(Node)));
+    list->blockused++;
+    return(node);
+    }
+
+
+/*
+ * _freeNode : Frees a Node and its Info structure or returns them to the
+ *             block free list. The node must already be unlinked.
+ *
+ * Status   : Private
+ *
+ * Arguments: list -- Pointer to type List
+ *            node -- Pointer to the node to free
+ *
+ * Return   : void
+ */
+void _freeNode(List *list, Node *node)
+    {
+    if(_MAPPED(list, node)) /* Freed with the mapping */
+        return;
+
+    if(list->blocksize == 0L)
+        {
+        if(list->inline_info == DLL_FALSE)
+            free(node->info);
+
+        free(node);
+        return;
+        }
+
+    node->prior = NULL;
+    node->next = list->freenodes;
+    list->freenodes = node;
+    }
+
+
+/*
+ * _newBlock : Allocates a block of count records, adds it to the end of the
+ *             block chain, and makes it the block new records are taken from.
+ *
+ * Status   : Private
+ *
+ * Arguments: list  -- Pointer to type List
+ *            count -- Number of records in the block
+ *
+ * Return   : Pointer to the new Block
+ *            NULL if unsuccessful
+ */
+Block *_newBlock(List *list, unsigned long count)
+    {
+    Block *block;
+
+    if((block = (Block *) malloc(_ALIGN(sizeof(Block))
+     + count * _SLOT_SIZE(list))) == NULL)
+        return(NULL);
+
+    block->count = count;
+    block->next = NULL;
+
+    if(list->block == NULL)
+        {
+        block->next = list->blocks;
+        list->blocks = block;
+        }
+    else
+        list->block->next = block;
+
+    list->block = block;
+    list->blockused = 0L;
+    return(block);
+    }
+
+
+/*
+ * _releaseBlocks : Frees all the allocation blocks. Any records still in
+ *                  the list must have been deleted first.
+ *
+ * Status   : Private
+ *
+ * Arguments: list -- Pointer to type List
+ *
+ * Return   : void
+ */
+void _releaseBlocks(List *list)
+    {
+    Block *block;
+
+    while((block = list->blocks) != NULL)
+        {
+        list->blocks = block->next;
+        free(block);
+        }
+
+    list->block = NULL;
+    list->blockused = 0L;
+    list->freenodes = NULL;
+    }
+
+
+/*
+ * _releaseMap : Unmaps the file mapped by _mapList() and frees its nodes.
+ *               Any of its records still in the list must have been deleted
+ *               first.
+ *
+ * Status   : Private
+ *
+ * Arguments: list -- Pointer to type List
+ *
+ * Return   : void
+ */
+void _releaseMap(List *list)
+    {
+    if(list->map == NULL)
+        return;
+
+    munmap(list->map, list->mapsize);
+    close(list->mapfd);
+    free(list->mapnodes);
+    list->map = NULL;
+    list->mapsize = 0;
+    list->mapnodes = NULL;
+    list->mapcount = 0L;
+    list->mapfd = -1;
+    }
+
+
+/*
+ * _compareField : Compare one field of two records as described by key.
+ *
+ * Status   : Private
+ *
+ * Arguments: key     -- Pointer to the field description
+ *            record  -- Pointer to an Info structure
+ *            compare -- Pointer to an Info structure
+ *
+ * Return   : -1, 0 or 1 as record is less than, equal to or greater than
+ *            compare, reversed when key->descending is DLL_TRUE
+ */
+#define _CMP_AS(type, a, b, result) \
+    { \
+    type x, y; \
+    memcpy(&x, (a), sizeof(type)); \
+    memcpy(&y, (b), sizeof(type)); \
+    (result) = (x > y) - (x < y); \
+    }
+
+int _compareField(FieldKey *key, Info *record, Info *compare)
+    {
+    const char *a = (const char *) record + key->offset;
+    const char *b = (const char *) compare + key->offset;
+    int result;
+
+    switch(key->type)
+        {
+        case DLL_FIELD_STRING:
+            result = strncmp(a, b, key->length);
+            break;
+        case DLL_FIELD_INT:
+            if(key->length == sizeof(int))
+                _CMP_AS(int, a, b, result)
+            else if(key->length == sizeof(long))
+                _CMP_AS(long, a, b, result)
+            else if(key->length == sizeof(short))
+                _CMP_AS(short, a, b, result)
+            else if(key->length == sizeof(signed char))
+                _CMP_AS(signed char, a, b, result)
+            else
+                result = _compareBytes((const unsigned char *) a,
+                    (const unsigned char *) b, key->length, DLL_TRUE);
+
+            break;
+        case DLL_FIELD_UINT:
+            if(key->length == sizeof(unsigned int))
+                _CMP_AS(unsigned int, a, b, result)
+            else if(key->length == sizeof(unsigned long))
+                _CMP_AS(unsigned long, a, b, result)
+            else if(key->length == sizeof(unsigned short))
+                _CMP_AS(unsigned short, a, b, result)
+            else
+                result = _compareBytes((const unsigned char *) a,
+                    (const unsigned char *) b, key->length, DLL_FALSE);
+
+            break;
+        case DLL_FIELD_FLOAT:
+            if(key->length == sizeof(float))
+                _CMP_AS(float, a, b, result)
+            else
+                _CMP_AS(double, a, b, result)
+
+            break;
+        case DLL_FIELD_MEMORY:
+        default:
+            result = memcmp(a, b, key->length);
+            break;
+        }
+
+    if(result != 0)
+        result = (result < 0) ? -1 : 1;
+
+    return(key->descending == DLL_TRUE ? -result : result);
+    }
+
+
+/*
+ * _compareBytes : Compare two native byte order integers of any length.
+ *
+ * Status   : Private
+ *
+ * Arguments: a      -- Pointer to the first integer
+ *            b      -- Pointer to the second integer
+ *            length -- Length of the integers in bytes
+ *            sign   -- DLL_TRUE if the integers are signed
+ *
+ * Return   : -1, 0 or 1 as a is less than, equal to or greater than b
+ */
+int _compareBytes(const unsigned char *a, const unsigned char *b,
+ size_t length, DLL_Boolean sign)
+    {
+    static const union
+        {
+        unsigned int  i;
+        unsigned char c;
+        } order = { 1 };
+    unsigned int x, y;
+    size_t i, idx;
+
+    for(i = 0; i < length; i++)
+        {
+        /* Start with the most significant byte. */
+        idx = order.c ? length - 1 - i : i;
+        x = a[idx];
+        y = b[idx];
+
+        if(i == 0 && sign == DLL_TRUE)
+            {
+            x ^= 0x80;
+            y ^= 0x80;
+            }
+
+        if(x != y)
+            return((x < y) ? -1 : 1);
+        }
+
+    return(0);
+    }
+
+
+/*
+ * _relinkList : Rebuilds the prior pointers, tail and indexes after the
+ *               nodes have been reordered through their next pointers.
+ *
+ * Status   : Private
+ *
+ * Arguments: list -- Pointer to type List
+ *            head -- Pointer to the new first node
+ *
+ * Return   : void
+ */
+void _relinkList(List *list, Node *head)
+    {
+    Node *step, *prior = NULL;
+    unsigned long index = 1L;
+
+    list->head = head;
+
+    for(step = head; step != NULL; prior = step, step = step->next, index++)
+        {
+        step->prior = prior;
+
+        if(step == list->current)
+            list->current_index = index;
+
+        if(step == list->saved)
+            list->save_index = index;
+        }
+
+    list->tail = prior;
+    }
+
+
+/*
+ * _mergeSort : Sorts a chain of nodes with a stable bottom up merge sort.
+ *              Only the next pointers are used, the prior pointers are left
+ *              for _relinkList() to set.
+ *
+ * Status   : Private
+ *
+ * Arguments: head     -- First Node of the chain
+ *            pFun     -- Pointer to sort function or NULL to use key
+ *            key      -- Pointer to the field description used when pFun
+ *                        is NULL
+ *            compares -- Has the number of comparisons made added to it
+ *
+ * Return   : The first Node of the sorted chain
+ */
+Node *_mergeSort(Node *head, int (*pFun)(Info *, Info *), FieldKey *key,
+ unsigned long *compares)
+    {
+    Node *tail, *p, *q, *e;
+    unsigned long insize, nmerges, psize, qsize;
+
+    /* Bottom up merge of runs of insize nodes. */
+    for(insize = 1L; ; insize *= 2)
+        {
+        p = head;
+        head = tail = NULL;
+        nmerges = 0L;
+
+        while(p != NULL)
+            {
+            nmerges++;
+            q = p;
+
+            for(psize = 0L; psize < insize && q != NULL; psize++)
+                q = q->next;
+
+            qsize = insize;
+
+            while(psize > 0 || (qsize > 0 && q != NULL))
+                {
+                /* Take from p on ties so equal records keep their order. */
+                if(psize > 0 && (qsize == 0 || q == NULL
+                    || ((*compares)++, (pFun != NULL)
+                        ? (*pFun)(p->info, q->info)
+                        : _compareField(key, p->info, q->info)) <= 0))
+                    {
+                    e = p;
+                    p = p->next;
+                    psize--;
+                    }
+                else
+                    {
+                    e = q;
+                    q = q->next;
+                    qsize--;
+                    }
+
+                if(tail == NULL)
+                    head = e;
+                else
+                    tail->next = e;
+
+                tail = e;
+                }
+
+            p = q;
+            }
+
+        tail->next = NULL;
+
+        if(nmerges <= 1)
+            break;
+        }
+
+    return(head);
+    }
+
+
+/*
+ * _mergeRuns : Merges two sorted chains of nodes into one, records in p
+ *              come before equal records in q.
+ *
+ * Status   : Private
+ *
+ * Arguments: p        -- First Node of the first chain
+ *            q        -- First Node of the second chain
+ *            pFun     -- Pointer to sort function
+ *            compares -- Has the number of calls made to pFun added to it
+ *
+ * Return   : The first Node of the merged chain
+ */
+Node *_mergeRuns(Node *p, Node *q, int (*pFun)(Info *, Info *),
+ unsigned long *compares)
+    {
+    Node head, *tail = &head;
+
+    while(p != NULL && q != NULL)
+        {
+        (*compares)++;
+
+        if((*pFun)(p->info, q->info) <= 0)
+            {
+            tail->next = p;
+            p = p->next;
+            }
+        else
+            {
+            tail->next = q;
+            q = q->next;
+            }
+
+        tail = tail->next;
+        }
+
+    tail->next = (p != NULL) ? p : q;
+    return(head.next);
+    }
+
+
+/*
+ * _linkNode : Links node into the list after prior.
+ *
+ * Status   : Private
+ *
+ * Arguments: list  -- Pointer to type List
+ *            node  -- Pointer to the node to link
+ *            prior -- Pointer to the node before it, NULL for a new head
+ *
+ * Return   : void
+ */
+void _linkNode(List *list, Node *node, Node *prior)
+    {
+    node->prior = prior;
+    node->next = (prior == NULL) ? list->head : prior->next;
+
+    if(prior == NULL)
+        list->head = node;
+    else
+        prior->next = node;
+
+    if(node->next == NULL)
+        list->tail = node;
+    else
+        node->next->prior = node;
+    }
+
+
+/*
+ * _newSkipNode : Allocates a skip list tower of random height.
+ *
+ * Status   : Private
+ *
+ * Arguments: list -- Pointer to type List
+ *
+ * Return   : Pointer to the tower or NULL if malloc failed
+ */
+SkipNode *_newSkipNode(List *list)
+    {
+    SkipNode *sn;
+    int level = 1;
+
+    /* Each level up is taken with a probability of one in four. */
+    for(;;)
+        {
+        list->skipseed = list->skipseed * 1103515245L + 12345L;
+
+        if(level == _SKIP_MAXLEVEL || ((list->skipseed >> 16) & 3) != 0)
+            break;
+
+        level++;
+        }
+
+    if((sn = (SkipNode *) malloc(_SKIP_SIZE(level))) != NULL)
+        sn->level = level;
+
+    return(sn);
+    }
+
+
+/*
+ * _skipFind : Finds the first tower whose record is not less than match.
  *
- * Status   : Public
+ * Status   : Private
  *
- * Arguments: list          -- Pointer to type List
+ * Arguments: list   -- Pointer to type List
+ *            match  -- Pointer to an Info structure to match
+ *            update -- Returns the last tower before it at each level
+ *            rank   -- Returns the index of each tower in update
  *
- * Returns  : DLL_NORMAL    -- Record found
- *            DLL_NULL_LIST -- Empty list
- *            DLL_NOT_FOUND -- Record not found
+ * Return   : Pointer to the tower or NULL if every record is less
  */
-DLL_Return DLL_IncrementCurrentPointer(List *list)
+SkipNode *_skipFind(List *list, Info *match, SkipNode **update,
+ unsigned long *rank)
     {
-    if(list->current == NULL)
-        return(DLL_NULL_LIST);
+    SkipNode *x = list->skiphead;
+    unsigned long traversed = 0L;
+    int i;
 
-    if(list->current->next == NULL)
-        return(DLL_NOT_FOUND);
+    for(i = list->skiplevel - 1; i >= 0; i--)
+        {
+        while(x->link[i].next != NULL
+            && (*list->skipfun)(x->link[i].next->node->info, match) < 0)
+            {
+            traversed += x->link[i].span;
+            x = x->link[i].next;
+            }
 
-    list->current = list->current->next;
-    list->current_index++;
-    return(DLL_NORMAL);
+        update[i] = x;
+        rank[i] = traversed;
+        }
+
+    return(x->link[0].next);
     }
 
 
 /*
- * DLL_DecrementCurrentPointer() : Moves the current pointer to last position.
+ * _skipLink : Links the tower for node into the skip list in order. The
+ *             node goes before any records equal to it, the same as
+ *             DLL_AddRecord() does, and list->current_index is set to its
+ *             index.
  *
- * Status   : Public
+ * Status   : Private
  *
- * Arguments: list          -- Pointer to type List
+ * Arguments: list -- Pointer to type List
+ *            sn   -- Pointer to the tower
+ *            node -- Pointer to the node the tower is for
  *
- * Returns  : DLL_NORMAL    -- Record found
- *            DLL_NULL_LIST -- Empty list
- *            DLL_NOT_FOUND -- Record not found
+ * Return   : Pointer to the node it goes after or NULL for a new head
  */
-DLL_Return DLL_DecrementCurrentPointer(List *list)
+Node *_skipLink(List *list, SkipNode *sn, Node *node)
     {
-    if(list->current == NULL)
-        return(DLL_NULL_LIST);
+    SkipNode *update[_SKIP_MAXLEVEL];
+    unsigned long rank[_SKIP_MAXLEVEL];
+    int i;
 
-    if(list->current->prior == NULL)
-        return(DLL_NOT_FOUND);
+    _skipFind(list, node->info, update, rank);
 
-    list->current = list->current->prior;
-    list->current_index--;
-    return(DLL_NORMAL);
+    for(i = list->skiplevel; i < sn->level; i++)
+        {
+        rank[i] = 0L;
+        update[i] = list->skiphead;
+        update[i]->link[i].span = list->listsize;
+        }
+
+    if(sn->level > list->skiplevel)
+        list->skiplevel = sn->level;
+
+    sn->node = node;
+
+    for(i = 0; i < sn->level; i++)
+        {
+        sn->link[i].next = update[i]->link[i].next;
+        update[i]->link[i].next = sn;
+        sn->link[i].span = update[i]->link[i].span - (rank[0] - rank[i]);
+        update[i]->link[i].span = (rank[0] - rank[i]) + 1;
+        }
+
+    for(; i < list->skiplevel; i++)
+        update[i]->link[i].span++;
+
+    list->current_index = rank[0] + 1;
+    return((update[0] == list->skiphead) ? NULL : update[0]->node);
     }
 
 
 /*
- * DLL_StoreCurrentPointer() : Saves the current pointer.
+ * _skipUnlink : Unlinks the tower of the record at index from the skip
+ *               list.
  *
- * Status   : Public
+ * Status   : Private
  *
- * Arguments: list          -- Pointer to type List
+ * Arguments: list  -- Pointer to type List
+ *            index -- Index of the record from the head starting at one
  *
- * Returns  : DLL_NORMAL    -- Record found
- *            DLL_NOT_FOUND -- Record not found
+ * Return   : Pointer to the tower, it is not freed
  */
-DLL_Return DLL_StoreCurrentPointer(List *list)
+SkipNode *_skipUnlink(List *list, unsigned long index)
     {
-    if(list->current == NULL)
-        return(DLL_NOT_FOUND);
+    SkipNode *update[_SKIP_MAXLEVEL], *x = list->skiphead, *sn;
+    unsigned long traversed = 0L;
+    int i;
 
-    list->saved = list->current;
-    list->save_index = list->current_index;
-    return(DLL_NORMAL);
+    for(i = list->skiplevel - 1; i >= 0; i--)
+        {
+        while(x->link[i].next != NULL && traversed + x->link[i].span < index)
+            {
+            traversed += x->link[i].span;
+            x = x->link[i].next;
+            }
+
+        update[i] = x;
+        }
+
+    sn = x->link[0].next;
+
+    for(i = 0; i < list->skiplevel; i++)
+        {
+        if(update[i]->link[i].next == sn)
+            {
+            update[i]->link[i].span += sn->link[i].span - 1;
+            update[i]->link[i].next = sn->link[i].next;
+            }
+        else
+            update[i]->link[i].span--;
+        }
+
+    while(list->skiplevel > 1
+        && list->skiphead->link[list->skiplevel - 1].next == NULL)
+        list->skiplevel--;
+
+    return(sn);
     }
 
 
 /*
- * DLL_RestoreCurrentPointer() : Loads the previously saved current pointer.
+ * _skipClear : Frees every tower in the skip list leaving it empty.
  *
- * Status   : Public
+ * Status   : Private
  *
- * Arguments: list          -- Pointer to type List
+ * Arguments: list -- Pointer to type List
  *
- * Returns  : DLL_NORMAL    -- Record found
- *            DLL_NOT_FOUND -- Record not found
+ * Return   : void
  */
-DLL_Return DLL_RestoreCurrentPointer(List *list)
+void _skipClear(List *list)
     {
-    if(list->saved == NULL)
-        return(DLL_NOT_FOUND);
+    SkipNode *sn, *next;
+    int i;
 
-    list->current = list->saved;
-    list->saved = NULL;
-    list->current_index = list->save_index;
-    return(DLL_NORMAL);
-    }
+    for(sn = list->skiphead->link[0].next; sn != NULL; sn = next)
+        {
+        next = sn->link[0].next;
+        free(sn);
+        }
+
+    for(i = 0; i < _SKIP_MAXLEVEL; i++)
+        {
+        list->skiphead->link[i].next = NULL;
+        list->skiphead->link[i].span = 0L;
+        }
 
+    list->skiplevel = 1;
+    }
 
-/***********************
- * List Update Functions
- */
 
 /*
- * DLL_AddRecord() : Creates a new node in list with or without sorting.
+ * _skipAddRecord : Adds a record in skip list order.
  *
- * Status   : Public
+ * Status   : Private
  *
  * Arguments: list          -- Pointer to type List
  *            info          -- Pointer to record to add
- *            pFun          -- Pointer to search function
  *
- * Returns  : DLL_NORMAL    -- Node was added successfully
+ * Return   : DLL_NORMAL    -- Node was added successfully
  *            DLL_MEM_ERROR -- Memory allocation failed
  */
-DLL_Return DLL_AddRecord(List *list, Info *info, int (*pFun)(Info *, Info *))
+DLL_Return _skipAddRecord(List *list, Info *info)
     {
-    Node *newN = NULL, *old, *step;
+    SkipNode *sn;
+    Node *newN = NULL;
     Info *newI = NULL;
     DLL_Return exitCode;
 
-    if((exitCode = _createNewRecord(list, info, &newN, &newI)) != DLL_CONTINUE)
-        return(exitCode);
-
-    if(pFun != NULL) /* If NULL don't do sort */
-        {
-        step = list->head;
-        old = list->tail;
-        list->current_index = 1L;
+    if((sn = _newSkipNode(list)) == NULL)
+        return(DLL_MEM_ERROR);
 
-        while(step != NULL) /* Loop through records until a match is found. */
-            {
-            if(((*pFun)(step->info, newI)) >= 0)
-                break;
+    exitCode = _createNewRecord(list, info, &newN, &newI);
 
-            list->current_index++;
-            old = step;
-            step = (Node *) step->next;
-            }
-        }
-    else
+    if(exitCode == DLL_MEM_ERROR)
         {
-        /* Will always be last record. */
-        step = NULL;
-        old = list->tail;
-        list->current_index = list->listsize + 1;
+        free(sn);
+        return(exitCode);
         }
 
-    /*
-     * The order of the 'if' statements below is critical and
-     * cannot be changed or a no sort (NULL) situation will fail.
-     */
-    if(step == NULL) /* New last record */
-        {
-        /*printf("New last record.\n");*/
-        newN->info = newI;
-        old->next = newN;
-        newN->next = NULL;
-        newN->prior = old;
-        list->tail = newN;
-        list->current = newN;
-        }
-    else if(step->prior == NULL) /* New first record */
-        {
-        /*printf("New first record.\n");*/
-        newN->info = newI;
-        newN->prior = NULL;
-        newN->next = step;
-        step->prior = newN;
-        list->head = newN;
-        list->current = newN;
-        }
-    else /* New middle record */
+    if(exitCode == DLL_NORMAL) /* First record is already linked. */
         {
-        /*printf("New middle record.\n");*/
-        newN->info = newI;
-        step->prior->next = newN;
-        newN->next = step;
-        newN->prior = step->prior;
-        step->prior = newN;
-        list->current = newN;
+        _skipLink(list, sn, newN);
+        return(DLL_NORMAL);
         }
 
+    _positionsChanged(list);
+    _linkNode(list, newN, _skipLink(list, sn, newN));
+    list->current = newN;
     list->listsize++;
     list->modified = DLL_TRUE;
     return(DLL_NORMAL);
@@ -515,735 +5804,1114 @@ DLL_Return DLL_AddRecord(List *list, Info *info, int (*pFun)(Info *, Info *))
 
 
 /*
- * DLL_InsertRecord() : Creates a new node in list above or below current
- *                      record. The new record will be current after completion.
+ * _skipFindRecord : Finds the first record not less than match, or equal to
+ *                   it if exact is DLL_TRUE, with the skip list and moves the
+ *                   cursor to it.
  *
- * Status   : Public
+ * Status   : Private
  *
- * Arguments: list             -- Pointer to type List
- *            info             -- Record to add
- *            dir              -- Direction to insert, can be DLL_ABOVE
- *                                (toward head) or DLL_BELOW (toward tail)
+ * Arguments: cursor        -- Pointer to type Cursor
+ *            record        -- Pointer to an Info structure
+ *            match         -- Pointer to an Info structure to match
+ *            exact         -- DLL_TRUE if the record must be equal
  *
- * Returns  : DLL_NORMAL       -- Node was added successfully
- *            DLL_MEM_ERROR    -- Memory allocation failed
- *            DLL_NOT_MODIFIED -- Insert direction is invalid (not DLL_ABOVE
- *                                or DLL_BELOW)
+ * Return   : DLL_NORMAL    -- Record found
+ *            DLL_NULL_LIST -- List is empty
+ *            DLL_NOT_FOUND -- Record not found
  */
-DLL_Return DLL_InsertRecord(List *list, Info *info, DLL_InsertDir dir)
+DLL_Return _skipFindRecord(Cursor *cursor, Info *record, Info *match,
+ DLL_Boolean exact)
     {
-    Node *newN = NULL;
-    Info *newI = NULL;
-    DLL_Return retval;
+    List *list = cursor->list;
+    SkipNode *update[_SKIP_MAXLEVEL], *sn;
+    unsigned long rank[_SKIP_MAXLEVEL];
 
-    if((retval = _createNewRecord(list, info, &newN, &newI)) != DLL_CONTINUE)
-        return retval;
+    if(list->head == NULL)
+        return(DLL_NULL_LIST);
 
-    /* Decide what to do according to dir */
-    switch(dir)
-        {
-        case DLL_ABOVE:
-            newN->info = newI;
-            newN->next = list->current;
-            newN->prior = list->current->prior;
+    sn = _skipFind(list, match, update, rank);
+
+    if(sn == NULL
+        || (exact == DLL_TRUE && (*list->skipfun)(sn->node->info, match) != 0))
+        return(DLL_NOT_FOUND);
 
-            /* If current is not at head */
-            if(list->current->prior)
-                list->current->prior->next = newN;
+    memcpy(record, sn->node->info, list->infosize);
+    cursor->current = sn->node;
+    cursor->current_index = rank[0] + 1;
+    return(DLL_NORMAL);
+    }
 
-            list->current->prior = newN;
 
-            /* If none above new one, set head */
-            if(newN->prior == NULL)
-                list->head = newN;
+/*
+ * _currentIndex : Works out the index of the current record if it is not
+ *                 known. DLL_FindByKey() leaves it at zero.
+ *
+ * Status   : Private
+ *
+ * Arguments: list -- Pointer to type List
+ *
+ * Return   : The index of the current record
+ */
+unsigned long _currentIndex(List *list)
+    {
+    Node *step;
 
-            list->current = newN;
-            break;
-        case DLL_BELOW:
-            newN->info = newI;
-            newN->next = list->current->next;
-            newN->prior = list->current;
+    if(list->current_index == 0L && list->current != NULL)
+        {
+        if(list->current == list->tail)
+            list->current_index = list->listsize;
+        else
+            for(step = list->current; step != NULL; step = step->prior)
+                list->current_index++;
+        }
 
-            /* If current is not at tail */
-            if(list->current->next)
-                list->current->next->prior = newN;
+    return(list->current_index);
+    }
 
-            list->current->next = newN;
 
-            /* If none below new one, set tail */
-            if(newN->next == NULL)
-                list->tail = newN;
+/*
+ * _positionsChanged : Called when records may have moved to new indexes.
+ *                     The indexes of the current and stored records and of
+ *                     every cursor are worked out again when they are next
+ *                     needed and the checkpoint table is rebuilt when it is
+ *                     next used. A caller that knows the new index of its
+ *                     record sets it afterwards.
+ *
+ * Status   : Private
+ *
+ * Arguments: list -- Pointer to type List
+ *
+ * Return   : void
+ */
+void _positionsChanged(List *list)
+    {
+    Cursor *cursor;
 
-            list->current = newN;
-            list->current_index++;
-            break;
-        default:
-            free(newI);
-            free(newN);
-            return(DLL_NOT_MODIFIED);
-            break;
-        }
+    list->current_index = 0L;
+    list->save_index = 0L;
+    list->checkcount = 0L;
 
-    list->listsize++;
-    list->modified = DLL_TRUE;
-    return(DLL_NORMAL);
+    for(cursor = list->cursors; cursor != NULL; cursor = cursor->next)
+        cursor->current_index = 0L;
     }
 
 
 /*
- * DLL_SwapRecord() : Swaps current record up or down one place in the
- *                    list. The swapped record will still be current
- *                    after completion.
+ * _seekIndex : Finds the node at an index walking from whichever of the
+ *              head, tail, cursor, current, saved node or checkpoint is
+ *              nearest. The checkpoint table is used only if it is built.
  *
- * Status   : Public
+ * Status   : Private
  *
- * Arguments: list             -- Pointer to type List
- *            dir              --  Direction to swap, can be DLL_ABOVE
- *                                 (toward head) or DLL_BELOW (toward tail)
+ * Arguments: cursor -- Pointer to type Cursor
+ *            index  -- Index of the node, from one to list->listsize
  *
- * Returns  : DLL_NORMAL       -- Node was swapped successfully
- *            DLL_NULL_LIST    -- list->current is NULL
- *            DLL_NOT_MODIFIED -- Swap direction not DLL_ABOVE or DLL_BELOW
- *            DLL_NOT_FOUND    -- Current record is already at end of
- *                                list indicated by dir.
+ * Return   : Pointer to the Node
  */
-DLL_Return DLL_SwapRecord(List *list, DLL_InsertDir dir)
+Node *_seekIndex(Cursor *cursor, unsigned long index)
     {
-    Node *swap, *newPrior, *newNext;
-
-    /* If current is NULL, can't swap it */
-    if(list->current == NULL)
-        return(DLL_NULL_LIST);
+    List *list = cursor->list;
+    Node *step = list->head;
+    unsigned long at = 1L, j;
 
-    /* Decide what to do according to dir */
-    switch(dir)
+    if(list->listsize - index < index - at)
         {
-        case DLL_ABOVE:
-            swap = list->current;
-
-            /* current is at head */
-            if(swap->prior == NULL)
-                return(DLL_NOT_FOUND);
+        step = list->tail;
+        at = list->listsize;
+        }
 
-            /* Save current new prior and new next */
-            newPrior = swap->prior->prior;
-            newNext = swap->prior;
+    if(cursor->current_index != 0L
+        && _DISTANCE(cursor->current_index, index) < _DISTANCE(at, index))
+        {
+        step = cursor->current;
+        at = cursor->current_index;
+        }
 
-            /* If prior node is not at head */
-            if(newPrior != NULL)
-                newPrior->next = swap;
+    if(list->current_index != 0L
+        && _DISTANCE(list->current_index, index) < _DISTANCE(at, index))
+        {
+        step = list->current;
+        at = list->current_index;
+        }
 
-            /* Set up old next record's prior node */
-            if(swap->next != NULL)
-                swap->next->prior = newNext;
+    if(list->saved != NULL && list->save_index != 0L
+        && _DISTANCE(list->save_index, index) < _DISTANCE(at, index))
+        {
+        step = list->saved;
+        at = list->save_index;
+        }
 
-            /* Set up new next record's next & prior nodes */
-            newNext->next = swap->next;
-            newNext->prior = swap;
+    if(list->checkcount != 0L)
+        {
+        j = (index - 1) / list->checkstep;
 
-            /* Set the current record's new next & prior node */
-            swap->prior = newPrior;
-            swap->next = newNext;
+        /* The nearer of the checkpoints either side of the index. */
+        if(j + 1 < list->checkcount
+            && (index - 1) % list->checkstep > list->checkstep / 2)
+            j++;
+        else if(j >= list->checkcount)
+            j = list->checkcount - 1;
 
-            /* If current is now at head, set list head */
-            if(newPrior == NULL)
-                list->head = swap;
+        if(_DISTANCE(j * list->checkstep + 1, index) < _DISTANCE(at, index))
+            {
+            step = list->checkpoints[j];
+            at = j * list->checkstep + 1;
+            }
+        }
 
-            /* If current used to be at tail, set list tail */
-            if(newNext->next == NULL)
-                list->tail = newNext;
+    for(; at < index; at++)
+        step = step->next;
 
-            list->current_index--;
-            break;
-        case DLL_BELOW:
-            swap = list->current;
+    for(; at > index; at--)
+        step = step->prior;
 
-            /* current is at tail */
-            if(swap->next == NULL)
-                return(DLL_NOT_FOUND);
+    return(step);
+    }
 
-            /* Save current new prior and new next */
-            newPrior = swap->next;
-            newNext = swap->next->next;
 
-            /* If next node is not at tail */
-            if(newNext != NULL)
-                newNext->prior = swap;
+/*
+ * _buildCheckpoints : Fills the checkpoint table with every checkstep'th
+ *                     node starting with the head.
+ *
+ * Status   : Private
+ *
+ * Arguments: list          -- Pointer to type List
+ *
+ * Return   : DLL_NORMAL    -- Table was built
+ *            DLL_MEM_ERROR -- Memory allocation failed
+ */
+DLL_Return _buildCheckpoints(List *list)
+    {
+    unsigned long count = (list->listsize + list->checkstep - 1)
+        / list->checkstep, n;
+    Node **table, *step;
 
-            /* Set up old prior record's next node */
-            if(swap->prior != NULL)
-                swap->prior->next = newPrior;
+    if((table = (Node **) realloc(list->checkpoints,
+        (count ? count : 1) * sizeof(Node *))) == NULL)
+        return(DLL_MEM_ERROR);
 
-            /* Set up new prior record's next & prior nodes */
-            newPrior->next = swap;
-            newPrior->prior = swap->prior;
+    list->checkpoints = table;
 
-            /* Set the current record's new next & prior node */
-            swap->prior = newPrior;
-            swap->next = newNext;
+    for(n = 0L, step = list->head; step != NULL; step = step->next, n++)
+        if(n % list->checkstep == 0L)
+            table[n / list->checkstep] = step;
 
-            /* If current is now at tail, set list tail */
-            if(newNext == NULL)
-                list->tail = swap;
+    list->checkcount = count;
+    return(count ? DLL_NORMAL : DLL_NOT_FOUND);
+    }
 
-            /* If current used to be at head, set list head */
-            if(newPrior->prior == NULL)
-                list->head = newPrior;
 
-            list->current_index++;
-            break;
-        default:
-            return(DLL_NOT_MODIFIED);
-            break;
+/*
+ * _cursorIndex : Works out the index of the cursor's record if it is not
+ *                known.
+ *
+ * Status   : Private
+ *
+ * Arguments: cursor -- Pointer to type Cursor
+ *
+ * Return   : The index of the cursor's record
+ */
+unsigned long _cursorIndex(Cursor *cursor)
+    {
+    Node *step;
+
+    if(cursor->current_index == 0L && cursor->current != NULL)
+        {
+        if(cursor->current == cursor->list->tail)
+            cursor->current_index = cursor->list->listsize;
+        else
+            for(step = cursor->current; step != NULL; step = step->prior)
+                cursor->current_index++;
         }
 
-    list->modified = DLL_TRUE;
-    return(DLL_NORMAL);
+    return(cursor->current_index);
     }
 
 
 /*
- * DLL_UpdateCurrentRecord() : Updates current record
+ * _getListCursor : Loads a cursor with the current record and search modes
+ *                  of the list so the list functions can share the code
+ *                  used by the cursor functions.
  *
- * Status   : Public
+ * Status   : Private
  *
- * Arguments: list          -- Pointer to type List
- *            record        -- Pointer to an Info structure in list
+ * Arguments: list   -- Pointer to type List
+ *            cursor -- Pointer to the Cursor to load
  *
- * Returns  : DLL_NORMAL    -- Record updated
- *            DLL_NULL_LIST -- Empty list
+ * Return   : void
  */
-DLL_Return DLL_UpdateCurrentRecord(List *list, Info *record)
+void _getListCursor(List *list, Cursor *cursor)
     {
-    if(list->current == NULL)
-        return(DLL_NULL_LIST);
+    cursor->list = list;
+    cursor->current = list->current;
+    cursor->current_index = list->current_index;
+    cursor->search_origin = list->search_origin;
+    cursor->search_dir = list->search_dir;
+    cursor->next = NULL;
+    }
 
-    memcpy(list->current->info, record, list->infosize);
-    return(DLL_NORMAL);
+
+/*
+ * _putListCursor : Stores a cursor loaded by _getListCursor() back into the
+ *                  list.
+ *
+ * Status   : Private
+ *
+ * Arguments: list   -- Pointer to type List
+ *            cursor -- Pointer to the Cursor to store
+ *
+ * Return   : void
+ */
+void _putListCursor(List *list, Cursor *cursor)
+    {
+    list->current = cursor->current;
+    list->current_index = cursor->current_index;
+    list->search_origin = cursor->search_origin;
+    list->search_dir = cursor->search_dir;
     }
 
 
 /*
- * DLL_DeleteCurrentRecord() : Delete a record from the list. This removes the
- *                             Node and Info objects.
+ * _getPositionCursor : Loads a cursor, which is not added to the list, from
+ *                      a position and search modes for the query functions.
  *
- * Status   : Public
+ * Status   : Private
  *
- * Arguments: list          -- Pointer to type List
+ * Arguments: list             -- Pointer to type List
+ *            cursor           -- Pointer to the Cursor to load
+ *            origin           -- Search origin
+ *            dir              -- Search direction
+ *            position         -- Pointer to type DLL_Position
  *
- * Returns  : DLL_NORMAL    -- Record deleted
- *            DLL_NULL_LIST -- List is empty
+ * Return   : DLL_NORMAL       -- Cursor loaded
+ *            DLL_NOT_MODIFIED -- Invalid origin or direction
  */
-DLL_Return DLL_DeleteCurrentRecord(List *list)
+DLL_Return _getPositionCursor(List *list, Cursor *cursor,
+ DLL_SrchOrigin origin, DLL_SrchDir dir, DLL_Position *position)
     {
-    Info *oldI;
-    Node *oldN;
+    cursor->list = list;
+    cursor->current = position->node;
+    cursor->current_index = (position->node != NULL) ? position->index : 0L;
+    cursor->search_origin = DLL_HEAD;
+    cursor->search_dir = DLL_DOWN;
+    cursor->next = NULL;
+    return(DLL_CursorSetSearchModes(cursor, origin, dir));
+    }
 
-    if(list->current == NULL)
-        return(DLL_NULL_LIST);
 
-    oldI = list->current->info;
-    oldN = list->current;
+/*
+ * _putPositionCursor : Stores the record of a cursor loaded by
+ *                      _getPositionCursor() back into the position.
+ *
+ * Status   : Private
+ *
+ * Arguments: cursor   -- Pointer to the Cursor to store
+ *            position -- Pointer to type DLL_Position
+ *
+ * Return   : void
+ */
+void _putPositionCursor(Cursor *cursor, DLL_Position *position)
+    {
+    position->node = cursor->current;
+    position->index = cursor->current_index;
+    }
+
+
+/*
+ * _insertRecord : Inserts a record relative to the cursor's record and
+ *                 moves the cursor to it.
+ *
+ * Status   : Private
+ *
+ * Arguments: cursor           -- Pointer to type Cursor
+ *            info             -- Record to add
+ *            dir              -- Direction to insert, can be DLL_ABOVE
+ *                                (toward head) or DLL_BELOW (toward tail)
+ *
+ * Return   : DLL_NORMAL       -- Node was added successfully
+ *            DLL_MEM_ERROR    -- Memory allocation failed
+ *            DLL_NULL_LIST    -- Cursor is not on a record
+ *            DLL_NOT_MODIFIED -- Insert direction is invalid or the list
+ *                                has a skip list
+ */
+DLL_Return _insertRecord(Cursor *cursor, Info *info, DLL_InsertDir dir)
+    {
+    List *list = cursor->list;
+    Node *newN = NULL, *at = cursor->current;
+    Info *newI = NULL;
+    unsigned long index;
+    DLL_Return retval;
+
+    if(list->skipfun != NULL) /* Would break the skip list order. */
+        return(DLL_NOT_MODIFIED);
 
-    if(list->current == list->head) /* current is first record */
+    if(list->head != NULL)
         {
-        /* A single record in a list can't do this ...next->prior */
-        if(list->current->next != NULL)
-            list->current->next->prior = NULL;
+        if(at == NULL)
+            return(DLL_NULL_LIST);
 
-        list->head = list->current->next;
-        list->current = list->head;
+        if(dir != DLL_ABOVE && dir != DLL_BELOW)
+            return(DLL_NOT_MODIFIED);
         }
-    else
-        if(list->current == list->tail) /* current is last record */
-            {
-            list->current->prior->next = NULL;
-            list->tail = list->current->prior;
-            list->current = list->tail;
-            list->current_index--;
-            }
-        else /* current is a middle record */
+
+    /* Above, the new record takes the index of the cursor's record. */
+    index = (dir == DLL_BELOW) ? _cursorIndex(cursor) + 1
+        : cursor->current_index;
+
+    if((retval = _createNewRecord(list, info, &newN, &newI)) != DLL_CONTINUE)
+        {
+        if(retval == DLL_NORMAL) /* First record in the list. */
             {
-            list->current->prior->next = list->current->next;
-            list->current->next->prior = list->current->prior;
-            list->current = list->current->next;
+            cursor->current = newN;
+            cursor->current_index = 1L;
+            retval = _journalOp(list, _JOURNAL_INSERT, 1L, 1L, (char *) newI);
             }
 
-    free(oldI);
-    free(oldN);
-    list->listsize--;
+        return(retval);
+        }
+
+    _positionsChanged(list);
+    _linkNode(list, newN, (dir == DLL_ABOVE) ? at->prior : at);
+    cursor->current = newN;
+    cursor->current_index = index;
+    list->listsize++;
     list->modified = DLL_TRUE;
+
+    if(list->journal != NULL)
+        return(_journalOp(list, _JOURNAL_INSERT, _cursorIndex(cursor), 1L,
+            (char *) newI));
+
     return(DLL_NORMAL);
     }
 
 
 /*
- * DLL_DeleteEntireList() : Deletes all the Node structures from the list then
- *                          reinitializes the control List structure for
- *                          continued use.
+ * _deleteRecord : Deletes the cursor's record. The cursor, and the current
+ *                 record or any other cursor on it, move to the next record
+ *                 or to the prior one if it was the tail.
  *
- * Status   : Public
+ * Status   : Private
  *
- * Arguments: list          -- Pointer to type List
+ * Arguments: cursor        -- Pointer to type Cursor
  *
- * Returns  : DLL_NORMAL    -- List deleted
- *            DLL_NULL_LIST -- List is empty
+ * Return   : DLL_NORMAL    -- Record deleted
+ *            DLL_NULL_LIST -- Cursor is not on a record
  */
-DLL_Return DLL_DeleteEntireList(List *list)
+DLL_Return _deleteRecord(Cursor *cursor)
     {
-    Info *oldI;
-    Node *oldN;
+    List *list = cursor->list;
+    Node *oldN = cursor->current, *next;
+    Cursor *step;
+    unsigned long index, deleted = 0L;
 
-    if(list->head == NULL)
+    if(oldN == NULL)
         return(DLL_NULL_LIST);
 
-    do
-        {
-        oldI = list->head->info;
-        oldN = list->head;
-        list->head = list->head->next;
-        free(oldI);
-        free(oldN);
-        }
-    while(list->head != NULL);
+    if(list->journal != NULL)
+        deleted = _cursorIndex(cursor);
 
-    _initializeList(list, 0L);
-    return(DLL_NORMAL);
-    }
+    if(list->skipfun != NULL)
+        free(_skipUnlink(list, _cursorIndex(cursor)));
 
+    if(list->hashlength != 0)
+        _hashRemove(list, oldN);
+
+    next = (oldN->next != NULL) ? oldN->next : oldN->prior;
+    index = (oldN->next != NULL) ? cursor->current_index : list->listsize - 1;
+
+    if(list->saved == oldN)
+        list->saved = NULL;
+
+    if(list->current == oldN)
+        list->current = next;
+
+    _positionsChanged(list);
+
+    for(step = list->cursors; step != NULL; step = step->next)
+        if(step->current == oldN)
+            step->current = next;
+
+    if(oldN->prior != NULL)
+        oldN->prior->next = oldN->next;
+    else
+        list->head = oldN->next;
+
+    if(oldN->next != NULL)
+        oldN->next->prior = oldN->prior;
+    else
+        list->tail = oldN->prior;
+
+    cursor->current = next;
+    cursor->current_index = index;
+    _freeNode(list, oldN);
+    list->listsize--;
+    list->modified = DLL_TRUE;
+    return(_journalOp(list, _JOURNAL_DELETE, deleted, 0L, NULL));
+    }
 
-/********************************
- * Search and Retrieval Functions
- */
 
 /*
- * DLL_FindRecord() : Find a record in list with search criteria.
+ * _findRecord : Finds a record with search criteria starting from the
+ *               cursor's search origin and moves the cursor to it.
  *
- * Status   : Public
+ * Status   : Private
  *
- * Arguments: list              -- Pointer to type List
- *            record            -- Pointer to an Info structure in list
- *            match             -- Pointer to an Info structure to match to
- *                                 Node in list
+ * Arguments: cursor            -- Pointer to type Cursor
+ *            record            -- Pointer to an Info structure
+ *            match             -- Pointer to an Info structure to match
  *            pFun              -- Pointer to search function
  *
- * Returns  : DLL_NORMAL        -- Record found
+ * Return   : DLL_NORMAL        -- Record found
  *            DLL_NULL_LIST     -- Empty list
  *            DLL_NOT_FOUND     -- Record not found
  *            DLL_NULL_FUNCTION -- pFun is NULL
  */
-DLL_Return DLL_FindRecord(List *list, Info *record, Info *match,
+DLL_Return _findRecord(Cursor *cursor, Info *record, Info *match,
   int (*pFun)(Info *, Info *))
     {
-    unsigned long save;
+    List *list = cursor->list;
+    unsigned long save, count, offset;
     Node *step;
     DLL_SrchDir dir;
 
     if(pFun == NULL)
         return(DLL_NULL_FUNCTION);
 
-    save = list->current_index;
+    /* The first match from the head can be found with the skip list. */
+    if(pFun == list->skipfun && cursor->search_origin != DLL_CURRENT
+        && cursor->search_origin != DLL_TAIL)
+        {
+        cursor->search_origin = DLL_HEAD;
+        cursor->search_dir = DLL_DOWN;
+        return(_skipFindRecord(cursor, record, match, DLL_TRUE));
+        }
+
+    save = cursor->current_index;
 
-    switch(list->search_origin)
+    switch(cursor->search_origin)
         {
         case DLL_CURRENT:
-            step = list->current;
-            dir = list->search_dir;
+            _cursorIndex(cursor);
+            step = cursor->current;
+            dir = cursor->search_dir;
             break;
         case DLL_TAIL:
             step = list->tail;
-            list->search_dir = dir = DLL_UP;
-            list->current_index = list->listsize;
+            cursor->search_dir = dir = DLL_UP;
+            cursor->current_index = list->listsize;
             break;
         case DLL_HEAD:
         default:
-            list->search_origin = DLL_HEAD;
+            cursor->search_origin = DLL_HEAD;
             step = list->head;
-            list->search_dir = dir = DLL_DOWN;
-            list->current_index = 1L;
+            cursor->search_dir = dir = DLL_DOWN;
+            cursor->current_index = 1L;
         }
 
     if(step == NULL)
         return(DLL_NULL_LIST);
 
+    count = (dir == DLL_DOWN) ? list->listsize - cursor->current_index + 1
+        : cursor->current_index;
+
+    if(list->searchthreads > 1 && count >= list->searchmin)
+        {
+        if((step = _parallelFind(cursor, step, dir, count, match, pFun,
+            &offset)) == NULL)
+            {
+            cursor->current_index = save;
+            return(DLL_NOT_FOUND);
+            }
+
+        memcpy(record, step->info, list->infosize);
+        cursor->current = step;
+
+        if(dir == DLL_DOWN)
+            cursor->current_index += offset;
+        else
+            cursor->current_index -= offset;
+
+        return(DLL_NORMAL);
+        }
+
     while(step != NULL)
         {
         if(((*pFun)(step->info, match)) == 0)
             {
             memcpy(record, step->info, list->infosize);
-            list->current = step;
+            cursor->current = step;
             return(DLL_NORMAL);
             }
 
-        step = (dir == DLL_DOWN) ? (Node *) step->next : (Node *) step->prior;
-        list->current_index += (dir == DLL_DOWN) ? 1 : -1;
+        step = (dir == DLL_DOWN) ? (Node *) step->next : (Node *) step->prior;
+        cursor->current_index += (dir == DLL_DOWN) ? 1 : -1;
+        }
+
+    cursor->current_index = save;
+    return(DLL_NOT_FOUND);
+    }
+
+
+/*
+ * _parallelFind : Searches count records from start in direction dir with
+ *                 one thread for each part of the records.
+ *
+ * Note: The calling thread searches the first part after starting the
+ *       others, a part whose thread cannot be started is searched by the
+ *       calling thread too. A thread stops when a part before its own has
+ *       a match.
+ *
+ * Status   : Private
+ *
+ * Arguments: cursor -- Pointer to type Cursor, its index is that of start
+ *            start  -- Node to search from
+ *            dir    -- Direction to search
+ *            count  -- Number of records to search
+ *            match  -- Pointer to an Info structure to match
+ *            pFun   -- Pointer to search function
+ *            offset -- Returns the number of records from start to the
+ *                      match
+ *
+ * Return   : Pointer to the first matching Node in search order or NULL
+ */
+Node *_parallelFind(Cursor *cursor, Node *start, DLL_SrchDir dir,
+ unsigned long count, Info *match, int (*pFun)(Info *, Info *),
+ unsigned long *offset)
+    {
+    List *list = cursor->list;
+    SearchState state;
+    SearchPart part[_MAX_THREADS];
+    pthread_t thread[_MAX_THREADS];
+    DLL_Boolean started[_MAX_THREADS];
+    Cursor seek = *cursor;
+    Node *step, *found = NULL;
+    unsigned long j;
+    int parts, n;
+
+    parts = ((unsigned long) list->searchthreads < count)
+        ? list->searchthreads : (int) count;
+    pthread_mutex_init(&state.mutex, NULL);
+    state.best = parts;
+    state.dir = dir;
+    state.match = match;
+    state.pFun = pFun;
+    seek.current = start;
+
+    for(n = 0; n < parts; n++)
+        {
+        part[n].state = &state;
+        part[n].number = n;
+        part[n].found = NULL;
+        part[n].count = count / parts + ((unsigned long) n < count % parts);
+        started[n] = DLL_FALSE;
+
+        if(n == 0)
+            {
+            part[n].first = 0L;
+            part[n].start = start;
+            continue;
+            }
+
+        part[n].first = part[n - 1].first + part[n - 1].count;
+
+        if(list->checkcount != 0L)
+            part[n].start = _seekIndex(&seek, (dir == DLL_DOWN)
+                ? seek.current_index + part[n].first
+                : seek.current_index - part[n].first);
+        else
+            {
+            step = part[n - 1].start;
+
+            for(j = 0L; j < part[n - 1].count; j++)
+                step = (dir == DLL_DOWN) ? step->next : step->prior;
+
+            part[n].start = step;
+            }
+
+        if(pthread_create(&thread[n], NULL, _searchPart, &part[n]) == 0)
+            started[n] = DLL_TRUE;
+        }
+
+    _searchPart(&part[0]);
+
+    for(n = 1; n < parts; n++)
+        {
+        if(started[n] == DLL_TRUE)
+            pthread_join(thread[n], NULL);
+        else
+            _searchPart(&part[n]);
+        }
+
+    for(n = 0; n < parts && found == NULL; n++)
+        if(part[n].found != NULL)
+            {
+            found = part[n].found;
+            *offset = part[n].first + part[n].offset;
+            }
+
+    pthread_mutex_destroy(&state.mutex);
+    return(found);
+    }
+
+
+/*
+ * _searchPart : Searches one part of a parallel search, it is the start
+ *               routine of the search threads.
+ *
+ * Status   : Private
+ *
+ * Arguments: arg -- Pointer to type SearchPart
+ *
+ * Return   : NULL
+ */
+void *_searchPart(void *arg)
+    {
+    SearchPart *part = (SearchPart *) arg;
+    SearchState *state = part->state;
+    Node *step = part->start;
+    unsigned long n;
+    int best;
+
+    for(n = 0L; n < part->count; n++)
+        {
+        /* Give up once a part before this one has a match. */
+        if(n % _SEARCH_POLL == 0L)
+            {
+            pthread_mutex_lock(&state->mutex);
+            best = state->best;
+            pthread_mutex_unlock(&state->mutex);
+
+            if(best < part->number)
+                break;
+            }
+
+        if(((*state->pFun)(step->info, state->match)) == 0)
+            {
+            part->found = step;
+            part->offset = n;
+            pthread_mutex_lock(&state->mutex);
+
+            if(part->number < state->best)
+                state->best = part->number;
+
+            pthread_mutex_unlock(&state->mutex);
+            break;
+            }
+
+        step = (state->dir == DLL_DOWN) ? step->next : step->prior;
         }
 
-    list->current_index = save;
-    return(DLL_NOT_FOUND);
+    return(NULL);
     }
 
 
 /*
- * DLL_FindNthRecord() : Returns the Nth record in the list based on the
- *                       setting of list->search_origin and list->search_dir.
- *
- * Note: The Nth record is found based on the ordinal numbering system, in
- *       other words if the current record is 1 then a skip value of 5 would
- *       return the 6th not the 5th record.
+ * _parallelSort : Sorts the list with one thread for each run of records,
+ *                 then merges neighbouring runs in pairs until one is left.
  *
- * Status   : Public
+ * Status   : Private
  *
- * Arguments: list          -- Pointer to type List
- *            record        -- Record to hold return data
- *            skip          -- Number of records to skip
- *                             (Always a positive number)
+ * Arguments: list     -- Pointer to type List
+ *            pFun     -- Pointer to sort function
+ *            threads  -- Number of threads to use
+ *            compares -- Has the number of calls made to pFun added to it
  *
- * Returns  : DLL_NORMAL    -- Node was found successfully
- *            DLL_NULL_LIST -- list->current is NULL
- *            DLL_NOT_FOUND -- Skip value is too large, too small or wrong dir
- *                             value (current index remains unchanged)
+ * Return   : The first Node of the sorted chain, only the next pointers are
+ *            set
  */
-DLL_Return DLL_FindNthRecord(List *list, Info *record, unsigned long skip)
+Node *_parallelSort(List *list, int (*pFun)(Info *, Info *), int threads,
+ unsigned long *compares)
     {
-    unsigned long save;
+    SortRun run[_MAX_THREADS];
+    Cursor seek;
     Node *step;
-    DLL_SrchDir dir;
-    register int nCnt;
+    unsigned long size, j;
+    int runs, n;
 
-    save = list->current_index;
+    runs = ((unsigned long) threads < list->listsize)
+        ? threads : (int) list->listsize;
+    size = list->listsize / runs;
+    _getListCursor(list, &seek);
+    run[0].head = list->head;
 
-    switch(list->search_origin)
+    /* Find where each run starts before any of the chain is cut. */
+    for(n = 1; n < runs; n++)
         {
-        case DLL_CURRENT:
-            step = list->current;
-            dir = list->search_dir;
-            break;
-        case DLL_TAIL:
-            step = list->tail;
-            list->search_dir = dir = DLL_UP;
-            list->current_index = list->listsize;
-            break;
-        case DLL_HEAD:
-        default:
-            list->search_origin = DLL_HEAD;
-            step = list->head;
-            list->search_dir = dir = DLL_DOWN;
-            list->current_index = 1L;
-        }
+        if(list->checkcount != 0L)
+            run[n].head = _seekIndex(&seek, n * size + 1);
+        else
+            {
+            for(step = run[n - 1].head, j = 0L; j < size; j++)
+                step = step->next;
 
-    if(step == NULL)
-        return(DLL_NULL_LIST);
+            run[n].head = step;
+            }
+        }
 
-    if(skip <= 0 || ((dir == DLL_DOWN)
-        ? (list->listsize < (list->current_index + skip))
-        : (list->current_index <= skip)))
+    for(n = 0; n < runs; n++)
         {
-        list->current_index = save;
-        return(DLL_NOT_FOUND);
+        if(n > 0)
+            run[n].head->prior->next = NULL;
+
+        run[n].other = NULL;
+        run[n].merge = DLL_FALSE;
+        run[n].pFun = pFun;
+        run[n].compares = 0L;
         }
 
-    switch(dir)
+    _runSortRuns(run, runs);
+
+    for(n = 0; n < runs; n++)
+        *compares += run[n].compares;
+
+    while(runs > 1)
         {
-        case DLL_DOWN:
-            for(nCnt = 0; nCnt < skip && step->next != NULL; nCnt++)
-                step = step->next;
+        for(n = 0; n < runs; n += 2)
+            {
+            run[n / 2].head = run[n].head;
+            run[n / 2].other = (n + 1 < runs) ? run[n + 1].head : NULL;
+            run[n / 2].merge = DLL_TRUE;
+            run[n / 2].compares = 0L;
+            }
 
-            break;
-        case DLL_UP:
-            for(nCnt = 0; nCnt < skip && step->prior != NULL; nCnt++)
-                step = step->prior;
+        runs = (runs + 1) / 2;
+        _runSortRuns(run, runs);
 
-            break;
-        default:
-            return(DLL_NOT_FOUND);
+        for(n = 0; n < runs; n++)
+            *compares += run[n].compares;
         }
 
-    memcpy(record, step->info, list->infosize);
-    list->current = step;
-    list->current_index += (dir == DLL_DOWN) ? (1 * skip) : (-1 * skip);
-    return(DLL_NORMAL);
+    return(run[0].head);
     }
 
 
 /*
- * DLL_GetCurrentRecord() : Get the current record.
+ * _runSortRuns : Sorts or merges each run in its own thread, the calling
+ *                thread takes the first run and any run whose thread cannot
+ *                be started.
  *
- * Status   : Public
+ * Status   : Private
  *
- * Arguments: list          -- Pointer to type List
- *            record        -- Pointer to an Info structure
+ * Arguments: run   -- Array of type SortRun
+ *            count -- Number of runs
  *
- * Returns  : DLL_NORMAL    -- Record returned
- *            DLL_NULL_LIST -- List is empty
+ * Return   : void
  */
-DLL_Return DLL_GetCurrentRecord(List *list, Info *record)
+void _runSortRuns(SortRun *run, int count)
     {
-    if(list->current == NULL)
-        return(DLL_NULL_LIST);
+    pthread_t thread[_MAX_THREADS];
+    DLL_Boolean started[_MAX_THREADS];
+    int n;
 
-    memcpy(record, list->current->info, list->infosize);
-    return(DLL_NORMAL);
+    for(n = 1; n < count; n++)
+        started[n] = (pthread_create(&thread[n], NULL, _sortRun, &run[n]) == 0)
+            ? DLL_TRUE : DLL_FALSE;
+
+    _sortRun(&run[0]);
+
+    for(n = 1; n < count; n++)
+        {
+        if(started[n] == DLL_TRUE)
+            pthread_join(thread[n], NULL);
+        else
+            _sortRun(&run[n]);
+        }
     }
 
 
 /*
- * DLL_GetPriorRecord() : Get the record pointed to by current->prior
+ * _sortRun : Sorts one run or merges two, it is the start routine of the
+ *            sort threads.
  *
- * Status   : Public
+ * Status   : Private
  *
- * Arguments: list          -- Pointer to type List
- *            record        -- Pointer to an Info structure
+ * Arguments: arg -- Pointer to type SortRun
  *
- * Returns  : DLL_NORMAL    -- Record returned
- *            DLL_NULL_LIST -- List is empty
- *            DLL_NOT_FOUND -- Beginning of list
+ * Return   : NULL
  */
-DLL_Return DLL_GetPriorRecord(List *list, Info *record)
+void *_sortRun(void *arg)
     {
-    if(list->current == NULL)
-        return(DLL_NULL_LIST);
+    SortRun *run = (SortRun *) arg;
 
-    if(list->current->prior == NULL)
-        return(DLL_NOT_FOUND);
+    if(run->merge == DLL_FALSE)
+        run->head = _mergeSort(run->head, run->pFun, NULL, &run->compares);
+    else if(run->other != NULL)
+        run->head = _mergeRuns(run->head, run->other, run->pFun,
+            &run->compares);
 
-    list->current = list->current->prior;
-    memcpy(record, list->current->info, list->infosize);
-    list->current_index--;
-    return(DLL_NORMAL);
+    return(NULL);
     }
 
 
 /*
- * DLL_GetNextRecord() : Get the record pointed to by current->next
+ * _findNthRecord : Finds the Nth record from the cursor's search origin and
+ *                  moves the cursor to it.
  *
- * Status   : Public
+ * Status   : Private
  *
- * Arguments: list          -- Pointer to type List
- *            record        -- Pointer to an Info structure
+ * Arguments: cursor        -- Pointer to type Cursor
+ *            record        -- Record to hold return data
+ *            skip          -- Number of records to skip
  *
- * Returns  : DLL_NORMAL    -- Record returned
- *            DLL_NULL_LIST -- List is empty
- *            DLL_NOT_FOUND -- End of list
+ * Return   : DLL_NORMAL    -- Node was found successfully
+ *            DLL_NULL_LIST -- Empty list
+ *            DLL_NOT_FOUND -- Skip value is too large, too small or wrong dir
+ *                             value (cursor index remains unchanged)
  */
-DLL_Return DLL_GetNextRecord(List *list, Info *record)
+DLL_Return _findNthRecord(Cursor *cursor, Info *record, unsigned long skip)
     {
-    if(list->current == NULL)
+    List *list = cursor->list;
+    unsigned long save, index;
+    Node *step;
+    DLL_SrchDir dir;
+
+    save = cursor->current_index;
+
+    switch(cursor->search_origin)
+        {
+        case DLL_CURRENT:
+            _cursorIndex(cursor);
+            step = cursor->current;
+            dir = cursor->search_dir;
+            break;
+        case DLL_TAIL:
+            step = list->tail;
+            cursor->search_dir = dir = DLL_UP;
+            cursor->current_index = list->listsize;
+            break;
+        case DLL_HEAD:
+        default:
+            cursor->search_origin = DLL_HEAD;
+            step = list->head;
+            cursor->search_dir = dir = DLL_DOWN;
+            cursor->current_index = 1L;
+        }
+
+    if(step == NULL)
         return(DLL_NULL_LIST);
 
-    if(list->current->next == NULL)
+    if(skip <= 0 || (dir != DLL_DOWN && dir != DLL_UP) || ((dir == DLL_DOWN)
+        ? (list->listsize < (cursor->current_index + skip))
+        : (cursor->current_index <= skip)))
+        {
+        cursor->current_index = save;
         return(DLL_NOT_FOUND);
+        }
 
-    list->current = list->current->next;
-    memcpy(record, list->current->info, list->infosize);
-    list->current_index++;
+    index = (dir == DLL_DOWN) ? cursor->current_index + skip
+        : cursor->current_index - skip;
+    cursor->current_index = save;
+    step = _seekIndex(cursor, index);
+    memcpy(record, step->info, list->infosize);
+    cursor->current = step;
+    cursor->current_index = index;
     return(DLL_NORMAL);
     }
 
 
-/************************
- * Input/Output Functions
- */
-
 /*
- * DLL_SaveList() : Save list to disk.
+ * _getRecords : Copies records starting with the cursor's record into a
+ *               buffer moving the cursor in direction dir.
  *
- * Status   : Public
+ * Status   : Private
  *
- * Arguments: list             -- Pointer to type List
- *            path             -- Pointer to path and filename
+ * Arguments: cursor        -- Pointer to type Cursor
+ *            buffer        -- Pointer to an array of at least count records
+ *            count         -- Number of records to copy
+ *            dir           -- Direction to move
+ *            fetched       -- Returns the number of records copied
  *
- * Return   : DLL_NORMAL       -- File written successfully
- *            DLL_NULL_LIST    -- List is empty
- *            DLL_OPEN_ERROR   -- File open error
- *            DLL_WRITE_ERROR  -- File write error
- *            DLL_NOT_MODIFIED -- Unmodified list no save was done
+ * Return   : DLL_NORMAL    -- More records remain
+ *            DLL_NULL_LIST -- Cursor is not on a record
+ *            DLL_NOT_FOUND -- The end of the list was reached
  */
-DLL_Return DLL_SaveList(List *list, const char *path)
+DLL_Return _getRecords(Cursor *cursor, Info *buffer, unsigned long count,
+ DLL_SrchDir dir, unsigned long *fetched)
     {
+    List *list = cursor->list;
+    char *dest = (char *) buffer;
     Node *step;
-    FILE *fp;
+    unsigned long n;
 
-    if(list->head == NULL)
-        return(DLL_NULL_LIST);
+    *fetched = 0L;
 
-    if(list->modified == DLL_FALSE)
-        return(DLL_NOT_MODIFIED);
+    if(cursor->current == NULL)
+        return(DLL_NULL_LIST);
 
-    if((fp = fopen(path, "wb")) == NULL)
-        return(DLL_OPEN_ERROR);
+    if(dir == DLL_DIRECTION_DEFAULT)
+        dir = cursor->search_dir;
 
-    step = list->head;
+    _cursorIndex(cursor);
 
-    while(step != NULL)
+    for(n = 0L; n < count; n++)
         {
-        if(fwrite(step->info, 1, list->infosize, fp) != list->infosize)
+        memcpy(dest, cursor->current->info, list->infosize);
+        dest += list->infosize;
+        step = (dir == DLL_UP) ? cursor->current->prior : cursor->current->next;
+
+        if(step == NULL)
             {
-            fclose(fp);
-            return(DLL_WRITE_ERROR);
+            *fetched = n + 1;
+            return(DLL_NOT_FOUND);
             }
 
-        step = (Node *) step->next;
+        cursor->current = step;
+
+        if(dir == DLL_UP)
+            cursor->current_index--;
+        else
+            cursor->current_index++;
         }
 
-    fclose(fp);
-    list->modified = DLL_FALSE;
+    *fetched = n;
     return(DLL_NORMAL);
     }
 
 
 /*
- * DLL_LoadList() : Load list to disk.
+ * _hashKey : Hashes the key of a record with FNV-1a.
  *
- * Status   : Public
- *
- * Note: The list->current_index will have an arbitrary value it depending on
- *       the sort algorithm used.
+ * Status   : Private
  *
- * Arguments: list           -- Pointer to type List
- *            path           -- Pointer to path and filename
- *            pFun           -- Pointer to search function
+ * Arguments: list -- Pointer to type List
+ *            info -- Pointer to the record
  *
- * Return   : DLL_NORMAL     -- File written successfully
- *            DLL_MEM_ERROR  -- Memory allocation failed
- *            DLL_OPEN_ERROR -- File open error
- *            DLL_READ_ERROR -- File read error
+ * Return   : The hash value
  */
-DLL_Return DLL_LoadList(List *list, const char *path,
-  int (*pFun)(Info *, Info *))
+unsigned long _hashKey(List *list, Info *info)
     {
-    Info *set;
-    FILE *fp;
-    DLL_Return exitCode;
+    const unsigned char *key = (const unsigned char *) info + list->hashoffset;
+    unsigned long hash = 2166136261UL;
+    size_t i;
 
-    if((fp = fopen(path, "rb")) == NULL)
-        return(DLL_OPEN_ERROR);
+    for(i = 0; i < list->hashlength; i++)
+        hash = (hash ^ key[i]) * 16777619UL;
 
-    DLL_DeleteEntireList(list);
+    /* Fold the high bits in as only the low bits pick the slot. */
+    return(hash ^ (hash >> 15));
+    }
 
-    list->head = list->tail = NULL;
 
-    if((set = (Info *) malloc(list->infosize)) == NULL)
-        return(DLL_MEM_ERROR);
+/*
+ * _hashFind : Finds a record with the same key as match in the hash index.
+ *
+ * Status   : Private
+ *
+ * Arguments: list  -- Pointer to type List
+ *            match -- Pointer to an Info structure holding the key
+ *
+ * Return   : Pointer to the Node or NULL if not found
+ */
+Node *_hashFind(List *list, Info *match)
+    {
+    unsigned long mask = list->hashsize - 1, i;
+    const char *key = (const char *) match + list->hashoffset;
+    Node *node;
 
-    for(;;)
+    for(i = _hashKey(list, match) & mask; (node = list->hashtable[i]) != NULL;
+        i = (i + 1) & mask)
         {
-        if(fread(set, 1, list->infosize, fp) != list->infosize)
-            {
-            if(feof(fp))
-                exitCode = DLL_NORMAL;
-            else
-                exitCode = DLL_READ_ERROR;
-
-            break;
-            }
-
-        if((exitCode = DLL_AddRecord(list, set, pFun)) == DLL_MEM_ERROR)
-            break;
+        if(memcmp((char *) node->info + list->hashoffset, key,
+            list->hashlength) == 0)
+            return(node);
         }
 
-    if(!pFun)
-        list->modified = DLL_FALSE;
-
-    free(set);
-    fclose(fp);
-    return(exitCode);
+    return(NULL);
     }
 
 
-/******************
- * Helper Functions
- */
-
 /*
- * _getListSize : Get the list size--sizeof(List)
+ * _hashInsert : Adds a node to the hash index. There must be a free slot.
  *
  * Status   : Private
  *
- * Arguments: Void
+ * Arguments: list -- Pointer to type List
+ *            node -- Pointer to the node to add
  *
- * Return   : Size of the List
+ * Return   : void
  */
-size_t _getListSize(void)
+void _hashInsert(List *list, Node *node)
     {
-    return sizeof(List);
+    unsigned long mask = list->hashsize - 1, i;
+
+    for(i = _hashKey(list, node->info) & mask; list->hashtable[i] != NULL;
+        i = (i + 1) & mask)
+        ;
+
+    list->hashtable[i] = node;
     }
 
 
 /*
- * _initializeList(): Initialize the list
+ * _hashRemove : Removes a node from the hash index, moving back any nodes
+ *               after it in the probe sequence to fill the gap.
  *
  * Status   : Private
  *
- * Arguments: list     -- Pointer to type List
- *            infosize -- Size of user Info
+ * Arguments: list -- Pointer to type List
+ *            node -- Pointer to the node to remove
  *
- * Returns  : void
+ * Return   : void
  */
-void _initializeList(List *list, size_t infosize)
+void _hashRemove(List *list, Node *node)
     {
-    list->head = NULL;
-    list->tail = NULL;
-    list->current = NULL;
-    list->saved = NULL;
-    if(infosize) list->infosize = infosize;
-    list->listsize = 0L;
-    list->modified = DLL_FALSE;
-    list->search_origin = DLL_HEAD;
-    list->search_dir = DLL_DOWN;
-    list->save_index = 0L;
-    list->current_index = 0L;
+    unsigned long mask = list->hashsize - 1, i, j, k;
+
+    for(i = _hashKey(list, node->info) & mask; list->hashtable[i] != node;
+        i = (i + 1) & mask)
+        ;
+
+    list->hashtable[i] = NULL;
+
+    for(j = (i + 1) & mask; list->hashtable[j] != NULL; j = (j + 1) & mask)
+        {
+        k = _hashKey(list, list->hashtable[j]->info) & mask;
+
+        /* Leave it if its home slot is cyclically in (i, j]. */
+        if((i <= j) ? (i < k && k <= j) : (i < k || k <= j))
+            continue;
+
+        list->hashtable[i] = list->hashtable[j];
+        list->hashtable[j] = NULL;
+        i = j;
+        }
     }
 
 
 /*
- * _createNewRecord : Allocates space for a new node and info structure and
- *                    possibly adds the new node to the list if the list is
- *                    empty.
+ * _hashResize : Sizes the hash index for count records and moves the nodes
+ *               already in it.
  *
  * Status   : Private
  *
  * Arguments: list          -- Pointer to type List
- *            info          -- Record to add
- *            newN          -- Pointer to new node
- *            newI          -- Pointer to new info
+ *            count         -- Number of records the index must hold
  *
- * Return   : DLL_NORMAL    -- File written successfully
+ * Return   : DLL_NORMAL    -- Index was resized
  *            DLL_MEM_ERROR -- Memory allocation failed
- *            DLL_CONTINUE  -- Continue (internal use only)
  */
-DLL_Return _createNewRecord(List *list, Info *info, Node **newN, Info **newI)
+DLL_Return _hashResize(List *list, unsigned long count)
     {
-    /* Allocate space for new node */
-    if((*newN = (Node *) malloc(sizeof(Node))) == NULL)
-        return(DLL_MEM_ERROR);
+    Node **old = list->hashtable;
+    unsigned long oldsize = list->hashsize, size = _HASH_MINSIZE, i;
+
+    while(size < count * 2)
+        size <<= 1;
 
-    /* Allocate space for new info */
-    if((*newI = (Info *) malloc(list->infosize)) == NULL)
+    if((list->hashtable = (Node **) calloc(size, sizeof(Node *))) == NULL)
         {
-        free(*newN);
+        list->hashtable = old;
         return(DLL_MEM_ERROR);
         }
 
-    /* Put new info into allocated space */
-    memcpy(*newI, info, list->infosize);
+    list->hashsize = size;
 
-    /* If list->head is NULL, assume empty list and this is the 1st record. */
-    if(list->head == NULL)
-        {
-        (*newN)->info = *newI;
-        (*newN)->next = NULL;
-        (*newN)->prior = NULL;
-        list->head = *newN;
-        list->tail = *newN;
-        list->current = *newN;
-        list->listsize = 1L;
-        list->current_index = 1L;
-        list->modified = DLL_TRUE;
-        return(DLL_NORMAL);
-        }
+    for(i = 0L; i < oldsize; i++)
+        if(old[i] != NULL)
+            _hashInsert(list, old[i]);
 
-    return(DLL_CONTINUE);
+    free(old);
+    return(DLL_NORMAL);
     }
 
 
@@ -1260,4 +6928,22 @@ void _printList(List *list)
     printf("list->search_dir: %ld\n", (long int) list->search_dir);
     printf("list->save_index: %ld\n", (long int) list->save_index);
     printf("list->current_index: %ld\n", (long int) list->current_index);
+    printf("list->blocksize: %ld\n", (long int) list->blocksize);
+    printf("list->blocks: %lx\n", (long unsigned int) list->blocks);
+    printf("list->block: %lx\n", (long unsigned int) list->block);
+    printf("list->blockused: %ld\n", (long int) list->blockused);
+    printf("list->freenodes: %lx\n", (long unsigned int) list->freenodes);
+    printf("list->inline_info: %ld\n", (long int) list->inline_info);
+    printf("list->skiphead: %lx\n", (long unsigned int) list->skiphead);
+    printf("list->skiplevel: %ld\n", (long int) list->skiplevel);
+    printf("list->skipfun: %lx\n", (long unsigned int) list->skipfun);
+    printf("list->skipseed: %lu\n", list->skipseed);
+    printf("list->hashtable: %lx\n", (long unsigned int) list->hashtable);
+    printf("list->hashsize: %lu\n", list->hashsize);
+    printf("list->hashoffset: %lu\n", (long unsigned int) list->hashoffset);
+    printf("list->hashlength: %lu\n", (long unsigned int) list->hashlength);
+    printf("list->checkpoints: %lx\n", (long unsigned int) list->checkpoints);
+    printf("list->checkstep: %lu\n", list->checkstep);
+    printf("list->checkcount: %lu\n", list->checkcount);
+    printf("list->cursors: %lx\n", (long unsigned int) list->cursors);
     }
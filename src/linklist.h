@@ -83,6 +83,40 @@ typedef enum
                               toward tail */
    } DLL_InsertDir;
 
+typedef enum
+   {
+   DLL_FIELD_MEMORY,      /* Compare field bytes with memcmp */
+   DLL_FIELD_STRING,      /* Compare field text with strncmp */
+   DLL_FIELD_INT,         /* Compare field as a signed integer */
+   DLL_FIELD_UINT,        /* Compare field as an unsigned integer */
+   DLL_FIELD_FLOAT        /* Compare field as a float or double */
+   } DLL_FieldType;
+
+typedef enum
+   {
+   DLL_LOAD_INSERT = 0,   /* Insert each record with pFun as it is read */
+   DLL_LOAD_SORT = 1,     /* Append all records then sort once with pFun */
+   DLL_LOAD_SORTED = 2,   /* File is already sorted, append without pFun */
+   DLL_LOAD_MAP = 4       /* Map the file, records are not copied */
+   } DLL_LoadMode;
+
+typedef enum
+   {
+   DLL_SAVE_RAW = 0,      /* Records only, as written by DLL_SaveList */
+   DLL_SAVE_HEADER = 1,   /* Records after a versioned file header */
+   DLL_SAVE_ATOMIC = 2,   /* Write a temporary file and rename it */
+   DLL_SAVE_SYNC = 4,     /* Flush the file to disk before returning */
+   DLL_SAVE_COMPACT = 8   /* Store the used bytes of each field only */
+   } DLL_SaveMode;
+
+typedef enum
+   {
+   DLL_BIG_ENDIAN = 0,    /* First key byte is the most significant */
+   DLL_LITTLE_ENDIAN = 1  /* First key byte is the least significant */
+   } DLL_Endian;
+
+#define DLL_MAX_COMPARATORS 32  /* Number of distinct field comparators */
+
 /*
  * Structures
  *
@@ -124,6 +158,50 @@ typedef struct node
    struct node *prior;
    } Node;
 
+typedef struct block
+   {
+   struct block  *next;
+   unsigned long count;
+   } Block;
+
+typedef struct skip_link
+   {
+   struct skip_node *next;
+   unsigned long    span;
+   } SkipLink;
+
+typedef struct skip_node
+   {
+   Node     *node;
+   int      level;
+   SkipLink link[1];
+   } SkipNode;
+
+typedef struct field_key
+   {
+   size_t        offset;
+   size_t        length;
+   DLL_FieldType type;
+   DLL_Boolean   descending;
+   } FieldKey;
+
+typedef struct cursor
+   {
+   struct list    *list;
+   Node           *current;
+   unsigned long  current_index;
+   DLL_SrchOrigin search_origin;
+   DLL_SrchDir    search_dir;
+   struct cursor  *next;
+   } Cursor;
+
+typedef struct list_lock ListLock;
+typedef struct sort_run SortRun;
+typedef struct file_header FileHeader;
+typedef struct journal Journal;
+typedef struct journal_header JournalHeader;
+typedef struct journal_op JournalOp;
+
 typedef struct list
    {
    Node           *head;
@@ -137,10 +215,47 @@ typedef struct list
    DLL_Boolean    modified;
    DLL_SrchOrigin search_origin;
    DLL_SrchDir    search_dir;
+   unsigned long  blocksize;
+   Block          *blocks;
+   Block          *block;
+   unsigned long  blockused;
+   Node           *freenodes;
+   DLL_Boolean    inline_info;
+   SkipNode       *skiphead;
+   int            skiplevel;
+   int            (*skipfun)(Info *, Info *);
+   unsigned long  skipseed;
+   Node           **hashtable;
+   unsigned long  hashsize;
+   size_t         hashoffset;
+   size_t         hashlength;
+   Node           **checkpoints;
+   unsigned long  checkstep;
+   unsigned long  checkcount;
+   Cursor         *cursors;
+   ListLock       *lock;
+   int            searchthreads;
+   unsigned long  searchmin;
+   void           *map;
+   size_t         mapsize;
+   Node           *mapnodes;
+   unsigned long  mapcount;
+   int            mapfd;
+   Journal        *journal;
+   struct field_layout *fields;
+   unsigned long  fieldcount;
    } List;
 #else
 typedef struct list List;
 typedef struct node Node;
+typedef struct block Block;
+typedef struct field_key FieldKey;
+typedef struct skip_node SkipNode;
+typedef struct cursor Cursor;
+typedef struct sort_run SortRun;
+typedef struct file_header FileHeader;
+typedef struct journal_header JournalHeader;
+typedef struct journal_op JournalOp;
 #endif   /* _DLL_MAIN_C || DEBUG */
 
 typedef struct search_modes
@@ -149,45 +264,229 @@ typedef struct search_modes
    DLL_SrchDir    search_dir;
    } DLL_SearchModes;
 
+typedef struct position
+   {
+   Node           *node;
+   unsigned long  index;
+   } DLL_Position;
+
+typedef struct sort_stats
+   {
+   int            threads;       /* threads the records were split between */
+   unsigned long  comparisons;   /* calls made to the sort function */
+   double         seconds;       /* wall time taken */
+   } DLL_SortStats;
+
+typedef struct field_layout
+   {
+   size_t         offset;        /* offset of the field in the Info */
+   size_t         length;        /* bytes in the field */
+   } DLL_Field;
+
 /*
  * Prototypes
  */
 List *DLL_CreateList(List **list);
 void DLL_DestroyList(List **list);
+Cursor *DLL_CreateCursor(List *list);
+void DLL_DestroyCursor(Cursor **cursor);
 char *DLL_Version(void);
 DLL_Boolean DLL_IsListEmpty(List *list);
 DLL_Boolean DLL_IsListFull(List *list);
 DLL_Return DLL_AddRecord(List *list, Info *info,
  int (*pFun)(Info *, Info *));
+DLL_Return DLL_AddRecords(List *list, Info *buffer, unsigned long count,
+ int (*pFun)(Info *, Info *));
+DLL_Return DLL_CloseJournal(List *list);
+DLL_Return DLL_CompactJournal(List *list);
+DLL_Return DLL_CopyToBuffer(List *list, Info *buffer, unsigned long start,
+ unsigned long count);
+DLL_Return DLL_CreateIndex(List *list, size_t offset, size_t length);
 DLL_Return DLL_CurrentPointerToHead(List *list);
 DLL_Return DLL_CurrentPointerToTail(List *list);
+DLL_Return DLL_CursorDeleteRecord(Cursor *cursor);
+DLL_Return DLL_CursorFindNthRecord(Cursor *cursor, Info *record,
+ unsigned long skip);
+DLL_Return DLL_CursorFindRecord(Cursor *cursor, Info *record, Info *match,
+ int (*pFun)(Info *, Info *));
+DLL_Return DLL_CursorGetCurrent(Cursor *cursor, Info *record);
+DLL_Return DLL_CursorGetNext(Cursor *cursor, Info *record);
+DLL_Return DLL_CursorGetPrior(Cursor *cursor, Info *record);
+DLL_Return DLL_CursorGetRecordAt(Cursor *cursor, Info *record,
+ unsigned long index);
+DLL_Return DLL_CursorGetRecords(Cursor *cursor, Info *buffer,
+ unsigned long count, DLL_SrchDir dir, unsigned long *fetched);
+DLL_Return DLL_CursorInsertRecord(Cursor *cursor, Info *info,
+ DLL_InsertDir dir);
+DLL_Return DLL_CursorSetSearchModes(Cursor *cursor, DLL_SrchOrigin origin,
+ DLL_SrchDir dir);
+DLL_Return DLL_CursorToHead(Cursor *cursor);
+DLL_Return DLL_CursorToTail(Cursor *cursor);
 DLL_Return DLL_DecrementCurrentPointer(List *list);
 DLL_Return DLL_DeleteCurrentRecord(List *list);
 DLL_Return DLL_DeleteEntireList(List *list);
+DLL_Return DLL_FieldComparator(int (**pFun)(Info *, Info *), size_t offset,
+ size_t length, DLL_FieldType type, DLL_Boolean descending);
+DLL_Return DLL_FindByKey(List *list, Info *record, Info *match);
+DLL_Return DLL_FindLowerBound(List *list, Info *record, Info *match);
 DLL_Return DLL_FindNthRecord(List *list, Info *record, unsigned long nRec);
 DLL_Return DLL_FindRecord(List *list, Info *record, Info *match,
  int (*pFun)(Info *, Info *));
 DLL_Return DLL_GetCurrentRecord(List *list, Info *record);
 DLL_Return DLL_GetNextRecord(List *list, Info *record);
 DLL_Return DLL_GetPriorRecord(List *list, Info *record);
+DLL_Return DLL_GetRecordAt(List *list, Info *record, unsigned long index);
+DLL_Return DLL_GetRecords(List *list, Info *buffer, unsigned long count,
+ DLL_SrchDir dir, unsigned long *fetched);
 DLL_Return DLL_InitializeList(List *list, size_t infosize);
 DLL_Return DLL_IncrementCurrentPointer(List *list);
 DLL_Return DLL_InsertRecord(List *list, Info *info, DLL_InsertDir dir);
 DLL_Return DLL_LoadList(List *list, const char *path,
  int (*pFun)(Info *, Info *));
+DLL_Return DLL_LoadListEx(List *list, const char *path,
+ int (*pFun)(Info *, Info *), DLL_LoadMode mode);
+DLL_Return DLL_OpenJournal(List *list, const char *path, const char *logpath,
+ DLL_Boolean sync);
+DLL_Return DLL_ParallelSortList(List *list, int (*pFun)(Info *, Info *),
+ int threads, DLL_SortStats *stats);
+DLL_Return DLL_QueryNextRecord(List *list, Info *record, DLL_SrchDir dir,
+ DLL_Position *position);
+DLL_Return DLL_QueryNthRecord(List *list, Info *record, unsigned long skip,
+ DLL_SrchOrigin origin, DLL_SrchDir dir, DLL_Position *position);
+DLL_Return DLL_QueryRecord(List *list, Info *record, Info *match,
+ int (*pFun)(Info *, Info *), DLL_SrchOrigin origin, DLL_SrchDir dir,
+ DLL_Position *position);
+DLL_Return DLL_QueryRecordAt(List *list, Info *record, unsigned long index,
+ DLL_Position *position);
+DLL_Return DLL_QueryRecords(List *list, Info *buffer, unsigned long count,
+ DLL_SrchDir dir, DLL_Position *position, unsigned long *fetched);
+DLL_Return DLL_RadixSortList(List *list, size_t offset, size_t length,
+ DLL_Endian endian);
 DLL_Return DLL_RestoreCurrentPointer(List *list);
 DLL_Return DLL_SaveList(List *list, const char *path);
+DLL_Return DLL_SaveListEx(List *list, const char *path,
+ int (*pFun)(Info *, Info *), DLL_SaveMode mode);
+DLL_Return DLL_SetBlockSize(List *list, unsigned long blocksize);
+DLL_Return DLL_SetCheckpoints(List *list, unsigned long step);
+DLL_Return DLL_SetFieldLayout(List *list, const DLL_Field *fields,
+ unsigned long count);
+DLL_Return DLL_SetInlineInfo(List *list, DLL_Boolean flag);
+DLL_Return DLL_SetParallelSearch(List *list, int threads,
+ unsigned long minsize);
 DLL_Return DLL_SetSearchModes(List *list, DLL_SrchOrigin origin,
  DLL_SrchDir dir);
+DLL_Return DLL_SetSkipList(List *list, int (*pFun)(Info *, Info *));
+DLL_Return DLL_SetThreadSafe(List *list, DLL_Boolean flag);
+DLL_Return DLL_SortList(List *list, int (*pFun)(Info *, Info *));
+DLL_Return DLL_SortListByKeys(List *list, Info *keys, size_t keysize,
+ DLL_FieldType type, DLL_Boolean descending);
 DLL_Return DLL_StoreCurrentPointer(List *list);
 DLL_Return DLL_SwapRecord(List *list, DLL_InsertDir dir);
 DLL_Return DLL_UpdateCurrentRecord(List *list, Info *record);
 DLL_SearchModes *DLL_GetSearchModes(List *list, DLL_SearchModes *ssp);
+unsigned long DLL_CursorGetIndex(Cursor *cursor);
 unsigned long DLL_GetCurrentIndex(List *list);
 unsigned long DLL_GetNumberOfRecords(List *list);
 size_t _getListSize(void);
 void _initializeList(List *list, size_t infosize);
+DLL_Boolean _isListFull(List *list);
+DLL_Return _addRecord(List *list, Info *info, int (*pFun)(Info *, Info *));
+DLL_Return _addRecords(List *list, Info *buffer, unsigned long count,
+ int (*pFun)(Info *, Info *));
+DLL_Return _swapRecord(List *list, DLL_InsertDir dir);
+DLL_Return _sortList(List *list, int (*pFun)(Info *, Info *), int threads,
+ DLL_SortStats *stats);
+DLL_Return _radixSortList(List *list, size_t offset, size_t length,
+ DLL_Endian endian);
+DLL_Return _sortByKeys(List *list, Info *keys, size_t keysize,
+ DLL_FieldType type, DLL_Boolean descending);
+DLL_Return _updateRecord(List *list, Info *record);
+DLL_Return _deleteEntireList(List *list);
+DLL_Return _saveList(List *list, const char *path,
+ int (*pFun)(Info *, Info *), DLL_SaveMode mode, FileHeader *written);
+DLL_Return _writeAll(int fd, const char *data, size_t length);
+void _syncDirectory(const char *path);
+DLL_Return _loadList(List *list, const char *path,
+ int (*pFun)(Info *, Info *), DLL_LoadMode mode);
+DLL_Return _mapList(List *list, const char *path,
+ int (*pFun)(Info *, Info *), DLL_LoadMode mode, size_t offset);
+DLL_Return _checkHeader(List *list, FileHeader *header,
+ unsigned long filesize);
+DLL_Return _checkLayout(List *list, const DLL_Field *fields,
+ unsigned long count, DLL_Boolean whole);
+size_t _packedSize(const DLL_Field *fields, unsigned long count);
+size_t _packRecord(const DLL_Field *fields, unsigned long count,
+ const char *info, char *data);
+DLL_Return _unpackRecord(const DLL_Field *fields, unsigned long count,
+ const char *data, size_t length, char *info, size_t *used);
+DLL_Return _openJournal(List *list, const char *path, const char *logpath,
+ DLL_Boolean sync);
+DLL_Return _closeJournal(List *list);
+DLL_Return _compactJournal(List *list);
+DLL_Return _startJournal(List *list, unsigned long count,
+ unsigned long checksum);
+DLL_Return _journalOp(List *list, unsigned long op, unsigned long index,
+ unsigned long count, const char *records);
+DLL_Return _replayJournal(List *list, const char *logpath,
+ unsigned long count, unsigned long checksum, long *length);
+DLL_Return _replayOp(List *list, JournalOp *op, char *records);
+unsigned long _sortTag(int (*pFun)(Info *, Info *));
+unsigned long _checksum(unsigned long sum, const unsigned char *data,
+ size_t length);
 DLL_Return _createNewRecord(List *list, Info *info, Node **newN, Info **newI);
+Node *_allocNode(List *list);
+void _freeNode(List *list, Node *node);
+Block *_newBlock(List *list, unsigned long count);
+void _releaseBlocks(List *list);
+void _releaseMap(List *list);
+void _relinkList(List *list, Node *head);
+Node *_mergeSort(Node *head, int (*pFun)(Info *, Info *), FieldKey *key,
+ unsigned long *compares);
+Node *_mergeRuns(Node *p, Node *q, int (*pFun)(Info *, Info *),
+ unsigned long *compares);
+Node *_parallelSort(List *list, int (*pFun)(Info *, Info *), int threads,
+ unsigned long *compares);
+void _runSortRuns(SortRun *run, int count);
+void *_sortRun(void *arg);
+void _linkNode(List *list, Node *node, Node *prior);
+SkipNode *_newSkipNode(List *list);
+SkipNode *_skipFind(List *list, Info *match, SkipNode **update,
+ unsigned long *rank);
+Node *_skipLink(List *list, SkipNode *sn, Node *node);
+SkipNode *_skipUnlink(List *list, unsigned long index);
+void _skipClear(List *list);
+DLL_Return _skipAddRecord(List *list, Info *info);
+DLL_Return _skipFindRecord(Cursor *cursor, Info *record, Info *match,
+ DLL_Boolean exact);
+unsigned long _currentIndex(List *list);
+unsigned long _cursorIndex(Cursor *cursor);
+void _getListCursor(List *list, Cursor *cursor);
+void _putListCursor(List *list, Cursor *cursor);
+DLL_Return _getPositionCursor(List *list, Cursor *cursor,
+ DLL_SrchOrigin origin, DLL_SrchDir dir, DLL_Position *position);
+void _putPositionCursor(Cursor *cursor, DLL_Position *position);
+DLL_Return _insertRecord(Cursor *cursor, Info *info, DLL_InsertDir dir);
+DLL_Return _deleteRecord(Cursor *cursor);
+DLL_Return _findRecord(Cursor *cursor, Info *record, Info *match,
+ int (*pFun)(Info *, Info *));
+Node *_parallelFind(Cursor *cursor, Node *start, DLL_SrchDir dir,
+ unsigned long count, Info *match, int (*pFun)(Info *, Info *),
+ unsigned long *offset);
+void *_searchPart(void *arg);
+DLL_Return _findNthRecord(Cursor *cursor, Info *record, unsigned long skip);
+DLL_Return _getRecords(Cursor *cursor, Info *buffer, unsigned long count,
+ DLL_SrchDir dir, unsigned long *fetched);
+void _positionsChanged(List *list);
+Node *_seekIndex(Cursor *cursor, unsigned long index);
+DLL_Return _buildCheckpoints(List *list);
+unsigned long _hashKey(List *list, Info *info);
+Node *_hashFind(List *list, Info *match);
+void _hashInsert(List *list, Node *node);
+void _hashRemove(List *list, Node *node);
+DLL_Return _hashResize(List *list, unsigned long count);
+int _compareField(FieldKey *key, Info *record, Info *compare);
+int _compareBytes(const unsigned char *a, const unsigned char *b,
+ size_t length, DLL_Boolean sign);
 void _printList(List *list);
 
 #ifdef __cplusplus
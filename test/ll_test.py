@@ -9,16 +9,18 @@
 # $Revision$
 #
 
-import os, sys
+import os, sys, glob, resource, signal, threading
 import unittest
-from ctypes import Structure, sizeof, string_at, cast, c_char, c_void_p
+from ctypes import Structure, sizeof, string_at, cast, addressof, c_char, \
+     c_void_p, c_int, c_short, c_ubyte, c_ulong, c_double, c_float
 
 path = os.path.join(os.path.split(os.getcwd())[0], "src")
 sys.path.insert(0, path)
 #print sys.path
 
 from dlinklist import APIException, FunctionException, DLinklist, Return, \
-     SrchOrigin, SrchDir, InsertDir
+     SrchOrigin, SrchDir, InsertDir, FieldType, LoadMode, SaveMode, Endian, \
+     Position
 from dlinklist.linklist import List
 
 class Info(Structure):
@@ -27,6 +29,17 @@ class Info(Structure):
         )
 
 
+class Record(Structure):
+    _fields_ = (
+        ('value', c_char * 10),
+        ('count', c_int),
+        ('delta', c_short),
+        ('flags', c_ubyte),
+        ('weight', c_double),
+        ('ratio', c_float),
+        )
+
+
 class TestLibDll(unittest.TestCase):
     """
     This class runs testunit test on all the function in my C{C} linklist
@@ -142,6 +155,301 @@ class TestLibDll(unittest.TestCase):
         """
         self._isListFull(test=False)
 
+    def test_DLL_SetBlockSize(self):
+        """
+        Check that records are allocated from blocks correctly, deleted records
+        are reused, and the correct return codes are returned.
+
+        @return: C{None}
+        """
+        self._setBlockSize(2)
+        values = []
+        values.append("ZZZZ - This is test record one.")
+        values.append("AAAA - This is test record two.")
+        values.append("NNNN - This is test record three.")
+        values.append("YYYY - This is test record four.")
+        values.append("BBBB - This is test record five.")
+
+        for value in values:
+            self._addRecord(Info(value), self._dll.compare())
+
+        self._getNumberOfRecords(test=5)
+        self._isListFull(test=False)
+        # Test that the block size cannot be turned off with records in list.
+        self._setBlockSize(0, result=Return.NOT_MODIFIED)
+        # Test that the block size can be changed with records in list.
+        self._setBlockSize(3)
+        # Test that deleted records are reused.
+        self._currentPointerToHead()
+        self._deleteCurrentRecord()
+        values.sort()
+        values.pop(0)
+        value = "MMMM - This is test record six."
+        self._addRecord(Info(value), self._dll.compare())
+        values.append(value)
+        values.sort()
+        self._getNumberOfRecords(test=5)
+        self._currentPointerToHead()
+        size = len(values)
+
+        for idx in range(size):
+            self._getCurrentRecord(Info(), test=values[idx])
+            idx < (size-1) and self._incrementCurrentPointer()
+
+        self.assertTrue(idx == (size-1))
+        # Test that block allocation can be turned off with an empty list.
+        self._deleteEntireList()
+        self._setBlockSize(0)
+        self._addRecord(Info(value))
+        self._getCurrentRecord(Info(), test=value)
+
+    def test_DLL_SetInlineInfo(self):
+        """
+        Check that records stored with their C{Node} are added, updated, saved,
+        loaded, and deleted correctly, and the correct return codes are
+        returned.
+
+        @return: C{None}
+        """
+        filePath = "/tmp/unittest.data"
+        self._setInlineInfo(True)
+        values = []
+        values.append("ZZZZ - This is test record one.")
+        values.append("AAAA - This is test record two.")
+        values.append("NNNN - This is test record three.")
+
+        for value in values:
+            self._addRecord(Info(value), self._dll.compare())
+
+        # Test that the flag cannot be changed with records in list.
+        self._setInlineInfo(False, result=Return.NOT_MODIFIED)
+        value = "MMMM - This is an updated record."
+        self._updateCurrentRecord(Info(value))
+        values[2] = value
+        self._saveList(filePath)
+        self._loadList(filePath)
+        self._getNumberOfRecords(test=3)
+        values.sort()
+        self._currentPointerToHead()
+        size = len(values)
+
+        for idx in range(size):
+            self._getCurrentRecord(Info(), test=values[idx])
+            idx < (size-1) and self._incrementCurrentPointer()
+
+        self.assertTrue(idx == (size-1))
+        self._deleteCurrentRecord()
+        self._getNumberOfRecords(test=2)
+        os.remove(filePath)
+
+    def test_DLL_SetCheckpoints(self):
+        """
+        Check that records are found by index with checkpoints before and
+        after the list is changed, and the correct return codes are
+        returned.
+
+        @return: C{None}
+        """
+        self._setCheckpoints(3)
+        values = ["r%02d" % idx for idx in range(20)]
+
+        for value in values:
+            self._addRecord(Info(value))
+
+        for idx in (1, 20, 2, 19, 10, 11, 5):
+            self._getRecordAt(Info(), idx, test=values[idx-1])
+            self._getCurrentIndex(test=idx)
+
+        # Test records appended and deleted after the table was built.
+        self._addRecord(Info("r20"))
+        values.append("r20")
+        self._getRecordAt(Info(), 21, test="r20")
+        self._getRecordAt(Info(), 4, test=values[3])
+        self._deleteCurrentRecord()
+        del values[3]
+
+        for idx in range(len(values), 0, -1):
+            self._getRecordAt(Info(), idx, test=values[idx-1])
+
+        self._setCheckpoints(0)
+        self._getRecordAt(Info(), 7, test=values[6])
+
+    def test_DLL_SetSkipList(self):
+        """
+        Check that a list with a skip list stays sorted as records are added,
+        updated, and deleted, that the current index is correct, and the
+        correct return codes are returned.
+
+        @return: C{None}
+        """
+        pFun = self._dll.compare()
+        self._setSkipList(pFun)
+        values = []
+        values.append("ZZZZ - This is test record one.")
+        values.append("AAAA - This is test record two.")
+        values.append("NNNN - This is test record three.")
+        values.append("YYYY - This is test record four.")
+        values.append("BBBB - This is test record five.")
+
+        for idx, value in enumerate(values):
+            # The skip list places the record whatever pFun is passed.
+            self._addRecord(Info(value))
+            self._getCurrentRecord(Info(), test=value)
+            test = sorted(values[:idx+1]).index(value) + 1
+            self._getCurrentIndex(test=test)
+
+        self._iterRecords(test=sorted(values))
+        # Test that the skip list cannot be changed with records in list.
+        self._setSkipList(None, result=Return.NOT_MODIFIED)
+        self._setSkipList(pFun)
+        # Test that the order cannot be broken.
+        self._currentPointerToHead()
+        self._insertRecord(Info("CCCC"), InsertDir.ABOVE,
+                           result=Return.NOT_MODIFIED)
+        self._swapRecord(SrchDir.DOWN, result=Return.NOT_MODIFIED)
+        self._sort(pFun)
+        self._sort(self._dll.fieldComparator(Info, 'value', descending=True),
+                   result=Return.NOT_MODIFIED)
+        # Test an updated record is moved.
+        value = "MMMM - This is an updated record."
+        self._updateCurrentRecord(Info(value))
+        values[1] = value
+        self._getCurrentRecord(Info(), test=value)
+        self._getCurrentIndex(test=sorted(values).index(value) + 1)
+        self._iterRecords(test=sorted(values))
+        self._findRecord(Info(), Info(values[3]), pFun)
+        self._getCurrentIndex(test=sorted(values).index(values[3]) + 1)
+        self._deleteCurrentRecord()
+        del values[3]
+        self._iterRecords(test=sorted(values))
+        self._findRecord(Info(), Info("XXXX"), pFun, result=Return.NOT_FOUND)
+        self._findRecord(Info(), Info(values[0]), pFun)
+        # Test the list is empty after deleting all records.
+        self._deleteEntireList()
+        self._addRecord(Info(values[0]))
+        self._iterRecords(test=values[:1])
+        self._deleteEntireList()
+        self._setSkipList(None)
+        self._insertRecord(Info(values[0]), InsertDir.ABOVE)
+
+    def test_DLL_CreateIndex(self):
+        """
+        Check that the hash index is built from the records in the list,
+        follows records as they are added, inserted, updated, deleted, and
+        loaded, and the correct return codes are returned.
+
+        @return: C{None}
+        """
+        filePath = "/tmp/unittest.data"
+        self._destroyList()
+        self._dll.create(sizeof(Record), infoClass=Record)
+        # Test a field that is not in the Info class.
+        self.assertRaises(APIException, self._dll.createIndex, 'missing')
+
+        for idx in range(20):
+            self._addRecord(Record("r%d" % idx, idx))
+
+        self._createIndex('count')
+        self._findByKey(Record(), 7, test="r7")
+        self._findByKey(Record(), 20, result=Return.NOT_FOUND)
+        # Test added and inserted records are indexed.
+        self._addRecord(Record("r20", 20))
+        self._insertRecord(Record("r21", 21), InsertDir.ABOVE)
+        self._findByKey(Record(), 20, test="r20")
+        self._findByKey(Record(), 21, test="r21")
+        # Test an updated key is moved in the index.
+        self._findByKey(Record(), 3, test="r3")
+        self._updateCurrentRecord(Record("r3", 33))
+        self._findByKey(Record(), 3, result=Return.NOT_FOUND)
+        self._findByKey(Record(), 33, test="r3")
+        # Test a deleted record is removed from the index.
+        self._deleteCurrentRecord()
+        self._findByKey(Record(), 33, result=Return.NOT_FOUND)
+        self._getNumberOfRecords(test=21)
+        # Test loaded records are indexed.
+        self._saveList(filePath)
+        self._deleteEntireList()
+        self._findByKey(Record(), 7, result=Return.NULL_LIST)
+        self._loadList(filePath)
+        self._findByKey(Record(), 7, test="r7")
+        # Test the index can be removed.
+        self._createIndex(None)
+        self._findByKey(Record(), 7, result=Return.NULL_FUNCTION)
+        os.remove(filePath)
+
+    def test_DLL_SetThreadSafe(self):
+        """
+        Check that the lock can be turned on and off, and that records added
+        from several threads while others query the list are all kept.
+
+        @return: C{None}
+        """
+        self._setThreadSafe(True)
+        self.assertTrue(self._dll._list_p.contents.lock is not None)
+        self._setThreadSafe(True)
+        self._setThreadSafe(False)
+        self.assertTrue(self._dll._list_p.contents.lock is None)
+        self._destroyList()
+        self._dll.create(sizeof(Info), threadSafe=True)
+        self.assertTrue(self._dll._list_p.contents.lock is not None)
+
+        def writer(idx):
+            for count in range(50):
+                self._dll.addRecord(Info("w%d - %02d" % (idx, count)))
+
+        def reader():
+            for count in range(50):
+                [raw for raw in self._dll.queryRecords(chunkSize=8)]
+
+        threads = [threading.Thread(target=writer, args=(idx,))
+                   for idx in range(2)]
+        threads += [threading.Thread(target=reader) for idx in range(2)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self._getNumberOfRecords(test=100)
+        records = sorted(Info.from_buffer_copy(raw).value
+                         for raw in self._dll.queryRecords())
+        values = sorted("w%d - %02d" % (idx, count) for idx in range(2)
+                        for count in range(50))
+        msg = "records: %s, values: %s" % (records, values)
+        self.assertTrue(records == values, msg=msg)
+
+    def test_DLL_SetParallelSearch(self):
+        """
+        Check that a search split between threads finds the first match in
+        search order with native and Python compare functions, and the
+        correct return codes are returned.
+
+        @return: C{None}
+        """
+        self._setParallelSearch(-1, result=Return.NOT_MODIFIED)
+        self._setParallelSearch(65, result=Return.NOT_MODIFIED)
+        self._destroyList()
+        self._dll.create(sizeof(Record), infoClass=Record)
+        self._setParallelSearch(4, minSize=1)
+
+        for idx in range(500):
+            self._addRecord(Record("r%d" % idx, idx % 50))
+
+        pFun = self._fieldComparator(Record, 'count')
+        self._findRecord(Record(), Record("r37", 37), pFun)
+        self._getCurrentIndex(test=38)
+        self._setSearchModes(SrchOrigin.TAIL, SrchDir.UP)
+        self._findRecord(Record(), Record("r487", 37), pFun)
+        self._getCurrentIndex(test=488)
+        self._findRecord(Record(), Record("", 99), pFun,
+                         result=Return.NOT_FOUND)
+        self._getCurrentIndex(test=488)
+        # Test a Python compare function called from the threads.
+        self._setSearchModes(SrchOrigin.HEAD, SrchDir.DOWN)
+        self._findRecord(Record(), Record("r321"), self._dll.compare())
+        self._getCurrentIndex(test=322)
+
     def test_DLL_GetNumberOfRecords(self):
         """
         Check that the correct number of records are returned.
@@ -333,6 +641,50 @@ class TestLibDll(unittest.TestCase):
 
         self.assertTrue(idx == (size-1))
 
+    def test_DLL_AddRecords(self):
+        """
+        Check that arrays of records are added to the link list properly in
+        each of the supported buffer types, the index values are correct after
+        each add, and the correct exceptions are raised.
+
+        @return: C{None}
+        """
+        values = []
+        values.append("ZZZZ - This is test record one.")
+        values.append("AAAA - This is test record two.")
+        values.append("NNNN - This is test record three.")
+        records = (Info * len(values))(*[Info(value) for value in values])
+        # Test non-sorted addRecords with each buffer type.
+        buffers = (records, string_at(records, sizeof(records)),
+                   bytearray(string_at(records, sizeof(records))),
+                   memoryview(string_at(records, sizeof(records))))
+
+        for buf in buffers:
+            self._addRecords(buf)
+            self._getCurrentIndex(test=3)
+            self._getNumberOfRecords(test=3)
+            self._iterRecords(test=values)
+            self._deleteEntireList()
+
+        # Test appending to a list that already has records.
+        self._addRecord(Info("BBBB - This is test record zero."))
+        self._addRecords(records, count=2)
+        self._getCurrentIndex(test=3)
+        self._iterRecords(test=["BBBB - This is test record zero."] +
+                          values[:2])
+        self._deleteEntireList()
+        # Test sorted addRecords.
+        self._addRecords(records, pFun=self._dll.compare())
+        self._getNumberOfRecords(test=3)
+        self._iterRecords(test=sorted(values))
+        self._deleteEntireList()
+        # Test buffers that do not hold whole records.
+        self.assertRaises(APIException, self._dll.addRecords, records,
+                          count=4)
+        self.assertRaises(APIException, self._dll.addRecords,
+                          string_at(records, sizeof(records) - 1))
+        self._getNumberOfRecords(test=0)
+
     def test_DLL_InsertRecord(self):
         """
         Check that inserted records are added properly based on C{InsertDir},
@@ -412,6 +764,185 @@ class TestLibDll(unittest.TestCase):
 
         self.assertTrue(idx == (size-1))
 
+    def test_DLL_SortList(self):
+        """
+        Check that the list is sorted correctly, equal records keep their
+        order, the current record and index values are correct after the
+        sort, and the correct return codes are returned.
+
+        @return: C{None}
+        """
+        # Test for null function pointer
+        self._sort(None, result=Return.NULL_FUNCTION)
+        # Test no records
+        self._sort(self._dll.compare(), result=Return.NULL_LIST)
+        values = []
+        values.append("ZZZZ - This is test record one.")
+        values.append("AAAA - This is test record two.")
+        values.append("NNNN - This is test record three.")
+        values.append("YYYY - This is test record four.")
+        values.append("BBBB - This is test record five.")
+        values.append("MMMM - This is test record six.")
+        values.append("CCCC - This is test record seven.")
+
+        for value in values:
+            self._addRecord(Info(value))
+
+        # Make record six saved and record three current.
+        self._findNthRecord(Info(), 5, test=values[5])
+        self._storeCurrentPointer()
+        self._findNthRecord(Info(), 2, test=values[2])
+        self._sort(self._dll.compare())
+        # Test the current and saved records follow the sort.
+        self._getCurrentRecord(Info(), test=values[2])
+        self._getCurrentIndex(test=sorted(values).index(values[2]) + 1)
+        self._restoreCurrentPointer()
+        self._getCurrentRecord(Info(), test=values[5])
+        self._getCurrentIndex(test=sorted(values).index(values[5]) + 1)
+        self._iterRecords(test=sorted(values))
+        self._sort(self._dll.fieldComparator(Info, 'value', descending=True))
+        self._iterRecords(test=sorted(values, reverse=True))
+        # Test equal records keep their order.
+        self._destroyList()
+        self._dll.create(sizeof(Record), infoClass=Record)
+        rows = [("r%d" % idx, idx % 3) for idx in range(20)]
+
+        for row in rows:
+            self._addRecord(Record(*row))
+
+        self._sort(self._dll.fieldComparator(Record, 'count'))
+        records = [(r.value, r.count) for r in self._dll]
+        test = sorted(rows, key=lambda row: row[1])
+        msg = "records: %s, test: %s" % (records, test)
+        self.assertTrue(records == test, msg=msg)
+
+    def test_DLL_SortListByKeys(self):
+        """
+        Check that a sort with a Python key function calls it once per record,
+        gives the same order as the Python C{sorted} function for each kind
+        of key, keeps the current record, and the correct return codes are
+        returned.
+
+        @return: C{None}
+        """
+        # Test no records
+        self._sortByKey(lambda r: r.value, result=Return.NULL_LIST)
+        self._destroyList()
+        self._dll.create(sizeof(Record), infoClass=Record)
+        rows = [("r%d" % idx, (idx * 7) % 11 - 5, (idx * 13) % 7 * 0.5)
+                for idx in range(60)]
+
+        for row in rows:
+            self._addRecord(Record(row[0], row[1], weight=row[2]))
+
+        calls = []
+
+        def count(record):
+            calls.append(record.value)
+            return record.count
+
+        self._sortByKey(count)
+        msg = "calls: %s" % len(calls)
+        self.assertTrue(len(calls) == len(rows), msg=msg)
+        # Test the last record added is still current.
+        self._getCurrentRecord(Record(), test=rows[-1][0])
+        keys = (lambda r: r[1], lambda r: r[2], lambda r: r[0],
+                lambda r: (r[1], r[0][-1:]))
+
+        for idx, key in enumerate(keys):
+            for reverse in (False, True):
+                self._sortByKey(lambda r: key((r.value, r.count, r.weight)),
+                                reverse=reverse)
+                records = [(r.value, r.count, r.weight) for r in self._dll]
+                test = sorted(records, key=key, reverse=reverse)
+                msg = "key: %s, records: %s, test: %s" % (idx, records, test)
+                self.assertTrue(records == test, msg=msg)
+
+        # Test that string keys of many widths use up no comparators
+        for width in range(1, 41): # More than DLL_MAX_COMPARATORS
+            for reverse in (False, True):
+                self._sortByKey(lambda r: r.value.ljust(width, 'x'),
+                                reverse=reverse)
+
+        # Test both a compare function and a key function
+        self.assertRaises(APIException, self._dll.sort,
+                          self._dll.compare(), key=count)
+
+    def test_DLL_ParallelSortList(self):
+        """
+        Check that a sort split between threads gives the same order as the
+        serial sort, equal records keep their order, the statistics are
+        returned, and the correct return codes are returned.
+
+        @return: C{None}
+        """
+        pFun = self._fieldComparator(Info, 'value')
+        # Test for null function pointer
+        self._parallelSort(None, 4, result=Return.NULL_FUNCTION)
+        # Test no records
+        self._parallelSort(pFun, 4, result=Return.NULL_LIST)
+        # Test too many threads
+        self._parallelSort(pFun, 65, result=Return.NOT_MODIFIED)
+        self._destroyList()
+        self._dll.create(sizeof(Record), infoClass=Record)
+        rows = [("r%d" % idx, (idx * 7) % 11) for idx in range(300)]
+
+        for row in rows:
+            self._addRecord(Record(*row))
+
+        pFun = self._fieldComparator(Record, 'count')
+        self._parallelSort(pFun, 4, test=4)
+        records = [(r.value, r.count) for r in self._dll]
+        test = sorted(rows, key=lambda row: row[1])
+        msg = "records: %s, test: %s" % (records, test)
+        self.assertTrue(records == test, msg=msg)
+        # Test more threads than records and the index values after the sort.
+        self._destroyList()
+        self._dll.create(sizeof(Record), infoClass=Record)
+
+        for row in rows[:3]:
+            self._addRecord(Record(*row))
+
+        self._parallelSort(pFun, 8, test=3)
+        # The last record added, count 3, is still current.
+        self._getCurrentIndex(test=2)
+        records = [(r.value, r.count) for r in self._dll]
+        test = sorted(rows[:3], key=lambda row: row[1])
+        msg = "records: %s, test: %s" % (records, test)
+        self.assertTrue(records == test, msg=msg)
+
+    def test_DLL_RadixSortList(self):
+        """
+        Check that a radix sort orders the list the same as a stable sort on
+        text and integer fields, and the correct return codes are returned.
+
+        @return: C{None}
+        """
+        # Test no records
+        self._radixSort(Info, 'value', result=Return.NULL_LIST)
+        self._destroyList()
+        self._dll.create(sizeof(Record), infoClass=Record)
+        rows = [("%05d" % ((idx * 37) % 101), (idx * 7919) % 70001)
+                for idx in range(400)]
+
+        for row in rows:
+            self._addRecord(Record(*row))
+
+        self._radixSort(Record, 'count')
+        records = [(r.value, r.count) for r in self._dll]
+        test = sorted(rows, key=lambda row: row[1])
+        msg = "records: %s, test: %s" % (records, test)
+        self.assertTrue(records == test, msg=msg)
+        # Test equal text keys keep the order of the last sort.
+        self._radixSort(Record, 'value', endian=Endian.BIG)
+        records = [(r.value, r.count) for r in self._dll]
+        test = sorted(test, key=lambda row: row[0])
+        msg = "records: %s, test: %s" % (records, test)
+        self.assertTrue(records == test, msg=msg)
+        # Test an invalid byte order
+        self._radixSort(Record, 'count', endian=2,
+                        result=Return.NOT_MODIFIED)
+
     def test_DLL_UpdateCurrentRecord(self):
         """
         Check that a record gets updated correctly, the index values are
@@ -473,6 +1004,36 @@ class TestLibDll(unittest.TestCase):
         self._deleteEntireList()
         self._isListEmpty(test=True)
 
+    def test_DLL_DeleteEntireListBlocks(self):
+        """
+        Check that a list using block allocation is emptied correctly, that its
+        blocks are reused afterwards, and the correct return codes are
+        returned.
+
+        @return: C{None}
+        """
+        self._setBlockSize(2)
+        # Test no records
+        self._deleteEntireList(result=Return.NULL_LIST)
+
+        for count in (5, 3, 7):
+            values = ["%04d - This is a test record." % idx
+                      for idx in range(count)]
+
+            for value in values:
+                self._addRecord(Info(value))
+
+            self._getNumberOfRecords(test=count)
+            self._currentPointerToHead()
+
+            for idx in range(count):
+                self._getCurrentRecord(Info(), test=values[idx])
+                idx < (count-1) and self._incrementCurrentPointer()
+
+            self._deleteEntireList()
+            self._isListEmpty(test=True)
+            self._getCurrentIndex(test=0)
+
     def test_DLL_FindRecord(self):
         """
         Check that records are found correctly, the index values are correct
@@ -502,6 +1063,121 @@ class TestLibDll(unittest.TestCase):
         self._findRecord(record, Info("Record not found."),
                          self._dll.compare(), result=Return.NOT_FOUND)
 
+    def test_DLL_FieldComparator(self):
+        """
+        Check that native field comparators order and find records correctly
+        for each field type in both directions, that the same comparator is
+        returned for the same field, and the correct return codes are returned.
+
+        @return: C{None}
+        """
+        self._destroyList()
+        self._dll.create(sizeof(Record), infoClass=Record)
+        rows = (("CCCC", 3, -2, 200, 2.5, -1.5),
+                ("AAAA", -7, 300, 7, -0.5, 8.0),
+                ("DDDD", 12, -400, 0, 10.25, 0.0),
+                ("BBBB", 0, 5, 255, 1.0, 2.25))
+
+        for field in ('value', 'count', 'delta', 'flags', 'weight', 'ratio'):
+            for descending in (False, True):
+                pFun = self._fieldComparator(Record, field,
+                                             descending=descending)
+
+                for row in rows:
+                    self._addRecord(Record(*row), pFun)
+
+                records = [getattr(r, field) for r in self._dll]
+                test = sorted(records, reverse=descending)
+                msg = "field: %s, records: %s, test: %s" % (field, records,
+                                                            test)
+                self.assertTrue(records == test, msg=msg)
+                self._deleteEntireList()
+
+        # Test find with a comparator.
+        for row in rows:
+            self._addRecord(Record(*row))
+
+        pFun = self._fieldComparator(Record, 'count')
+        self._findRecord(Record(), Record("DDDD", 12), pFun)
+        self._getCurrentIndex(test=3)
+        self._findRecord(Record(), Record("", 99), pFun,
+                         result=Return.NOT_FOUND)
+        # Test the same comparator is returned for the same field.
+        cmp1 = self._fieldComparator(Record, 'value')
+        cmp2 = self._fieldComparator(Record, 'value', type=FieldType.STRING)
+        cmp3 = self._fieldComparator(Record, 'value', type=FieldType.MEMORY)
+        address = lambda f: cast(f, c_void_p).value
+        self.assertTrue(address(cmp1) == address(cmp2))
+        self.assertTrue(address(cmp1) != address(cmp3))
+        # Test invalid field and type.
+        self.assertRaises(APIException, self._dll.fieldComparator, Record,
+                          'missing')
+        self._fieldComparator(Record, 'value', type=FieldType.FLOAT,
+                              result=Return.NOT_MODIFIED)
+
+    def test_DLL_FindByKey(self):
+        """
+        Check that a record is found by its key, that it is made current with
+        the correct index, and the correct return codes are returned.
+
+        @return: C{None}
+        """
+        # Test with no index.
+        self._findByKey(Info(), "AAAA", result=Return.NULL_FUNCTION)
+        self._createIndex('value', infoClass=Info)
+        # Test no records.
+        self._findByKey(Info(), "AAAA", result=Return.NULL_LIST)
+        values = []
+        values.append("ZZZZ - This is test record one.")
+        values.append("AAAA - This is test record two.")
+        values.append("NNNN - This is test record three.")
+        values.append("YYYY - This is test record four.")
+
+        for value in values:
+            self._addRecord(Info(value))
+
+        for idx, value in enumerate(values):
+            self._findByKey(Info(), value, test=value)
+            self._getCurrentIndex(test=idx + 1)
+
+        # Test an Info object can hold the key.
+        self._findByKey(Info(), Info(values[2]), test=values[2])
+        self._getNextRecord(Info(), test=values[3])
+        self._getCurrentIndex(test=4)
+        self._findByKey(Info(), values[1], test=values[1])
+        self._getPriorRecord(Info(), test=values[0])
+        self._getCurrentIndex(test=1)
+        self._findByKey(Info(), "AAAA", result=Return.NOT_FOUND)
+
+    def test_DLL_FindLowerBound(self):
+        """
+        Check that the first record not less than the match is found with
+        the skip list, and the correct return codes are returned.
+
+        @return: C{None}
+        """
+        # Test with no skip list.
+        self._findLowerBound(Info(), Info("AAAA"),
+                             result=Return.NULL_FUNCTION)
+        self._setSkipList(self._dll.compare())
+        # Test no records.
+        self._findLowerBound(Info(), Info("AAAA"), result=Return.NULL_LIST)
+        values = ["BBBB", "DDDD", "DDDD", "FFFF"]
+
+        for value in reversed(values):
+            self._addRecord(Info(value))
+
+        self._findLowerBound(Info(), Info("AAAA"), test="BBBB")
+        self._getCurrentIndex(test=1)
+        self._findLowerBound(Info(), Info("CCCC"), test="DDDD")
+        self._getCurrentIndex(test=2)
+        self._findLowerBound(Info(), Info("DDDD"), test="DDDD")
+        self._getCurrentIndex(test=2)
+        self._findLowerBound(Info(), Info("EEEE"), test="FFFF")
+        self._getCurrentIndex(test=4)
+        self._findLowerBound(Info(), Info("GGGG"), result=Return.NOT_FOUND)
+        self._getCurrentIndex(test=4)
+
     def test_DLL_FindNthRecord(self):
         """
         Check that records are found correctly based on the skip value, the
@@ -624,33 +1300,363 @@ class TestLibDll(unittest.TestCase):
         self._getNextRecord(Info(), test=values[1])
         self._getCurrentIndex(test=2)
 
-    def test_DLL_Save_LoadList(self):
+    def test_DLL_GetRecordAt(self):
         """
-        Check that the list is saved and loaded correctly, the index values are
-        correct after the loads, the sorting on load is done properly, and the
-        correct return codes are returned.
+        Check that the record at an index is returned and made current, that
+        the stored record is used correctly after the list is changed, that
+        the list can be indexed, and the correct return codes are returned.
 
         @return: C{None}
         """
-        filePath = "/tmp/unittest.data"
         # Test no records
-        self._saveList(filePath, result=Return.NULL_LIST)
-        # Test saving list to dick
+        self._getRecordAt(Info(), 1, result=Return.NULL_LIST)
         values = []
         values.append("ZZZZ - This is test record one.")
         values.append("AAAA - This is test record two.")
         values.append("NNNN - This is test record three.")
         values.append("YYYY - This is test record four.")
         values.append("BBBB - This is test record five.")
-        values.append("MMMM - This is test record six.")
 
         for value in values:
             self._addRecord(Info(value))
 
-        self._getNumberOfRecords(test=6)
-        self._saveList(filePath)
-        # Test already has data in list.
-        self._saveList(filePath, result=Return.NOT_MODIFIED)
+        self._getRecordAt(Info(), 3, test=values[2])
+        self._getCurrentIndex(test=3)
+        # Test out of range leaves the current record.
+        self._getRecordAt(Info(), 0, result=Return.NOT_FOUND)
+        self._getRecordAt(Info(), 6, result=Return.NOT_FOUND)
+        self._getCurrentIndex(test=3)
+        # Test the stored record is not used once it has moved.
+        self._storeCurrentPointer()
+        self._currentPointerToHead()
+        self._insertRecord(Info("MMMM"), InsertDir.ABOVE)
+        values.insert(0, "MMMM")
+        self._restoreCurrentPointer()
+        self._getCurrentIndex(test=4)
+
+        for idx in (4, 3, 5, 1, 6):
+            self._getRecordAt(Info(), idx, test=values[idx-1])
+
+        # Test indexing the list.
+        for idx in (0, -1, 3):
+            record = Info.from_buffer_copy(self._dll[idx])
+            msg = "record.value: %s, test: %s" % (record.value, values[idx])
+            self.assertTrue(record.value == values[idx], msg=msg)
+
+        self.assertRaises(IndexError, self._dll.__getitem__, len(values))
+        self.assertRaises(TypeError, self._dll.__getitem__, "1")
+
+    def test_DLL_GetRecords(self):
+        """
+        Check that iterating over the list returns every record in order in
+        both directions for different chunk sizes, and that C{len()} returns
+        the number of records.
+
+        @return: C{None}
+        """
+        # Test no records
+        self._iterRecords(test=[])
+        self.assertTrue(len(self._dll) == 0, msg="len: %s" % len(self._dll))
+        # Test raw records
+        values = []
+        values.append("ZZZZ - This is test record one.")
+        values.append("AAAA - This is test record two.")
+        values.append("NNNN - This is test record three.")
+        values.append("YYYY - This is test record four.")
+        values.append("BBBB - This is test record five.")
+
+        for value in values:
+            self._addRecord(Info(value))
+
+        self.assertTrue(len(self._dll) == 5, msg="len: %s" % len(self._dll))
+
+        for chunkSize in (1, 2, 5, 64):
+            self._iterRecords(test=values, chunkSize=chunkSize)
+            self._iterRecords(dir=SrchDir.UP, test=values[::-1],
+                              chunkSize=chunkSize)
+
+        self._getCurrentIndex(test=1)
+        # Test records returned as Info objects
+        self._destroyList()
+        self._dll.create(sizeof(Info), infoClass=Info)
+
+        for value in values:
+            self._addRecord(Info(value))
+
+        records = [info.value for info in self._dll]
+        msg = "records: %s, values: %s" % (records, values)
+        self.assertTrue(records == values, msg=msg)
+        records = [info.value for info in reversed(self._dll)]
+        msg = "records: %s, values: %s" % (records, values[::-1])
+        self.assertTrue(records == values[::-1], msg=msg)
+
+    def test_DLL_LenNoList(self):
+        """
+        Check that C{len()} and C{bool()} return zero and C{False} on a list
+        that has not been created or has been destroyed.
+
+        @return: C{None}
+        """
+        # Test a list that was never created
+        dll = DLinklist(disableLogging=True)
+        self.assertTrue(len(dll) == 0, msg="len: %s" % len(dll))
+        self.assertFalse(dll, msg="bool: %s" % bool(dll))
+        self.assertRaises(IndexError, dll.__getitem__, 0)
+        # Test a destroyed list
+        self._addRecord(Info("ZZZZ - This is test record one."))
+        self.assertTrue(self._dll, msg="bool: %s" % bool(self._dll))
+        self._destroyList()
+        self.assertTrue(len(self._dll) == 0, msg="len: %s" % len(self._dll))
+        self.assertFalse(self._dll, msg="bool: %s" % bool(self._dll))
+        self._dll.create(sizeof(Info))
+
+    def test_DLL_CopyToBuffer(self):
+        """
+        Check that ranges of records are copied into arrays correctly, the
+        current index is not changed, and the correct return codes are
+        returned.
+
+        @return: C{None}
+        """
+        # Test no records
+        self._toArray(Info * 1, count=1, result=Return.NULL_LIST)
+        values = []
+        values.append("ZZZZ - This is test record one.")
+        values.append("AAAA - This is test record two.")
+        values.append("NNNN - This is test record three.")
+        values.append("YYYY - This is test record four.")
+        values.append("BBBB - This is test record five.")
+
+        for value in values:
+            self._addRecord(Info(value))
+
+        self._currentPointerToHead()
+        self._incrementCurrentPointer()
+        # Test whole list and ranges from both ends.
+        self._toArray(Info * 5, test=values)
+        self._toArray(Info * 2, start=1, count=2, test=values[1:3])
+        self._toArray(Info * 2, start=3, test=values[3:])
+        self._toArray(Info * 1, start=4, count=1, test=values[4:])
+        self._getCurrentIndex(test=2)
+        # Test out of range.
+        self._toArray(Info * 2, start=4, count=2, result=Return.NOT_FOUND)
+        self._toArray(Info * 1, start=5, count=1, result=Return.NOT_FOUND)
+        # Test buffer too small.
+        self.assertRaises(APIException, self._dll.toArray, (Info * 4)())
+        # Test new array returned.
+        out = self._dll.toArray(start=3)
+        records = [Info.from_buffer_copy(out, offset).value
+                   for offset in range(0, sizeof(out), sizeof(Info))]
+        msg = "records: %s, values: %s" % (records, values[3:])
+        self.assertTrue(records == values[3:], msg=msg)
+
+    def test_DLL_CreateCursor(self):
+        """
+        Check that cursors move, find and iterate independently of each other
+        and of the current record, and that destroyed cursors raise an
+        exception.
+
+        @return: C{None}
+        """
+        # Test no records
+        cursor = self._createCursor()
+        self._cursorRecord(cursor.getCurrentRecord, (Info(),),
+                           result=Return.NULL_LIST)
+        self._cursorRecord(cursor.getRecordAt, (Info(), 1),
+                           result=Return.NULL_LIST)
+        values = []
+        values.append("ZZZZ - This is test record one.")
+        values.append("AAAA - This is test record two.")
+        values.append("NNNN - This is test record three.")
+        values.append("YYYY - This is test record four.")
+        values.append("BBBB - This is test record five.")
+
+        for value in values:
+            self._addRecord(Info(value))
+
+        other = self._createCursor()
+        self._currentPointerToHead()
+        self._incrementCurrentPointer()
+        # Test each cursor keeps its own position.
+        self._cursorRecord(cursor.getRecordAt, (Info(), 4), test=values[3])
+        self._cursorRecord(other.getCurrentRecord, (Info(),), test=values[0])
+        self._cursorRecord(other.getNextRecord, (Info(),), test=values[1])
+        self._cursorRecord(cursor.getPriorRecord, (Info(),), test=values[2])
+        other.toTail()
+        self._cursorRecord(other.getNextRecord, (Info(),),
+                           result=Return.NOT_FOUND)
+        self.assertTrue(cursor.getCurrentIndex() == 3)
+        self.assertTrue(other.getCurrentIndex() == 5)
+        # Test iterating and finding with a cursor leave the list alone.
+        records = [Info.from_buffer_copy(raw).value for raw in cursor]
+        msg = "records: %s, values: %s" % (records, values)
+        self.assertTrue(records == values, msg=msg)
+        other.setSearchModes(SrchOrigin.TAIL, SrchDir.UP)
+        self._cursorRecord(other.findRecord, (Info(), Info(values[1]),
+                                              self._dll.compare()),
+                           test=values[1])
+        self.assertTrue(other.getCurrentIndex() == 2)
+        other.setSearchModes(SrchOrigin.CURRENT, SrchDir.DOWN)
+        self._cursorRecord(other.findNthRecord, (Info(), 2), test=values[3])
+        self._cursorRecord(other.findNthRecord, (Info(), 2),
+                           result=Return.NOT_FOUND)
+        self._getSearchModes()
+        self._getCurrentIndex(test=2)
+        self._getCurrentRecord(Info(), test=values[1])
+        # Test destroyed cursors.
+        other.destroy()
+        other.destroy()
+        self.assertRaises(APIException, other.toHead)
+        self._destroyList()
+        self.assertRaises(APIException, cursor.toHead)
+        self._initList(sizeof(Info))
+
+    def test_DLL_CursorInsertDelete(self):
+        """
+        Check that inserting and deleting records through a cursor keeps the
+        other cursors and the current record on their records.
+
+        @return: C{None}
+        """
+        cursor = self._createCursor()
+        self._cursorRecord(cursor.insertRecord, (Info("CCCC"),
+                                                 InsertDir.BELOW))
+        self._cursorRecord(cursor.insertRecord, (Info("AAAA"),
+                                                 InsertDir.ABOVE))
+        self._cursorRecord(cursor.insertRecord, (Info("BBBB"),
+                                                 InsertDir.BELOW))
+        self._cursorRecord(cursor.insertRecord, (Info("XXXX"), -1),
+                           result=Return.NOT_MODIFIED)
+        self._iterRecords(test=["AAAA", "BBBB", "CCCC"])
+        self.assertTrue(cursor.getCurrentIndex() == 2)
+        self._currentPointerToTail()
+        other = self._createCursor()
+        other.toTail()
+        # Test inserting above the current record moves its index.
+        self._cursorRecord(cursor.insertRecord, (Info("DDDD"),
+                                                 InsertDir.BELOW))
+        self._getCurrentIndex(test=4)
+        self._getCurrentRecord(Info(), test="CCCC")
+        self.assertTrue(other.getCurrentIndex() == 4)
+        # Test deleting the record under other cursors moves them on.
+        self._cursorRecord(other.getPriorRecord, (Info(),), test="DDDD")
+        self._cursorRecord(cursor.deleteRecord, ())
+        self._cursorRecord(cursor.getCurrentRecord, (Info(),), test="CCCC")
+        self._cursorRecord(other.getCurrentRecord, (Info(),), test="CCCC")
+        self.assertTrue(other.getCurrentIndex() == 3)
+        self._getCurrentIndex(test=3)
+        # Test deleting the tail moves back.
+        self._cursorRecord(cursor.deleteRecord, ())
+        self._cursorRecord(cursor.getCurrentRecord, (Info(),), test="BBBB")
+        self._getCurrentRecord(Info(), test="BBBB")
+        self._getCurrentIndex(test=2)
+        self._iterRecords(test=["AAAA", "BBBB"])
+        # Test deleting all records empties the cursors.
+        self._deleteEntireList()
+        self._cursorRecord(other.getCurrentRecord, (Info(),),
+                           result=Return.NULL_LIST)
+        self._cursorRecord(other.deleteRecord, (), result=Return.NULL_LIST)
+        self.assertTrue(other.getCurrentIndex() == 0)
+
+    def test_DLL_QueryRecord(self):
+        """
+        Check that the query methods find the same records as the methods
+        they mirror, return the positions of the records, and leave the
+        current record and search modes alone, also when several threads
+        query the list at once.
+
+        @return: C{None}
+        """
+        # Test no records
+        self._queryRecord(self._dll.queryRecordAt, (Info(), 1),
+                          result=Return.NULL_LIST)
+        self._queryRecord(self._dll.queryNextRecord, (Info(), Position()),
+                          result=Return.NULL_LIST)
+        records = [raw for raw in self._dll.queryRecords()]
+        self.assertTrue(records == [], msg="records: %s" % records)
+        values = []
+        values.append("ZZZZ - This is test record one.")
+        values.append("AAAA - This is test record two.")
+        values.append("NNNN - This is test record three.")
+        values.append("YYYY - This is test record four.")
+        values.append("BBBB - This is test record five.")
+
+        for value in values:
+            self._addRecord(Info(value))
+
+        self._currentPointerToHead()
+        self._incrementCurrentPointer()
+        position = Position()
+        self._queryRecord(self._dll.queryRecord,
+                          (Info(), Info(values[3]), self._dll.compare(),
+                           SrchOrigin.TAIL, SrchDir.UP, position),
+                          test=values[3])
+        self.assertTrue(position.index == 4, msg="index: %s" % position.index)
+        self._queryRecord(self._dll.queryNthRecord,
+                          (Info(), 2, SrchOrigin.CURRENT, SrchDir.UP,
+                           position), test=values[1])
+        self.assertTrue(position.index == 2, msg="index: %s" % position.index)
+        self._queryRecord(self._dll.queryNthRecord,
+                          (Info(), 2, SrchOrigin.CURRENT, SrchDir.UP,
+                           position), result=Return.NOT_FOUND)
+        self._queryRecord(self._dll.queryRecordAt, (Info(), 5, position),
+                          test=values[4])
+        self._queryRecord(self._dll.queryNextRecord, (Info(), position),
+                          result=Return.NOT_FOUND)
+        self._queryRecord(self._dll.queryNextRecord,
+                          (Info(), position, SrchDir.UP), test=values[3])
+        self._queryRecord(self._dll.queryRecord,
+                          (Info(), Info(values[0]), self._dll.compare(),
+                           -1, SrchDir.DOWN), result=Return.NOT_MODIFIED)
+        records = [Info.from_buffer_copy(raw).value for raw in
+                   self._dll.queryRecords(dir=SrchDir.UP, chunkSize=2)]
+        msg = "records: %s, values: %s" % (records, values[::-1])
+        self.assertTrue(records == values[::-1], msg=msg)
+        self._getCurrentIndex(test=2)
+        self._getSearchModes()
+        # Test iterating from several threads at once.
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            [Info.from_buffer_copy(raw).value for raw in
+             self._dll.queryRecords(chunkSize=1)])) for i in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        msg = "results: %s, values: %s" % (results, values)
+        self.assertTrue(results == [values] * 4, msg=msg)
+        self._getCurrentIndex(test=2)
+
+    def test_DLL_Save_LoadList(self):
+        """
+        Check that the list is saved and loaded correctly, the index values are
+        correct after the loads, the sorting on load is done properly, and the
+        correct return codes are returned.
+
+        @return: C{None}
+        """
+        filePath = "/tmp/unittest.data"
+        # Test no records
+        self._saveList(filePath, result=Return.NULL_LIST)
+        # Test saving list to dick
+        values = []
+        values.append("ZZZZ - This is test record one.")
+        values.append("AAAA - This is test record two.")
+        values.append("NNNN - This is test record three.")
+        values.append("YYYY - This is test record four.")
+        values.append("BBBB - This is test record five.")
+        values.append("MMMM - This is test record six.")
+
+        for value in values:
+            self._addRecord(Info(value))
+
+        self._getNumberOfRecords(test=6)
+        self._saveList(filePath)
+        # Test already has data in list.
+        self._saveList(filePath, result=Return.NOT_MODIFIED)
         # Test load list.
         self._loadList(filePath, self._dll.compare())
         # The current index is an arbitrary number depending on the sort
@@ -663,6 +1669,358 @@ class TestLibDll(unittest.TestCase):
         self._getCurrentIndex(test=1)
         os.remove(filePath)
 
+    def test_DLL_LoadListEx(self):
+        """
+        Check that the list is loaded correctly in each load mode, the
+        modified state is correct after the loads, and the correct return
+        codes are returned.
+
+        @return: C{None}
+        """
+        filePath = "/tmp/unittest.data"
+        values = ["%04d - Test record." % ((idx * 7919) % 1000)
+                  for idx in range(1000)]
+
+        for value in values:
+            self._addRecord(Info(value))
+
+        self._saveList(filePath)
+        # Test sort after load.
+        self._loadList(filePath, self._dll.compare(), mode=LoadMode.SORT)
+        self._getNumberOfRecords(test=1000)
+        self._iterRecords(test=sorted(values))
+        # Test insert and sort after load give the same order.
+        pFun = self._dll.fieldComparator(Info, 'value', descending=True)
+        self._loadList(filePath, pFun, mode=LoadMode.INSERT)
+        self._iterRecords(test=sorted(values, reverse=True))
+        self._loadList(filePath, pFun, mode=LoadMode.SORT)
+        self._iterRecords(test=sorted(values, reverse=True))
+        # Test sorted file is loaded as is and is unmodified.
+        self._saveList(filePath)
+        self._loadList(filePath, self._dll.compare(), mode=LoadMode.SORTED)
+        self._iterRecords(test=sorted(values, reverse=True))
+        self._saveList(filePath, result=Return.NOT_MODIFIED)
+        # Test load without a compare function in the sort mode.
+        self._loadList(filePath, mode=LoadMode.SORT)
+        self._getNumberOfRecords(test=1000)
+        # Test open error.
+        self._loadList("", mode=LoadMode.SORT, result=Return.OPEN_ERROR)
+        os.remove(filePath)
+
+    def test_DLL_LoadListMapped(self):
+        """
+        Check that a mapped load gives the same list as a read, changes are
+        not written back to the file, the list can be saved over its own
+        file, and the correct return codes are returned.
+
+        @return: C{None}
+        """
+        filePath = "/tmp/unittest.data"
+        values = ["%04d - Test record." % ((idx * 7919) % 1000)
+                  for idx in range(1000)]
+
+        for value in values:
+            self._addRecord(Info(value))
+
+        self._saveList(filePath)
+        data = open(filePath, 'rb').read()
+        # Test the mapped records sorted once and loaded as is.
+        self._loadList(filePath, self._dll.compare(),
+                       mode=LoadMode.MAP | LoadMode.SORT)
+        self._getNumberOfRecords(test=1000)
+        self._iterRecords(test=sorted(values))
+        self._loadList(filePath, mode=LoadMode.MAP | LoadMode.SORTED)
+        self._iterRecords(test=values)
+        self._saveList(filePath, result=Return.NOT_MODIFIED)
+        # Test changes are copied and the file is untouched.
+        self._currentPointerToHead()
+        self._updateCurrentRecord(Info("Changed record."))
+        self._deleteCurrentRecord()
+        self._addRecord(Info("Added record."))
+        msg = "The mapped file was changed."
+        self.assertTrue(open(filePath, 'rb').read() == data, msg=msg)
+        # Test a failed save over the mapped file leaves it whole.
+        limit = resource.getrlimit(resource.RLIMIT_FSIZE)
+        handler = signal.signal(signal.SIGXFSZ, signal.SIG_IGN)
+        resource.setrlimit(resource.RLIMIT_FSIZE, (1, limit[1]))
+
+        try:
+            self._saveList(filePath, result=Return.WRITE_ERROR)
+        finally:
+            resource.setrlimit(resource.RLIMIT_FSIZE, limit)
+            signal.signal(signal.SIGXFSZ, handler)
+
+        self.assertTrue(open(filePath, 'rb').read() == data, msg=msg)
+        temps = glob.glob(filePath + ".*")
+        self.assertFalse(temps, msg="Files left: %s" % temps)
+        # Test saving over the mapped file.
+        self._saveList(filePath)
+        self._iterRecords(test=values[1:] + ["Added record."])
+        self._deleteEntireList()
+        self._loadList(filePath, mode=LoadMode.MAP)
+        self._iterRecords(test=values[1:] + ["Added record."])
+        # Test open error.
+        self._loadList("", mode=LoadMode.MAP, result=Return.OPEN_ERROR)
+        os.remove(filePath)
+
+    def test_DLL_SaveListHeader(self):
+        """
+        Check that a file with a header is loaded the same as one without,
+        the sort order in the header is used, a file that does not match its
+        header is rejected, and the correct return codes are returned.
+
+        @return: C{None}
+        """
+        filePath = "/tmp/unittest.data"
+        values = ["%04d - Test record." % ((idx * 7919) % 1000)
+                  for idx in range(1000)]
+
+        for value in values:
+            self._addRecord(Info(value))
+
+        # Test invalid save mode.
+        self._saveList(filePath, mode=17, result=Return.NOT_MODIFIED)
+        # Test a file with a header loads as it was saved.
+        self._saveList(filePath, mode=SaveMode.HEADER)
+        size = os.path.getsize(filePath)
+        msg = "size: %s, records: %s" % (size, sizeof(Info) * 1000)
+        self.assertTrue(size > sizeof(Info) * 1000, msg=msg)
+        self._loadList(filePath)
+        self._iterRecords(test=values)
+        # Test a file in the comparator's order is not sorted again.
+        pFun = self._dll.fieldComparator(Info, 'value')
+        self._loadList(filePath, pFun, mode=LoadMode.SORT)
+        self._saveList(filePath, pFun=pFun, mode=SaveMode.HEADER)
+        self._loadList(filePath, pFun)
+        self._iterRecords(test=sorted(values))
+        self._saveList(filePath, result=Return.NOT_MODIFIED)
+        # Test a file out of the comparator's order is sorted.
+        pDesc = self._dll.fieldComparator(Info, 'value', descending=True)
+        self._loadList(filePath, pDesc, mode=LoadMode.SORT)
+        self._iterRecords(test=sorted(values, reverse=True))
+        # Test a mapped file with a header.
+        self._saveList(filePath, pFun=pDesc, mode=SaveMode.HEADER)
+        self._loadList(filePath, pDesc, mode=LoadMode.MAP | LoadMode.SORT)
+        self._getNumberOfRecords(test=1000)
+        self._iterRecords(test=sorted(values, reverse=True))
+        self._saveList(filePath, result=Return.NOT_MODIFIED)
+        # Test a header for another record size leaves the list as it was.
+        data = bytearray(open(filePath, 'rb').read())
+        infoSize = c_ulong.from_buffer(data, 8 + sizeof(c_ulong) * 2)
+        infoSize.value += 1
+        open(filePath, 'wb').write(data)
+        self._loadList(filePath, result=Return.READ_ERROR)
+        self._getNumberOfRecords(test=1000)
+        # Test a changed record empties the list.
+        infoSize.value -= 1
+        data[-1] ^= 0xff
+        open(filePath, 'wb').write(data)
+        self._loadList(filePath, result=Return.READ_ERROR)
+        self._getNumberOfRecords(test=0)
+        # Test a truncated file.
+        open(filePath, 'wb').write(data[:-sizeof(Info)])
+        self._loadList(filePath, result=Return.READ_ERROR)
+        os.remove(filePath)
+
+    def test_DLL_SaveListAtomic(self):
+        """
+        Check that an atomic save replaces the file whole and leaves nothing
+        behind, keeps the file's permissions, can replace a mapped file, and
+        the correct return codes are returned.
+
+        @return: C{None}
+        """
+        filePath = "/tmp/unittest.data"
+        values = ["%04d - Test record." % idx for idx in range(1000)]
+
+        for value in values:
+            self._addRecord(Info(value))
+
+        # Test the atomic save replaces the old file with its permissions.
+        open(filePath, 'wb').write("Old file.")
+        os.chmod(filePath, 0600)
+        self._saveList(filePath, mode=SaveMode.ATOMIC | SaveMode.SYNC)
+        mode = os.stat(filePath).st_mode & 0777
+        msg = "mode: %o" % mode
+        self.assertTrue(mode == 0600, msg=msg)
+        left = [name for name in os.listdir("/tmp")
+                if name.startswith("unittest.data.")]
+        msg = "Temporary files left: %s" % left
+        self.assertTrue(not left, msg=msg)
+        self._loadList(filePath, mode=LoadMode.MAP | LoadMode.SORTED)
+        self._iterRecords(test=values)
+        # Test replacing the mapped file keeps the mapped records.
+        self._currentPointerToHead()
+        self._deleteCurrentRecord()
+        self._saveList(filePath, mode=SaveMode.HEADER | SaveMode.ATOMIC)
+        self._iterRecords(test=values[1:])
+        self._loadList(filePath)
+        self._iterRecords(test=values[1:])
+        # Test invalid save mode.
+        self._deleteCurrentRecord()
+        self._saveList(filePath, mode=16, result=Return.NOT_MODIFIED)
+        # Test open error, nothing is left behind.
+        self._saveList("/tmp/no/such/dir/unittest.data",
+                       mode=SaveMode.ATOMIC, result=Return.OPEN_ERROR)
+        os.remove(filePath)
+
+    def test_DLL_Journal(self):
+        """
+        Check that changes are logged and replayed on a reopened list, that a
+        torn entry is dropped, that compaction empties the log, and the
+        correct return codes are returned.
+
+        @return: C{None}
+        """
+        filePath = "/tmp/unittest.data"
+        logPath = "/tmp/unittest.log"
+        headerSize = 8 + 4 * sizeof(c_ulong)
+
+        for path in (filePath, logPath):
+            if os.path.exists(path):
+                os.remove(path)
+
+        values = ["%04d - Test record." % idx for idx in range(5)]
+
+        for value in values[:3]:
+            self._addRecord(Info(value))
+
+        # Test the first snapshot is written and the log is started.
+        self._openJournal(filePath, logPath)
+        self._openJournal(filePath, logPath, result=Return.NOT_MODIFIED)
+        msg = "Snapshot not written."
+        self.assertTrue(os.path.exists(filePath), msg=msg)
+        size = os.path.getsize(logPath)
+        msg = "Log size: %d" % size
+        self.assertTrue(size == headerSize, msg=msg)
+        # Test each kind of change is replayed.
+        self._addRecord(Info(values[3]))
+        self._currentPointerToHead()
+        self._insertRecord(Info(values[4]), InsertDir.ABOVE)
+        self._incrementCurrentPointer()
+        self._updateCurrentRecord(Info("Updated record."))
+        self._swapRecord(InsertDir.BELOW)
+        self._currentPointerToTail()
+        self._deleteCurrentRecord()
+        records = (Info * 2)(*[Info(value) for value in values[:2]])
+        self._addRecords(records)
+        test = [values[4], values[1], "Updated record.", values[2]] + \
+               values[:2]
+        self._iterRecords(test=test)
+        self._closeJournal()
+        self._closeJournal(result=Return.NOT_MODIFIED)
+        self._compactJournal(result=Return.NOT_MODIFIED)
+        self._deleteEntireList()
+        self._openJournal(filePath, logPath)
+        self._iterRecords(test=test)
+        # Test a torn entry at the end of the log is dropped.
+        self._closeJournal()
+        size = os.path.getsize(logPath)
+        open(logPath, 'ab').write("Torn entry.")
+        self._deleteEntireList()
+        self._openJournal(filePath, logPath, sync=True)
+        self._iterRecords(test=test)
+        msg = "Log size: %d" % os.path.getsize(logPath)
+        self.assertTrue(os.path.getsize(logPath) == size, msg=msg)
+        # Test sorting writes a new snapshot and empties the log.
+        self._sort(self._dll.fieldComparator(Info, 'value'))
+        msg = "Log size: %d" % os.path.getsize(logPath)
+        self.assertTrue(os.path.getsize(logPath) == headerSize, msg=msg)
+        self._closeJournal()
+        self._deleteEntireList()
+        self._openJournal(filePath, logPath)
+        self._iterRecords(test=sorted(test))
+        # Test a log older than the snapshot is not replayed.
+        self._currentPointerToHead()
+        self._deleteCurrentRecord()
+        self._closeJournal()
+        data = open(logPath, 'rb').read()
+        self._openJournal(filePath, logPath)
+        self._compactJournal()
+        self._closeJournal()
+        open(logPath, 'wb').write(data)
+        self._deleteEntireList()
+        self._openJournal(filePath, logPath)
+        self._iterRecords(test=sorted(test)[1:])
+        # Test emptying the list removes the snapshot.
+        self._deleteEntireList()
+        msg = "Snapshot not removed."
+        self.assertTrue(not os.path.exists(filePath), msg=msg)
+        self._addRecord(Info(values[0]))
+        self._closeJournal()
+        self._deleteEntireList()
+        self._openJournal(filePath, logPath)
+        self._iterRecords(test=values[:1])
+        self._compactJournal()
+        self._closeJournal()
+        os.remove(filePath)
+        os.remove(logPath)
+
+    def test_DLL_SaveListCompact(self):
+        """
+        Check that a compact file is smaller than a raw one, loads the same
+        records byte for byte with or without a field layout, that a damaged
+        file is rejected, and the correct return codes are returned.
+
+        @return: C{None}
+        """
+        filePath = "/tmp/unittest.data"
+        values = ["%04d - Test record." % idx for idx in range(1000)]
+
+        for value in values:
+            self._addRecord(Info(value))
+
+        # Test a compact file without a layout.
+        self._saveList(filePath, mode=SaveMode.COMPACT)
+        self._loadList(filePath)
+        self._iterRecords(test=values)
+        # Test a compact file with a layout is smaller and is never mapped.
+        self._setFieldLayout(Info)
+        self._deleteCurrentRecord()
+        self._saveList(filePath, mode=SaveMode.COMPACT | SaveMode.ATOMIC)
+        size = os.path.getsize(filePath)
+        msg = "size: %s, records: %s" % (size, sizeof(Info) * 999)
+        self.assertTrue(size < sizeof(Info) * 999 / 2, msg=msg)
+        self._loadList(filePath, mode=LoadMode.MAP | LoadMode.SORTED)
+        self._iterRecords(test=values[:-1])
+        # Test a field that says it holds more than it can.
+        data = bytearray(open(filePath, 'rb').read())
+        headerSize = c_ulong.from_buffer(data, 8 + sizeof(c_ulong)).value
+        data[headerSize] = sizeof(Info) + 1
+        open(filePath, 'wb').write(data)
+        self._loadList(filePath, result=Return.READ_ERROR)
+        self._getNumberOfRecords(test=0)
+        # Test a truncated file.
+        data[headerSize] = len(values[0])
+        open(filePath, 'wb').write(data[:-1])
+        self._loadList(filePath, result=Return.READ_ERROR)
+        open(filePath, 'wb').write(data)
+        self._loadList(filePath)
+        self._iterRecords(test=values[:-1])
+        # Test the bytes between fields are kept.
+        self._destroyList()
+        self._dll.create(sizeof(Record), infoClass=Record)
+        self._setFieldLayout()
+        records = []
+
+        for idx in range(100):
+            record = Record("r%d" % idx, idx, -idx, idx % 256, idx / 3.0)
+            data = bytearray(string_at(addressof(record), sizeof(Record)))
+            data[Record.value.size] = 0xaa
+            records.append(str(data))
+            self._addRecord(Record.from_buffer_copy(data))
+
+        self._saveList(filePath, mode=SaveMode.COMPACT)
+        self._deleteEntireList()
+        self._loadList(filePath)
+        test = [string_at(addressof(record), sizeof(Record))
+                for record in self._dll.iterRecords()]
+        msg = "Records do not match."
+        self.assertTrue(test == records, msg=msg)
+        # Test a field outside the record.
+        self.assertRaises(FunctionException, self._dll.setFieldLayout, Info)
+        os.remove(filePath)
+
     #
     # Methods to interface into ctypes.
     #
@@ -701,6 +2059,172 @@ class TestLibDll(unittest.TestCase):
         except APIException, e:
             self.fail(e)
 
+    def _setBlockSize(self, blockSize, result=Return.NORMAL):
+        """
+        Execute the C{setBlockSize} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
+        @param blockSize: The number of records in each block.
+        @type blockSize: C{int}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.setBlockSize(blockSize)
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+    def _setInlineInfo(self, flag, result=Return.NORMAL):
+        """
+        Execute the C{setInlineInfo} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
+        @param flag: C{True} to store records with their C{Node}.
+        @type flag: C{bool}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.setInlineInfo(flag)
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+    def _setSkipList(self, pFun, result=Return.NORMAL):
+        """
+        Execute the C{setSkipList} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
+        @param pFun: The compare function or C{None}.
+        @type pFun: C{ctypes CFUNCTYPE}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.setSkipList(pFun)
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+    def _createIndex(self, field, infoClass=None, result=Return.NORMAL):
+        """
+        Execute the C{createIndex} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
+        @param field: The name of the field to index or C{None}.
+        @type field: C{str}
+        @keyword infoClass: The C{Info} class, the default is C{None}.
+        @type infoClass: C{ctypes Structure}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.createIndex(field, infoClass=infoClass)
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+    def _setFieldLayout(self, infoClass=None, result=Return.NORMAL):
+        """
+        Execute the C{setFieldLayout} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
+        @keyword infoClass: The user defined C{Info} class, the default
+                            C{None} uses the class given to C{create}.
+        @type infoClass: C{ctypes Structure}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.setFieldLayout(infoClass=infoClass)
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+    def _setThreadSafe(self, flag, result=Return.NORMAL):
+        """
+        Execute the C{setThreadSafe} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
+        @param flag: C{True} to lock the list.
+        @type flag: C{bool}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.setThreadSafe(flag)
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+    def _setParallelSearch(self, threads, minSize=0, result=Return.NORMAL):
+        """
+        Execute the C{setParallelSearch} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
+        @param threads: The number of threads.
+        @type threads: C{int}
+        @keyword minSize: The fewest records searched in parallel, the default
+                          is C{0}.
+        @type minSize: C{int}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.setParallelSearch(threads, minSize=minSize)
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+    def _setCheckpoints(self, step, result=Return.NORMAL):
+        """
+        Execute the C{setCheckpoints} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
+        @param step: The number of records between checkpoints.
+        @type step: C{int}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.setCheckpoints(step)
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
     def _isListEmpty(self, test=True):
         """
         Executes the C{isListEmpty} method, asserts that there are no
@@ -831,154 +2355,277 @@ class TestLibDll(unittest.TestCase):
             msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
             self.assertTrue(e.getRetval() == result, msg=msg)
 
-    def _currentPointerToTail(self, result=Return.NORMAL):
+    def _currentPointerToTail(self, result=Return.NORMAL):
+        """
+        Execute the C{currentPointerToTail} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.currentPointerToTail()
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+    def _incrementCurrentPointer(self, result=Return.NORMAL):
+        """
+        Execute the C{incrementCurrentPointer} method, asserts that there are
+        no C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.incrementCurrentPointer()
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+    def _decrementCurrentPointer(self, result=Return.NORMAL):
+        """
+        Execute the C{decrementCurrentPointer} method, asserts that there are
+        no C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.decrementCurrentPointer()
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+    def _storeCurrentPointer(self, result=Return.NORMAL):
+        """
+        Execute the C{storeCurrentPointer} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.storeCurrentPointer()
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+    def _restoreCurrentPointer(self, result=Return.NORMAL):
+        """
+        Execute the C{restoreCurrentPointer} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.restoreCurrentPointer()
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+    def _addRecord(self, info, pFun=None, result=Return.NORMAL):
         """
-        Execute the C{currentPointerToTail} method, asserts that there are no
+        Execute the C{addRecord} method, asserts that there are no
         C{APIException} or C{FunctionException} exceptions, and asserts that
         the return code is correct.
 
+        @param info: An instance of the C{Info} class.
+        @type info: C{Info}
+        @keyword pFun: An optional compare function, the default is C{None}.
+        @type pFun: C{ctypes CFUNCTYPE}
         @keyword result: The expected value, the default is C{Return.NORMAL}.
         @type result: C{Return}
         @return: C{None}
         """
         try:
-            retval = self._dll.currentPointerToTail()
+            retval = self._dll.addRecord(info, pFun=pFun)
         except APIException, e:
             self.fail(e)
         except FunctionException, e:
             msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
             self.assertTrue(e.getRetval() == result, msg=msg)
 
-    def _incrementCurrentPointer(self, result=Return.NORMAL):
+    def _addRecords(self, records, count=None, pFun=None,
+                    result=Return.NORMAL):
         """
-        Execute the C{incrementCurrentPointer} method, asserts that there are
-        no C{APIException} or C{FunctionException} exceptions, and asserts that
+        Execute the C{addRecords} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
         the return code is correct.
 
+        @param records: An array of records.
+        @type records: C{ctypes Array}, C{str} or a buffer object
+        @keyword count: The number of records to add, the default is C{None}.
+        @type count: C{int}
+        @keyword pFun: An optional compare function, the default is C{None}.
+        @type pFun: C{ctypes CFUNCTYPE}
         @keyword result: The expected value, the default is C{Return.NORMAL}.
         @type result: C{Return}
         @return: C{None}
         """
         try:
-            retval = self._dll.incrementCurrentPointer()
+            retval = self._dll.addRecords(records, count=count, pFun=pFun)
         except APIException, e:
             self.fail(e)
         except FunctionException, e:
             msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
             self.assertTrue(e.getRetval() == result, msg=msg)
 
-    def _decrementCurrentPointer(self, result=Return.NORMAL):
+    def _insertRecord(self, info, dir, result=Return.NORMAL):
         """
-        Execute the C{decrementCurrentPointer} method, asserts that there are
-        no C{APIException} or C{FunctionException} exceptions, and asserts that
+        Execute the C{insertRecord} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
         the return code is correct.
 
+        @param info: An instance of the C{Info} class.
+        @type info: C{Info}
+        @param dir: The direction to insert indicator.
+        @type dir: C{InsertDir}
         @keyword result: The expected value, the default is C{Return.NORMAL}.
         @type result: C{Return}
         @return: C{None}
         """
         try:
-            retval = self._dll.decrementCurrentPointer()
+            retval = self._dll.insertRecord(info, dir)
         except APIException, e:
             self.fail(e)
         except FunctionException, e:
             msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
             self.assertTrue(e.getRetval() == result, msg=msg)
 
-    def _storeCurrentPointer(self, result=Return.NORMAL):
+    def _swapRecord(self, dir, result=Return.NORMAL):
         """
-        Execute the C{storeCurrentPointer} method, asserts that there are no
+        Execute the C{swapRecord} method, asserts that there are no
         C{APIException} or C{FunctionException} exceptions, and asserts that
         the return code is correct.
 
+        @param dir: The direction to swap indicator.
+        @type dir: C{InsertDir}
         @keyword result: The expected value, the default is C{Return.NORMAL}.
         @type result: C{Return}
         @return: C{None}
         """
         try:
-            retval = self._dll.storeCurrentPointer()
+            retval = self._dll.swapRecord(dir)
         except APIException, e:
             self.fail(e)
         except FunctionException, e:
             msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
             self.assertTrue(e.getRetval() == result, msg=msg)
 
-    def _restoreCurrentPointer(self, result=Return.NORMAL):
+    def _sort(self, pFun, result=Return.NORMAL):
         """
-        Execute the C{restoreCurrentPointer} method, asserts that there are no
+        Execute the C{sort} method, asserts that there are no
         C{APIException} or C{FunctionException} exceptions, and asserts that
         the return code is correct.
 
+        @param pFun: The compare function.
+        @type pFun: C{ctypes CFUNCTYPE}
         @keyword result: The expected value, the default is C{Return.NORMAL}.
         @type result: C{Return}
         @return: C{None}
         """
         try:
-            retval = self._dll.restoreCurrentPointer()
+            retval = self._dll.sort(pFun)
         except APIException, e:
             self.fail(e)
         except FunctionException, e:
             msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
             self.assertTrue(e.getRetval() == result, msg=msg)
 
-    def _addRecord(self, info, pFun=None, result=Return.NORMAL):
+    def _sortByKey(self, key, reverse=False, result=Return.NORMAL):
         """
-        Execute the C{addRecord} method, asserts that there are no
-        C{APIException} or C{FunctionException} exceptions, and asserts that
-        the return code is correct.
+        Execute the C{sort} method with a key function, asserts that there are
+        no C{APIException} or C{FunctionException} exceptions, and asserts
+        that the return code is correct.
 
-        @param info: An instance of the C{Info} class.
-        @type info: C{Info}
-        @keyword pFun: An optional compare function, the default is C{None}.
-        @type pFun: C{ctypes CFUNCTYPE}
+        @param key: The key function.
+        @type key: C{callable}
+        @keyword reverse: Sort the largest keys first, the default is
+                          C{False}.
+        @type reverse: C{bool}
         @keyword result: The expected value, the default is C{Return.NORMAL}.
         @type result: C{Return}
         @return: C{None}
         """
         try:
-            retval = self._dll.addRecord(info, pFun=pFun)
+            self._dll.sort(key=key, reverse=reverse)
         except APIException, e:
             self.fail(e)
         except FunctionException, e:
             msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
             self.assertTrue(e.getRetval() == result, msg=msg)
 
-    def _insertRecord(self, info, dir, result=Return.NORMAL):
+    def _parallelSort(self, pFun, threads, result=Return.NORMAL, test=None):
         """
-        Execute the C{insertRecord} method, asserts that there are no
+        Execute the C{parallelSort} method, asserts that there are no
         C{APIException} or C{FunctionException} exceptions, and asserts that
-        the return code is correct.
+        the return code and statistics are correct.
 
-        @param info: An instance of the C{Info} class.
-        @type info: C{Info}
-        @param dir: The direction to insert indicator.
-        @type dir: C{InsertDir}
+        @param pFun: The compare function.
+        @type pFun: C{ctypes CFUNCTYPE}
+        @param threads: The number of threads.
+        @type threads: C{int}
         @keyword result: The expected value, the default is C{Return.NORMAL}.
         @type result: C{Return}
+        @keyword test: The expected number of threads used.
+        @type test: C{int}
         @return: C{None}
         """
         try:
-            retval = self._dll.insertRecord(info, dir)
+            stats = self._dll.parallelSort(pFun, threads)
+            msg = "stats.threads: %s, test: %s" % (stats.threads, test)
+            self.assertTrue(test is None or stats.threads == test, msg=msg)
+            msg = "stats.comparisons: %s" % stats.comparisons
+            self.assertTrue(stats.comparisons > 0, msg=msg)
+            msg = "stats.seconds: %s" % stats.seconds
+            self.assertTrue(stats.seconds >= 0.0, msg=msg)
         except APIException, e:
             self.fail(e)
         except FunctionException, e:
             msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
             self.assertTrue(e.getRetval() == result, msg=msg)
 
-    def _swapRecord(self, dir, result=Return.NORMAL):
+    def _radixSort(self, infoClass, field, endian=None,
+                   result=Return.NORMAL):
         """
-        Execute the C{swapRecord} method, asserts that there are no
+        Execute the C{radixSort} method, asserts that there are no
         C{APIException} or C{FunctionException} exceptions, and asserts that
         the return code is correct.
 
-        @param dir: The direction to swap indicator.
-        @type dir: C{InsertDir}
+        @param infoClass: The C{Info} class.
+        @type infoClass: C{ctypes Structure}
+        @param field: The name of the key field.
+        @type field: C{str}
+        @keyword endian: The byte order, the default is C{None}.
+        @type endian: C{int}
         @keyword result: The expected value, the default is C{Return.NORMAL}.
         @type result: C{Return}
         @return: C{None}
         """
         try:
-            retval = self._dll.swapRecord(dir)
+            self._dll.radixSort(infoClass, field, endian=endian)
         except APIException, e:
             self.fail(e)
         except FunctionException, e:
@@ -1069,6 +2716,95 @@ class TestLibDll(unittest.TestCase):
         self.assertTrue(record.value == match.value or
                         result == Return.NOT_FOUND, msg=msg)
 
+    def _fieldComparator(self, infoClass, field, type=None, descending=False,
+                         result=Return.NORMAL):
+        """
+        Execute the C{fieldComparator} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
+        @param infoClass: The C{Info} class.
+        @type infoClass: C{ctypes Structure}
+        @param field: The name of the field to compare.
+        @type field: C{str}
+        @keyword type: The field type, the default is C{None}.
+        @type type: C{FieldType}
+        @keyword descending: Reverse the order, the default is C{False}.
+        @type descending: C{bool}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: The compare function.
+        @rtype: C{ctypes CFUNCTYPE}
+        """
+        pFun = None
+
+        try:
+            pFun = self._dll.fieldComparator(infoClass, field, type=type,
+                                             descending=descending)
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+        return pFun
+
+    def _findByKey(self, record, key, test="", result=Return.NORMAL):
+        """
+        Execute the C{findByKey} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, assert that the
+        test value is correct, and asserts that the return code is correct.
+
+        @param record:  Will contain the results of the find.
+        @type record: C{Info}
+        @param key: The value of the indexed field.
+        @type key: The type of the field or C{Info}
+        @keyword test: The value to test against, the default is an empty
+                       string.
+        @type test: C{str}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.findByKey(record, key)
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+        msg = "record.value: %s, test: %s" % (record.value, test)
+        self.assertTrue(record.value == test, msg=msg)
+
+    def _findLowerBound(self, record, match, test="", result=Return.NORMAL):
+        """
+        Execute the C{findLowerBound} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, assert that the
+        test value is correct, and asserts that the return code is correct.
+
+        @param record:  Will contain the results of the find.
+        @type record: C{Info}
+        @param match: Provides the query information.
+        @type match: C{Info}
+        @keyword test: The value to test against, the default is an empty
+                       string.
+        @type test: C{str}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.findLowerBound(record, match)
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+        msg = "record.value: %s, test: %s" % (record.value, test)
+        self.assertTrue(record.value == test, msg=msg)
+
     def _findNthRecord(self, record, skip, test="", result=Return.NORMAL):
         """
         Execute the C{findNthRecord} method, asserts that there are no
@@ -1173,7 +2909,176 @@ class TestLibDll(unittest.TestCase):
         msg = "record.value: %s, test: %s" % (record.value, test)
         self.assertTrue(test == record.value, msg=msg)
 
-    def _saveList(self, path, result=Return.NORMAL):
+    def _getRecordAt(self, record, index, test="", result=Return.NORMAL):
+        """
+        Execute the C{getRecordAt} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, assert that the
+        test value is correct, and asserts that the return code is correct.
+
+        @param record: Will contain the results of the find.
+        @type record: C{Info}
+        @param index: The index of the record starting at one.
+        @type index: C{int}
+        @keyword test: The value to test against, the default is an empty
+                       string.
+        @type test: C{str}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.getRecordAt(record, index)
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+        msg = "record.value: %s, test: %s" % (record.value, test)
+        self.assertTrue(record.value == test, msg=msg)
+
+    def _iterRecords(self, dir=SrchDir.DOWN, test=[], chunkSize=None):
+        """
+        Execute the C{iterRecords} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
+        the records returned match the test values.
+
+        @keyword dir: The direction to walk the list.
+        @type dir: C{SrchDir}
+        @keyword test: Values to test, default is an empty list.
+        @type test: C{list}
+        @keyword chunkSize: The number of records fetched per call.
+        @type chunkSize: C{int}
+        @return: C{None}
+        """
+        try:
+            records = [Info.from_buffer_copy(raw).value for raw in
+                       self._dll.iterRecords(dir=dir, chunkSize=chunkSize)]
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            self.fail(e)
+
+        msg = "records: %s, test: %s" % (records, test)
+        self.assertTrue(test == records, msg=msg)
+
+    def _toArray(self, arrayType, start=0, count=None, test=[],
+                 result=Return.NORMAL):
+        """
+        Execute the C{toArray} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, assert that the
+        records copied match the test values, and asserts that the return code
+        is correct.
+
+        @param arrayType: The C{ctypes} array type to copy the records into.
+        @type arrayType: C{ctypes Array} type
+        @keyword start: The index of the first record, the default is C{0}.
+        @type start: C{int}
+        @keyword count: The number of records, the default is C{None}.
+        @type count: C{int}
+        @keyword test: Values to test, default is an empty list.
+        @type test: C{list}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        out = arrayType()
+
+        try:
+            self._dll.toArray(out, start=start, count=count)
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+            return
+
+        records = [info.value for info in out]
+        msg = "records: %s, test: %s" % (records, test)
+        self.assertTrue(test == records, msg=msg)
+
+    def _createCursor(self):
+        """
+        Execute the C{cursor} method and asserts that there are no
+        C{APIException} exceptions.
+
+        @return: The new cursor.
+        @rtype: C{Cursor}
+        """
+        try:
+            cursor = self._dll.cursor()
+        except APIException, e:
+            self.fail(e)
+
+        return cursor
+
+    def _cursorRecord(self, method, args, test="", result=Return.NORMAL):
+        """
+        Execute a C{Cursor} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, assert that the
+        test value is correct, and asserts that the return code is correct.
+
+        @param method: The bound C{Cursor} method.
+        @type method: C{instancemethod}
+        @param args: The arguments to the method, if the first is an C{Info}
+                     object its value is tested.
+        @type args: C{tuple}
+        @keyword test: The value to test against, the default is an empty
+                       string.
+        @type test: C{str}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            method(*args)
+            retval = Return.NORMAL
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            retval = e.getRetval()
+
+        msg = "Return.%s: %s" % Return.getMessage(retval)
+        self.assertTrue(retval == result, msg=msg)
+
+        if args and isinstance(args[0], Info) and method.__name__.startswith(
+            ('get', 'find')):
+            msg = "record.value: %s, test: %s" % (args[0].value, test)
+            self.assertTrue(args[0].value == test, msg=msg)
+
+    def _queryRecord(self, method, args, test="", result=Return.NORMAL):
+        """
+        Execute a C{query} method, asserts that there are no C{APIException}
+        or C{FunctionException} exceptions, assert that the test value is
+        correct, and asserts that the return code is correct.
+
+        @param method: The bound C{query} method.
+        @type method: C{instancemethod}
+        @param args: The arguments to the method, the first is the C{Info}
+                     object to test.
+        @type args: C{tuple}
+        @keyword test: The value to test against, the default is an empty
+                       string.
+        @type test: C{str}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            method(*args)
+            retval = Return.NORMAL
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            retval = e.getRetval()
+
+        msg = "Return.%s: %s" % Return.getMessage(retval)
+        self.assertTrue(retval == result, msg=msg)
+        msg = "record.value: %s, test: %s" % (args[0].value, test)
+        self.assertTrue(args[0].value == test, msg=msg)
+
+    def _saveList(self, path, pFun=None, mode=SaveMode.RAW,
+                  result=Return.NORMAL):
         """
         Execute the C{saveList} method, asserts that there are no
         C{APIException} or C{FunctionException} exceptions, and asserts that
@@ -1181,19 +3086,24 @@ class TestLibDll(unittest.TestCase):
 
         @param path: The full path to the data file.
         @type path: C{str}
+        @keyword pFun: An optional compare function, the default is C{None}.
+        @type pFun: C{ctypes CFUNCTYPE}
+        @keyword mode: The save mode, the default is C{SaveMode.RAW}.
+        @type mode: C{SaveMode}
         @keyword result: The expected value, the default is C{Return.NORMAL}.
         @type result: C{Return}
         @return: C{None}
         """
         try:
-            retval = self._dll.saveList(path)
+            retval = self._dll.saveList(path, pFun=pFun, mode=mode)
         except APIException, e:
             self.fail(e)
         except FunctionException, e:
             msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
             self.assertTrue(e.getRetval() == result, msg=msg)
 
-    def _loadList(self, path, pFun=None, result=Return.NORMAL):
+    def _loadList(self, path, pFun=None, mode=LoadMode.INSERT,
+                  result=Return.NORMAL):
         """
         Execute the C{loadList} method, asserts that there are no
         C{APIException} or C{FunctionException} exceptions, and asserts that
@@ -1203,12 +3113,75 @@ class TestLibDll(unittest.TestCase):
         @type path: C{str}
         @keyword pFun: An optional compare function, the default is C{None}.
         @type pFun: C{ctypes CFUNCTYPE}
+        @keyword mode: The load mode, the default is C{LoadMode.INSERT}.
+        @type mode: C{LoadMode}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.loadList(path, pFun=pFun, mode=mode)
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+
+    def _openJournal(self, path, logPath, sync=False, result=Return.NORMAL):
+        """
+        Execute the C{openJournal} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
+        @param path: The full path to the snapshot file.
+        @type path: C{str}
+        @param logPath: The full path to the log file.
+        @type logPath: C{str}
+        @keyword sync: Flush every write to disk, the default is C{False}.
+        @type sync: C{bool}
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.openJournal(path, logPath, sync=sync)
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+    def _compactJournal(self, result=Return.NORMAL):
+        """
+        Execute the C{compactJournal} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
+        @keyword result: The expected value, the default is C{Return.NORMAL}.
+        @type result: C{Return}
+        @return: C{None}
+        """
+        try:
+            retval = self._dll.compactJournal()
+        except APIException, e:
+            self.fail(e)
+        except FunctionException, e:
+            msg = "Return.%s: %s" % Return.getMessage(e.getRetval())
+            self.assertTrue(e.getRetval() == result, msg=msg)
+
+    def _closeJournal(self, result=Return.NORMAL):
+        """
+        Execute the C{closeJournal} method, asserts that there are no
+        C{APIException} or C{FunctionException} exceptions, and asserts that
+        the return code is correct.
+
         @keyword result: The expected value, the default is C{Return.NORMAL}.
         @type result: C{Return}
         @return: C{None}
         """
         try:
-            retval = self._dll.loadList(path, pFun=pFun)
+            retval = self._dll.closeJournal()
         except APIException, e:
             self.fail(e)
         except FunctionException, e: